@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+相框生成性能基准测试
+使用合成照片（不同分辨率、EXIF方向和相机品牌）对每个已注册模板计时，
+分别统计解码、方向处理、布局、Logo、文本、合成、编码和总耗时
+
+用法:
+    python benchmark/bench_create_frame.py                                   # 12MP和24MP合成照片
+    python benchmark/bench_create_frame.py --resolutions 12MP 24MP 45MP 100MP --json results.json
+    python benchmark/bench_create_frame.py --corpus <照片目录>               # 使用真实照片
+"""
+
+import argparse
+import glob
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+# 将项目根目录添加到Python路径
+PROJECT_ROOT = os.path.dirname(os.path.abspath(os.path.join(__file__, "..")))
+sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import PIL
+
+from entity.photo import Photo
+from template import get_template_context
+from template.bottom_bar_template import get_bar_strip_cache, get_logo_cache
+from utils.canvas_pool import release_canvas
+from utils.text_measure import get_measure_cache
+from utils.text_sprite import get_sprite_cache
+from synthetic_corpus import generate_corpus, RESOLUTIONS, ORIENTATIONS
+
+# 结果中各阶段的顺序
+STAGES = ("decode", "orientation", "layout", "logo", "text", "compose", "encode", "total")
+
+
+class StageTimer:
+    """
+    通过包装模板实例的方法统计各阶段耗时
+    """
+
+    def __init__(self):
+        self.totals = defaultdict(float)
+
+    def wrap(self, obj, method_name, stage):
+        """
+        包装对象的方法，调用耗时累加到指定阶段；对象没有该方法时忽略
+
+        Args:
+            obj: 模板实例
+            method_name: 方法名
+            stage: 阶段名
+        """
+        method = getattr(obj, method_name, None)
+        if method is None:
+            return
+
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self.totals[stage] += time.perf_counter() - start
+
+        setattr(obj, method_name, timed)
+
+
+def clear_caches():
+    """
+    清空模板使用的全部缓存，用于测量冷启动耗时
+    """
+    get_bar_strip_cache().clear()
+    get_logo_cache().clear()
+    get_sprite_cache().clear()
+    get_measure_cache().clear()
+
+
+def render_once(template_name, photo_path):
+    """
+    使用指定模板处理一张照片并统计各阶段耗时
+
+    Args:
+        template_name: 模板名称
+        photo_path: 照片路径
+
+    Returns:
+        dict: 各阶段耗时（毫秒）
+    """
+    timings = {}
+    start = time.perf_counter()
+
+    photo = Photo(photo_path)
+    photo.img.load()
+    timings["decode"] = time.perf_counter() - start
+
+    stage_start = time.perf_counter()
+    photo.fix_orientation()
+    timings["orientation"] = time.perf_counter() - stage_start
+
+    template = get_template_context().get_template(template_name)
+    timer = StageTimer()
+    timer.wrap(template, "plan_bar", "plan")
+    timer.wrap(template, "_get_scaled_logo", "logo")
+    timer.wrap(template, "draw_static_content", "static_text")
+    timer.wrap(template, "draw_dynamic_text", "dynamic_text")
+
+    stage_start = time.perf_counter()
+    frame = template.create_frame(photo=photo, selected_params=template_selected_params(template))
+    create_frame_time = time.perf_counter() - stage_start
+
+    stage_start = time.perf_counter()
+    buffer = io.BytesIO()
+    frame.save(buffer, "JPEG")
+    timings["encode"] = time.perf_counter() - stage_start
+    timings["total"] = time.perf_counter() - start
+
+    text_time = timer.totals["static_text"] + timer.totals["dynamic_text"]
+    timings["logo"] = timer.totals["logo"]
+    timings["layout"] = timer.totals["plan"] - timer.totals["logo"]
+    timings["text"] = text_time
+    timings["compose"] = create_frame_time - timer.totals["plan"] - text_time
+
+    release_canvas(frame)
+    photo.close()
+    return {stage: timings[stage] * 1000 for stage in STAGES}
+
+
+def template_selected_params(template):
+    """
+    获取模板显示的EXIF参数（与GUI一致）
+    """
+    return list(getattr(template, "SELECTED_PARAMS", ["相机型号", "镜头型号", "焦距", "光圈", "快门速度", "ISO", "拍摄时间"]))
+
+
+def load_real_corpus(corpus_dir):
+    """
+    读取真实照片目录，按照片尺寸归类
+
+    Returns:
+        list: 照片信息列表
+    """
+    paths = sorted(set(glob.glob(os.path.join(corpus_dir, "*.jpg")) + glob.glob(os.path.join(corpus_dir, "*.jpeg"))
+                       + glob.glob(os.path.join(corpus_dir, "*.JPG"))))
+    photos = []
+    for path in paths:
+        photo = Photo(path)
+        megapixels = photo.width * photo.height / 1e6
+        photos.append({
+            "path": path,
+            "size": [photo.width, photo.height],
+            "resolution": f"{megapixels:.0f}MP",
+            "orientation": photo.orientation,
+            "make": photo.exif_data.get("Make", ""),
+            "model": photo.exif_data.get("Model", ""),
+            "has_logo": None
+        })
+        photo.close()
+    return photos
+
+
+def summarize(results):
+    """
+    按模板和分辨率汇总各阶段耗时的中位数
+
+    Returns:
+        dict: 模板 -> 分辨率 -> 阶段 -> 中位数耗时（毫秒）
+    """
+    grouped = defaultdict(lambda: defaultdict(lambda: defaultdict(list)))
+    for result in results:
+        for stage in STAGES:
+            grouped[result["template"]][result["resolution"]][stage].append(result["stages"][stage])
+    return {
+        template: {
+            resolution: {stage: statistics.median(values) for stage, values in stages.items()}
+            for resolution, stages in resolutions.items()
+        }
+        for template, resolutions in grouped.items()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="相框生成性能基准测试")
+    parser.add_argument("--corpus", help="真实照片目录（不指定时使用合成照片）")
+    parser.add_argument("--corpus-dir", default=os.path.join(tempfile.gettempdir(), "photo_frame_helper_corpus"),
+                        help="合成照片目录（参数相同时复用已生成的照片）")
+    parser.add_argument("--resolutions", nargs="+", default=["12MP", "24MP"], choices=list(RESOLUTIONS),
+                        help="合成照片的分辨率")
+    parser.add_argument("--orientations", nargs="+", type=int, default=list(ORIENTATIONS), choices=ORIENTATIONS,
+                        help="合成照片的EXIF方向")
+    parser.add_argument("--templates", nargs="+", help="要测试的模板名称（默认全部已注册模板）")
+    parser.add_argument("--repeat", type=int, default=1, help="每张照片的重复次数")
+    parser.add_argument("--cold", action="store_true", help="每次处理前清空缓存，测量冷启动耗时")
+    parser.add_argument("--json", help="将结果写入JSON文件")
+    args = parser.parse_args()
+
+    # 模板按当前工作目录查找logo等资源
+    os.chdir(PROJECT_ROOT)
+
+    if args.corpus:
+        photos = load_real_corpus(args.corpus)
+    else:
+        print(f"准备合成照片: {args.corpus_dir}")
+        photos = generate_corpus(args.corpus_dir, args.resolutions, args.orientations)
+    if not photos:
+        print("没有找到JPG/JPEG文件")
+        return
+
+    template_names = args.templates or get_template_context().get_all_template_names()
+    results = []
+    for template_name in template_names:
+        clear_caches()
+        for photo in photos:
+            for run in range(args.repeat):
+                if args.cold:
+                    clear_caches()
+                stages = render_once(template_name, photo["path"])
+                results.append({
+                    "template": template_name,
+                    "photo": os.path.basename(photo["path"]),
+                    "resolution": photo["resolution"],
+                    "orientation": photo["orientation"],
+                    "make": photo["make"],
+                    "has_logo": photo["has_logo"],
+                    "run": run,
+                    "stages": stages
+                })
+
+    summary = summarize(results)
+    print(f"\n{'模板':<8} {'分辨率':<6} " + " ".join(f"{stage:>11}" for stage in STAGES))
+    for template_name, resolutions in summary.items():
+        for resolution, stages in resolutions.items():
+            print(f"{template_name:<8} {resolution:<6} " + " ".join(f"{stages[stage]:>9.1f}ms" for stage in STAGES))
+
+    if args.json:
+        output = {
+            "environment": {
+                "python": platform.python_version(),
+                "pillow": PIL.__version__,
+                "platform": platform.platform(),
+                "processor": platform.processor()
+            },
+            "config": {"corpus": args.corpus or args.corpus_dir, "repeat": args.repeat, "cold": args.cold,
+                       "templates": template_names},
+            "summary": summary,
+            "results": results
+        }
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(output, f, ensure_ascii=False, indent=2)
+        print(f"\n结果已写入: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
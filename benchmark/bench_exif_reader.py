@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+EXIF读取性能基准测试
+对比精简EXIF读取工具与Pillow的_getexif在同一批照片上的耗时
+
+用法:
+    python benchmark/bench_exif_reader.py                      # 使用生成的测试照片
+    python benchmark/bench_exif_reader.py --corpus <照片目录>  # 使用真实照片
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import tempfile
+import time
+
+# 将项目根目录添加到Python路径
+sys.path.insert(0, os.path.dirname(os.path.abspath(os.path.join(__file__, ".."))))
+
+from PIL import Image, ExifTags
+from PIL.TiffImagePlugin import IFDRational
+
+from utils.exif_reader import read_exif_tags, EXIF_TAGS
+
+
+def generate_corpus(output_dir, count, maker_note_size):
+    """
+    生成带EXIF信息和MakerNote的测试照片
+
+    Args:
+        output_dir: 输出目录
+        count: 照片数量
+        maker_note_size: MakerNote的字节数
+
+    Returns:
+        list: 照片路径列表
+    """
+    paths = []
+    for i in range(count):
+        exif = Image.Exif()
+        exif[0x010f] = "NIKON CORPORATION"
+        exif[0x0110] = "NIKON Z 6_2"
+        exif[0x0112] = 1
+        exif_ifd = exif.get_ifd(0x8769)
+        exif_ifd[0x829a] = IFDRational(1, 250)
+        exif_ifd[0x829d] = IFDRational(28, 10)
+        exif_ifd[0x8827] = 100 * (i % 8 + 1)
+        exif_ifd[0x9003] = f"2025:10:01 12:00:{i % 60:02d}"
+        exif_ifd[0x920a] = IFDRational(50, 1)
+        exif_ifd[0x927c] = os.urandom(maker_note_size)
+        exif_ifd[0xa434] = "NIKKOR Z 24-70mm f/4 S"
+        path = os.path.join(output_dir, f"exif_{i:04d}.jpg")
+        Image.new("RGB", (640, 427), (i % 255, 100, 150)).save(path, exif=exif, quality=85)
+        paths.append(path)
+    return paths
+
+
+def read_with_getexif(path):
+    """
+    原有的读取方式：打开图片并用_getexif解析全部标签
+    """
+    exif_data = {}
+    with Image.open(path) as img:
+        exif = img._getexif()
+        if exif:
+            for tag_id, value in exif.items():
+                exif_data[ExifTags.TAGS.get(tag_id, tag_id)] = value
+    return exif_data
+
+
+def read_with_reader(path):
+    """
+    新的读取方式：只解析APP1段中需要的标签
+    """
+    return read_exif_tags(path, EXIF_TAGS)
+
+
+def time_reader(reader, paths, repeat):
+    """
+    统计读取一批照片的耗时
+
+    Returns:
+        dict: 总耗时和单张照片平均耗时（毫秒）
+    """
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for path in paths:
+            reader(path)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return {"total_ms": best * 1000, "per_photo_ms": best * 1000 / len(paths)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="EXIF读取性能基准测试")
+    parser.add_argument("--corpus", help="真实照片目录（不指定时生成测试照片）")
+    parser.add_argument("--count", type=int, default=200, help="生成的测试照片数量")
+    parser.add_argument("--maker-note-size", type=int, default=32 * 1024, help="生成照片的MakerNote字节数")
+    parser.add_argument("--repeat", type=int, default=3, help="重复次数，取最快一次")
+    parser.add_argument("--json", help="将结果写入JSON文件")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        if args.corpus:
+            paths = sorted(glob.glob(os.path.join(args.corpus, "*.jpg")) + glob.glob(os.path.join(args.corpus, "*.jpeg"))
+                           + glob.glob(os.path.join(args.corpus, "*.JPG")))
+        else:
+            paths = generate_corpus(temp_dir, args.count, args.maker_note_size)
+
+        if not paths:
+            print("没有找到JPG/JPEG文件")
+            return
+
+        # 先校验两种方式读取到的标签一致
+        mismatches = 0
+        for path in paths:
+            expected = {k: v for k, v in read_with_getexif(path).items() if k in EXIF_TAGS}
+            if read_with_reader(path) != expected:
+                mismatches += 1
+
+        results = {
+            "photos": len(paths),
+            "mismatches": mismatches,
+            "getexif": time_reader(read_with_getexif, paths, args.repeat),
+            "exif_reader": time_reader(read_with_reader, paths, args.repeat)
+        }
+        results["speedup"] = results["getexif"]["total_ms"] / max(results["exif_reader"]["total_ms"], 1e-9)
+
+    print(f"照片数量: {results['photos']}，结果不一致: {results['mismatches']}")
+    print(f"_getexif:    {results['getexif']['per_photo_ms']:.3f} ms/张")
+    print(f"exif_reader: {results['exif_reader']['per_photo_ms']:.3f} ms/张")
+    print(f"加速比: {results['speedup']:.1f}x")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
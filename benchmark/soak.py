@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+长时间运行的资源泄漏检测（soak测试）
+循环处理合成照片数千次，定期采样打开的文件描述符数量和常驻内存，
+预热（缓存填满）后两者应保持平稳
+
+用法:
+    python benchmark/soak.py --renders 10000
+    python benchmark/soak.py --renders 2000 --templates 白色底边 --json soak.json
+"""
+
+import argparse
+import gc
+import json
+import os
+import statistics
+import sys
+import tempfile
+
+# 将项目根目录添加到Python路径
+PROJECT_ROOT = os.path.dirname(os.path.abspath(os.path.join(__file__, "..")))
+sys.path.insert(0, PROJECT_ROOT)
+
+from entity.photo import Photo
+from template import get_template_context
+from utils.canvas_pool import release_canvas
+from utils.image_io import save_image
+from utils.memory_profiler import current_rss
+from benchmark.synthetic_corpus import generate_photo, CAMERAS
+
+_MB = 1024 * 1024
+
+# soak照片的尺寸和EXIF方向，相机在有Logo和没有Logo的品牌之间轮换
+SOAK_PHOTO_SIZE = (1200, 800)
+SOAK_ORIENTATIONS = (1, 3, 6, 8)
+
+
+def open_fd_count():
+    """
+    获取当前进程打开的文件描述符数量
+
+    Returns:
+        int: 文件描述符数量，平台不支持时返回None
+    """
+    for fd_dir in ("/proc/self/fd", "/dev/fd"):
+        try:
+            return len(os.listdir(fd_dir))
+        except OSError:
+            continue
+    return None
+
+
+def generate_soak_photos(output_dir, size=SOAK_PHOTO_SIZE):
+    """
+    生成soak测试使用的合成照片
+
+    Args:
+        output_dir: 输出目录
+        size: 照片尺寸
+
+    Returns:
+        list: 照片路径列表
+    """
+    paths = []
+    for index, camera in enumerate(CAMERAS):
+        path = os.path.join(output_dir, f"soak_{index}.jpg")
+        generate_photo(path, size, SOAK_ORIENTATIONS[index % len(SOAK_ORIENTATIONS)], camera, index)
+        paths.append(path)
+    return paths
+
+
+def render_and_save(template, photo_path, output_path):
+    """
+    按批量处理流程处理一张照片：解码、修复方向、生成相框并保存
+    """
+    with Photo(photo_path) as photo:
+        photo.decode()
+        photo.fix_orientation()
+        framed = template.render(photo)
+    save_image(framed, output_path, "JPEG")
+    release_canvas(framed)
+
+
+def run_soak(photo_paths, renders, template_names=None, samples=20, output_dir=None):
+    """
+    循环处理照片，定期采样文件描述符数量和常驻内存
+
+    每次处理后还会只读取一次照片信息（不解码），覆盖只读取EXIF和尺寸的使用方式
+
+    Args:
+        photo_paths: 照片路径列表
+        renders: 处理次数
+        template_names: 轮换使用的模板名称，为空时使用全部已注册模板
+        samples: 采样次数
+        output_dir: 输出目录，为空时使用临时目录
+
+    Returns:
+        dict: 采样结果，包含samples列表以及预热后的fd_growth和rss_growth_mb
+    """
+    context = get_template_context()
+    templates = [context.get_template(name) for name in (template_names or context.get_all_template_names())]
+    interval = max(1, renders // samples)
+
+    with tempfile.TemporaryDirectory(dir=output_dir) as temp_dir:
+        output_path = os.path.join(temp_dir, "framed.jpg")
+        sample_list = []
+        for index in range(renders):
+            render_and_save(templates[index % len(templates)], photo_paths[index % len(photo_paths)], output_path)
+            Photo(photo_paths[(index + 1) % len(photo_paths)]).close()
+            if (index + 1) % interval == 0 or index + 1 == renders:
+                gc.collect()
+                sample_list.append({"renders": index + 1, "fds": open_fd_count(), "rss_mb": current_rss() / _MB})
+
+    # 前四分之一作为预热（填满logo、文本等缓存），之后与最后四分之一的采样比较
+    warm = sample_list[max(0, len(sample_list) // 4 - 1)]
+    tail = sample_list[-max(1, len(sample_list) // 4):]
+    fds = [sample["fds"] for sample in sample_list if sample["fds"] is not None]
+    return {
+        "renders": renders,
+        "samples": sample_list,
+        "fd_growth": (max(fds[len(fds) // 4:]) - warm["fds"]) if fds else None,
+        "rss_growth_mb": statistics.median(sample["rss_mb"] for sample in tail) - warm["rss_mb"]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="长时间运行的文件描述符和内存泄漏检测")
+    parser.add_argument("--renders", type=int, default=10000, help="处理次数")
+    parser.add_argument("--templates", nargs="+", help="轮换使用的模板名称（默认全部已注册模板）")
+    parser.add_argument("--samples", type=int, default=20, help="采样次数")
+    parser.add_argument("--max-fd-growth", type=int, default=0, help="允许的文件描述符增长数量")
+    parser.add_argument("--max-rss-growth", type=float, default=32, help="允许的常驻内存增长（MB）")
+    parser.add_argument("--json", help="将采样结果写入JSON文件")
+    args = parser.parse_args()
+
+    # 模板按当前工作目录查找logo等资源
+    os.chdir(PROJECT_ROOT)
+
+    with tempfile.TemporaryDirectory() as corpus_dir:
+        photo_paths = generate_soak_photos(corpus_dir)
+        result = run_soak(photo_paths, args.renders, args.templates, args.samples)
+
+    print(f"{'处理次数':>8} {'文件描述符':>10} {'RSS(MB)':>10}")
+    for sample in result["samples"]:
+        print(f"{sample['renders']:>12} {str(sample['fds']):>14} {sample['rss_mb']:>10.1f}")
+    print(f"\n预热后文件描述符增长: {result['fd_growth']}，常驻内存增长: {result['rss_growth_mb']:.1f}MB")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f"结果已写入: {args.json}")
+
+    leaked = ((result["fd_growth"] or 0) > args.max_fd_growth) or result["rss_growth_mb"] > args.max_rss_growth
+    if leaked:
+        print("检测到资源泄漏")
+    sys.exit(1 if leaked else 0)
+
+
+if __name__ == "__main__":
+    main()
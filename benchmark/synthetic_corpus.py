@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+合成测试照片生成工具
+生成带EXIF信息的JPEG照片，覆盖常见分辨率、全部8种EXIF方向，
+以及有Logo和没有Logo的相机品牌，供基准测试和单元测试使用
+
+用法:
+    python benchmark/synthetic_corpus.py --output <目录> --resolutions 12MP 24MP
+"""
+
+import argparse
+import json
+import os
+import random
+
+from PIL import Image, ImageOps
+from PIL.TiffImagePlugin import IFDRational
+
+# 常见相机分辨率（宽, 高）
+RESOLUTIONS = {
+    "12MP": (4000, 3000),
+    "24MP": (6000, 4000),
+    "45MP": (8256, 5504),
+    "100MP": (11648, 8736)
+}
+
+# EXIF方向1-8
+ORIENTATIONS = tuple(range(1, 9))
+
+# 相机品牌、型号和镜头；has_logo表示logo目录中能按型号识别到品牌Logo
+CAMERAS = (
+    {"make": "NIKON CORPORATION", "model": "NIKON Z 6_2", "lens": "NIKKOR Z 24-70mm f/4 S", "has_logo": True},
+    {"make": "Canon", "model": "Canon EOS R5", "lens": "RF24-105mm F4 L IS USM", "has_logo": True},
+    {"make": "Leica Camera AG", "model": "LEICA Q3", "lens": "SUMMILUX 1:1.7/28 ASPH.", "has_logo": True},
+    {"make": "SONY", "model": "ILCE-7RM5", "lens": "FE 24-70mm F2.8 GM II", "has_logo": False},
+    {"make": "FUJIFILM", "model": "X-T5", "lens": "XF16-55mmF2.8 R LM WR", "has_logo": False}
+)
+
+# 噪声纹理块大小，使生成的照片具有接近真实照片的压缩率和解码开销
+_NOISE_TILE_SIZE = 256
+
+# 生成清单文件名
+MANIFEST_NAME = "manifest.json"
+
+
+def _build_exif(camera, orientation, index):
+    """
+    构造照片的EXIF信息
+
+    Args:
+        camera: CAMERAS中的相机信息
+        orientation: EXIF方向
+        index: 照片序号，用于生成不同的拍摄参数
+
+    Returns:
+        Image.Exif: EXIF信息
+    """
+    exif = Image.Exif()
+    exif[0x010f] = camera["make"]
+    exif[0x0110] = camera["model"]
+    exif[0x0112] = orientation
+    exif_ifd = exif.get_ifd(0x8769)
+    exif_ifd[0x829a] = IFDRational(1, (125, 250, 500, 1000, 4000)[index % 5])
+    exif_ifd[0x829d] = IFDRational((18, 28, 40, 56, 80)[index % 5], 10)
+    exif_ifd[0x8827] = (100, 200, 400, 800, 3200)[index % 5]
+    exif_ifd[0x9003] = f"2025:10:{index % 28 + 1:02d} 12:{index % 60:02d}:00"
+    exif_ifd[0x9204] = IFDRational(-(index % 3), 3)
+    exif_ifd[0x920a] = IFDRational((24, 35, 50, 70, 105)[index % 5], 1)
+    exif_ifd[0xa434] = camera["lens"]
+    return exif
+
+
+def generate_image(size, index, texture=True):
+    """
+    生成带渐变和噪声纹理的RGB图像，相同参数生成的图像完全相同
+
+    Args:
+        size: 图像尺寸（宽, 高）
+        index: 照片序号，用于生成不同的色调和纹理
+        texture: 是否叠加噪声纹理（不叠加时图像更容易压缩，适合保存为参考图片）
+
+    Returns:
+        Image.Image: RGB图像
+    """
+    dark = ((index * 53) % 128, (index * 97) % 128, (index * 29) % 128)
+    light = (128 + (index * 31) % 128, 128 + (index * 71) % 128, 128 + (index * 13) % 128)
+    gradient = Image.linear_gradient("L").resize(size)
+    image = ImageOps.colorize(gradient, dark, light)
+    gradient.close()
+    if not texture:
+        return image
+
+    noise_bytes = random.Random(index).randbytes(_NOISE_TILE_SIZE * _NOISE_TILE_SIZE * 3)
+    noise = Image.frombytes("RGB", (_NOISE_TILE_SIZE, _NOISE_TILE_SIZE), noise_bytes)
+    for top in range(0, size[1], _NOISE_TILE_SIZE):
+        for left in range(0, size[0], _NOISE_TILE_SIZE):
+            box = (left, top, min(left + _NOISE_TILE_SIZE, size[0]), min(top + _NOISE_TILE_SIZE, size[1]))
+            region = image.crop(box)
+            tile = noise.crop((0, 0, region.width, region.height))
+            image.paste(Image.blend(region, tile, 0.25), box)
+    return image
+
+
+def generate_photo(path, size, orientation=1, camera=CAMERAS[0], index=0, quality=90, texture=True):
+    """
+    生成一张带EXIF信息的合成JPEG照片
+
+    Args:
+        path: 输出路径
+        size: 传感器方向的图像尺寸（宽, 高）
+        orientation: EXIF方向
+        camera: CAMERAS中的相机信息
+        index: 照片序号
+        quality: JPEG质量
+        texture: 是否叠加噪声纹理
+
+    Returns:
+        dict: 照片信息
+    """
+    image = generate_image(size, index, texture)
+    image.save(path, "JPEG", quality=quality, exif=_build_exif(camera, orientation, index))
+    image.close()
+    return {
+        "path": path,
+        "size": list(size),
+        "orientation": orientation,
+        "make": camera["make"],
+        "model": camera["model"],
+        "lens": camera["lens"],
+        "has_logo": camera["has_logo"]
+    }
+
+
+def generate_corpus(output_dir, resolutions=("12MP", "24MP"), orientations=ORIENTATIONS, quality=90):
+    """
+    生成合成照片集，已存在相同参数的照片集时直接复用
+
+    每种分辨率生成每个方向各一张照片，相机在有Logo和没有Logo的品牌之间轮换
+
+    Args:
+        output_dir: 输出目录
+        resolutions: RESOLUTIONS中的分辨率名称
+        orientations: EXIF方向
+        quality: JPEG质量
+
+    Returns:
+        list: 照片信息列表（包含path、resolution、orientation、make、has_logo等）
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    params = {"resolutions": list(resolutions), "orientations": list(orientations), "quality": quality}
+    manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+    if os.path.exists(manifest_path):
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("params") == params and all(os.path.exists(p["path"]) for p in manifest["photos"]):
+            return manifest["photos"]
+
+    photos = []
+    index = 0
+    for resolution in resolutions:
+        size = RESOLUTIONS[resolution]
+        for orientation in orientations:
+            camera = CAMERAS[index % len(CAMERAS)]
+            path = os.path.join(output_dir, f"{resolution}_o{orientation}_{index:03d}.jpg")
+            info = generate_photo(path, size, orientation, camera, index, quality)
+            info["resolution"] = resolution
+            photos.append(info)
+            index += 1
+
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump({"params": params, "photos": photos}, f, ensure_ascii=False, indent=2)
+    return photos
+
+
+def main():
+    parser = argparse.ArgumentParser(description="生成带EXIF信息的合成测试照片")
+    parser.add_argument("--output", required=True, help="输出目录")
+    parser.add_argument("--resolutions", nargs="+", default=["12MP", "24MP"], choices=list(RESOLUTIONS),
+                        help="生成的分辨率")
+    parser.add_argument("--orientations", nargs="+", type=int, default=list(ORIENTATIONS), choices=ORIENTATIONS,
+                        help="生成的EXIF方向")
+    parser.add_argument("--quality", type=int, default=90, help="JPEG质量")
+    args = parser.parse_args()
+
+    photos = generate_corpus(args.output, args.resolutions, args.orientations, args.quality)
+    print(f"已生成 {len(photos)} 张照片: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,8 +2,28 @@ import os
 import sys
 import argparse
 import glob
+import time
+import asyncio
+from contextlib import nullcontext, redirect_stdout
 from PIL import Image, ImageDraw, ImageFont, ExifTags
 from entity.photo import Photo
+from config import config_manager
+from utils.batch_scheduler import schedule_batch, ResultReorderBuffer
+from utils.exif_format import format_exif_value
+from utils.canvas_pool import get_canvas_pool, release_canvas
+from utils.exif_catalog import ExifCatalog
+from utils.image_io import save_image, encode_image, write_image
+from utils.instrumentation import TraceCollector, add_collector, remove_collector
+from utils.memory_profiler import MemoryProfiler
+from utils.progress_reporter import ProgressReporter, StageTimings
+from utils.pipe_framing import read_frames, write_frame, FramingError
+from utils.metrics import RenderMetrics, MetricsFileExporter, MetricsHTTPExporter
+from template.bottom_bar_template import render_cache_stats
+from template import get_template_context
+from engine.async_batch import AsyncBatch
+from engine.render_api import get_template
+from engine.worker_pool import IsolatedWorkerPool, RenderTask
+from engine.strip_render import render_strips
 
 # 定义中文参数到EXIF标签的映射
 EXIF_MAPPING = {
@@ -22,6 +42,9 @@ EXIF_MAPPING = {
 # 定义所有可用的EXIF参数
 ALL_EXIF_PARAMS = list(EXIF_MAPPING.keys())
 
+# 分条渲染支持的未压缩照片格式
+STRIP_EXTENSIONS = (".tif", ".tiff", ".ppm", ".bmp")
+
 def get_exif_data(image_path):
     """获取照片的EXIF数据"""
     exif_data = {}
@@ -36,64 +59,336 @@ def get_exif_data(image_path):
         print(f"读取EXIF数据失败: {e}")
     return exif_data
 
-def process_image(photo, output_dir, frame_color, frame_width, selected_params):
+def frame_photo(photo, frame_color, frame_width, selected_params, template=None):
+    """解码照片并生成带相框的图片"""
+    photo.decode()
+    if template:
+        # 使用已注册的模板（依次调用before/after_create_frame钩子）
+        photo.fix_orientation()
+        return template.render(photo, frame_width=frame_width, frame_color=frame_color,
+                               selected_params=selected_params)
+    return draw_border_frame(photo, frame_color, frame_width, selected_params)
+
+def process_image(photo, output_dir, frame_color, frame_width, selected_params, template=None):
     """处理单张图片"""
     try:
-        # 计算新尺寸（添加相框）
-        new_width = photo.width + 2 * frame_width
-        new_height = photo.height + 2 * frame_width
-        
-        # 创建新图片（包含相框）
-        new_img = Image.new("RGB", (new_width, new_height), frame_color)
-        new_img.paste(photo.img, (frame_width, frame_width))
-        
-        # 添加EXIF信息（如果有选中参数）
-        if selected_params:
-            draw = ImageDraw.Draw(new_img)
-            # 使用默认字体
-            try:
-                font = ImageFont.truetype("arial.ttf", 12)
-            except:
-                font = ImageFont.load_default()
-            
-            y_offset = frame_width + 10
-            for param in selected_params:
-                if param in EXIF_MAPPING:
-                    exif_tag = EXIF_MAPPING[param]
-                    if exif_tag in photo.exif_data:
-                        value = photo.exif_data[exif_tag]
-                        text = f"{param}: {value}"
-                        draw.text((frame_width + 10, y_offset), text, fill="white", font=font)
-                        y_offset += 20
+        new_img = frame_photo(photo, frame_color, frame_width, selected_params, template)
         
         # 保存新图片
-        filename = os.path.basename(photo.path)
+        filename = os.path.basename(photo.image_path)
         new_filename = f"framed_{filename}"
         new_file_path = os.path.join(output_dir, new_filename)
         
-        new_img.save(new_file_path, "JPEG")
+        save_image(new_img, new_file_path, "JPEG")
+        # 画布归还给画布池，下一张相同尺寸的照片直接复用
+        release_canvas(new_img)
         return True, new_file_path
     except Exception as e:
-        return False, str(e)
+        return False, e
+
+def render_photo_file(task):
+    """
+    在隔离的工作进程中处理一张照片（--isolate）
+    
+    Args:
+        task: RenderTask，params中为frame_color、frame_width和selected_params，
+              输出文件在output_path所在的目录中按命令行的命名规则生成
+    
+    Returns:
+        str: 输出文件路径
+    """
+    template = get_template(task.template) if task.template else None
+    with Photo(task.path, exif_data=task.exif_data) as photo:
+        success, result = process_image(photo, os.path.dirname(task.output_path), task.params["frame_color"],
+                                        task.params["frame_width"], task.params["selected_params"], template)
+    if not success:
+        raise result
+    return result
+
+def draw_border_frame(photo, frame_color, frame_width, selected_params):
+    """绘制四周等宽的相框，并在左上角列出EXIF参数"""
+    # 计算新尺寸（添加相框）
+    new_width = photo.width + 2 * frame_width
+    new_height = photo.height + 2 * frame_width
+    
+    # 从画布池取出画布并原地填充相框颜色
+    new_img = get_canvas_pool().acquire("RGB", (new_width, new_height), frame_color)
+    new_img.paste(photo.img, (frame_width, frame_width))
+    
+    # 添加EXIF信息（如果有选中参数）
+    if selected_params:
+        draw = ImageDraw.Draw(new_img)
+        # 使用默认字体
+        try:
+            font = ImageFont.truetype("arial.ttf", 12)
+        except:
+            font = ImageFont.load_default()
+        
+        y_offset = frame_width + 10
+        for param in selected_params:
+            if param in EXIF_MAPPING:
+                exif_tag = EXIF_MAPPING[param]
+                if exif_tag in photo.exif_data:
+                    value = photo.exif_data[exif_tag]
+                    text = f"{param}: {format_exif_value(param, value)}"
+                    draw.text((frame_width + 10, y_offset), text, fill="white", font=font)
+                    y_offset += 20
+    
+    return new_img
 
 def main():
     parser = argparse.ArgumentParser(description="照片相框助手 - 命令行版本")
     
     # 添加参数
-    parser.add_argument("--input", "-i", required=True, help="输入照片文件或目录路径")
-    parser.add_argument("--output", "-o", required=True, help="输出目录路径")
+    parser.add_argument("--input", "-i", help="输入照片文件或目录路径，-表示从标准输入读取照片数据")
+    parser.add_argument("--output", "-o", help="输出目录路径，-表示将JPEG写到标准输出")
+    parser.add_argument("--framing", choices=["none", "length"], default="none",
+                        help="管道模式下的多图片分帧：length表示每张图片前有一行十进制字节数（需要-i -）")
     parser.add_argument("--frame-color", "-c", default="black", choices=["black", "white"], help="相框模板")
     parser.add_argument("--frame-width", "-w", type=int, default=20, help="相框宽度（像素）")
     parser.add_argument("--params", "-p", nargs="+", choices=ALL_EXIF_PARAMS, help="要显示的EXIF参数")
+    parser.add_argument("--schedule", action="store_true", default=config_manager.get_cache_aware_ordering(),
+                        help="按尺寸、相机和镜头分组处理以提高缓存命中率（结果仍按原始顺序输出）")
+    parser.add_argument("--catalog", help="EXIF目录库文件路径（SQLite），用于增量扫描和筛选照片")
+    parser.add_argument("--recursive", "-r", action="store_true", help="使用目录库时递归扫描子目录")
+    parser.add_argument("--make", help="只处理指定品牌的照片（需要--catalog）")
+    parser.add_argument("--model", help="只处理指定相机型号的照片（需要--catalog）")
+    parser.add_argument("--lens", help="只处理指定镜头的照片（需要--catalog）")
+    parser.add_argument("--focal-length", type=float, help="只处理指定焦距（毫米）的照片（需要--catalog）")
+    parser.add_argument("--date-from", help="只处理该日期及之后拍摄的照片，如2025-10-01（需要--catalog）")
+    parser.add_argument("--date-to", help="只处理该日期及之前拍摄的照片，如2025-10-31（需要--catalog）")
+    parser.add_argument("--template", "-t", choices=get_template_context().get_all_template_names(),
+                        help="使用已注册的相框模板（不指定时绘制四周等宽的相框）")
+    parser.add_argument("--trace", help="记录各阶段耗时并写入Chrome trace JSON文件，处理完成后输出耗时统计")
+    parser.add_argument("--profile-memory", action="store_true", default=config_manager.get_profile_memory(),
+                        help="记录每张照片的峰值内存（RSS）、各阶段内存增量和主要内存分配位置")
+    parser.add_argument("--memory-threshold", type=float, default=config_manager.get_memory_threshold_mb(),
+                        help="标记峰值内存增量超过该值（MB）的照片（需要--profile-memory）")
+    parser.add_argument("--memory-report", default=config_manager.get_memory_report() or None,
+                        help="将内存报告写入JSON文件（需要--profile-memory）")
+    parser.add_argument("--progress", choices=["text", "jsonl"], default="text",
+                        help="进度输出格式：text为中文日志，jsonl为每张照片一行JSON记录并在结束时输出汇总")
+    parser.add_argument("--progress-fd", type=int, default=1,
+                        help="jsonl进度输出的文件描述符（默认1即标准输出，此时其他日志输出到标准错误）")
+    parser.add_argument("--metrics-file", default=config_manager.get_metrics_output() or None,
+                        help="定期将运行指标写入Prometheus文本格式文件")
+    parser.add_argument("--metrics-port", type=int, default=config_manager.get_metrics_port(),
+                        help="在本地端口上通过HTTP提供Prometheus格式的运行指标（/metrics）")
+    parser.add_argument("--metrics-interval", type=float, default=config_manager.get_metrics_interval(),
+                        help="写入指标文件的间隔（秒）")
+    parser.add_argument("--timeout", type=float, default=config_manager.get_item_timeout(),
+                        help="单张照片的超时时间（秒），超时的照片记为失败，0表示不超时")
+    worker_config = config_manager.get_worker_config()
+    parser.add_argument("--isolate", action="store_true", default=config_manager.get_isolate_workers(),
+                        help="在隔离的工作进程中处理照片，卡死、崩溃或超出内存的照片重试一次后写入隔离清单并跳过")
+    parser.add_argument("--workers", type=int, default=worker_config["workers"], help="隔离模式下的工作进程数")
+    parser.add_argument("--worker-timeout", type=float, default=worker_config["timeout"],
+                        help="隔离模式下单张照片的处理时间上限（秒），0表示不限制")
+    parser.add_argument("--worker-memory", type=float, default=worker_config["memory_limit_mb"],
+                        help="隔离模式下工作进程的常驻内存上限（MB），0表示不限制")
+    parser.add_argument("--quarantine", default=worker_config["quarantine_output"] or None,
+                        help="隔离清单文件（JSONL），记录被跳过的照片和诊断信息")
+    parser.add_argument("--strip", action="store_true",
+                        help="分条渲染超大全景照片（底边模板，输入为未压缩的TIFF/PPM/BMP，输出PNG），内存占用与像素数无关")
+    parser.add_argument("--band-mb", type=float, default=config_manager.get_strip_band_mb(),
+                        help="分条渲染时每个行段占用的内存（MB）")
+    parser.add_argument("--list-params", action="store_true", help="列出可用的EXIF参数后退出")
     
     args = parser.parse_args()
     
+    if args.list_params:
+        print("可用的EXIF参数:")
+        for param in ALL_EXIF_PARAMS:
+            print(f"  - {param}")
+        return
+    if not args.input or not args.output:
+        parser.error("需要指定--input和--output")
+    if args.framing != "none" and args.input != "-":
+        parser.error("--framing需要配合-i -使用")
+    
+    if args.strip:
+        sys.exit(run_strips(args))
+    
+    if args.input == "-" or args.output == "-":
+        # 管道模式：标准输出只写图片数据，其他日志输出到标准错误
+        binary_stdout = sys.stdout.buffer
+        with redirect_stdout(sys.stderr):
+            status = run_pipe(args, binary_stdout)
+        sys.exit(status)
+    
+    if args.progress != "jsonl":
+        run_batch(args)
+        return
+    # jsonl记录直接写入文件描述符；输出到标准输出时其他日志改为输出到标准错误，避免混入记录
+    with ProgressReporter.open_fd(args.progress_fd) as reporter:
+        with redirect_stdout(sys.stderr) if args.progress_fd == 1 else nullcontext():
+            run_batch(args, reporter)
+
+
+def run_strips(args):
+    """
+    分条渲染模式：逐张处理超大全景照片，照片按行段读取并直接写入PNG
+    
+    Args:
+        args: 命令行参数
+    
+    Returns:
+        int: 退出码，全部成功时为0
+    """
+    if args.input == "-" or args.output == "-":
+        print("分条渲染需要从文件读取照片并写入输出目录")
+        return 2
+    if os.path.isfile(args.input):
+        photo_files = [args.input]
+    elif os.path.isdir(args.input):
+        photo_files = sorted(path for path in glob.glob(os.path.join(args.input, "*"))
+                             if path.lower().endswith(STRIP_EXTENSIONS))
+    else:
+        print(f"输入路径不存在: {args.input}")
+        return 2
+    os.makedirs(args.output, exist_ok=True)
+    band_bytes = int(args.band_mb * 1024 * 1024)
+    
+    failures = 0
+    for path in photo_files:
+        name = os.path.splitext(os.path.basename(path))[0]
+        output_path = os.path.join(args.output, f"framed_{name}.png")
+        start = time.time()
+        try:
+            width, height = render_strips(path, output_path, args.template, band_bytes=band_bytes)
+            print(f"已处理: {path} -> {output_path}（{width}x{height}，{time.time() - start:.1f}秒）")
+        except Exception as e:
+            failures += 1
+            print(f"处理 {path} 失败: {e}")
+    print(f"\n处理完成! 成功: {len(photo_files) - failures}, 失败: {failures}")
+    return 1 if failures else 0
+
+
+def run_pipe(args, binary_stdout):
+    """
+    管道模式：从标准输入（或单个文件）读取照片数据，生成相框后写到标准输出（或输出目录），不经过临时文件
+    
+    分帧模式下连续处理多张图片，每张输出一帧；处理失败的图片输出空帧，保持输入和输出一一对应
+    
+    Args:
+        args: 命令行参数
+        binary_stdout: 标准输出的二进制流
+    
+    Returns:
+        int: 退出码，全部成功时为0
+    """
+    template = get_template_context().get_template(args.template) if args.template else None
+    framed_output = args.framing == "length"
+    
+    if args.input == "-":
+        if sys.stdin.isatty():
+            print("管道模式需要从标准输入读取照片数据")
+            return 2
+        if framed_output:
+            sources = ((f"stdin_{index:04d}.jpg", data) for index, data in enumerate(read_frames(sys.stdin.buffer)))
+        else:
+            sources = [("stdin.jpg", sys.stdin.buffer.read())]
+    else:
+        if not os.path.isfile(args.input):
+            print(f"输出到标准输出时输入需要是单个照片文件: {args.input}")
+            return 2
+        with open(args.input, "rb") as f:
+            sources = [(os.path.basename(args.input), f.read())]
+    if args.output != "-":
+        os.makedirs(args.output, exist_ok=True)
+    
+    failures = 0
+    try:
+        for name, data in sources:
+            try:
+                with Photo.from_bytes(data, name) as photo:
+                    new_img = frame_photo(photo, args.frame_color, args.frame_width, args.params, template)
+                if args.output != "-":
+                    save_image(new_img, os.path.join(args.output, f"framed_{name}"), "JPEG")
+                elif framed_output:
+                    write_frame(binary_stdout, encode_image(new_img, "JPEG"))
+                else:
+                    # 编码器直接写入标准输出
+                    write_image(new_img, binary_stdout, "JPEG")
+                    binary_stdout.flush()
+                release_canvas(new_img)
+            except Exception as e:
+                failures += 1
+                print(f"处理 {name} 失败: {e}")
+                if framed_output and args.output == "-":
+                    write_frame(binary_stdout, b"")
+    except FramingError as e:
+        print(f"输入数据分帧错误: {e}")
+        return 2
+    except BrokenPipeError:
+        # 下游提前关闭管道
+        return 1
+    return 1 if failures else 0
+
+
+def start_metrics(args):
+    """
+    按命令行参数启动运行指标的统计和导出
+    
+    Args:
+        args: 命令行参数
+    
+    Returns:
+        tuple: (RenderMetrics, 导出器列表)，未配置指标输出时返回(None, [])
+    """
+    if not args.metrics_file and not args.metrics_port:
+        return None, []
+    metrics = RenderMetrics(caches=render_cache_stats())
+    metrics.start()
+    exporters = []
+    if args.metrics_file:
+        exporters.append(MetricsFileExporter(metrics.registry, args.metrics_file, args.metrics_interval))
+    if args.metrics_port:
+        exporter = MetricsHTTPExporter(metrics.registry, args.metrics_port)
+        print(f"运行指标: http://127.0.0.1:{exporter.port}/metrics")
+        exporters.append(exporter)
+    for exporter in exporters:
+        exporter.start()
+    return metrics, exporters
+
+
+def run_batch(args, reporter=None):
+    """
+    按命令行参数批量处理照片
+    
+    Args:
+        args: 命令行参数
+        reporter: jsonl进度输出，为空时输出中文日志
+    """
+    filters = {
+        "make": args.make, "model": args.model, "lens_model": args.lens, "focal_length": args.focal_length,
+        "date_from": args.date_from, "date_to": args.date_to
+    }
+    if not args.catalog and any(value is not None for value in filters.values()):
+        print("筛选参数需要配合--catalog使用")
+        return
+    
     # 确保输出目录存在
     os.makedirs(args.output, exist_ok=True)
     
     # 收集照片文件
     photo_files = []
-    if os.path.isfile(args.input):
+    catalog = None
+    if args.catalog:
+        if not os.path.exists(args.input):
+            print(f"输入路径不存在: {args.input}")
+            return
+        # 增量扫描，只解析新增或修改过的照片，然后从目录库中筛选
+        catalog = ExifCatalog(args.catalog)
+        stats = catalog.scan([args.input], recursive=args.recursive)
+        print(f"目录库扫描: 新增 {stats['added']}，更新 {stats['updated']}，未变 {stats['unchanged']}，"
+              f"移除 {stats['removed']}，失败 {stats['failed']}")
+        if os.path.isfile(args.input):
+            candidates = set(catalog.query(**filters, directory=os.path.dirname(os.path.abspath(args.input))))
+            photo_files = [p for p in [os.path.abspath(args.input)] if p in candidates]
+        else:
+            photo_files = catalog.query(**filters, directory=args.input, recursive=args.recursive)
+    elif os.path.isfile(args.input):
         if args.input.lower().endswith((".jpg", ".jpeg")):
             photo_files.append(args.input)
     elif os.path.isdir(args.input):
@@ -108,35 +403,167 @@ def main():
         return
     
     print(f"找到 {len(photo_files)} 张照片")
-    print(f"相框模板: {args.frame_color}")
+    print(f"相框模板: {args.template or args.frame_color}")
     print(f"相框宽度: {args.frame_width} 像素")
     print(f"显示的EXIF参数: {', '.join(args.params) if args.params else '无'}")
     print(f"输出目录: {args.output}")
     print("\n开始处理照片...")
     
-    success_count = 0
-    for i, photo_path in enumerate(photo_files, 1):
-        print(f"处理 {i}/{len(photo_files)}: {os.path.basename(photo_path)}")
+    # 按相框模板、尺寸、相机和镜头分组处理以提高缓存命中率，结果仍按原始顺序输出
+    if args.schedule:
+        order = schedule_batch(photo_files, args.template or args.frame_color)
+    else:
+        order = list(range(len(photo_files)))
+    reorder_buffer = ResultReorderBuffer()
+    template = get_template_context().get_template(args.template) if args.template else None
+    template_label = args.template or args.frame_color
+    
+    # jsonl进度输出时统计每张照片各阶段的耗时
+    stage_timings = StageTimings() if reporter else None
+    if stage_timings:
+        add_collector(stage_timings)
+        reporter.event({"type": "start", "photos": len(photo_files), "template": template_label,
+                        "output_dir": args.output})
+    
+    # 启用埋点时记录每个阶段的耗时
+    collector = TraceCollector() if args.trace else None
+    if collector:
+        add_collector(collector)
+    
+    # 开启内存分析时记录每张照片的峰值内存和主要内存分配位置
+    memory_profiler = MemoryProfiler(threshold_mb=args.memory_threshold) if args.profile_memory else None
+    if memory_profiler:
+        memory_profiler.start()
+    
+    # 配置了指标文件或端口时导出Prometheus格式的运行指标
+    metrics, exporters = start_metrics(args)
+    
+    # 隔离模式下照片在工作进程中处理，看门狗结束卡死、崩溃或超出内存的工作进程
+    pool = IsolatedWorkerPool(render_photo_file, workers=args.workers, timeout=args.worker_timeout or None,
+                              memory_limit_mb=args.worker_memory, quarantine_file=args.quarantine) \
+        if args.isolate else None
+    
+    def render_isolated(file_index):
+        """在隔离的工作进程中处理一张照片，不统计内存和各阶段耗时
+        
+        等待结果时检查该照片的取消标志，单张超时或取消时结束正在处理的工作进程
+        """
+        photo_path = photo_files[file_index]
+        exif_data = catalog.get_exif_data(photo_path) if catalog else None
+        start_ns = time.perf_counter_ns()
         try:
-            # 创建Photo对象封装照片信息
-            photo = Photo(photo_path)
-            success, result = process_image(photo, args.output, args.frame_color, args.frame_width, args.params)
+            task = RenderTask(photo_path, os.path.join(args.output, f"framed_{os.path.basename(photo_path)}"),
+                              args.template, {"frame_color": args.frame_color, "frame_width": args.frame_width,
+                                              "selected_params": args.params}, exif_data)
+            success, result = True, pool.run(task)
         except Exception as e:
-            success = False
-            result = str(e)
+            success, result = False, e
+        return success, result, (time.perf_counter_ns() - start_ns) / 1e6, None
+    
+    def render_one(file_index):
+        """在处理线程中处理一张照片，返回(是否成功, 输出路径或异常, 耗时毫秒, 各阶段耗时)"""
+        photo_path = photo_files[file_index]
+        if stage_timings:
+            # 丢弃超时中止的照片在该线程中留下的阶段耗时
+            stage_timings.take()
+        start_ns = time.perf_counter_ns()
+        with memory_profiler.photo(photo_path) if memory_profiler else nullcontext():
+            try:
+                # 创建Photo对象封装照片信息，目录库中有最新EXIF时不再重复解析
+                exif_data = catalog.get_exif_data(photo_path) if catalog else None
+                with Photo(photo_path, exif_data=exif_data) as photo:
+                    success, result = process_image(photo, args.output, args.frame_color, args.frame_width,
+                                                    args.params, template)
+            except Exception as e:
+                success = False
+                result = e
+        latency_ms = (time.perf_counter_ns() - start_ns) / 1e6
+        stages = stage_timings.take() if stage_timings else None
+        return success, result, latency_ms, stages
+    
+    success_count = 0
+    
+    def report(ready):
+        """按原始顺序输出处理结果"""
+        nonlocal success_count
+        for index, (success, result, latency_ms, stages) in ready:
+            if success:
+                success_count += 1
+            if reporter:
+                reporter.photo(photo_files[index], result if success else None, template_label,
+                               "ok" if success else "error", latency_ms, stages, None if success else str(result))
+                continue
+            print(f"处理 {index + 1}/{len(photo_files)}: {os.path.basename(photo_files[index])}")
+            if success:
+                print(f"  ✓ 成功: {result}")
+            else:
+                print(f"  ✗ 失败: {result}")
+    
+    # 照片在处理线程中逐张处理，超时的照片在下一个处理阶段中止
+    if pool:
+        batch = AsyncBatch(render_isolated, order, concurrency=args.workers, timeout=args.timeout or None)
+    else:
+        batch = AsyncBatch(render_one, order, timeout=args.timeout or None)
+    
+    async def consume():
+        position = 0
+        async for item in batch:
+            position += 1
+            if item.ok:
+                success, result, latency_ms, stages = item.value
+            else:
+                success, result, latency_ms, stages = False, item.error, item.elapsed * 1000, None
             
-        if success:
-            print(f"  ✓ 成功: {result}")
-            success_count += 1
-        else:
-            print(f"  ✗ 失败: {result}")
+            if metrics:
+                if success:
+                    metrics.photo_rendered(template_label)
+                else:
+                    metrics.photo_failed(template_label, result)
+            
+            report(reorder_buffer.add(item.item, (success, result, latency_ms, stages)))
+            
+            if metrics:
+                metrics.set_queue_depth("pending", len(order) - position)
+                metrics.set_queue_depth("reorder", len(reorder_buffer))
     
-    print(f"\n处理完成! 成功: {success_count}, 失败: {len(photo_files) - success_count}")
+    try:
+        asyncio.run(consume())
+    except KeyboardInterrupt:
+        # 正在处理的照片在下一个处理阶段中止，输出已完成的结果
+        print("\n处理已中断")
+        report(reorder_buffer.flush())
+    
+    if pool:
+        pool.shutdown()
+        if pool.quarantined:
+            print(f"\n已隔离 {len(pool.quarantined)} 张照片（工作进程重启 {pool.restarts} 次）"
+                  + (f"，详见: {args.quarantine}" if args.quarantine else ""))
+    
+    if stage_timings:
+        remove_collector(stage_timings)
     
-    # 显示所有可用的EXIF参数
-    print("\n可用的EXIF参数:")
-    for param in ALL_EXIF_PARAMS:
-        print(f"  - {param}")
+    if metrics:
+        for exporter in exporters:
+            exporter.stop()
+        metrics.stop()
+    
+    if catalog:
+        catalog.close()
+    
+    if collector:
+        remove_collector(collector)
+        collector.export_chrome_trace(args.trace)
+        print(f"\n各阶段耗时（毫秒）:\n{collector.format_summary()}")
+        print(f"Chrome trace已写入: {args.trace}")
+    
+    if memory_profiler:
+        memory_profiler.stop()
+        print(f"\n内存分析:\n{memory_profiler.format_report()}")
+        if args.memory_report:
+            memory_profiler.export_json(args.memory_report)
+            print(f"内存报告已写入: {args.memory_report}")
+    
+    print(f"\n处理完成! 成功: {success_count}, 失败: {len(photo_files) - success_count}")
 
 if __name__ == "__main__":
     main()
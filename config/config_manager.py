@@ -1,8 +1,11 @@
 import yaml
 import os
 import sys
+import logging
 from pathlib import Path
 
+logger = logging.getLogger(__name__)
+
 
 class ConfigManager:
     """
@@ -22,8 +25,8 @@ class ConfigManager:
                 # 检查是否是PyInstaller打包后的环境
                 if hasattr(sys, '_MEIPASS'):
                     return os.path.join(sys._MEIPASS, relative_path)
-                # 如果是开发环境，直接返回相对路径
-                return os.path.join(os.path.abspath(""), relative_path)
+                # 如果是开发环境，返回相对于项目根目录的路径（与当前工作目录无关）
+                return os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), relative_path)
             
             # 默认配置文件路径
             config_file = get_resource_path("application.yml")
@@ -42,10 +45,10 @@ class ConfigManager:
             with open(self.config_file, 'r', encoding='utf-8') as f:
                 return yaml.safe_load(f)
         except FileNotFoundError:
-            print(f"警告：配置文件 {self.config_file} 不存在，将使用默认配置")
+            logger.warning("警告：配置文件 %s 不存在，将使用默认配置", self.config_file)
             return self.get_default_config()
         except yaml.YAMLError as e:
-            print(f"错误：解析配置文件失败 - {e}")
+            logger.error("错误：解析配置文件失败 - %s", e)
             return self.get_default_config()
     
     def get_default_config(self):
@@ -77,7 +80,32 @@ class ConfigManager:
             'template': {
                 'default_template': 'black_bottom',
                 'directory': 'template/impl',
-                'templates': ['black_bottom_template', 'white_bottom_template']
+                'templates': ['black_bottom_template', 'white_bottom_template', 'blurred_background_template'],
+                'spec_file': 'frame_templates.yml'
+            },
+            'batch': {
+                'cache_aware_ordering': False,
+                'trace_output': '',
+                'profile_memory': False,
+                'memory_threshold_mb': 0,
+                'memory_report': '',
+                'metrics_output': '',
+                'metrics_port': 0,
+                'metrics_interval': 15,
+                'item_timeout': 0,
+                'isolate_workers': False,
+                'workers': 2,
+                'worker_timeout': 120,
+                'worker_memory_mb': 0,
+                'quarantine_output': 'quarantine.jsonl'
+            },
+            'server': {
+                'host': '127.0.0.1',
+                'port': 8765,
+                'workers': 2,
+                'max_queue': 8,
+                'queue_timeout': 30,
+                'max_upload_mb': 64
             },
             'logging': {
                 'level': 'INFO',
@@ -210,6 +238,142 @@ class ConfigManager:
         """
         return self.get_config('template.templates')
     
+    def get_template_spec_file(self):
+        """
+        获取声明式模板描述文件路径
+        
+        Returns:
+            str: 模板描述文件路径（相对于项目目录）
+        """
+        return self.get_config('template.spec_file', 'frame_templates.yml')
+    
+    def get_cache_aware_ordering(self):
+        """
+        获取是否按缓存友好的顺序处理批量照片
+        
+        Returns:
+            bool: 是否重新排序
+        """
+        return bool(self.get_config('batch.cache_aware_ordering', False))
+    
+    def get_trace_output(self):
+        """
+        获取批量处理耗时记录的输出文件
+        
+        Returns:
+            str: Chrome trace文件路径，为空时不记录耗时
+        """
+        return self.get_config('batch.trace_output', '') or ''
+    
+    def get_profile_memory(self):
+        """
+        获取批量处理时是否进行内存分析
+        
+        Returns:
+            bool: 是否进行内存分析
+        """
+        return bool(self.get_config('batch.profile_memory', False))
+    
+    def get_memory_threshold_mb(self):
+        """
+        获取内存报告中标记照片的峰值内存增量阈值
+        
+        Returns:
+            float: 阈值（MB），为None时不标记
+        """
+        threshold = self.get_config('batch.memory_threshold_mb', 0)
+        return float(threshold) if threshold else None
+    
+    def get_memory_report(self):
+        """
+        获取内存报告JSON输出文件
+        
+        Returns:
+            str: 文件路径，为空时不写文件
+        """
+        return self.get_config('batch.memory_report', '') or ''
+    
+    def get_metrics_output(self):
+        """
+        获取Prometheus文本格式指标文件
+        
+        Returns:
+            str: 文件路径，为空时不写文件
+        """
+        return self.get_config('batch.metrics_output', '') or ''
+    
+    def get_metrics_port(self):
+        """
+        获取通过HTTP提供指标的本地端口
+        
+        Returns:
+            int: 端口，为0时不提供
+        """
+        return int(self.get_config('batch.metrics_port', 0) or 0)
+    
+    def get_metrics_interval(self):
+        """
+        获取写入指标文件的间隔
+        
+        Returns:
+            float: 间隔（秒）
+        """
+        return float(self.get_config('batch.metrics_interval', 15) or 15)
+    
+    def get_item_timeout(self):
+        """
+        获取批量处理中单张照片的超时时间
+        
+        Returns:
+            float: 超时时间（秒），0表示不超时
+        """
+        return float(self.get_config('batch.item_timeout', 0) or 0)
+    
+    def get_isolate_workers(self):
+        """
+        获取是否在隔离的工作进程中处理照片
+        
+        Returns:
+            bool: 是否启用进程隔离
+        """
+        return bool(self.get_config('batch.isolate_workers', False))
+    
+    def get_worker_config(self):
+        """
+        获取隔离工作进程的配置
+        
+        Returns:
+            dict: 包含workers、timeout、memory_limit_mb、quarantine_output
+        """
+        return {
+            'workers': int(self.get_config('batch.workers', 2) or 2),
+            'timeout': float(self.get_config('batch.worker_timeout', 120) or 0),
+            'memory_limit_mb': float(self.get_config('batch.worker_memory_mb', 0) or 0),
+            'quarantine_output': self.get_config('batch.quarantine_output', 'quarantine.jsonl') or ''
+        }
+    
+    def get_strip_band_mb(self):
+        """
+        获取分条渲染时每个行段占用的内存
+        
+        Returns:
+            float: 行段内存（MB）
+        """
+        return float(self.get_config('batch.strip_band_mb', 32) or 32)
+    
+    def get_server_config(self):
+        """
+        获取本地HTTP渲染服务配置
+        
+        Returns:
+            dict: 包含host、port、workers、max_queue、queue_timeout、max_upload_mb、isolate、max_frame_mp、
+                render_timeout
+        """
+        defaults = {'host': '127.0.0.1', 'port': 8765, 'workers': 2, 'max_queue': 8, 'queue_timeout': 30,
+                    'max_upload_mb': 64, 'isolate': False, 'max_frame_mp': 120, 'render_timeout': 60}
+        server = self.get_config('server', {}) or {}
+        return {key: server.get(key, value) for key, value in defaults.items()}
+    
     def get_logging_level(self):
         """
         获取日志级别
@@ -0,0 +1,17 @@
+"""
+相框渲染引擎
+供其他程序调用的渲染入口（内存渲染接口、异步批量处理、进程隔离的工作进程池、本地HTTP渲染服务），与GUI和命令行共用模板和缓存
+"""
+
+from .render_api import render, get_template
+from .async_batch import AsyncBatch, BatchResult, ItemCancelled, ItemTimeout, check_cancelled
+from .worker_pool import (IsolatedWorkerPool, RenderTask, render_task, FrameTask, render_frame_task,
+                          WorkerTaskError, QuarantinedError)
+from .shared_frames import SharedFramePool, SharedFrame, FrameSlot, FrameTooLarge
+from .strip_render import render_strips, BandSource, StripUnsupported
+from .render_service import RenderService, RenderServer, ServiceBusy, RenderRequestError
+
+__all__ = ["render", "get_template", "AsyncBatch", "BatchResult", "ItemCancelled", "ItemTimeout", "check_cancelled",
+           "IsolatedWorkerPool", "RenderTask", "render_task", "FrameTask", "render_frame_task", "WorkerTaskError",
+           "QuarantinedError", "SharedFramePool", "SharedFrame", "FrameSlot", "FrameTooLarge",
+           "render_strips", "BandSource", "StripUnsupported", "RenderService", "RenderServer", "ServiceBusy", "RenderRequestError"]
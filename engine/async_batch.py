@@ -0,0 +1,315 @@
+"""
+asyncio批量处理
+把每张照片的处理提交到线程池，按完成顺序通过异步迭代器返回结果，GUI和命令行共用
+
+取消和单张超时在下一个阶段边界生效：处理线程进入下一个埋点阶段（解码、方向处理、布局、绘制、编码、写文件等）时
+检查取消标志并中止，不必等整张照片处理完。
+
+用法:
+    batch = AsyncBatch(process_one, photo_paths, timeout=30)
+    async for result in batch:
+        print(result.index, result.status, result.value)
+    # 在其他线程或协程中调用batch.cancel()取消
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Sequence
+
+from utils.instrumentation import add_collector, remove_collector
+
+
+class ItemCancelled(BaseException):
+    """
+    照片处理被取消
+
+    继承BaseException而不是Exception，避免被模板等代码中捕获Exception的错误处理吞掉
+    """
+
+
+class ItemTimeout(ItemCancelled):
+    """
+    照片处理超过单张超时时间
+    """
+
+
+class CancelToken:
+    """
+    取消标志，处理线程在阶段边界调用check()检查
+    """
+
+    def __init__(self, parent: Optional["CancelToken"] = None, deadline: Optional[float] = None):
+        """
+        初始化取消标志
+
+        Args:
+            parent: 上级取消标志（如整个批次），上级取消时本标志也视为取消
+            deadline: 超时时刻（time.monotonic()），为空时不超时
+        """
+        self._event = threading.Event()
+        self._parent = parent
+        self.deadline = deadline
+        # 开始处理的时刻（time.monotonic()），尚未开始时为空
+        self.started: Optional[float] = None
+
+    def start(self, timeout: Optional[float] = None) -> None:
+        """
+        标记开始处理，超时从此刻开始计算（在线程池中排队的时间不计入超时）
+
+        Args:
+            timeout: 超时时间（秒），为空时不超时
+        """
+        self.started = time.monotonic()
+        if timeout:
+            self.deadline = self.started + timeout
+
+    def cancel(self) -> None:
+        """
+        取消，可以在任意线程中调用
+        """
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        """
+        是否已取消
+        """
+        return self._event.is_set() or (self._parent is not None and self._parent.cancelled)
+
+    def expired(self) -> bool:
+        """
+        是否已超时
+        """
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    def check(self) -> None:
+        """
+        已取消或超时时抛出异常
+
+        Raises:
+            ItemCancelled: 已取消
+            ItemTimeout: 已超时
+        """
+        if self.cancelled:
+            raise ItemCancelled("处理已取消")
+        if self.expired():
+            raise ItemTimeout("处理超时")
+
+
+_local = threading.local()
+
+
+def check_cancelled() -> None:
+    """
+    检查当前线程正在处理的照片是否已取消或超时，供不经过埋点阶段的长时间处理手动调用
+    """
+    token = getattr(_local, "token", None)
+    if token is not None:
+        token.check()
+
+
+class _CancellationCollector:
+    """
+    埋点收集器：在每个阶段开始时检查当前线程的取消标志
+    """
+
+    def span_started(self, name: str, args: Dict[str, object]) -> None:
+        check_cancelled()
+
+    def record(self, record) -> None:
+        pass
+
+
+_cancellation_collector = _CancellationCollector()
+_collector_users = 0
+_collector_lock = threading.Lock()
+
+
+def _acquire_collector() -> None:
+    """
+    有照片正在处理时注册取消检查收集器
+    """
+    global _collector_users
+    with _collector_lock:
+        _collector_users += 1
+        if _collector_users == 1:
+            add_collector(_cancellation_collector)
+
+
+def _release_collector() -> None:
+    """
+    没有照片正在处理时移除取消检查收集器
+    """
+    global _collector_users
+    with _collector_lock:
+        _collector_users -= 1
+        if _collector_users == 0:
+            remove_collector(_cancellation_collector)
+
+
+@dataclass
+class BatchResult:
+    """
+    单项处理结果
+    """
+    # 在输入序列中的位置
+    index: int
+    # 输入项
+    item: Any
+    # ok、error、timeout或cancelled
+    status: str
+    # 处理函数的返回值（status为ok时）
+    value: Any = None
+    # 处理函数抛出的异常（status不为ok时）
+    error: Optional[BaseException] = None
+    # 处理耗时（秒）
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.status == "ok"
+
+
+def _consume_exception(future: asyncio.Future) -> None:
+    """
+    取出已放弃等待的任务的异常，避免asyncio报告异常未处理
+    """
+    if not future.cancelled():
+        future.exception()
+
+
+class AsyncBatch:
+    """
+    异步批量处理：处理函数在线程池中运行，结果按完成顺序以异步迭代器返回
+
+    已取消时不再提交新的照片，正在处理的照片在下一个阶段边界中止并返回cancelled结果，
+    未开始的照片不返回结果。超时的照片立即返回timeout结果，处理线程在下一个阶段边界中止。
+    单张超时从处理线程开始处理该照片时计算，已超时但尚未中止的线程占用线程池时，排队的照片不会因此超时。
+    """
+
+    def __init__(self, func: Callable[[Any], Any], items: Sequence[Any], executor: Optional[Executor] = None,
+                 concurrency: int = 1, timeout: Optional[float] = None):
+        """
+        初始化批量处理
+
+        Args:
+            func: 处理单项的函数，在线程池中调用
+            items: 输入项（如照片路径）
+            executor: 线程池，为空时创建concurrency个线程的线程池，结束后关闭
+            concurrency: 同时处理的项数
+            timeout: 单项超时时间（秒），为空时不超时
+        """
+        self.func = func
+        self.items = list(items)
+        self.executor = executor
+        self.concurrency = max(1, concurrency)
+        self.timeout = timeout
+        self._token = CancelToken()
+
+    def cancel(self) -> None:
+        """
+        取消批量处理，可以在任意线程中调用
+        """
+        self._token.cancel()
+
+    @property
+    def cancelled(self) -> bool:
+        """
+        是否已取消
+        """
+        return self._token.cancelled
+
+    def _call(self, item: Any, token: CancelToken, on_start: Callable[[], None]) -> Any:
+        """
+        在处理线程中调用处理函数，期间阶段边界检查该项的取消标志
+        """
+        token.start(self.timeout)
+        on_start()
+        # 收集器按正在处理的项注册，已放弃等待的项仍能在阶段边界中止
+        _acquire_collector()
+        _local.token = token
+        try:
+            token.check()
+            return self.func(item)
+        finally:
+            _local.token = None
+            _release_collector()
+
+    def __aiter__(self) -> AsyncIterator[BatchResult]:
+        return self._run()
+
+    async def _run(self) -> AsyncIterator[BatchResult]:
+        loop = asyncio.get_running_loop()
+        executor = self.executor or ThreadPoolExecutor(max_workers=self.concurrency,
+                                                       thread_name_prefix="async-batch")
+        # 正在处理或在线程池中排队的任务 -> (位置, 输入项, 取消标志)
+        pending: Dict[asyncio.Future, tuple] = {}
+        # 处理线程开始处理某项时唤醒等待，以便按该项的超时时刻重新计算等待时间
+        started = asyncio.Event()
+
+        def on_start():
+            try:
+                loop.call_soon_threadsafe(started.set)
+            except RuntimeError:
+                # 批量处理已结束、事件循环已关闭
+                pass
+
+        wake = None
+        next_index = 0
+        try:
+            while True:
+                while not self.cancelled and next_index < len(self.items) and len(pending) < self.concurrency:
+                    item = self.items[next_index]
+                    token = CancelToken(self._token)
+                    future = loop.run_in_executor(executor, self._call, item, token, on_start)
+                    pending[future] = (next_index, item, token)
+                    next_index += 1
+                if not pending:
+                    break
+
+                # 等待任一项完成、有项开始处理，或最早的超时时刻到达
+                deadlines = [entry[2].deadline for entry in pending.values() if entry[2].deadline is not None]
+                wait_timeout = max(0.0, min(deadlines) - time.monotonic()) if deadlines else None
+                if wake is None or wake.done():
+                    started.clear()
+                    wake = asyncio.ensure_future(started.wait())
+                done, _ = await asyncio.wait([*pending, wake], timeout=wait_timeout,
+                                             return_when=asyncio.FIRST_COMPLETED)
+
+                for future in list(pending):
+                    index, item, token = pending[future]
+                    if future in done:
+                        del pending[future]
+                        yield self._result(future, index, item, token)
+                    elif token.expired():
+                        # 处理线程在下一个阶段边界中止，结果不再等待
+                        del pending[future]
+                        future.add_done_callback(_consume_exception)
+                        yield BatchResult(index, item, "timeout", error=ItemTimeout("处理超时"),
+                                          elapsed=time.monotonic() - token.started)
+        finally:
+            if wake is not None:
+                wake.cancel()
+            # 迭代提前结束（取消或调用方不再读取）时中止正在处理的项
+            for future, (_, _, token) in pending.items():
+                token.cancel()
+                future.add_done_callback(_consume_exception)
+            if self.executor is None:
+                executor.shutdown(wait=False)
+
+    def _result(self, future: asyncio.Future, index: int, item: Any, token: CancelToken) -> BatchResult:
+        """
+        将已完成的任务转换为处理结果
+        """
+        elapsed = time.monotonic() - token.started if token.started is not None else 0.0
+        try:
+            return BatchResult(index, item, "ok", value=future.result(), elapsed=elapsed)
+        except ItemTimeout as e:
+            return BatchResult(index, item, "timeout", error=e, elapsed=elapsed)
+        except ItemCancelled as e:
+            return BatchResult(index, item, "cancelled", error=e, elapsed=elapsed)
+        except Exception as e:
+            return BatchResult(index, item, "error", error=e, elapsed=elapsed)
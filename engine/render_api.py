@@ -0,0 +1,108 @@
+"""
+内存渲染接口
+供其他Python程序直接调用：传入照片数据、路径或图像，返回编码后的字节或图像对象，不读写临时文件
+
+用法:
+    from engine import render
+    jpeg_bytes = render(upload_bytes, "白色底边", selected_params=["相机型号", "光圈"], encode_options={"quality": 90})
+    framed = render("photo.jpg", output="image")
+
+不导入tkinter，不向标准输出打印；运行中的警告通过logging输出。
+模板实例不保存单张照片的状态，同一模板在所有线程和调用之间共享同一个预热的实例，可以在多个线程中同时调用。
+"""
+
+import os
+import threading
+from typing import Dict, Optional, Union
+
+from PIL import Image
+
+from entity.photo import Photo
+from template import get_template_context
+from template.frame_template import FrameTemplate
+from utils.canvas_pool import release_canvas
+from utils.image_io import encode_image
+
+# 按名称缓存的模板实例，字体、logo等缓存在调用之间保持预热
+_templates: Dict[str, FrameTemplate] = {}
+_templates_lock = threading.Lock()
+
+# 可以作为输入的照片来源：文件内容、文件路径或已打开的图像
+PhotoSource = Union[bytes, bytearray, memoryview, str, os.PathLike, Image.Image]
+
+
+def get_template(template_name: Optional[str] = None) -> FrameTemplate:
+    """
+    获取共享的模板实例
+
+    Args:
+        template_name: 模板名称，为空时使用默认模板
+
+    Returns:
+        FrameTemplate: 模板实例
+
+    Raises:
+        ValueError: 找不到模板
+    """
+    context = get_template_context()
+    if template_name is None:
+        template_name = context.get_default_template_name()
+    with _templates_lock:
+        template = _templates.get(template_name)
+        if template is None:
+            template = context.get_template(template_name) if template_name is not None else None
+            if template is None:
+                raise ValueError(f"找不到模板: {template_name}")
+            _templates[template_name] = template
+        return template
+
+
+def _open_photo(source: PhotoSource, filename: Optional[str], exif_data: Optional[dict]) -> Photo:
+    """
+    根据照片来源创建Photo对象
+    """
+    if isinstance(source, Image.Image):
+        return Photo.from_image(source, filename or "image.jpg", exif_data=exif_data)
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return Photo.from_bytes(bytes(source), filename or "upload.jpg", exif_data=exif_data)
+    if isinstance(source, (str, os.PathLike)):
+        return Photo(os.fspath(source), exif_data=exif_data)
+    raise TypeError(f"不支持的照片来源类型: {type(source).__name__}")
+
+
+def render(source: PhotoSource, template: Optional[str] = None, output: str = "bytes", format: str = "JPEG",
+           encode_options: Optional[dict] = None, filename: Optional[str] = None,
+           exif_data: Optional[dict] = None, **params) -> Union[bytes, Image.Image]:
+    """
+    为一张照片生成相框
+
+    Args:
+        source: 照片文件内容、文件路径或PIL图像（图像的EXIF从Image.getexif()读取，调用方负责关闭）
+        template: 模板名称，为空时使用默认模板
+        output: "bytes"返回编码后的数据，"image"返回图像对象
+        format: 编码格式（output为"bytes"时有效）
+        encode_options: 传给编码器的参数（如{"quality": 90, "optimize": True}）
+        filename: 照片名称，只用于日志
+        exif_data: 已读取的EXIF数据，提供时不再解析照片
+        **params: 相框参数（frame_width、frame_color、selected_params等）
+
+    Returns:
+        Union[bytes, Image.Image]: 编码后的数据或加好相框的图像
+
+    Raises:
+        ValueError: 找不到模板或output无效
+        TypeError: 不支持的照片来源类型
+    """
+    if output not in ("bytes", "image"):
+        raise ValueError(f"output应为bytes或image: {output}")
+    frame_template = get_template(template)
+    with _open_photo(source, filename, exif_data) as photo:
+        photo.decode()
+        photo.fix_orientation()
+        framed = frame_template.render(photo, **params)
+    if output == "image":
+        return framed
+    try:
+        return encode_image(framed, format, **(encode_options or {}))
+    finally:
+        release_canvas(framed)
@@ -0,0 +1,493 @@
+"""
+本地HTTP渲染服务
+其他程序通过HTTP上传照片并指定模板和参数，服务返回加好相框的JPEG，
+进程常驻，模板实例、字体、logo和信息横条等缓存在请求之间保持预热，避免每张照片都重新启动命令行
+
+接口:
+    POST /render?template=白色底边&quality=90&params=相机型号,光圈   请求体为照片文件内容，返回JPEG（分块传输）
+    GET  /templates                                                  已注册的模板名称（JSON）
+    GET  /healthz                                                    工作线程、处理中和排队中的请求数（JSON）
+    GET  /metrics                                                    Prometheus格式的运行指标（启用指标时）
+
+并发控制：同时渲染的请求数不超过工作线程数，排队的请求数超过上限时直接返回503
+
+隔离模式（isolate=True）下照片在独立的工作进程中渲染，解码器崩溃或卡死只影响当前请求；
+渲染结果写入共享内存，请求线程不复制地读取并直接编码发送，像素数据不经过pickle和管道
+"""
+
+import io
+import json
+import threading
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+from PIL import Image
+
+from entity.photo import Photo
+from template import get_template_context
+from utils.canvas_pool import release_canvas
+from utils.image_io import write_image
+from utils.metrics import RenderMetrics, CONTENT_TYPE as METRICS_CONTENT_TYPE
+from .render_api import get_template
+from .shared_frames import SharedFramePool
+from .worker_pool import FrameTask, IsolatedWorkerPool, render_frame_task
+
+# 分块传输时每块的最大字节数
+CHUNK_SIZE = 64 * 1024
+
+
+class ServiceBusy(Exception):
+    """
+    服务已满（排队的请求数达到上限或等待超时），应返回503
+    """
+
+
+class RenderRequestError(Exception):
+    """
+    请求参数错误，应返回对应的HTTP状态码
+    """
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class RenderService:
+    """
+    渲染服务：持有预热的模板实例，并限制同时渲染和排队的请求数
+    """
+
+    def __init__(self, workers: int = 2, max_queue: int = 8, queue_timeout: float = 30.0,
+                 max_upload_bytes: int = 64 * 1024 * 1024, metrics: Optional[RenderMetrics] = None,
+                 isolate: bool = False, max_frame_pixels: int = 120_000_000, render_timeout: Optional[float] = 60.0):
+        """
+        初始化渲染服务
+
+        Args:
+            workers: 同时渲染的请求数
+            max_queue: 等待渲染的请求数上限，超过时返回503
+            queue_timeout: 排队等待的最长时间（秒），超时返回503
+            max_upload_bytes: 上传照片的最大字节数
+            metrics: 运行指标，为空时不统计
+            isolate: 是否在独立的工作进程中渲染
+            max_frame_pixels: 隔离模式下单张渲染结果（含相框）的最大像素数，决定共享内存块的大小
+            render_timeout: 隔离模式下单张照片的渲染超时时间（秒），为空时不超时
+        """
+        self.workers = workers
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.max_upload_bytes = max_upload_bytes
+        self.metrics = metrics
+        # 模板实例不保存单张照片的状态，所有请求共享同一个实例
+        self.templates = {name: get_template(name) for name in get_template_context().get_all_template_names()}
+        self._slots = threading.Semaphore(workers)
+        self._lock = threading.Lock()
+        self._admitted = 0
+        self._active = 0
+        self._pool = None
+        self._frames = None
+        if isolate:
+            # 同时渲染的请求数不超过工作线程数，每个工作线程一个共享内存块，获取时不会等待
+            self._frames = SharedFramePool.for_budget(workers, max_frame_pixels)
+            self._pool = IsolatedWorkerPool(render_frame_task, workers=workers, timeout=render_timeout, retries=0)
+
+    @property
+    def isolated(self) -> bool:
+        """
+        是否在独立的工作进程中渲染
+        """
+        return self._pool is not None
+
+    def template_names(self) -> List[str]:
+        """
+        获取可用的模板名称
+        """
+        return list(self.templates)
+
+    def status(self) -> Dict[str, int]:
+        """
+        获取服务状态
+
+        Returns:
+            Dict[str, int]: 工作线程数、正在渲染和排队中的请求数
+        """
+        with self._lock:
+            return {"workers": self.workers, "active": self._active, "queued": self._admitted - self._active,
+                    "max_queue": self.max_queue}
+
+    def _update_queue_metrics(self) -> None:
+        """
+        更新队列长度指标（调用方需持有锁）
+        """
+        if self.metrics:
+            self.metrics.set_queue_depth("active", self._active)
+            self.metrics.set_queue_depth("queued", self._admitted - self._active)
+
+    @contextmanager
+    def admit(self):
+        """
+        接纳一个请求：处理中和排队中的请求总数达到上限时抛出ServiceBusy
+
+        在读取请求体之前调用，服务已满时不必接收上传的数据
+        """
+        with self._lock:
+            if self._admitted >= self.workers + self.max_queue:
+                raise ServiceBusy("渲染队列已满")
+            self._admitted += 1
+            self._update_queue_metrics()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._admitted -= 1
+                self._update_queue_metrics()
+
+    @contextmanager
+    def worker_slot(self):
+        """
+        等待空闲的工作线程，等待超过queue_timeout时抛出ServiceBusy
+        """
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            raise ServiceBusy("等待渲染超时")
+        with self._lock:
+            self._active += 1
+            self._update_queue_metrics()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._active -= 1
+                self._update_queue_metrics()
+            self._slots.release()
+
+    def warm_up(self) -> None:
+        """
+        用一张空白照片经每个模板渲染一次，提前加载字体等资源
+
+        隔离模式下在每个工作进程中渲染，同时启动全部工作进程
+        """
+        buffer = io.BytesIO()
+        Image.new("RGB", (320, 240), "gray").save(buffer, "JPEG")
+        if self._pool is not None:
+            for name in self.templates:
+                slots = [self._frames.acquire() for _ in range(self._frames.slots)]
+                try:
+                    futures = [self._pool.submit(FrameTask(buffer.getvalue(), slot, "warm_up.jpg", name))
+                               for slot in slots]
+                    for future in futures:
+                        future.result()
+                finally:
+                    for slot in slots:
+                        self._frames.release(slot)
+            return
+        for template in self.templates.values():
+            with Photo.from_bytes(buffer.getvalue(), "warm_up.jpg") as photo:
+                photo.decode()
+                template.render(photo)
+
+    def render(self, data: bytes, template_name: str, filename: str = "upload.jpg", **params) -> Image.Image:
+        """
+        渲染一张照片（调用方需持有工作线程）
+
+        Args:
+            data: 照片文件内容
+            template_name: 模板名称
+            filename: 照片名称
+            **params: 相框参数（frame_width、frame_color、selected_params等）
+
+        Returns:
+            Image.Image: 加好相框的图片
+        """
+        if self._pool is not None:
+            with self.render_frame(data, template_name, filename, **params) as framed:
+                return framed.convert("RGB")
+        return self._render_in_process(data, template_name, filename, **params)
+
+    @contextmanager
+    def render_frame(self, data: bytes, template_name: str, filename: str = "upload.jpg", **params):
+        """
+        渲染一张照片并在with块中使用结果（调用方需持有工作线程），退出时释放图片
+
+        隔离模式下得到的是共享内存中的只读图片（RGBX等模式），不复制像素数据，只能在with块中使用
+
+        Args:
+            data: 照片文件内容
+            template_name: 模板名称
+            filename: 照片名称
+            **params: 相框参数（frame_width、frame_color、selected_params等）
+
+        Yields:
+            Image.Image: 加好相框的图片
+        """
+        if self._pool is None:
+            framed = self._render_in_process(data, template_name, filename, **params)
+            try:
+                yield framed
+            finally:
+                release_canvas(framed)
+            return
+
+        self._get_template(template_name)
+        slot = self._frames.acquire()
+        try:
+            try:
+                frame = self._pool.run(FrameTask(data, slot, filename, template_name, params))
+            except Exception as e:
+                if self.metrics:
+                    self.metrics.photo_failed(template_name, e)
+                raise RenderRequestError(422, f"无法处理照片: {e}") from e
+            if self.metrics:
+                self.metrics.photo_rendered(template_name)
+            with self._frames.open(slot, frame) as framed:
+                yield framed
+        finally:
+            self._frames.release(slot)
+
+    def _get_template(self, template_name: str):
+        """
+        获取预热的模板实例，找不到时抛出404错误
+        """
+        template = self.templates.get(template_name)
+        if template is None:
+            raise RenderRequestError(404, f"找不到模板: {template_name}")
+        return template
+
+    def _render_in_process(self, data: bytes, template_name: str, filename: str, **params) -> Image.Image:
+        """
+        在当前线程中渲染一张照片
+        """
+        template = self._get_template(template_name)
+        try:
+            with Photo.from_bytes(data, filename) as photo:
+                photo.decode()
+                photo.fix_orientation()
+                framed = template.render(photo, **params)
+        except Exception as e:
+            if self.metrics:
+                self.metrics.photo_failed(template_name, e)
+            raise RenderRequestError(422, f"无法处理照片: {e}") from e
+        if self.metrics:
+            self.metrics.photo_rendered(template_name)
+        return framed
+
+    def close(self) -> None:
+        """
+        停止工作进程并释放共享内存（隔离模式）
+        """
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._frames.close()
+
+
+class _ChunkedWriter(io.RawIOBase):
+    """
+    将写入的数据按HTTP分块传输编码发送，编码器输出多少就发送多少
+    """
+
+    def __init__(self, wfile):
+        super().__init__()
+        self._wfile = wfile
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        view = memoryview(data)
+        for start in range(0, len(view), CHUNK_SIZE):
+            chunk = view[start:start + CHUNK_SIZE]
+            self._wfile.write(f"{len(chunk):X}\r\n".encode("ascii"))
+            self._wfile.write(chunk)
+            self._wfile.write(b"\r\n")
+        return len(view)
+
+    def finish(self):
+        """
+        发送结束块
+        """
+        self._wfile.write(b"0\r\n\r\n")
+        self._wfile.flush()
+
+
+def _parse_render_params(query: Dict[str, List[str]]) -> Dict[str, object]:
+    """
+    解析/render的查询参数中的相框参数
+    """
+    params = {}
+    try:
+        if "quality" in query:
+            quality = int(query["quality"][0])
+            if not 1 <= quality <= 100:
+                raise ValueError(quality)
+            params["quality"] = quality
+        if "frame_width" in query:
+            params["frame_width"] = int(query["frame_width"][0])
+    except ValueError:
+        raise RenderRequestError(400, "quality应为1-100的整数，frame_width应为整数")
+    if "frame_color" in query:
+        params["frame_color"] = query["frame_color"][0]
+    if "params" in query:
+        params["selected_params"] = [p for p in query["params"][0].split(",") if p]
+    return params
+
+
+def create_handler(service: RenderService, default_template: str):
+    """
+    创建绑定到渲染服务的请求处理类
+
+    Args:
+        service: 渲染服务
+        default_template: 未指定模板时使用的模板
+
+    Returns:
+        type: BaseHTTPRequestHandler子类
+    """
+
+    class RenderRequestHandler(BaseHTTPRequestHandler):
+        # 分块传输需要HTTP/1.1
+        protocol_version = "HTTP/1.1"
+        server_version = "PhotoFrameHelper"
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send_json(self, status: int, payload, headers: Optional[Dict[str, str]] = None) -> None:
+            body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            path = urlsplit(self.path).path
+            if path == "/templates":
+                self._send_json(200, {"templates": service.template_names(), "default": default_template})
+            elif path == "/healthz":
+                self._send_json(200, service.status())
+            elif path == "/metrics" and service.metrics:
+                body = service.metrics.registry.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", METRICS_CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            else:
+                self._send_json(404, {"error": f"未知路径: {path}"})
+
+        def do_POST(self):
+            url = urlsplit(self.path)
+            if url.path != "/render":
+                self._send_json(404, {"error": f"未知路径: {url.path}"})
+                return
+            try:
+                # 先检查参数，再占用队列名额和读取请求体
+                query = parse_qs(url.query)
+                template_name = query.get("template", [default_template])[0]
+                if template_name not in service.templates:
+                    raise RenderRequestError(404, f"找不到模板: {template_name}")
+                params = _parse_render_params(query)
+                filename = query.get("filename", ["upload.jpg"])[0]
+                with service.admit():
+                    data = self._read_body()
+                    with service.worker_slot():
+                        self._render(data, template_name, filename, params)
+            except ServiceBusy as e:
+                # 没有读取请求体，响应后关闭连接
+                self.close_connection = True
+                self._send_json(503, {"error": str(e)}, {"Retry-After": "1", "Connection": "close"})
+            except RenderRequestError as e:
+                # 请求体可能没有读取完，响应后关闭连接
+                self.close_connection = True
+                self._send_json(e.status, {"error": str(e)}, {"Connection": "close"})
+
+        def _read_body(self) -> bytes:
+            length = self.headers.get("Content-Length")
+            if length is None:
+                raise RenderRequestError(411, "需要Content-Length")
+            try:
+                length = int(length)
+            except ValueError:
+                raise RenderRequestError(400, "Content-Length无效")
+            if length > service.max_upload_bytes:
+                raise RenderRequestError(413, f"照片超过 {service.max_upload_bytes} 字节")
+            return self.rfile.read(length)
+
+        def _render(self, data: bytes, template_name: str, filename: str, params: Dict[str, object]) -> None:
+            quality = params.pop("quality", 90)
+            with service.render_frame(data, template_name, filename, **params) as framed:
+                self.send_response(200)
+                self.send_header("Content-Type", "image/jpeg")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                writer = _ChunkedWriter(self.wfile)
+                try:
+                    write_image(framed, writer, "JPEG", quality=quality)
+                    writer.finish()
+                except Exception:
+                    # 响应头已经发送，只能中断连接
+                    self.close_connection = True
+                    raise
+
+    return RenderRequestHandler
+
+
+class RenderServer:
+    """
+    渲染服务的HTTP服务器
+
+    用法:
+        server = RenderServer(RenderService(workers=2), port=8765)
+        server.serve_forever()
+    """
+
+    def __init__(self, service: RenderService, host: str = "127.0.0.1", port: int = 8765,
+                 default_template: Optional[str] = None):
+        """
+        初始化HTTP服务器
+
+        Args:
+            service: 渲染服务
+            host: 监听地址
+            port: 端口，0表示由系统分配
+            default_template: 未指定模板时使用的模板，为空时使用第一个已注册模板
+        """
+        self.service = service
+        default_template = default_template if default_template in service.templates else \
+            next(iter(service.templates), None)
+        self._server = ThreadingHTTPServer((host, port), create_handler(service, default_template))
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def port(self) -> int:
+        """
+        实际监听的端口
+        """
+        return self._server.server_address[1]
+
+    def serve_forever(self) -> None:
+        """
+        在当前线程中提供服务，直到调用shutdown()
+        """
+        self._server.serve_forever()
+
+    def start(self) -> None:
+        """
+        在后台线程中提供服务
+        """
+        self._thread = threading.Thread(target=self.serve_forever, name="render-server", daemon=True)
+        self._thread.start()
+
+    def shutdown(self) -> None:
+        """
+        停止服务并关闭监听端口
+        """
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
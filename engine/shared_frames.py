@@ -0,0 +1,229 @@
+"""
+共享内存帧池
+隔离的工作进程渲染出的图片通过multiprocessing.shared_memory交给主进程编码，像素数据不经过pickle和管道：
+
+- 主进程创建固定数量的共享内存块（按同时渲染的照片数和单帧最大像素数确定），重复使用
+- 工作进程把渲染结果按行分段写入分配给它的共享内存块，只返回SharedFrame描述（块名称、模式、尺寸）
+- 主进程用Image.frombuffer直接包装共享内存得到只读图片，编码完成后归还共享内存块
+
+RGB图片以RGBX格式保存（Pillow内部每像素4字节），frombuffer可以不复制地映射，JPEG编码器也直接支持RGBX。
+"""
+
+import queue
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Dict, Optional, Tuple
+
+from PIL import Image
+
+# 可以不复制地映射到共享内存的模式，以及其他模式写入前转换成的模式
+_FRAME_MODES = {"RGB": "RGBX", "RGBX": "RGBX", "RGBA": "RGBA", "L": "L"}
+_BYTES_PER_PIXEL = {"RGBX": 4, "RGBA": 4, "L": 1}
+
+# 写入共享内存时每段的行数，避免一次生成整帧大小的临时数据
+_BAND_ROWS = 256
+
+
+class FrameTooLarge(Exception):
+    """
+    渲染结果超过共享内存块的容量
+    """
+
+
+@dataclass(frozen=True)
+class SharedFrame:
+    """
+    共享内存中一帧图片的描述，在进程之间传递
+    """
+    # 共享内存块名称
+    slot: str
+    # 像素格式（RGBX、RGBA或L）
+    mode: str
+    # 图片尺寸(宽, 高)
+    size: Tuple[int, int]
+
+    @property
+    def nbytes(self) -> int:
+        return self.size[0] * self.size[1] * _BYTES_PER_PIXEL[self.mode]
+
+
+@dataclass(frozen=True)
+class FrameSlot:
+    """
+    分配给一次渲染的共享内存块
+    """
+    # 共享内存块名称
+    name: str
+    # 容量（字节）
+    capacity: int
+
+
+# 生产帧的进程中已打开的共享内存块，按名称缓存，避免每帧重新映射
+_attached: Dict[str, shared_memory.SharedMemory] = {}
+_attached_lock = threading.Lock()
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """
+    打开其他进程创建的共享内存块
+    """
+    with _attached_lock:
+        block = _attached.get(name)
+        if block is None:
+            block = shared_memory.SharedMemory(name=name)
+            _attached[name] = block
+        return block
+
+
+def write_frame(image: Image.Image, slot: FrameSlot) -> SharedFrame:
+    """
+    把图片写入共享内存块（在工作进程中调用）
+
+    Args:
+        image: 渲染结果
+        slot: 主进程分配的共享内存块
+
+    Returns:
+        SharedFrame: 帧描述
+
+    Raises:
+        FrameTooLarge: 图片超过共享内存块的容量
+    """
+    mode = _FRAME_MODES.get(image.mode)
+    if mode is None:
+        image = image.convert("RGB")
+        mode = "RGBX"
+    frame = SharedFrame(slot.name, mode, image.size)
+    if frame.nbytes > slot.capacity:
+        raise FrameTooLarge(f"图片 {image.width}x{image.height} 超过共享内存块容量 {slot.capacity} 字节")
+
+    buffer = _attach(slot.name).buf
+    row_bytes = image.width * _BYTES_PER_PIXEL[mode]
+    for top in range(0, image.height, _BAND_ROWS):
+        bottom = min(top + _BAND_ROWS, image.height)
+        band = image.crop((0, top, image.width, bottom)) if (top, bottom) != (0, image.height) else image
+        buffer[top * row_bytes:bottom * row_bytes] = band.tobytes("raw", mode)
+    return frame
+
+
+class SharedFramePool:
+    """
+    可重复使用的共享内存块池（在主进程中创建）
+
+    用法:
+        pool = SharedFramePool.for_budget(workers=2, max_frame_pixels=120_000_000)
+        slot = pool.acquire()
+        frame = ...  # 工作进程调用write_frame(image, slot)
+        with pool.open(slot, frame) as image:
+            write_image(image, fp, "JPEG")
+        pool.release(slot)
+    """
+
+    def __init__(self, slots: int, slot_bytes: int):
+        """
+        初始化共享内存块池
+
+        Args:
+            slots: 共享内存块数量，即同时在进程之间传递的帧数上限
+            slot_bytes: 每块的容量（字节）；Linux下共享内存按实际写入的页面占用内存
+        """
+        self.slot_bytes = slot_bytes
+        self._blocks: Dict[str, shared_memory.SharedMemory] = {}
+        self._free: "queue.Queue[FrameSlot]" = queue.Queue()
+        for _ in range(max(1, slots)):
+            block = shared_memory.SharedMemory(create=True, size=slot_bytes)
+            self._blocks[block.name] = block
+            self._free.put(FrameSlot(block.name, slot_bytes))
+        self._closed = False
+
+    @classmethod
+    def for_budget(cls, workers: int, max_frame_pixels: int) -> "SharedFramePool":
+        """
+        按同时渲染的照片数和单帧最大像素数创建共享内存块池
+
+        Args:
+            workers: 同时渲染的照片数（如渲染服务的工作线程数）
+            max_frame_pixels: 单帧（含相框）的最大像素数
+
+        Returns:
+            SharedFramePool: 共享内存块池
+        """
+        return cls(workers, max_frame_pixels * 4)
+
+    @property
+    def slots(self) -> int:
+        """
+        共享内存块数量
+        """
+        return len(self._blocks)
+
+    def free_slots(self) -> int:
+        """
+        空闲的共享内存块数量
+        """
+        return self._free.qsize()
+
+    def acquire(self, timeout: Optional[float] = None) -> FrameSlot:
+        """
+        取出一个空闲的共享内存块，没有空闲块时等待
+
+        Args:
+            timeout: 最长等待时间（秒），为空时一直等待
+
+        Returns:
+            FrameSlot: 共享内存块
+
+        Raises:
+            TimeoutError: 等待超时
+        """
+        try:
+            return self._free.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError("没有空闲的共享内存块")
+
+    def release(self, slot: FrameSlot) -> None:
+        """
+        归还共享内存块
+        """
+        self._free.put(slot)
+
+    @contextmanager
+    def open(self, slot: FrameSlot, frame: SharedFrame):
+        """
+        不复制地把共享内存中的帧包装为只读图片，退出时关闭图片（共享内存块需另外归还）
+
+        Args:
+            slot: 共享内存块
+            frame: 工作进程返回的帧描述
+
+        Yields:
+            Image.Image: 图片
+        """
+        if frame.slot != slot.name:
+            raise ValueError(f"帧不在共享内存块 {slot.name} 中")
+        buffer = self._blocks[slot.name].buf[:frame.nbytes]
+        image = Image.frombuffer(frame.mode, frame.size, buffer, "raw", frame.mode, 0, 1)
+        try:
+            yield image
+        finally:
+            image.close()
+            buffer.release()
+
+    def close(self) -> None:
+        """
+        释放并删除所有共享内存块
+        """
+        if self._closed:
+            return
+        self._closed = True
+        for block in self._blocks.values():
+            block.close()
+            block.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,290 @@
+"""
+超大全景照片的分条渲染
+拼接出的全景照片可达20000x6000甚至上亿像素，整张解码再创建整帧画布会超出工作进程的内存，
+也会触发Pillow的解压炸弹保护。底边模板只在照片下方追加信息横条，照片部分逐行原样输出，因此可以分条处理：
+
+- 照片按行段读取，每段直接交给PNG编码器写出，读取下一段前释放
+- 信息横条按布局方案单独渲染，同样按行段写出
+- 同时在内存中的只有一个行段，内存占用由行段大小决定，与照片像素数无关
+
+Pillow不能只解码JPEG、PNG或压缩TIFF的一部分，分条读取只支持未压缩的TIFF、PPM和BMP
+（拼接软件通常可以导出未压缩的TIFF，各通道分开存储的平面TIFF也支持）；输出为PNG。
+
+用法:
+    size = render_strips("panorama.tif", "framed_panorama.png", "黑色底边", band_bytes=32 * 1024 * 1024)
+"""
+
+import os
+import struct
+from contextlib import nullcontext
+from typing import BinaryIO, Dict, List, Optional, Tuple, Union
+
+from PIL import Image, BmpImagePlugin, PpmImagePlugin, TiffImagePlugin
+
+from entity.photo import Photo
+from template.bottom_bar_template import BottomBarTemplate
+from utils.image_io import PNGStreamWriter
+from utils.instrumentation import span
+from .render_api import get_template
+
+# 可以按行段读取的格式（像素按行原样存储）
+_RAW_FORMATS = (TiffImagePlugin.TiffImageFile, PpmImagePlugin.PpmImageFile, BmpImagePlugin.BmpImageFile)
+
+
+class StripUnsupported(Exception):
+    """
+    照片格式或模板不支持分条渲染
+    """
+
+
+class _RawTile:
+    """
+    照片中一块按行存储的像素区域
+    """
+
+    def __init__(self, extents: Tuple[int, int, int, int], offset: int, rawmode: str, stride: int,
+                 orientation: int, band: Optional[int] = None):
+        self.x0, self.y0, self.x1, self.y1 = extents
+        self.offset = offset
+        self.rawmode = rawmode
+        self.stride = stride
+        # 1表示从上到下存储，-1表示从下到上（BMP）
+        self.orientation = orientation
+        # 平面TIFF中该区域存储的通道序号，各通道交错存储时为空
+        self.band = band
+
+
+def _open_raw_image(path: str) -> Image.Image:
+    """
+    打开可以按行段读取的照片
+
+    不经过Image.open：分条渲染的内存占用与像素数无关，不需要解压炸弹检查
+    """
+    for image_class in _RAW_FORMATS:
+        try:
+            return image_class(path)
+        except (SyntaxError, IndexError, TypeError, struct.error):
+            continue
+    raise StripUnsupported(f"分条渲染只支持未压缩的TIFF、PPM和BMP: {path}")
+
+
+def _row_bytes(mode: str, rawmode: str, width: int) -> int:
+    """
+    计算一行像素按rawmode存储时的字节数
+    """
+    try:
+        return len(Image.new(mode, (width, 1)).tobytes("raw", rawmode))
+    except (ValueError, OSError) as e:
+        raise StripUnsupported(f"不支持的像素格式: {rawmode}") from e
+
+
+class BandSource:
+    """
+    按行段读取未压缩照片的像素，不解码整张照片
+
+    用法:
+        with BandSource("panorama.tif") as source:
+            band = source.read(0, 256)
+    """
+
+    def __init__(self, path: str):
+        """
+        打开照片并解析像素存储位置
+
+        Args:
+            path: 照片文件路径
+
+        Raises:
+            StripUnsupported: 照片是压缩格式或像素格式不支持
+        """
+        self.path = path
+        self.image = _open_raw_image(path)
+        try:
+            self.tiles = self._group_tiles([self._parse_tile(tile) for tile in self.image.tile])
+        except StripUnsupported:
+            self.image.close()
+            raise
+        self._fp = open(path, "rb")
+
+    def _parse_tile(self, tile) -> _RawTile:
+        codec_name, extents, offset, args = tile
+        if codec_name != "raw":
+            raise StripUnsupported(f"分条渲染只支持未压缩的照片: {os.path.basename(self.path)}（{codec_name}）")
+        if isinstance(args, str):
+            args = (args,)
+        rawmode = args[0]
+        stride = args[1] if len(args) > 1 else 0
+        orientation = args[2] if len(args) > 2 else 1
+        bands = self.image.getbands()
+        band = None
+        if len(bands) > 1 and len(rawmode) == 1:
+            # 平面TIFF：每块区域只存储一个通道（rawmode为R、G、B等）
+            if rawmode not in bands:
+                raise StripUnsupported(f"不支持的平面像素格式: {rawmode}")
+            band = bands.index(rawmode)
+            rawmode = "L"
+        if not stride:
+            stride = _row_bytes("L" if band is not None else self.image.mode, rawmode, extents[2] - extents[0])
+        return _RawTile(extents, offset, rawmode, stride, orientation, band)
+
+    def _group_tiles(self, tiles: List[_RawTile]) -> List[List[_RawTile]]:
+        """
+        把位置相同的区域分为一组：交错存储时每组一块区域，平面TIFF中每组是同一位置的各个通道（按通道顺序）
+
+        Raises:
+            StripUnsupported: 区域重叠，或平面TIFF的通道不完整
+        """
+        groups: Dict[Tuple[int, int, int, int], List[_RawTile]] = {}
+        for tile in tiles:
+            groups.setdefault((tile.x0, tile.y0, tile.x1, tile.y1), []).append(tile)
+
+        band_count = len(self.image.getbands())
+        result = []
+        for extents, group in groups.items():
+            bands = sorted(tile.band for tile in group if tile.band is not None)
+            if len(group) == 1 and group[0].band is None:
+                result.append(group)
+            elif bands == list(range(band_count)) and len(group) == band_count:
+                result.append(sorted(group, key=lambda tile: tile.band))
+            else:
+                raise StripUnsupported(f"不支持的像素存储方式（区域{extents}重叠或通道不完整）: "
+                                       f"{os.path.basename(self.path)}")
+        return result
+
+    @property
+    def mode(self) -> str:
+        return self.image.mode
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        return self.image.size
+
+    def read(self, top: int, bottom: int) -> Image.Image:
+        """
+        读取第top到bottom行（不含）的像素
+
+        Args:
+            top: 起始行
+            bottom: 结束行（不含）
+
+        Returns:
+            Image.Image: 宽度与照片相同、高度为bottom - top的图片
+        """
+        width = self.size[0]
+        band = None
+        with span("decode_band", rows=bottom - top):
+            for group in self.tiles:
+                tile = group[0]
+                first, last = max(top, tile.y0), min(bottom, tile.y1)
+                if first >= last:
+                    continue
+                if tile.band is None:
+                    piece = self._read_tile_rows(tile, first - tile.y0, last - tile.y0)
+                else:
+                    # 平面TIFF：分别读取各通道后合并
+                    piece = Image.merge(self.mode, [self._read_tile_rows(plane, first - tile.y0, last - tile.y0)
+                                                    for plane in group])
+                if piece.size == (width, bottom - top):
+                    # 行段只来自一块区域（常见的情况），不必再复制
+                    return piece
+                if band is None:
+                    band = Image.new(self.mode, (width, bottom - top))
+                band.paste(piece, (tile.x0, first - top))
+        return band if band is not None else Image.new(self.mode, (width, bottom - top))
+
+    def _read_tile_rows(self, tile: _RawTile, first: int, last: int) -> Image.Image:
+        """
+        读取一块区域中第first到last行（相对区域顶部，不含last）
+        """
+        rows = last - first
+        if tile.orientation < 0:
+            # 从下到上存储：区域顶部的行在数据末尾
+            start_row = (tile.y1 - tile.y0) - last
+        else:
+            start_row = first
+        self._fp.seek(tile.offset + start_row * tile.stride)
+        data = self._fp.read(rows * tile.stride)
+        mode = "L" if tile.band is not None else self.mode
+        return Image.frombytes(mode, (tile.x1 - tile.x0, rows), data, "raw", tile.rawmode, tile.stride,
+                               tile.orientation)
+
+    def close(self) -> None:
+        """
+        关闭照片文件
+        """
+        self._fp.close()
+        self.image.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def band_rows(width: int, band_bytes: int) -> int:
+    """
+    计算每个行段的行数（Pillow中RGB图片每像素占4字节）
+
+    Args:
+        width: 图片宽度
+        band_bytes: 每个行段最多占用的字节数
+
+    Returns:
+        int: 行数，至少为1
+    """
+    return max(1, band_bytes // (width * 4))
+
+
+def render_strips(source: str, output: Union[str, BinaryIO], template: Optional[str] = None,
+                  band_bytes: int = 32 * 1024 * 1024, filename: Optional[str] = None,
+                  **params) -> Tuple[int, int]:
+    """
+    分条渲染一张照片并写出PNG，照片和整帧画布都不会整张出现在内存中
+
+    Args:
+        source: 照片文件路径（未压缩的TIFF、PPM或BMP）
+        output: 输出文件路径或可写的二进制文件对象
+        template: 模板名称（需要是底边模板），为空时使用默认模板
+        band_bytes: 每个行段最多占用的字节数
+        filename: 照片名称，为空时使用文件名
+        **params: 相框参数（底边模板不使用frame_width和frame_color）
+
+    Returns:
+        Tuple[int, int]: 输出图片的尺寸
+
+    Raises:
+        StripUnsupported: 模板不是底边模板、照片格式不支持或照片需要按EXIF方向旋转
+    """
+    frame_template = get_template(template)
+    if not isinstance(frame_template, BottomBarTemplate) or not frame_template.APPEND_ONLY:
+        raise StripUnsupported(f"分条渲染只支持在照片下方追加横条的底边模板: {frame_template.name}")
+
+    with BandSource(source) as band_source, \
+            Photo.from_image(band_source.image, filename or os.path.basename(source)) as photo:
+        if photo.orientation not in (None, 1):
+            raise StripUnsupported(f"分条渲染不支持需要旋转的照片（EXIF方向{photo.orientation}）")
+        width, height = band_source.size
+        with span("layout"):
+            plan = frame_template.plan_bar(photo, width, height)
+        size = (width, height + plan.height)
+        rows = band_rows(width, band_bytes)
+
+        with open(output, "wb") if isinstance(output, str) else nullcontext(output) as fp:
+            writer = PNGStreamWriter(fp, size)
+            for top in range(0, height, rows):
+                band = band_source.read(top, min(top + rows, height))
+                if band.mode != "RGB":
+                    converted = band.convert("RGB")
+                    band.close()
+                    band = converted
+                writer.write(band)
+                band.close()
+            for top in range(0, plan.height, rows):
+                with span("text"):
+                    band = frame_template.render_bar_rows(plan, top, min(top + rows, plan.height))
+                writer.write(band)
+                band.close()
+            writer.close()
+    return size
+
@@ -0,0 +1,516 @@
+"""
+进程隔离的渲染工作进程池
+每张照片在独立的工作进程中处理，截断的JPEG、超大图片等导致的卡死、崩溃或内存暴涨只影响当前照片：
+
+- 看门狗线程监控每个工作进程，超过单张时间或内存上限时结束该进程并启动新的工作进程
+- 进程被结束或异常退出的照片重试一次，仍然失败时写入隔离清单（JSONL）并跳过，附带诊断信息
+- 其他工作进程继续处理，批量处理的吞吐量不受影响
+
+照片处理函数抛出的普通异常（如无法识别的文件格式）不会重试，直接作为失败结果返回。
+处理函数和输入项需要能被pickle（模块级函数），工作进程使用spawn方式启动，与GUI和线程池兼容。
+
+用法:
+    with IsolatedWorkerPool(render_task, workers=2, timeout=120, memory_limit_mb=2048,
+                            quarantine_file="quarantine.jsonl") as pool:
+        output_path = pool.submit(RenderTask(path, output_path, "黑色底边")).result()
+
+需要在主进程中编码时使用render_frame_task，渲染结果写入共享内存（见shared_frames）而不是pickle后经管道返回。
+"""
+
+import json
+import multiprocessing
+import signal
+import threading
+import time
+import traceback
+from collections import deque
+from concurrent.futures import CancelledError, Future, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
+from datetime import datetime
+from multiprocessing.connection import wait
+from typing import Any, Callable, Deque, Dict, List, Optional, Union
+
+from entity.photo import Photo
+from utils.canvas_pool import release_canvas
+from utils.image_io import save_image
+from utils.memory_profiler import process_rss
+from .async_batch import check_cancelled
+from .render_api import get_template
+from .shared_frames import FrameSlot, SharedFrame, write_frame
+
+_MB = 1024 * 1024
+
+
+class WorkerTaskError(Exception):
+    """
+    照片处理函数在工作进程中抛出异常
+    """
+
+    def __init__(self, message: str, details: str = ""):
+        super().__init__(message)
+        # 工作进程中的异常堆栈
+        self.details = details
+
+
+class QuarantinedError(Exception):
+    """
+    照片多次导致工作进程超时、超出内存或崩溃，已写入隔离清单
+    """
+
+    def __init__(self, message: str, record: Dict[str, Any]):
+        super().__init__(message)
+        # 隔离清单中的记录
+        self.record = record
+
+
+@dataclass
+class RenderTask:
+    """
+    在工作进程中处理的一张照片
+    """
+    # 照片路径
+    path: str
+    # 输出文件路径
+    output_path: str
+    # 模板名称，为空时使用默认模板
+    template: Optional[str] = None
+    # 相框参数（frame_width、frame_color、selected_params等）
+    params: Dict[str, Any] = field(default_factory=dict)
+    # 已读取的EXIF数据
+    exif_data: Optional[dict] = None
+    # 传给编码器的参数
+    encode_options: Dict[str, Any] = field(default_factory=dict)
+
+
+def render_task(task: RenderTask) -> str:
+    """
+    在工作进程中为一张照片生成相框并保存
+
+    Args:
+        task: 照片处理任务
+
+    Returns:
+        str: 输出文件路径
+    """
+    with Photo(task.path, exif_data=task.exif_data) as photo:
+        photo.decode()
+        photo.fix_orientation()
+        framed = get_template(task.template).render(photo, **task.params)
+    try:
+        save_image(framed, task.output_path, "JPEG", **task.encode_options)
+    finally:
+        release_canvas(framed)
+    return task.output_path
+
+
+@dataclass
+class FrameTask:
+    """
+    在工作进程中渲染、由主进程编码的一张照片，渲染结果写入共享内存
+    """
+    # 照片文件内容或路径
+    source: Union[bytes, str]
+    # 主进程分配的共享内存块
+    slot: FrameSlot
+    # 照片名称，只用于日志
+    filename: str = "upload.jpg"
+    # 模板名称，为空时使用默认模板
+    template: Optional[str] = None
+    # 相框参数（frame_width、frame_color、selected_params等）
+    params: Dict[str, Any] = field(default_factory=dict)
+
+
+def render_frame_task(task: FrameTask) -> SharedFrame:
+    """
+    在工作进程中为一张照片生成相框，结果写入共享内存块
+
+    Args:
+        task: 照片渲染任务
+
+    Returns:
+        SharedFrame: 帧描述，主进程用SharedFramePool.open()不复制地读取
+    """
+    if isinstance(task.source, bytes):
+        photo = Photo.from_bytes(task.source, task.filename)
+    else:
+        photo = Photo(task.source)
+    with photo:
+        photo.decode()
+        photo.fix_orientation()
+        framed = get_template(task.template).render(photo, **task.params)
+    try:
+        return write_frame(framed, task.slot)
+    finally:
+        release_canvas(framed)
+
+
+def _worker_main(conn, func: Callable[[Any], Any]) -> None:
+    """
+    工作进程主循环：依次接收任务并返回结果，收到None时退出
+    """
+    # Ctrl+C由主进程处理，工作进程由主进程结束
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    while True:
+        try:
+            item = conn.recv()
+        except EOFError:
+            return
+        if item is None:
+            return
+        try:
+            conn.send((True, func(item), None))
+        except Exception as e:
+            conn.send((False, f"{type(e).__name__}: {e}", traceback.format_exc()))
+
+
+class _Job:
+    """
+    等待处理或正在处理的任务
+    """
+
+    __slots__ = ("item", "future", "attempts", "failures")
+
+    def __init__(self, item: Any, future: Future):
+        self.item = item
+        self.future = future
+        self.attempts = 0
+        # 每次工作进程被结束或崩溃的原因
+        self.failures: List[Dict[str, Any]] = []
+
+
+class _Worker:
+    """
+    一个工作进程及其正在处理的任务
+    """
+
+    def __init__(self, context, func: Callable[[Any], Any]):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn, func), daemon=True,
+                                       name="render-worker")
+        self.process.start()
+        child_conn.close()
+        self.job: Optional[_Job] = None
+        self.started = 0.0
+        self.peak_rss = 0
+
+    def assign(self, job: _Job) -> None:
+        job.attempts += 1
+        self.job = job
+        self.started = time.monotonic()
+        self.peak_rss = 0
+        self.conn.send(job.item)
+
+    def kill(self) -> None:
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+class IsolatedWorkerPool:
+    """
+    进程隔离的工作进程池，submit()返回concurrent.futures.Future，可以在多个线程中调用
+    """
+
+    def __init__(self, func: Callable[[Any], Any] = render_task, workers: int = 2, timeout: Optional[float] = 120.0,
+                 memory_limit_mb: float = 0, retries: int = 1, quarantine_file: Optional[str] = None,
+                 poll_interval: float = 0.05):
+        """
+        初始化工作进程池
+
+        Args:
+            func: 处理单项的模块级函数，在工作进程中调用
+            workers: 工作进程数
+            timeout: 单项处理时间上限（秒），为空时不限制
+            memory_limit_mb: 工作进程常驻内存上限（MB），0表示不限制（仅Linux支持）
+            retries: 工作进程被结束或崩溃后的重试次数
+            quarantine_file: 隔离清单文件（JSONL），为空时不写入
+            poll_interval: 看门狗检查间隔（秒）
+        """
+        self.func = func
+        self.workers = max(1, workers)
+        self.timeout = timeout
+        self.memory_limit_mb = memory_limit_mb
+        self.retries = retries
+        self.quarantine_file = quarantine_file
+        self.poll_interval = poll_interval
+        self.restarts = 0
+        self.quarantined: List[Dict[str, Any]] = []
+        self._context = multiprocessing.get_context("spawn")
+        self._queue: Deque[_Job] = deque()
+        self._lock = threading.Lock()
+        self._wake_reader, self._wake_writer = self._context.Pipe(duplex=False)
+        self._wake_lock = threading.Lock()
+        # 已请求取消、正在处理或等待重试的任务
+        self._cancel_requests = set()
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """
+        启动看门狗线程（首次submit时自动调用）
+        """
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="worker-pool-watchdog", daemon=True)
+                self._thread.start()
+
+    def submit(self, item: Any) -> Future:
+        """
+        提交一项任务
+
+        Args:
+            item: 传给处理函数的输入项
+
+        Returns:
+            Future: 结果为处理函数的返回值；处理函数抛出异常时为WorkerTaskError，
+                    多次超时、超出内存或崩溃时为QuarantinedError
+        """
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("工作进程池已关闭")
+            self._queue.append(_Job(item, future))
+        self.start()
+        self._wake()
+        return future
+
+    def run(self, item: Any, timeout: Optional[float] = None) -> Any:
+        """
+        提交一项任务并等待结果
+
+        等待期间按看门狗检查间隔检查调用线程的取消标志（在AsyncBatch中调用时即批量取消和单张超时），
+        取消或超过timeout时结束正在处理该任务的工作进程，不必等工作进程处理完
+
+        Args:
+            item: 传给处理函数的输入项
+            timeout: 等待时间上限（秒），为空时不限制
+
+        Returns:
+            Any: 处理函数的返回值
+
+        Raises:
+            concurrent.futures.TimeoutError: 超过timeout
+            ItemCancelled: 调用线程的照片处理已取消或超时
+        """
+        future = self.submit(item)
+        deadline = time.monotonic() + timeout if timeout else None
+        try:
+            while True:
+                check_cancelled()
+                wait_time = self.poll_interval
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise FutureTimeoutError(f"处理超过 {timeout:g} 秒")
+                    wait_time = min(wait_time, remaining)
+                try:
+                    return future.result(timeout=wait_time)
+                except FutureTimeoutError:
+                    continue
+        except BaseException:
+            self.cancel(future)
+            raise
+
+    def cancel(self, future: Future) -> None:
+        """
+        取消一项任务：未开始时不再处理，正在处理时结束该工作进程并启动新的工作进程（不重试、不写入隔离清单）
+
+        Args:
+            future: submit()返回的Future
+        """
+        if future.done() or future.cancel():
+            return
+        with self._lock:
+            self._cancel_requests.add(future)
+        self._wake()
+
+    def shutdown(self) -> None:
+        """
+        关闭工作进程池：未开始的任务取消，正在处理的任务等待完成
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            while self._queue:
+                job = self._queue.popleft()
+                if job.attempts:
+                    # 等待重试的任务已经开始，不能取消
+                    job.future.set_exception(RuntimeError("工作进程池已关闭"))
+                else:
+                    job.future.cancel()
+        self._wake()
+        if self._thread is not None:
+            self._thread.join()
+        with self._wake_lock:
+            self._wake_reader.close()
+            self._wake_writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown()
+
+    def _wake(self) -> None:
+        """
+        唤醒看门狗线程分配新任务
+        """
+        with self._wake_lock:
+            try:
+                self._wake_writer.send_bytes(b"")
+            except OSError:
+                pass
+
+    def _next_job(self) -> Optional[_Job]:
+        """
+        取出下一个未被取消的任务
+        """
+        with self._lock:
+            while self._queue:
+                job = self._queue.popleft()
+                if job.future in self._cancel_requests:
+                    # 等待重试的任务已取消
+                    self._cancel_requests.discard(job.future)
+                    job.future.set_exception(CancelledError("处理已取消"))
+                    continue
+                if job.attempts or job.future.set_running_or_notify_cancel():
+                    return job
+        return None
+
+    def _run(self) -> None:
+        """
+        看门狗线程：分配任务、接收结果，结束超时、超出内存或崩溃的工作进程
+        """
+        workers: List[_Worker] = []
+        try:
+            while True:
+                # 空闲的工作进程接收新任务，进程被结束后按需重新启动
+                for index in range(self.workers):
+                    if index < len(workers) and workers[index].job is not None:
+                        continue
+                    job = self._next_job()
+                    if job is None:
+                        break
+                    if index >= len(workers):
+                        workers.append(_Worker(self._context, self.func))
+                    try:
+                        workers[index].assign(job)
+                    except Exception as e:
+                        # 输入项无法发送给工作进程（如不能pickle）
+                        workers[index].job = None
+                        job.future.set_exception(e)
+
+                busy = [worker for worker in workers if worker.job is not None]
+                with self._lock:
+                    if self._closed and not busy and not self._queue:
+                        return
+
+                handles = [self._wake_reader] + [worker.conn for worker in busy] + \
+                          [worker.process.sentinel for worker in busy]
+                ready = wait(handles, timeout=self.poll_interval if busy else None)
+                if self._wake_reader in ready:
+                    while self._wake_reader.poll():
+                        self._wake_reader.recv_bytes()
+
+                for worker in busy:
+                    self._check_worker(workers, worker)
+        finally:
+            for worker in workers:
+                self._stop_worker(worker)
+
+    def _check_worker(self, workers: List[_Worker], worker: _Worker) -> None:
+        """
+        检查一个正在处理的工作进程：接收结果，或在超时、超出内存、崩溃时结束并替换该进程
+        """
+        job = worker.job
+        with self._lock:
+            cancelled = job.future in self._cancel_requests
+            self._cancel_requests.discard(job.future)
+        if cancelled:
+            # 调用方已取消：结束工作进程，结果不再需要
+            worker.kill()
+            workers[workers.index(worker)] = _Worker(self._context, self.func)
+            self.restarts += 1
+            job.future.set_exception(CancelledError("处理已取消"))
+            return
+
+        if worker.conn.poll():
+            try:
+                ok, value, details = worker.conn.recv()
+            except (EOFError, OSError):
+                self._fail(workers, worker, "crash", f"工作进程异常退出（退出码 {worker.process.exitcode}）")
+                return
+            worker.job = None
+            with self._lock:
+                self._cancel_requests.discard(job.future)
+            if ok:
+                job.future.set_result(value)
+            else:
+                job.future.set_exception(WorkerTaskError(value, details))
+            return
+
+        if not worker.process.is_alive():
+            self._fail(workers, worker, "crash", f"工作进程异常退出（退出码 {worker.process.exitcode}）")
+            return
+        elapsed = time.monotonic() - worker.started
+        if self.timeout and elapsed > self.timeout:
+            self._fail(workers, worker, "timeout", f"处理超过 {self.timeout:g} 秒")
+            return
+        if self.memory_limit_mb:
+            rss = process_rss(worker.process.pid)
+            worker.peak_rss = max(worker.peak_rss, rss)
+            if rss > self.memory_limit_mb * _MB:
+                self._fail(workers, worker, "memory", f"常驻内存 {rss / _MB:.0f}MB 超过上限 {self.memory_limit_mb:g}MB")
+
+    def _fail(self, workers: List[_Worker], worker: _Worker, reason: str, message: str) -> None:
+        """
+        结束工作进程并启动新的工作进程；未超过重试次数时重新排队，否则写入隔离清单
+        """
+        job = worker.job
+        job.failures.append({
+            "reason": reason,
+            "message": message,
+            "elapsed_s": round(time.monotonic() - worker.started, 3),
+            "peak_rss_mb": round(worker.peak_rss / _MB, 1),
+            "exitcode": worker.process.exitcode
+        })
+        worker.kill()
+        workers[workers.index(worker)] = _Worker(self._context, self.func)
+        self.restarts += 1
+
+        if job.attempts <= self.retries:
+            # 重新排到队尾，不阻塞其他照片
+            with self._lock:
+                self._queue.append(job)
+            return
+
+        record = {
+            "time": datetime.now().isoformat(timespec="seconds"),
+            "item": getattr(job.item, "path", repr(job.item)),
+            "reason": reason,
+            "attempts": job.attempts,
+            "failures": job.failures
+        }
+        self.quarantined.append(record)
+        if self.quarantine_file:
+            try:
+                with open(self.quarantine_file, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            except OSError as e:
+                record["quarantine_error"] = str(e)
+        job.future.set_exception(QuarantinedError(f"已隔离: {message}", record))
+
+    def _stop_worker(self, worker: _Worker) -> None:
+        """
+        通知工作进程退出，超时未退出时结束进程
+        """
+        try:
+            worker.conn.send(None)
+        except OSError:
+            pass
+        worker.process.join(timeout=5)
+        if worker.process.is_alive():
+            worker.process.kill()
+            worker.process.join()
+        worker.conn.close()
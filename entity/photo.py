@@ -1,5 +1,11 @@
+import io
+import logging
 import os
 from PIL import Image, ExifTags
+from utils.exif_reader import read_exif_tags, EXIF_TAGS
+from utils.instrumentation import span
+
+logger = logging.getLogger(__name__)
 
 class Photo:
     """
@@ -7,46 +13,119 @@ class Photo:
     封装照片的路径、图片对象、EXIF数据等信息
     """
     
-    def __init__(self, image_path):
+    def __init__(self, image_path, exif_data=None, data=None, image=None):
         """
         初始化Photo对象
+
+        Photo持有打开的照片文件，使用完毕后应调用close()或使用with语句：
+            with Photo(path) as photo:
+                ...
         
         Args:
             image_path: 照片文件路径
+            exif_data: 已读取的EXIF数据（如来自EXIF目录库），提供时不再解析文件
+            data: 照片文件的内容（如HTTP上传的数据），提供时从内存读取，image_path只作为名称
+            image: 调用方已打开的图像，提供时直接使用，image_path只作为名称；close()不会关闭该图像
         """
         self.image_path = image_path
+        self._data = io.BytesIO(data) if data is not None else None
         self.filename = os.path.basename(image_path)
-        self.img = None
+        self.img = image
+        # Image.open返回的原始图像，方向处理后self.img会替换为新图像
+        self._source = None
+        # 调用方传入的图像，由调用方负责关闭
+        self._borrowed = image
         self.exif_data = {}
         self.orientation = 1
         
         # 初始化时加载照片和EXIF数据
-        self._load_photo()
-        self._load_exif_data()
+        if image is None:
+            self._load_photo()
+        if exif_data is None:
+            self._load_exif_data()
+        else:
+            self.exif_data = exif_data
+            self.orientation = exif_data.get('Orientation', 1)
+    
+    @classmethod
+    def from_bytes(cls, data, filename="upload.jpg", exif_data=None):
+        """
+        从内存中的照片文件内容创建Photo对象
+        
+        Args:
+            data: 照片文件的内容
+            filename: 照片名称（用于输出文件名和日志）
+            exif_data: 已读取的EXIF数据
+            
+        Returns:
+            Photo: 照片对象
+        """
+        return cls(filename, exif_data=exif_data, data=data)
+    
+    @classmethod
+    def from_image(cls, image, filename="image.jpg", exif_data=None):
+        """
+        从已打开的图像创建Photo对象，EXIF数据从图像自带的信息中读取
+        
+        Args:
+            image: PIL图像对象
+            filename: 照片名称（用于输出文件名和日志）
+            exif_data: 已读取的EXIF数据
+            
+        Returns:
+            Photo: 照片对象
+        """
+        return cls(filename, exif_data=exif_data, image=image)
     
     def _load_photo(self):
         """加载照片"""
         try:
-            self.img = Image.open(self.image_path)
+            with span("load_photo", file=self.filename):
+                self.img = Image.open(self._data if self._data is not None else self.image_path)
+                self._source = self.img
         except Exception as e:
-            raise Exception(f"加载照片失败: {e}")
+            raise Exception(f"加载照片失败: {e}") from e
     
     def _load_exif_data(self):
-        """加载EXIF数据"""
+        """加载EXIF数据（只读取模板用到的标签）"""
         try:
-            exif = self.img._getexif()
-            if exif:
-                for tag_id, value in exif.items():
-                    tag = ExifTags.TAGS.get(tag_id, tag_id)
-                    self.exif_data[tag] = value
+            # 优先直接解析JPEG的APP1段，跳过MakerNote和缩略图等大块数据
+            exif_data = None
+            if self._borrowed is None:
+                exif_data = read_exif_tags(self._data if self._data is not None else self.image_path, EXIF_TAGS)
+            if exif_data is None:
+                # 非JPEG文件或EXIF数据无法解析时，回退到Pillow解析
+                exif_data = self._load_exif_data_with_pillow()
+            self.exif_data = exif_data
             
             # 获取照片方向信息
             self.orientation = self.exif_data.get('Orientation', 1)
         except Exception as e:
-            print(f"读取EXIF数据失败: {e}")
+            logger.warning("读取EXIF数据失败: %s", e)
+    
+    def _load_exif_data_with_pillow(self):
+        """使用Pillow读取EXIF数据，只保留模板用到的标签"""
+        exif = self.img.getexif()
+        exif_data = {}
+        for tag_id, value in list(exif.items()) + list(exif.get_ifd(ExifTags.IFD.Exif).items()):
+            tag = ExifTags.TAGS.get(tag_id, tag_id)
+            if tag in EXIF_TAGS:
+                exif_data[tag] = value
+        return exif_data
+    
+    def decode(self):
+        """解码照片像素数据（Image.open只读取文件头，像素在首次使用时才解码）"""
+        with span("decode", file=self.filename):
+            self.img.load()
+        return self.img
     
     def fix_orientation(self):
         """根据EXIF信息修复照片方向"""
+        with span("fix_orientation", orientation=self.orientation):
+            return self._fix_orientation()
+    
+    def _fix_orientation(self):
+        """按EXIF方向旋转或翻转照片"""
         if self.orientation == 2:
             self.img = self.img.transpose(Image.FLIP_LEFT_RIGHT)
         elif self.orientation == 3:
@@ -67,6 +146,22 @@ class Photo:
         
         return self.img
     
+    def close(self):
+        """关闭照片文件并释放像素数据，可重复调用"""
+        for image in (self.img, self._source):
+            if image is not None and image is not self._borrowed:
+                image.close()
+        self.img = None
+        self._source = None
+        self._borrowed = None
+        self._data = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
     @property
     def width(self):
         """获取照片宽度"""
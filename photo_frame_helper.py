@@ -2,12 +2,33 @@ import os
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 import glob
+import asyncio
+import multiprocessing
 import threading
+from collections import OrderedDict
+from contextlib import nullcontext
 from PIL import Image, ImageDraw, ImageFont, ExifTags, ImageTk
 from entity.photo import Photo
 from template.template_context import get_template_context
 from template import FrameTemplate
 from config import config_manager
+from utils.batch_scheduler import schedule_batch, ResultReorderBuffer
+from utils.exif_format import format_exposure_time
+from utils.thumbnail_loader import ThumbnailLoader, DEFAULT_THUMBNAIL_SIZE
+from utils.canvas_pool import release_canvas
+from utils.image_io import save_image
+from utils.instrumentation import TraceCollector, add_collector, remove_collector
+from utils.memory_profiler import MemoryProfiler
+from utils.metrics import RenderMetrics, MetricsFileExporter, MetricsHTTPExporter
+from template.bottom_bar_template import render_cache_stats
+from engine.async_batch import AsyncBatch
+from engine.worker_pool import IsolatedWorkerPool, RenderTask, QuarantinedError
+
+# 照片列表中同时显示的缩略图数量上限（超出后释放最久未显示的缩略图）
+MAX_THUMBNAIL_IMAGES = 300
+
+# 相框中显示的EXIF参数
+SELECTED_EXIF_PARAMS = ["相机型号", "镜头型号", "焦距", "光圈", "快门速度", "ISO", "拍摄时间"]
 
 class PhotoFrameHelper:
     def __init__(self, root):
@@ -48,6 +69,18 @@ class PhotoFrameHelper:
         self.output_dir = ""
         self.processed_files = []  # 保存处理成功的照片路径
         
+        # 照片列表缩略图：后台加载，按可见区域优先
+        self.thumbnail_loader = ThumbnailLoader(self._on_thumbnail_loaded, size=DEFAULT_THUMBNAIL_SIZE)
+        self.thumbnail_images = OrderedDict()  # 列表项ID -> ImageTk.PhotoImage，防止被垃圾回收
+        self.photo_item_ids = {}  # 照片路径 -> 列表项ID列表
+        self._thumbnail_request_pending = False
+        
+        # 配置了指标文件或端口时，在应用运行期间持续导出Prometheus格式的运行指标
+        self.metrics = None
+        self.metrics_exporters = []
+        self.batch = None
+        self._start_metrics()
+        
         # 输出目录设置变量
         self.output_mode = tk.StringVar(value="指定目录")  # 输出模式：指定目录、原始照片所在文件夹
         # 从配置文件获取默认输出目录
@@ -72,6 +105,7 @@ class PhotoFrameHelper:
         style.map("Process.TButton",
                  background=[("active", "#4a90e2")],
                  foreground=[("active", "white")])
+        style.configure("Thumbnail.Treeview", rowheight=DEFAULT_THUMBNAIL_SIZE[1] + 4)
         
         # 创建GUI布局
         self.create_widgets()
@@ -89,8 +123,23 @@ class PhotoFrameHelper:
         
         # 1. 照片文件选择
         ttk.Label(main_frame, text="照片文件:").grid(row=0, column=0, sticky=tk.W, pady=5)
-        self.photo_listbox = tk.Listbox(main_frame, height=5, selectmode=tk.MULTIPLE)
-        self.photo_listbox.grid(row=0, column=1, sticky=(tk.W, tk.E), pady=5)
+        photo_list_frame = ttk.Frame(main_frame)
+        photo_list_frame.grid(row=0, column=1, sticky=(tk.W, tk.E), pady=5)
+        photo_list_frame.columnconfigure(0, weight=1)
+        
+        # 带缩略图的照片列表，缩略图在后台加载，滚动时优先加载可见的照片
+        self.photo_tree = ttk.Treeview(photo_list_frame, show="tree", height=4, selectmode="extended",
+                                       style="Thumbnail.Treeview")
+        self.photo_tree.grid(row=0, column=0, sticky=(tk.W, tk.E))
+        photo_scrollbar = ttk.Scrollbar(photo_list_frame, orient=tk.VERTICAL, command=self.photo_tree.yview)
+        photo_scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
+        
+        def on_photo_list_scroll(first, last):
+            photo_scrollbar.set(first, last)
+            self._schedule_thumbnail_request()
+        
+        self.photo_tree.config(yscrollcommand=on_photo_list_scroll)
+        self.photo_tree.bind("<Configure>", lambda event: self._schedule_thumbnail_request())
         
         ttk.Button(main_frame, text="选择照片", command=self.select_photos).grid(row=0, column=2, padx=5, pady=5)
         ttk.Button(main_frame, text="清除选择", command=self.clear_photos).grid(row=0, column=3, padx=5, pady=5)
@@ -210,18 +259,81 @@ class PhotoFrameHelper:
         )
         
         # 清空当前列表
-        self.photo_listbox.delete(0, tk.END)
+        self.clear_photos()
         self.photo_files = list(files)
         
-        # 添加到列表框
-        for file in self.photo_files:
-            self.photo_listbox.insert(tk.END, os.path.basename(file))
+        # 先显示文件名，缩略图在后台加载后再填充
+        for index, file in enumerate(self.photo_files):
+            iid = str(index)
+            self.photo_tree.insert("", tk.END, iid=iid, text=os.path.basename(file))
+            self.photo_item_ids.setdefault(file, []).append(iid)
+            thumbnail = self.thumbnail_loader.get(file)
+            if thumbnail is not None:
+                self._apply_thumbnail(iid, thumbnail)
+        self._schedule_thumbnail_request()
     
     def clear_photos(self):
         """清除选择的照片"""
-        self.photo_listbox.delete(0, tk.END)
+        self.thumbnail_loader.cancel()
+        self.photo_tree.delete(*self.photo_tree.get_children())
+        self.thumbnail_images.clear()
+        self.photo_item_ids = {}
         self.photo_files = []
     
+    def _schedule_thumbnail_request(self):
+        """合并短时间内的多次滚动，稍后按可见区域提交缩略图加载请求"""
+        if not self._thumbnail_request_pending:
+            self._thumbnail_request_pending = True
+            self.root.after(50, self._request_visible_thumbnails)
+    
+    def _request_visible_thumbnails(self):
+        """按可见区域优先、向下预读一屏的顺序提交缩略图加载请求"""
+        self._thumbnail_request_pending = False
+        total = len(self.photo_files)
+        if not total:
+            return
+        first, last = self.photo_tree.yview()
+        start = int(first * total)
+        end = min(total, int(last * total + 0.999))
+        page = max(end - start, 1)
+        order = list(range(start, end)) + list(range(end, min(total, end + page))) + list(range(max(0, start - page), start))
+        
+        paths = []
+        for index in order:
+            iid = str(index)
+            if iid in self.thumbnail_images:
+                self.thumbnail_images.move_to_end(iid)
+                continue
+            thumbnail = self.thumbnail_loader.get(self.photo_files[index])
+            if thumbnail is not None:
+                self._apply_thumbnail(iid, thumbnail)
+            else:
+                paths.append(self.photo_files[index])
+        self.thumbnail_loader.request(paths)
+    
+    def _on_thumbnail_loaded(self, image_path, thumbnail):
+        """缩略图加载完成（在后台线程中调用），切换到主线程更新列表"""
+        self.root.after(0, self._show_loaded_thumbnail, image_path, thumbnail)
+    
+    def _show_loaded_thumbnail(self, image_path, thumbnail):
+        """在主线程中把缩略图显示到对应的列表项"""
+        for iid in self.photo_item_ids.get(image_path, []):
+            self._apply_thumbnail(iid, thumbnail)
+    
+    def _apply_thumbnail(self, iid, thumbnail):
+        """设置列表项的缩略图（必须在主线程中调用）"""
+        if not self.photo_tree.exists(iid):
+            return
+        # ImageTk.PhotoImage只能在主线程中创建
+        self.thumbnail_images[iid] = ImageTk.PhotoImage(thumbnail)
+        self.thumbnail_images.move_to_end(iid)
+        self.photo_tree.item(iid, image=self.thumbnail_images[iid])
+        # 限制同时持有的缩略图数量，释放最久未显示的
+        while len(self.thumbnail_images) > MAX_THUMBNAIL_IMAGES:
+            old_iid, _ = self.thumbnail_images.popitem(last=False)
+            if self.photo_tree.exists(old_iid):
+                self.photo_tree.item(old_iid, image="")
+    
     def select_output_dir(self):
         """选择输出目录"""
         dir_path = filedialog.askdirectory(title="选择输出目录")
@@ -245,20 +357,7 @@ class PhotoFrameHelper:
     
     def decimal_to_fraction(self, decimal):
         """将小数转换为分数形式"""
-        from fractions import Fraction
-        # 转换为分数并简化
-        fraction = Fraction(decimal).limit_denominator(1000)
-        numerator, denominator = fraction.numerator, fraction.denominator
-        
-        if denominator == 1:
-            # 整数形式
-            return f"{numerator}s"
-        elif numerator == 1:
-            # 1/分母 形式
-            return f"1/{denominator}s"
-        else:
-            # 分子/分母 形式
-            return f"{numerator}/{denominator}s"
+        return format_exposure_time(decimal)
 
     def get_exif_data(self, image_path):
         """获取照片的EXIF数据"""
@@ -288,16 +387,12 @@ class PhotoFrameHelper:
             if not template:
                 raise ValueError(f"找不到模板: {selected_template_name}")
             
-            # 4. 使用模板实例的create_frame方法处理图片
-            # 设置固定的EXIF参数列表
-            selected_params = ["相机型号", "镜头型号", "焦距", "光圈", "快门速度", "ISO", "拍摄时间"]
-            
-            # 使用模板处理图片
-            new_img = template.create_frame(
-                photo=photo,
+            # 4. 使用模板处理图片（依次调用before/after_create_frame钩子）
+            new_img = template.render(
+                photo,
                 frame_width=self.frame_width,
                 frame_color=self.frame_color,
-                selected_params=selected_params
+                selected_params=SELECTED_EXIF_PARAMS
             )
             
             return new_img
@@ -373,67 +468,138 @@ class PhotoFrameHelper:
         
         # 设置终止标志
         self.is_cancelled = False
+        self.batch = None
         
-        # 启动处理线程
+        # 启动处理线程（运行批量处理的事件循环，照片在线程池中处理，结果通过root.after更新界面）
         self.process_thread = threading.Thread(target=self._process_images_in_thread, args=(output_dir,))
         self.process_thread.daemon = True
         self.process_thread.start()
-        
-        # 定期检查线程是否完成
-        self.check_processing_status()
+    
+    def _start_metrics(self):
+        """按配置启动运行指标的统计和导出"""
+        metrics_output = config_manager.get_metrics_output()
+        metrics_port = config_manager.get_metrics_port()
+        if not metrics_output and not metrics_port:
+            return
+        try:
+            self.metrics = RenderMetrics(caches=render_cache_stats())
+            if metrics_output:
+                self.metrics_exporters.append(
+                    MetricsFileExporter(self.metrics.registry, metrics_output, config_manager.get_metrics_interval()))
+            if metrics_port:
+                self.metrics_exporters.append(MetricsHTTPExporter(self.metrics.registry, metrics_port))
+            for exporter in self.metrics_exporters:
+                exporter.start()
+            self.metrics.start()
+        except Exception as e:
+            print(f"启动运行指标导出失败: {e}")
     
     def _process_images_in_thread(self, output_dir):
-        """在后台线程中处理图片"""
+        """在后台线程中运行批量处理的事件循环"""
+        asyncio.run(self._process_images_async(output_dir))
+    
+    async def _process_images_async(self, output_dir):
+        """逐张处理图片，取消和单张超时在下一个处理阶段生效"""
         total_files = len(self.photo_files)
         success_count = 0
         
-        for i, file_path in enumerate(self.photo_files):
-            if self.is_cancelled:
-                break
+        # 按模板、尺寸、相机和镜头分组处理以提高缓存命中率，处理结果仍按原始顺序显示
+        if config_manager.get_cache_aware_ordering():
+            order = schedule_batch(self.photo_files, self.template_var.get())
+        else:
+            order = list(range(total_files))
+        reorder_buffer = ResultReorderBuffer()
+        
+        # 配置了耗时记录文件时，记录本次批量处理各阶段的耗时
+        trace_output = config_manager.get_trace_output()
+        collector = TraceCollector() if trace_output else None
+        if collector:
+            add_collector(collector)
+        
+        # 开启内存分析时记录每张照片的峰值内存和主要内存分配位置
+        memory_profiler = None
+        if config_manager.get_profile_memory():
+            memory_profiler = MemoryProfiler(threshold_mb=config_manager.get_memory_threshold_mb())
+            memory_profiler.start()
+        
+        # 启用进程隔离时照片在工作进程中处理，卡死、崩溃或超出内存的照片重试一次后写入隔离清单
+        worker_pool = None
+        concurrency = 1
+        if config_manager.get_isolate_workers():
+            worker_config = config_manager.get_worker_config()
+            worker_pool = IsolatedWorkerPool(workers=worker_config["workers"],
+                                             timeout=worker_config["timeout"] or None,
+                                             memory_limit_mb=worker_config["memory_limit_mb"],
+                                             quarantine_file=worker_config["quarantine_output"] or None)
+            concurrency = worker_pool.workers
+        
+        def process(entry):
+            """在处理线程中处理一张照片"""
+            i, file_index = entry
+            file_path = self.photo_files[file_index]
             
             # 更新进度（在主线程中进行）
             progress = ((i + 1) / total_files) * 100
             self.root.after(0, self._update_progress, progress, file_path, i+1, total_files)
             
+            if worker_pool:
+                return self._process_isolated_photo(worker_pool, file_path, output_dir)
+            # 启用内存分析时按照片统计峰值内存
+            with memory_profiler.photo(file_path) if memory_profiler else nullcontext():
+                return self._process_single_photo(file_path, output_dir)
+        
+        self.batch = AsyncBatch(process, list(enumerate(order)), concurrency=concurrency,
+                                timeout=config_manager.get_item_timeout() or None)
+        if self.is_cancelled:
+            # 创建批次之前已点击终止
+            self.batch.cancel()
+        completed = 0
+        async for result in self.batch:
+            _, file_index = result.item
+            completed += 1
+            processed = result.value if result.ok else None
+            if processed:
+                success_count += 1
+            elif result.status == "timeout":
+                if self.metrics:
+                    self.metrics.photo_failed(self.template_var.get(), result.error)
+                self.root.after(0, messagebox.showerror, "错误", f"处理图片 {self.photo_files[file_index]} 超时")
+            if self.metrics:
+                self.metrics.set_queue_depth("pending", total_files - completed)
+                self.metrics.set_queue_depth("reorder", len(reorder_buffer))
+            
+            # 按原始顺序添加到处理成功列表（在主线程中更新UI）
+            for _, ready in reorder_buffer.add(file_index, processed):
+                if ready:
+                    self.root.after(0, self._update_processed_list, *ready)
+        
+        # 处理被终止时，输出已完成但还未显示的结果
+        for _, ready in reorder_buffer.flush():
+            if ready:
+                self.root.after(0, self._update_processed_list, *ready)
+        
+        if worker_pool:
+            worker_pool.shutdown()
+            if worker_pool.quarantined:
+                print(f"已隔离 {len(worker_pool.quarantined)} 张照片（工作进程重启 {worker_pool.restarts} 次）")
+        
+        if collector:
+            remove_collector(collector)
             try:
-                # 创建Photo对象封装照片信息
-                photo = Photo(file_path)
-                # 处理图片
-                new_img = self.process_image(photo)
-                if new_img and not self.is_cancelled:
-                    # 确定输出路径
-                    filename = os.path.basename(file_path)
-                    new_filename = f"framed_{filename}"
-                    
-                    if self.output_mode.get() == "指定目录":
-                        # 输出到指定目录
-                        new_file_path = os.path.join(output_dir, new_filename)
-                    else:
-                        # 输出到原始照片所在文件夹
-                        file_dir = os.path.dirname(file_path)
-                        if self.use_subfolder.get() and self.subfolder_var.get():
-                            # 使用子文件夹
-                            subfolder_name = self.subfolder_var.get()
-                            output_path = os.path.join(file_dir, subfolder_name)
-                            # 创建子文件夹（如果不存在）
-                            if not os.path.exists(output_path):
-                                os.makedirs(output_path)
-                            new_file_path = os.path.join(output_path, new_filename)
-                        else:
-                            # 直接输出到原始文件夹
-                            new_file_path = os.path.join(file_dir, new_filename)
-                    
-                    try:
-                        new_img.save(new_file_path, "JPEG")
-                        success_count += 1
-                        # 添加到处理成功列表（在主线程中更新UI）
-                        self.root.after(0, self._update_processed_list, new_filename, new_file_path)
-                    except Exception as e:
-                        # 错误信息在主线程中显示
-                        self.root.after(0, messagebox.showerror, "错误", f"保存图片失败: {e}")
+                collector.export_chrome_trace(trace_output)
+                print(f"各阶段耗时（毫秒）:\n{collector.format_summary()}")
             except Exception as e:
-                # 错误信息在主线程中显示
-                self.root.after(0, messagebox.showerror, "错误", f"处理图片 {file_path} 失败: {e}")
+                print(f"写入耗时记录失败: {e}")
+        
+        if memory_profiler:
+            memory_profiler.stop()
+            print(f"内存分析:\n{memory_profiler.format_report()}")
+            memory_report = config_manager.get_memory_report()
+            if memory_report:
+                try:
+                    memory_profiler.export_json(memory_report)
+                except Exception as e:
+                    print(f"写入内存报告失败: {e}")
         
         # 处理完成后更新进度（在主线程中进行）
         self.root.after(0, self._update_progress, 100, "", 0, 0)
@@ -447,6 +613,100 @@ class PhotoFrameHelper:
         # 关闭进度条窗口
         self.root.after(1000, self._close_progress_window)
     
+    def _output_path(self, file_path, output_dir):
+        """
+        确定照片的输出路径，输出到子文件夹时创建子文件夹
+        
+        Returns:
+            tuple: (输出文件名, 输出路径)
+        """
+        filename = os.path.basename(file_path)
+        new_filename = f"framed_{filename}"
+        
+        if self.output_mode.get() == "指定目录":
+            # 输出到指定目录
+            return new_filename, os.path.join(output_dir, new_filename)
+        
+        # 输出到原始照片所在文件夹
+        file_dir = os.path.dirname(file_path)
+        if self.use_subfolder.get() and self.subfolder_var.get():
+            # 使用子文件夹
+            subfolder_name = self.subfolder_var.get()
+            output_path = os.path.join(file_dir, subfolder_name)
+            # 创建子文件夹（如果不存在）
+            if not os.path.exists(output_path):
+                os.makedirs(output_path)
+            return new_filename, os.path.join(output_path, new_filename)
+        # 直接输出到原始文件夹
+        return new_filename, os.path.join(file_dir, new_filename)
+    
+    def _process_isolated_photo(self, worker_pool, file_path, output_dir):
+        """
+        在隔离的工作进程中处理单张照片并保存
+        
+        Returns:
+            tuple: 成功时返回(输出文件名, 输出路径)，失败时返回None
+        """
+        try:
+            new_filename, new_file_path = self._output_path(file_path, output_dir)
+            task = RenderTask(file_path, new_file_path, self.template_var.get(), {
+                "frame_width": self.frame_width,
+                "frame_color": self.frame_color,
+                "selected_params": SELECTED_EXIF_PARAMS
+            })
+            worker_pool.run(task)
+        except QuarantinedError as e:
+            if self.metrics:
+                self.metrics.photo_failed(self.template_var.get(), e)
+            self.root.after(0, messagebox.showerror, "错误", f"处理图片 {file_path} 失败，已跳过并记入隔离清单: {e}")
+            return None
+        except Exception as e:
+            if self.metrics:
+                self.metrics.photo_failed(self.template_var.get(), e)
+            self.root.after(0, messagebox.showerror, "错误", f"处理图片 {file_path} 失败: {e}")
+            return None
+        if self.metrics:
+            self.metrics.photo_rendered(self.template_var.get())
+        return new_filename, new_file_path
+    
+    def _process_single_photo(self, file_path, output_dir):
+        """
+        处理单张照片并保存
+        
+        Returns:
+            tuple: 成功时返回(输出文件名, 输出路径)，失败时返回None
+        """
+        processed = None
+        try:
+            # 创建Photo对象封装照片信息，处理完成后关闭照片文件
+            with Photo(file_path) as photo:
+                photo.decode()
+                # 处理图片
+                new_img = self.process_image(photo)
+            if new_img and not self.is_cancelled:
+                # 确定输出路径
+                new_filename, new_file_path = self._output_path(file_path, output_dir)
+                
+                try:
+                    save_image(new_img, new_file_path, "JPEG")
+                    processed = (new_filename, new_file_path)
+                    if self.metrics:
+                        self.metrics.photo_rendered(self.template_var.get())
+                except Exception as e:
+                    if self.metrics:
+                        self.metrics.photo_failed(self.template_var.get(), e)
+                    # 错误信息在主线程中显示
+                    self.root.after(0, messagebox.showerror, "错误", f"保存图片失败: {e}")
+            # 画布归还给画布池，下一张相同尺寸的照片直接复用
+            release_canvas(new_img)
+        except Exception as e:
+            if self.metrics:
+                self.metrics.photo_failed(self.template_var.get(), e)
+            # 错误信息在主线程中显示
+            self.root.after(0, messagebox.showerror, "错误", f"处理图片 {file_path} 失败: {e}")
+        
+        return processed
+    
     def _update_progress(self, progress, filename, current, total):
         """在主线程中更新进度条和进度标签"""
         self.progress_var.set(progress)
@@ -466,8 +726,10 @@ class PhotoFrameHelper:
             self.progress_window.destroy()
     
     def cancel_batch_process(self):
-        """取消批量处理"""
+        """取消批量处理，正在处理的照片在下一个处理阶段中止"""
         self.is_cancelled = True
+        if self.batch:
+            self.batch.cancel()
         # 在主线程中更新UI
         self.root.after(0, self._update_cancel_ui)
     
@@ -478,15 +740,6 @@ class PhotoFrameHelper:
         if hasattr(self, 'cancel_button'):
             self.cancel_button.config(state=tk.DISABLED)
     
-    def check_processing_status(self):
-        """检查处理状态，更新进度条"""
-        if hasattr(self, 'process_thread') and self.process_thread.is_alive():
-            # 如果线程还在运行，继续检查
-            self.root.after(100, self.check_processing_status)
-        else:
-            # 线程已结束，不需要再检查
-            pass
-    
     def on_processed_item_double_click(self, event):
         """处理双击事件，打开对应的图片"""
         selection = self.processed_listbox.curselection()
@@ -543,28 +796,27 @@ class PhotoFrameHelper:
             # 清空画布
             self.preview_canvas.delete("all")
             
-            # 打开图片
-            image = Image.open(image_path)
-            
-            # 获取画布尺寸
-            canvas_width = self.preview_canvas.winfo_width()
-            canvas_height = self.preview_canvas.winfo_height()
+            # 打开图片，缩放后立即关闭文件
+            with Image.open(image_path) as image:
+                # 获取画布尺寸
+                canvas_width = self.preview_canvas.winfo_width()
+                canvas_height = self.preview_canvas.winfo_height()
             
-            # 调整图片大小以适应画布，保持比例
-            image_ratio = image.width / image.height
-            canvas_ratio = canvas_width / canvas_height
+                # 调整图片大小以适应画布，保持比例
+                image_ratio = image.width / image.height
+                canvas_ratio = canvas_width / canvas_height
             
-            if image_ratio > canvas_ratio:
-                # 图片更宽，按宽度缩放
-                new_width = canvas_width
-                new_height = int(new_width / image_ratio)
-            else:
-                # 图片更高，按高度缩放
-                new_height = canvas_height
-                new_width = int(new_height * image_ratio)
+                if image_ratio > canvas_ratio:
+                    # 图片更宽，按宽度缩放
+                    new_width = canvas_width
+                    new_height = int(new_width / image_ratio)
+                else:
+                    # 图片更高，按高度缩放
+                    new_height = canvas_height
+                    new_width = int(new_height * image_ratio)
             
-            # 缩放图片
-            resized_image = image.resize((new_width, new_height), Image.Resampling.LANCZOS)
+                # 缩放图片
+                resized_image = image.resize((new_width, new_height), Image.Resampling.LANCZOS)
             
             # 将PIL图片转换为tkinter兼容的格式
             tk_image = ImageTk.PhotoImage(resized_image)
@@ -583,6 +835,8 @@ class PhotoFrameHelper:
             messagebox.showerror("预览错误", f"无法预览图片: {str(e)}")
 
 if __name__ == "__main__":
+    # 打包后的程序启动隔离工作进程时需要
+    multiprocessing.freeze_support()
     root = tk.Tk()
     app = PhotoFrameHelper(root)
     root.mainloop()
@@ -5,7 +5,7 @@ a = Analysis(
     ['photo_frame_helper.py'],
     pathex=[],
     binaries=[],
-    datas=[('application.yml', '.'), ('template/impl', 'template/impl'), ('photo_frame_helper_logo.png', '.'), ('photo_frame_helper_logo_filleted.png', '.'), ('logo', 'logo')],
+    datas=[('application.yml', '.'), ('frame_templates.yml', '.'), ('template/impl', 'template/impl'), ('photo_frame_helper_logo.png', '.'), ('photo_frame_helper_logo_filleted.png', '.'), ('logo', 'logo')],
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},
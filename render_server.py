@@ -0,0 +1,68 @@
+"""
+本地HTTP渲染服务
+常驻进程，其他程序通过HTTP上传照片获取加好相框的JPEG，模板、字体和logo在请求之间保持预热
+
+用法:
+    python render_server.py --port 8765 --workers 2
+    python render_server.py --isolate --max-frame-mp 120    # 在独立的工作进程中渲染
+    curl --data-binary @photo.jpg "http://127.0.0.1:8765/render?template=白色底边" -o framed.jpg
+"""
+
+import argparse
+
+from config import config_manager
+from engine import RenderService, RenderServer
+from template import get_template_context
+from template.bottom_bar_template import render_cache_stats
+from utils.metrics import RenderMetrics
+
+
+def main():
+    server_config = config_manager.get_server_config()
+    parser = argparse.ArgumentParser(description="照片相框助手 - 本地HTTP渲染服务")
+    parser.add_argument("--host", default=server_config["host"], help="监听地址")
+    parser.add_argument("--port", type=int, default=server_config["port"], help="监听端口")
+    parser.add_argument("--workers", type=int, default=server_config["workers"], help="同时渲染的请求数")
+    parser.add_argument("--max-queue", type=int, default=server_config["max_queue"],
+                        help="等待渲染的请求数上限，超过时返回503")
+    parser.add_argument("--queue-timeout", type=float, default=server_config["queue_timeout"],
+                        help="排队等待的最长时间（秒），超时返回503")
+    parser.add_argument("--max-upload-mb", type=float, default=server_config["max_upload_mb"],
+                        help="上传照片的最大大小（MB）")
+    parser.add_argument("--template", "-t", choices=get_template_context().get_all_template_names(),
+                        default=config_manager.get_default_template(), help="请求未指定模板时使用的模板")
+    parser.add_argument("--isolate", action="store_true", default=server_config["isolate"],
+                        help="在独立的工作进程中渲染，渲染结果通过共享内存交给请求线程编码")
+    parser.add_argument("--max-frame-mp", type=float, default=server_config["max_frame_mp"],
+                        help="隔离模式下单张渲染结果的最大像素数（百万像素），决定共享内存的大小")
+    parser.add_argument("--render-timeout", type=float, default=server_config["render_timeout"],
+                        help="隔离模式下单张照片的渲染超时时间（秒），0表示不超时")
+    parser.add_argument("--no-metrics", action="store_true", help="不统计运行指标（/metrics）")
+    args = parser.parse_args()
+
+    metrics = None
+    if not args.no_metrics:
+        metrics = RenderMetrics(caches=render_cache_stats())
+        metrics.start()
+    service = RenderService(workers=args.workers, max_queue=args.max_queue, queue_timeout=args.queue_timeout,
+                            max_upload_bytes=int(args.max_upload_mb * 1024 * 1024), metrics=metrics,
+                            isolate=args.isolate, max_frame_pixels=int(args.max_frame_mp * 1_000_000),
+                            render_timeout=args.render_timeout or None)
+    print("预热模板...")
+    service.warm_up()
+
+    server = RenderServer(service, args.host, args.port, default_template=args.template)
+    print(f"渲染服务已启动: http://{args.host}:{server.port}/render（模板: {', '.join(service.template_names())}）")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n正在停止渲染服务...")
+    finally:
+        server.shutdown()
+        service.close()
+        if metrics:
+            metrics.stop()
+
+
+if __name__ == "__main__":
+    main()
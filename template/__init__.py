@@ -6,19 +6,22 @@
 import os
 import sys
 import importlib
+import logging
 from typing import List, Type
 
 from .frame_template import FrameTemplate
 from .template_context import get_template_context
 from config.config_manager import config_manager
 
+logger = logging.getLogger(__name__)
+
 # 获取资源文件的路径，支持PyInstaller打包后的情况
 def get_resource_path(relative_path):
     # 检查是否是PyInstaller打包后的环境
     if hasattr(sys, '_MEIPASS'):
         return os.path.join(sys._MEIPASS, relative_path)
-    # 如果是开发环境，直接返回相对路径
-    return os.path.join(os.path.abspath(""), relative_path)
+    # 如果是开发环境，返回相对于项目根目录的路径（与当前工作目录无关）
+    return os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), relative_path)
 
 # 获取模板实现目录路径
 # 在开发环境中使用相对路径，在PyInstaller打包后的环境中使用资源路径
@@ -37,22 +40,39 @@ try:
     # 导入黑底模板
     from .impl.black_bottom_template import BlackBottomTemplate
     _template_context.register_template(BlackBottomTemplate)
-    print("已注册模板: BlackBottomTemplate")
+    logger.info("已注册模板: BlackBottomTemplate")
 
-except Exception as e:
-    print(f"注册黑底模板失败: {e}")
-    import traceback
-    traceback.print_exc()
+except Exception:
+    logger.exception("注册黑底模板失败")
 
 try:
     # 导入白底模板
     from .impl.white_bottom_template import WhiteBottomTemplate
     _template_context.register_template(WhiteBottomTemplate)
-    print("已注册模板: WhiteBottomTemplate")
-except Exception as e:
-    print(f"注册白底模板失败: {e}")
-    import traceback
-    traceback.print_exc()
+    logger.info("已注册模板: WhiteBottomTemplate")
+except Exception:
+    logger.exception("注册白底模板失败")
+
+try:
+    # 导入模糊背景模板
+    from .impl.blurred_background_template import BlurredBackgroundTemplate
+    _template_context.register_template(BlurredBackgroundTemplate)
+    logger.info("已注册模板: BlurredBackgroundTemplate")
+except Exception:
+    logger.exception("注册模糊背景模板失败")
+
+try:
+    # 编译并注册声明式模板（frame_templates.yml），与已注册模板同名的跳过
+    from .spec_compiler import compile_template_specs
+    for template_class in compile_template_specs(get_resource_path(config_manager.get_template_spec_file())):
+        template_name = template_class().name
+        if template_name in _template_context.get_all_templates():
+            logger.warning("模板 %s 已存在，跳过同名的模板描述", template_name)
+            continue
+        _template_context.register_template(template_class)
+        logger.info("已注册模板: %s", template_class.__name__)
+except Exception:
+    logger.exception("注册声明式模板失败")
 
 
 # 导出常用的类和函数
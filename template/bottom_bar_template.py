@@ -0,0 +1,664 @@
+import logging
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from PIL import Image, ImageDraw
+from template.frame_template import FrameTemplate
+from entity.photo import Photo
+from utils.exif_format import format_exif_value, format_exposure_time
+from utils.canvas_pool import get_canvas_pool, release_canvas
+from utils.image_cache import ImageCache
+from utils.instrumentation import span
+from utils.text_measure import get_font, get_measure_cache, measure_text_width, fit_text_to_width
+from utils.text_sprite import draw_text_sprite, get_sprite_cache
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 信息横条缓存：连拍等场景下尺寸和EXIF展示内容相同的横条只渲染一次
+_bar_strip_cache = ImageCache(max_bytes=96 * 1024 * 1024)
+
+# logo缓存：保存调整颜色后的原始logo以及按高度缩放后的logo
+_logo_cache = ImageCache(max_bytes=16 * 1024 * 1024)
+
+
+def get_bar_strip_cache() -> ImageCache:
+    """
+    获取全局信息横条缓存
+
+    Returns:
+        ImageCache: 信息横条缓存
+    """
+    return _bar_strip_cache
+
+
+def get_logo_cache() -> ImageCache:
+    """
+    获取全局logo缓存
+
+    Returns:
+        ImageCache: logo缓存
+    """
+    return _logo_cache
+
+
+def render_cache_stats() -> Dict[str, Callable[[], Dict[str, int]]]:
+    """
+    获取模板渲染用到的各个缓存的命中统计函数，用于导出缓存命中率指标
+
+    Returns:
+        Dict[str, Callable[[], Dict[str, int]]]: 缓存名称 -> 返回hits、misses、entries的函数
+    """
+    def font_stats():
+        info = get_font.cache_info()
+        return {"hits": info.hits, "misses": info.misses, "entries": info.currsize}
+
+    return {
+        "fonts": font_stats,
+        "logos": _logo_cache.stats,
+        "bar_strips": _bar_strip_cache.stats,
+        "text_measure": get_measure_cache().stats,
+        "text_sprites": get_sprite_cache().stats,
+        "canvases": get_canvas_pool().stats
+    }
+
+
+@lru_cache(maxsize=8)
+def _list_logo_files(logo_dir: str) -> Tuple[str, ...]:
+    """
+    列出logo目录中的所有PNG文件（结果缓存，避免每张照片都扫描目录）
+
+    Args:
+        logo_dir: logo目录路径
+
+    Returns:
+        Tuple[str, ...]: logo文件名列表
+    """
+    return tuple(f for f in os.listdir(logo_dir) if f.endswith(".png"))
+
+
+@dataclass(frozen=True)
+class BarLayout:
+    """
+    信息横条的布局参数
+    比例均相对于照片高度或宽度，默认值即黑色底边和白色底边模板的布局；声明式模板（见template.spec_compiler）可以覆盖其中任意一项
+    """
+
+    # 横条高度，占照片高度的比例
+    bar_height: float = 0.08
+    # 左侧相机型号的字体、字号（占照片高度的比例）和最小字号
+    model_font: str = "Arial"
+    model_font_size: float = 0.03
+    model_font_min_size: int = 16
+    # 左侧镜头型号的字体、字号和最小字号
+    lens_font: str = "Arial"
+    lens_font_size: float = 0.02
+    lens_font_min_size: int = 12
+    # 右侧第一行（焦距、光圈、快门、ISO）的字体和字号
+    details_font: str = "Arial Bold"
+    details_font_size: float = 0.02
+    # 右侧第二行（拍摄时间）的字体和字号
+    time_font: str = "Arial"
+    time_font_size: float = 0.02
+    # 右侧文本框的最大宽度，占照片宽度的比例
+    max_text_width: float = 0.5
+    # 左右边距，占照片宽度的比例（横版和竖版/正方形分别设置）
+    landscape_margin: float = 0.02
+    portrait_margin: float = 0.01
+    # 右侧文本框和左侧文本框的高度，占横条高度的比例
+    text_box_height: float = 0.5
+    left_box_height: float = 0.625
+    # logo高度，占横条高度的比例
+    logo_height: float = 0.8
+    # logo、竖线和文本框之间的间距，占照片宽度的比例
+    spacing: float = 0.01
+    # 竖线高度（占横条高度的比例）和线宽（像素）
+    line_height: float = 0.5
+    line_width: int = 3
+    # 行间距（像素）
+    line_spacing: int = 5
+
+
+class BarPlan:
+    """
+    信息横条的布局方案
+    保存绘制横条所需的字体、文本和坐标，坐标均相对于横条左上角
+    """
+
+    def __init__(self, width: int, height: int):
+        """
+        初始化布局方案
+
+        Args:
+            width: 横条宽度（像素）
+            height: 横条高度（像素）
+        """
+        self.width = width
+        self.height = height
+        self.left_items: List[Tuple[Tuple[int, int], str, object]] = []
+        self.first_line: Optional[Tuple[Tuple[int, int], str, object]] = None
+        self.second_line: Optional[Tuple[Tuple[int, int], str, object]] = None
+        self.logo: Optional[Image.Image] = None
+        self.logo_position: Tuple[int, int] = (0, 0)
+        self.divider: Optional[Tuple[int, int, int]] = None
+        self.static_key: tuple = ()
+
+
+class BottomBarTemplate(FrameTemplate):
+    """
+    底部信息横条模板基类
+    在照片底部添加信息横条，左侧显示相机和镜头型号，右侧显示品牌logo和拍摄参数
+    子类只需指定横条的配色
+    """
+
+    # 横条背景色
+    BACKGROUND_COLOR = "black"
+    # 文字颜色
+    TEXT_COLOR = "white"
+    # logo与文字之间竖线的颜色
+    LINE_COLOR = "white"
+    # 需要根据背景色调整黑色logo颜色的背景色列表
+    LOGO_ADJUST_BACKGROUNDS = ["black", "#000000", "#000"]
+
+    # 是否只在照片下方追加横条：照片像素原样输出，可以分条渲染超大照片（见engine.strip_render）
+    APPEND_ONLY = True
+
+    # 固定显示的EXIF参数列表
+    SELECTED_PARAMS = ["相机型号", "镜头型号", "焦距", "光圈", "快门速度", "ISO", "拍摄时间"]
+
+    # 信息横条的布局参数
+    LAYOUT = BarLayout()
+
+    def create_frame(self, photo: Photo, frame_width: int = None, frame_color: str = None, **kwargs) -> Image.Image:
+        new_img = None
+        try:
+            # 获取已经处理好方向的图片
+            img = photo.img
+
+            # 计算信息横条布局（文本测量均有缓存）
+            with span("layout"):
+                plan = self.plan_bar(photo, img.width, img.height)
+
+            # 从画布池取出画布（包含底部横条），照片在顶部，横条在底部
+            # 照片和横条覆盖整块画布，复用的画布不需要填充
+            with span("compose"):
+                new_img = get_canvas_pool().acquire("RGB", (plan.width, img.height + plan.height))
+                new_img.paste(img, (0, 0))
+
+            # 粘贴缓存的横条，只重新绘制每张照片都不同的拍摄时间
+            with span("text"):
+                new_img.paste(self.render_static_bar(plan), (0, img.height))
+                self.draw_dynamic_text(new_img, plan, img.height)
+
+            return new_img
+        except Exception as e:
+            logger.error("处理图片失败: %s", e)
+            release_canvas(new_img)
+            raise
+        except BaseException:
+            # 在阶段边界取消或超时：画布同样归还给画布池，失败的照片不留下整帧画布
+            release_canvas(new_img)
+            raise
+
+    def plan_bar(self, photo: Photo, img_width: int, img_height: int) -> BarPlan:
+        """
+        计算信息横条的布局方案
+
+        Args:
+            photo: Photo对象，用于读取EXIF信息
+            img_width: 照片宽度（像素）
+            img_height: 照片高度（像素）
+
+        Returns:
+            BarPlan: 信息横条的布局方案
+        """
+        layout = self.LAYOUT
+
+        # 计算新尺寸（在照片底部添加信息横条）
+        frame_height = int(img_height * layout.bar_height)  # 默认为照片高度的8%
+        new_width = img_width
+        plan = BarPlan(new_width, frame_height)
+
+        # 为左下角文本框创建不同大小的字体
+        # 相机型号：默认为照片高度的3%，最小16像素
+        model_font_size = max(int(img_height * layout.model_font_size), layout.model_font_min_size)
+
+        # 镜头型号：默认为照片高度的2%，最小12像素
+        lens_font_size = max(int(img_height * layout.lens_font_size), layout.lens_font_min_size)
+
+        # 加载不同大小的字体（按字体名和字号缓存，加载失败时回退到默认字体）
+        model_font = get_font(layout.model_font, model_font_size)
+        lens_font = get_font(layout.lens_font, lens_font_size)
+
+        # 为右下角第一行创建字体：默认为照片高度的2%，加粗
+        right_first_line_font_size = int(img_height * layout.details_font_size)
+        right_first_line_font = get_font(layout.details_font, right_first_line_font_size)
+
+        # 为右下角第二行创建字体：默认为照片高度的2%，不加粗
+        right_second_line_font_size = int(img_height * layout.time_font_size)
+        right_second_line_font = get_font(layout.time_font, right_second_line_font_size)
+
+        # 收集并分组EXIF信息
+        left_texts, right_first_line, right_second_line = self._collect_exif_texts(photo)
+
+        # 检查相机品牌并加载对应的logo
+        camera_brand = self._detect_camera_brand(photo)
+
+        # 设置文字框宽度根据文本内容自适应，但最大不超过照片宽度的50%（默认）
+        max_allowed_width = int(new_width * layout.max_text_width)
+
+        # 计算两行文本的宽度（测量结果按字体和文本缓存）
+        first_line_text = "  ".join(right_first_line)
+        first_line_width = measure_text_width(right_first_line_font, first_line_text)
+        second_line_width = measure_text_width(right_second_line_font, right_second_line)
+
+        # 取两行中最宽的作为文本框宽度
+        text_box_width = max(first_line_width, second_line_width)
+
+        # 确保文本框宽度不超过最大允许宽度，并添加一些边距
+        text_box_width = min(text_box_width + 20, max_allowed_width)
+
+        # 根据照片构图类型设置不同的边距
+        if img_height > img_width or img_height == img_width:
+            # 竖版或正方形构图：边距默认为照片宽度的1%
+            margin = int(new_width * layout.portrait_margin)
+        else:
+            # 横版构图：边距默认为照片宽度的2%
+            margin = int(new_width * layout.landscape_margin)
+
+        # 1. 处理右下角文本框（焦距、光圈、快门、ISO、拍摄时间）
+        # 设置文字框右对齐的起始位置
+        text_box_x = new_width - text_box_width - margin
+
+        # 调整文本框高度为整个横条的50%（默认）并垂直居中
+        text_box_height = int(frame_height * layout.text_box_height)
+        text_box_y = int((frame_height - text_box_height) / 2)
+
+        # 右侧内容（logo或文本框）的最左边界，用于限制左下角文本的宽度
+        right_content_x = text_box_x
+
+        # 如果检测到支持的相机品牌，使用对应的logo
+        if camera_brand:
+            # logo高度默认为信息横条高度的80%
+            logo_height = int(frame_height * layout.logo_height)
+            try:
+                logo = self._get_scaled_logo(camera_brand, logo_height)
+            except Exception as e:
+                logger.warning("绘制%s logo失败: %s", camera_brand, e)
+                logo = None
+            if logo is not None:
+                # 按照片宽度的1%（默认）计算间距
+                spacing = int(new_width * layout.spacing)
+
+                # 从右往左计算各元素位置：文本框 -> 间距 -> 竖线 -> 间距 -> logo
+                # 竖线位置：文本框左侧 + 间距
+                line_x = text_box_x - spacing
+
+                # logo位置：竖线左侧 + 间距，垂直居中
+                logo_x = line_x - spacing - logo.width
+                logo_y = int((frame_height - logo_height) / 2)
+
+                plan.logo = logo
+                plan.logo_position = (logo_x, logo_y)
+
+                # 在logo和文本框之间添加竖线：高度默认为整个横条的50%，垂直居中
+                line_height = int(frame_height * layout.line_height)
+                line_center_y = frame_height // 2
+                plan.divider = (line_x, line_center_y - line_height // 2, line_center_y + line_height // 2)
+
+                right_content_x = logo_x
+
+        # 右下角文本框的EXIF信息，内容右对齐
+        y_offset = text_box_y
+
+        # 第一行：焦距、光圈、快门、ISO，用空格分隔
+        # 确保第一行文本不超过文字框宽度，超出时截断为能放下的最长文本并追加省略号
+        first_line_text = fit_text_to_width(right_first_line_font, first_line_text, text_box_width)
+        text_width = measure_text_width(right_first_line_font, first_line_text)
+        plan.first_line = ((text_box_x + text_box_width - text_width, y_offset), first_line_text, right_first_line_font)
+
+        # 下移到下一行
+        y_offset += right_first_line_font_size + layout.line_spacing  # 行间距默认为5像素
+
+        # 第二行：拍摄时间
+        if right_second_line:
+            second_line_text = fit_text_to_width(right_second_line_font, right_second_line, text_box_width)
+            text_width = measure_text_width(right_second_line_font, second_line_text)
+            plan.second_line = ((text_box_x + text_box_width - text_width, y_offset), second_line_text, right_second_line_font)
+
+        # 2. 处理左下角文本框（相机型号、镜头型号）
+        # 设置文字框左对齐的起始位置
+        left_box_x = margin
+
+        # 左下角文本的最大宽度：从左边距到右侧内容之间，并保留间距
+        left_box_max_width = max(right_content_x - int(new_width * layout.spacing) - left_box_x, 0)
+
+        # 计算左下角文本框高度为横条的62.5%（默认），并垂直居中
+        left_text_box_height = int(frame_height * layout.left_box_height)
+        left_box_y = (frame_height - left_text_box_height) // 2
+
+        # 计算文本垂直居中的起始y偏移
+        total_text_height = 0
+        for i, text in enumerate(left_texts):
+            if i == 0:  # 相机型号
+                total_text_height += model_font_size
+            else:  # 镜头型号及其他
+                total_text_height += lens_font_size
+            # 加上行间距（除了最后一行）
+            if i < len(left_texts) - 1:
+                total_text_height += layout.line_spacing
+
+        y_offset = left_box_y + (left_text_box_height - total_text_height) // 2
+
+        # 根据文本内容选择不同的字体大小
+        for i, text in enumerate(left_texts):
+            if i == 0:  # 相机型号
+                current_font = model_font
+                current_font_size = model_font_size
+            else:  # 镜头型号及其他
+                current_font = lens_font
+                current_font_size = lens_font_size
+
+            # 文本超过可用宽度时截断并追加省略号
+            fitted_text = fit_text_to_width(current_font, text, left_box_max_width)
+            plan.left_items.append(((left_box_x, y_offset), fitted_text, current_font))
+
+            # 下移到下一行
+            y_offset += current_font_size + layout.line_spacing
+
+        # 横条中除拍摄时间外的内容由以下输入唯一确定，作为横条缓存的键
+        # 拍摄时间只通过文本框宽度影响布局，因此用其宽度代替文本本身
+        plan.static_key = (
+            type(self).__name__, self.BACKGROUND_COLOR, self.TEXT_COLOR, self.LINE_COLOR, layout,
+            new_width, img_height, tuple(left_texts), first_line_text, second_line_width, camera_brand
+        )
+        return plan
+
+    def render_static_bar(self, plan: BarPlan) -> Image.Image:
+        """
+        渲染横条中不随照片变化的部分（背景、logo、竖线、相机参数），结果按布局缓存
+
+        返回的图片由缓存共享，调用方只能粘贴或复制，不应修改
+
+        Args:
+            plan: 信息横条的布局方案
+
+        Returns:
+            Image.Image: 信息横条图片
+        """
+        bar = _bar_strip_cache.get(plan.static_key)
+        if bar is not None:
+            return bar
+
+        bar = Image.new("RGB", (plan.width, plan.height), self.BACKGROUND_COLOR)
+        self.draw_static_content(bar, plan, 0)
+        _bar_strip_cache.put(plan.static_key, bar)
+        return bar
+
+    def render_bar_rows(self, plan: BarPlan, top: int, bottom: int) -> Image.Image:
+        """
+        渲染信息横条中第top到bottom行（不含）的部分，用于分条渲染超大照片，不经过横条缓存
+
+        Args:
+            plan: 信息横条的布局方案
+            top: 起始行（相对于横条顶部）
+            bottom: 结束行（不含）
+
+        Returns:
+            Image.Image: 宽度与横条相同、高度为bottom - top的图片
+        """
+        band = Image.new("RGB", (plan.width, bottom - top), self.BACKGROUND_COLOR)
+        self.draw_static_content(band, plan, -top)
+        self.draw_dynamic_text(band, plan, -top)
+        return band
+
+    def draw_static_content(self, image: Image.Image, plan: BarPlan, origin_y: int, origin_x: int = 0) -> None:
+        """
+        在目标图片上绘制横条的静态内容（logo、竖线、相机参数），不绘制背景
+
+        Args:
+            image: 目标图片
+            plan: 信息横条的布局方案
+            origin_y: 横条左上角在目标图片中的y坐标
+            origin_x: 横条左上角在目标图片中的x坐标
+        """
+        if plan.logo is not None:
+            logo_x, logo_y = plan.logo_position
+            image.paste(plan.logo, (origin_x + logo_x, origin_y + logo_y), plan.logo)
+
+        if plan.divider is not None:
+            # 绘制竖线，默认加粗为3像素
+            line_x, line_y_top, line_y_bottom = plan.divider
+            draw = ImageDraw.Draw(image)
+            draw.line([(origin_x + line_x, origin_y + line_y_top), (origin_x + line_x, origin_y + line_y_bottom)],
+                      fill=self.LINE_COLOR, width=self.LAYOUT.line_width)
+
+        # 文本通过精灵缓存粘贴，批量中重复出现的文本只光栅化一次
+        for (x, y), text, font in [plan.first_line] + plan.left_items:
+            draw_text_sprite(image, (origin_x + x, origin_y + y), text, font, self.TEXT_COLOR)
+
+    def draw_dynamic_text(self, image: Image.Image, plan: BarPlan, origin_y: int, origin_x: int = 0) -> None:
+        """
+        在目标图片上绘制横条中随照片变化的文本（拍摄时间）
+
+        Args:
+            image: 目标图片
+            plan: 信息横条的布局方案
+            origin_y: 横条左上角在目标图片中的y坐标
+            origin_x: 横条左上角在目标图片中的x坐标
+        """
+        if plan.second_line is not None:
+            (x, y), text, font = plan.second_line
+            draw_text_sprite(image, (origin_x + x, origin_y + y), text, font, self.TEXT_COLOR)
+
+    def _collect_exif_texts(self, photo: Photo) -> Tuple[List[str], List[str], str]:
+        """
+        收集并分组需要显示的EXIF文本
+
+        Args:
+            photo: Photo对象
+
+        Returns:
+            Tuple[List[str], List[str], str]: (左下角文本, 右下角第一行文本, 右下角第二行文本)
+        """
+        left_texts = []  # 左下角：相机型号、镜头型号
+        right_first_line = []  # 右下角第一行：焦距、光圈、快门、ISO
+        right_second_line = ""  # 右下角第二行：拍摄时间
+
+        for param in self.SELECTED_PARAMS:
+            # 将中文参数映射到EXIF标签
+            exif_tag = self._map_param_to_exif_tag(param)
+            value = photo.exif_data.get(exif_tag)
+            if value is None:
+                continue
+            # 根据参数类型进行格式化
+            if param == "相机型号" or param == "镜头型号":
+                # 左下角文本框内容
+                left_texts.append(f"{value}")
+            elif param == "拍摄时间":
+                # 拍摄时间保持原有格式
+                right_second_line = f"{value}"
+            else:
+                # 焦距、光圈、快门速度、ISO等使用统一的（带缓存的）格式化函数
+                right_first_line.append(format_exif_value(param, value))
+
+        return left_texts, right_first_line, right_second_line
+
+    def _get_scaled_logo(self, camera_brand: str, logo_height: int) -> Optional[Image.Image]:
+        """
+        获取缩放到指定高度的RGBA格式logo（结果缓存）
+
+        Args:
+            camera_brand: 相机品牌名称
+            logo_height: logo高度（像素）
+
+        Returns:
+            Optional[Image.Image]: 缩放后的logo，加载失败时返回None
+        """
+        if logo_height <= 0:
+            return None
+
+        with span("logo", brand=camera_brand):
+            return self._load_scaled_logo(camera_brand, logo_height)
+
+    def _load_scaled_logo(self, camera_brand: str, logo_height: int) -> Optional[Image.Image]:
+        """
+        从缓存获取缩放后的logo，未缓存时加载并缩放
+        """
+        scaled_key = ("scaled", camera_brand, self.BACKGROUND_COLOR, logo_height)
+        logo = _logo_cache.get(scaled_key)
+        if logo is not None:
+            return logo
+
+        # 调整颜色后的原始logo也缓存起来，不同尺寸的照片共享
+        source_key = ("source", camera_brand, self.BACKGROUND_COLOR)
+        source = _logo_cache.get(source_key)
+        if source is None:
+            source = self.get_camera_logo(camera_brand, self.BACKGROUND_COLOR)
+            if source is None:
+                return None
+            _logo_cache.put(source_key, source)
+
+        # 调整logo大小，保持宽高比
+        logo_width = int(source.width * (logo_height / source.height))
+        logo = source.resize((logo_width, logo_height), Image.Resampling.LANCZOS)
+
+        # 将logo转换为RGBA（如果不是的话）
+        if logo.mode != "RGBA":
+            logo = logo.convert("RGBA")
+        _logo_cache.put(scaled_key, logo)
+        return logo
+
+    def add_watermark(self, image: Image.Image, watermark_image: Image.Image,
+                     position: str = "bottom_right", opacity: float = 1.0, **kwargs) -> Image.Image:
+        # 默认实现，可根据需要自定义
+        try:
+            # 简单的水印实现
+            watermark = self.adjust_watermark_opacity(watermark_image, opacity)
+
+            # 如果有缩放比例参数，调整水印大小
+            if "scale" in kwargs:
+                watermark = self.resize_watermark(watermark, scale=kwargs["scale"])
+
+            # 获取水印位置
+            watermark_position = self.get_watermark_position(
+                image.size,
+                watermark.size,
+                position,
+                kwargs.get("margin", 20)
+            )
+
+            # 添加水印
+            image.paste(watermark, watermark_position, watermark)
+            return image
+        except Exception as e:
+            logger.warning("添加水印失败: %s", e)
+            return image
+
+    def _map_param_to_exif_tag(self, param):
+        """
+        将中文参数映射到EXIF标签
+        """
+        param_mapping = {
+            "相机型号": "Model",
+            "镜头型号": "LensModel",
+            "焦距": "FocalLength",
+            "光圈": "FNumber",
+            "快门速度": "ExposureTime",
+            "ISO": "ISOSpeedRatings",
+            "拍摄时间": "DateTimeOriginal",
+            "曝光补偿": "ExposureBiasValue"
+        }
+        return param_mapping.get(param, param)
+
+    def _decimal_to_fraction(self, decimal):
+        """
+        将小数转换为分数形式
+        """
+        return format_exposure_time(decimal)
+
+    def _detect_camera_brand(self, photo):
+        """
+        检测相机品牌
+        """
+        camera_brand = None
+        model = photo.exif_data.get("Model", "").lower()
+
+        # 获取logo文件夹中的所有品牌logo文件（目录列表有缓存）
+        logo_files = _list_logo_files(FrameTemplate.get_resource_path("logo"))
+
+        # 从文件名中提取品牌名称并检查是否匹配相机型号
+        for logo_file in logo_files:
+            # 提取品牌名称（去掉"_Logo.png"后缀）
+            brand_name = logo_file.replace("_Logo.png", "").lower()
+            # 检查相机型号中是否包含品牌名称
+            if brand_name in model:
+                camera_brand = brand_name
+                break
+
+        return camera_brand
+
+    def _find_logo_path(self, logo_filename: str) -> Optional[str]:
+        """
+        在logo目录中查找文件（文件名不区分大小写）
+
+        Args:
+            logo_filename: logo文件名
+
+        Returns:
+            Optional[str]: logo文件路径，不存在时返回None
+        """
+        logo_dir = FrameTemplate.get_resource_path("logo")
+        for logo_file in _list_logo_files(logo_dir):
+            if logo_file.lower() == logo_filename.lower():
+                return os.path.join(logo_dir, logo_file)
+        return None
+
+    def get_camera_logo(self, camera_brand: str, background_color: str, **kwargs) -> Optional[Image.Image]:
+        """
+        获取相机品牌的logo图像，支持根据背景色自动调整logo样式
+
+        Args:
+            camera_brand: 相机品牌名称（如"sony", "canon", "nikon"等）
+            background_color: 背景颜色，用于根据背景色调整logo样式
+            **kwargs: 额外参数（如logo大小、透明度等）
+
+        Returns:
+            Optional[Image.Image]: 处理后的logo图像，如果不支持该品牌则返回None
+        """
+        try:
+            # 首先尝试加载带_black后缀的logo文件
+            black_logo_path = self._find_logo_path(f"{camera_brand}_Logo_black.png")
+
+            # 如果存在黑色logo文件，则使用它
+            if black_logo_path:
+                logo_path = black_logo_path
+                is_black_logo = True
+            else:
+                # 否则使用普通logo文件
+                logo_path = self._find_logo_path(f"{camera_brand}_Logo.png")
+                is_black_logo = False
+
+            # 检查logo文件是否存在
+            if not logo_path:
+                logger.warning("相机品牌 %s 的logo文件不存在", camera_brand)
+                return None
+
+            # 加载logo图像，读取像素后立即关闭文件
+            with Image.open(logo_path) as opened:
+                logo = opened.copy()
+
+            # 根据背景色调整logo颜色
+            if background_color.lower() in self.LOGO_ADJUST_BACKGROUNDS:
+                logo = self.adjust_logo_color_for_background(logo, background_color, is_black_logo=is_black_logo)
+
+            # 如果有大小参数，调整logo大小
+            if "size" in kwargs:
+                logo = self.resize_logo(logo, size=kwargs["size"])
+            elif "scale" in kwargs:
+                logo = self.resize_logo(logo, scale=kwargs["scale"])
+
+            return logo
+        except Exception as e:
+            logger.warning("获取相机品牌 %s 的logo失败: %s", camera_brand, e)
+            return None
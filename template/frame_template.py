@@ -2,6 +2,7 @@ from abc import ABC, abstractmethod
 from PIL import Image
 from entity.photo import Photo
 from typing import Dict, Any, Optional, List, Tuple, Union
+from utils.instrumentation import span
 import os
 import sys
 
@@ -32,8 +33,8 @@ class FrameTemplate(ABC):
         # 检查是否是PyInstaller打包后的环境
         if hasattr(sys, '_MEIPASS'):
             return os.path.join(sys._MEIPASS, relative_path)
-        # 如果是开发环境，直接返回相对路径
-        return os.path.join(os.path.abspath(""), relative_path)
+        # 如果是开发环境，返回相对于项目根目录的路径（与当前工作目录无关）
+        return os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), relative_path)
     
     @abstractmethod
     def create_frame(self, photo: Photo, frame_width: int, frame_color: str, **kwargs) -> Image.Image:
@@ -51,6 +52,24 @@ class FrameTemplate(ABC):
         """
         pass
     
+    def render(self, photo: Photo, **params) -> Image.Image:
+        """
+        生成带相框的图片，依次调用before_create_frame、create_frame和after_create_frame钩子
+        
+        批量处理（GUI和命令行）都通过该方法调用模板，便于在钩子中扩展处理逻辑和统计耗时
+        
+        Args:
+            photo: Photo对象
+            **params: 相框参数（frame_width、frame_color、selected_params等）
+            
+        Returns:
+            Image.Image: 添加相框后的图片对象
+        """
+        params = self.before_create_frame(photo, params)
+        with span("create_frame", template=self.name):
+            framed_image = self.create_frame(photo=photo, **params)
+        return self.after_create_frame(photo, framed_image, params)
+    
     @property
     @abstractmethod
     def name(self) -> str:
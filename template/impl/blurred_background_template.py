@@ -0,0 +1,133 @@
+from functools import lru_cache
+from typing import Tuple
+
+from PIL import Image, ImageFilter
+
+from entity.photo import Photo
+from template.bottom_bar_template import BottomBarTemplate
+from utils.canvas_pool import get_canvas_pool, release_canvas
+from utils.instrumentation import span
+
+# 背景在缩小后模糊：缩小后的长边约为该像素数，模糊和调暗都在小图上完成，再放大到画布尺寸
+BACKGROUND_BASE_SIZE = 256
+# 模糊半径占缩小后背景长边的比例
+BLUR_RADIUS_RATIO = 0.04
+# 背景亮度（调暗后文字更清楚）
+BACKGROUND_BRIGHTNESS = 0.6
+# 照片四周留出的模糊背景宽度，占照片短边的比例
+MARGIN_RATIO = 0.06
+
+# 调暗背景的查找表（RGB三个通道）
+_DIM_TABLE = [int(value * BACKGROUND_BRIGHTNESS) for value in range(256)] * 3
+
+
+@lru_cache(maxsize=16)
+def _blur_filter(radius: int) -> ImageFilter.GaussianBlur:
+    """
+    获取指定半径的高斯模糊滤镜（按半径缓存）
+    """
+    return ImageFilter.GaussianBlur(radius)
+
+
+@lru_cache(maxsize=64)
+def _background_geometry(photo_size: Tuple[int, int], canvas_size: Tuple[int, int]):
+    """
+    计算背景的缩小倍数、小图中铺满画布的裁剪区域和模糊半径（按照片和画布尺寸缓存）
+
+    Args:
+        photo_size: 照片尺寸
+        canvas_size: 画布尺寸
+
+    Returns:
+        tuple: (缩小倍数, 裁剪区域, 模糊滤镜)
+    """
+    factor = max(1, max(photo_size) // BACKGROUND_BASE_SIZE)
+    small_width = -(-photo_size[0] // factor)
+    small_height = -(-photo_size[1] // factor)
+
+    # 按画布宽高比从小图中间裁剪，放大后铺满画布
+    canvas_ratio = canvas_size[0] / canvas_size[1]
+    if small_width / small_height > canvas_ratio:
+        crop_width, crop_height = max(1, round(small_height * canvas_ratio)), small_height
+    else:
+        crop_width, crop_height = small_width, max(1, round(small_width / canvas_ratio))
+    left = (small_width - crop_width) // 2
+    top = (small_height - crop_height) // 2
+    radius = max(1, round(max(small_width, small_height) * BLUR_RADIUS_RATIO))
+    return factor, (left, top, left + crop_width, top + crop_height), _blur_filter(radius)
+
+
+class BlurredBackgroundTemplate(BottomBarTemplate):
+    # 照片放在用自身模糊放大后的背景上，四周留出模糊背景，信息横条直接绘制在照片下方的背景上
+    # 背景调暗后使用白色文字；logo按黑色背景调整颜色
+    BACKGROUND_COLOR = "black"
+    TEXT_COLOR = "white"
+    LINE_COLOR = "white"
+    LOGO_ADJUST_BACKGROUNDS = ["black", "#000000", "#000"]
+    # 照片四周有背景，不能分条渲染
+    APPEND_ONLY = False
+
+    @property
+    def name(self):
+        return "模糊背景"
+
+    @property
+    def description(self):
+        return "以照片模糊后的画面作为背景，照片居中，下方显示相机参数和拍摄信息"
+
+    def create_frame(self, photo: Photo, frame_width: int = None, frame_color: str = None, **kwargs) -> Image.Image:
+        img = photo.img
+        margin = int(min(img.width, img.height) * MARGIN_RATIO)
+
+        # 横条与照片等宽，位于照片下方
+        with span("layout"):
+            plan = self.plan_bar(photo, img.width, img.height)
+        canvas_size = (img.width + 2 * margin, margin + img.height + plan.height)
+
+        canvas = None
+        try:
+            with span("compose"):
+                canvas = get_canvas_pool().acquire("RGB", canvas_size)
+                photo_box = (margin, margin, margin + img.width, margin + img.height)
+                self.paint_background(canvas, img, photo_box)
+                canvas.paste(img, (margin, margin))
+
+            # 横条没有背景色，文字、logo和竖线直接绘制在模糊背景上（文本精灵和logo仍然使用缓存）
+            with span("text"):
+                self.draw_static_content(canvas, plan, margin + img.height, margin)
+                self.draw_dynamic_text(canvas, plan, margin + img.height, margin)
+            return canvas
+        except BaseException:
+            # 失败、取消或超时时画布归还给画布池，不留下整帧画布
+            release_canvas(canvas)
+            raise
+
+    def paint_background(self, canvas: Image.Image, img: Image.Image, photo_box: Tuple[int, int, int, int]) -> None:
+        """
+        在画布上绘制模糊背景：缩小照片，在小图上裁剪、模糊和调暗，再只把照片周围露出的部分放大到画布上
+
+        全分辨率高斯模糊在45MP照片上需要数秒；小图上模糊的耗时可以忽略，
+        照片会覆盖画布中间的大部分区域，只放大四周的背景，耗时与粘贴照片相当
+
+        Args:
+            canvas: 画布
+            img: 已处理方向的照片
+            photo_box: 照片在画布中的位置(左, 上, 右, 下)
+        """
+        factor, crop_box, blur = _background_geometry(img.size, canvas.size)
+        source = img if img.mode in ("RGB", "RGBA", "L") else img.convert("RGB")
+        small = source.reduce(factor) if factor > 1 else source
+        small = small.convert("RGB").crop(crop_box).filter(blur).point(_DIM_TABLE)
+
+        # 背景的上、下、左、右四块，按画布坐标到小图坐标的比例从小图中取对应区域放大
+        width, height = canvas.size
+        left, top, right, bottom = photo_box
+        scale_x = small.width / width
+        scale_y = small.height / height
+        for x0, y0, x1, y1 in ((0, 0, width, top), (0, bottom, width, height),
+                               (0, top, left, bottom), (right, top, width, bottom)):
+            if x1 <= x0 or y1 <= y0:
+                continue
+            piece = small.resize((x1 - x0, y1 - y0), Image.Resampling.BICUBIC,
+                                 box=(x0 * scale_x, y0 * scale_y, x1 * scale_x, y1 * scale_y))
+            canvas.paste(piece, (x0, y0))
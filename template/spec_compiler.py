@@ -0,0 +1,241 @@
+"""
+声明式相框模板
+在frame_templates.yml（与application.yml放在一起）中用配色、字体、布局比例和显示的EXIF参数描述底边模板，
+加载时编译为BottomBarTemplate的子类：布局、字体、logo和文本精灵都走底边模板共享的缓存路径，
+新样式不需要编写和导入Python代码。
+
+模板描述示例:
+    templates:
+      - class_name: "GrayBottomTemplate"    # 类名，用于日志、参考图片和耗时预算
+        name: "灰色底边"
+        description: "在照片底部添加灰色信息横条"
+        colors:
+          background: "#3a3a3a"
+          text: "#f2f2f2"
+          line: "#f2f2f2"
+        fonts:                               # 字号为照片高度的比例
+          model: {family: "Arial", size: 0.03, min_size: 16}
+          details: {family: "Arial Bold", size: 0.02}
+        layout:                              # 横条高度、边距等比例，见BarLayout
+          bar_height: 0.1
+        fields: ["相机型号", "镜头型号", "焦距", "光圈", "快门速度", "ISO", "拍摄时间"]
+
+未写出的字体和布局参数使用黑色底边模板的默认值。
+"""
+
+import dataclasses
+import logging
+import os
+from typing import Any, Dict, List, Type
+
+import yaml
+from PIL import ImageColor
+
+from template.bottom_bar_template import BarLayout, BottomBarTemplate
+
+logger = logging.getLogger(__name__)
+
+# 可以显示的EXIF参数
+SUPPORTED_FIELDS = ("相机型号", "镜头型号", "焦距", "光圈", "快门速度", "ISO", "拍摄时间", "曝光补偿")
+
+# 字体角色 -> BarLayout中(字体名称, 字号比例, 最小字号)字段
+_FONT_ROLES = {
+    "model": ("model_font", "model_font_size", "model_font_min_size"),
+    "lens": ("lens_font", "lens_font_size", "lens_font_min_size"),
+    "details": ("details_font", "details_font_size", None),
+    "time": ("time_font", "time_font_size", None)
+}
+
+# 不在layout中设置的BarLayout字段（通过fonts设置）
+_FONT_FIELDS = {field for fields in _FONT_ROLES.values() for field in fields if field}
+
+_SPEC_KEYS = {"class_name", "name", "description", "colors", "logo_adjust", "fonts", "layout", "fields"}
+
+
+class TemplateSpecError(ValueError):
+    """
+    模板描述无效
+    """
+
+
+def load_template_specs(path: str) -> List[Dict[str, Any]]:
+    """
+    读取模板描述文件
+
+    Args:
+        path: 模板描述文件路径
+
+    Returns:
+        List[Dict[str, Any]]: 模板描述列表，文件不存在时返回空列表
+
+    Raises:
+        TemplateSpecError: 文件格式错误
+    """
+    if not os.path.exists(path):
+        logger.debug("模板描述文件不存在: %s", path)
+        return []
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            document = yaml.safe_load(f) or {}
+    except yaml.YAMLError as e:
+        raise TemplateSpecError(f"解析模板描述文件失败: {e}") from e
+
+    specs = document.get("templates") if isinstance(document, dict) else None
+    if specs is None:
+        return []
+    if not isinstance(specs, list):
+        raise TemplateSpecError("模板描述文件中的templates必须是列表")
+    return specs
+
+
+def _check_mapping(value: Any, what: str, allowed) -> Dict[str, Any]:
+    """
+    检查模板描述中的一项是字典，且只包含允许的键
+    """
+    if value is None:
+        return {}
+    if not isinstance(value, dict):
+        raise TemplateSpecError(f"{what}必须是字典")
+    unknown = sorted(set(value) - set(allowed))
+    if unknown:
+        raise TemplateSpecError(f"{what}中有未知的参数: {', '.join(map(str, unknown))}")
+    return value
+
+
+def _check_color(value: Any, what: str) -> str:
+    """
+    检查颜色能被Pillow识别
+    """
+    if not isinstance(value, str):
+        raise TemplateSpecError(f"{what}必须是颜色字符串")
+    try:
+        ImageColor.getrgb(value)
+    except ValueError as e:
+        raise TemplateSpecError(f"{what}不是有效的颜色: {value}") from e
+    return value
+
+
+def _check_layout_value(field: dataclasses.Field, value: Any, what: str):
+    """
+    按BarLayout字段的类型检查布局参数：字体名称为非空字符串，比例为正数，像素值为非负整数
+    """
+    if field.type in (str, "str"):
+        if not isinstance(value, str) or not value:
+            raise TemplateSpecError(f"{what}必须是字体名称或字体文件路径")
+        return value
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise TemplateSpecError(f"{what}必须是数字")
+    if field.type in (int, "int"):
+        if value != int(value) or value < 0:
+            raise TemplateSpecError(f"{what}必须是非负整数")
+        return int(value)
+    if value <= 0:
+        raise TemplateSpecError(f"{what}必须大于0")
+    return float(value)
+
+
+def _compile_layout(spec: Dict[str, Any], name: str) -> BarLayout:
+    """
+    把模板描述中的字体和布局参数编译为BarLayout
+    """
+    layout_fields = {field.name: field for field in dataclasses.fields(BarLayout)}
+    values = {}
+
+    layout = _check_mapping(spec.get("layout"), f"模板 {name} 的layout", set(layout_fields) - _FONT_FIELDS)
+    for key, value in layout.items():
+        values[key] = _check_layout_value(layout_fields[key], value, f"模板 {name} 的layout.{key}")
+
+    fonts = _check_mapping(spec.get("fonts"), f"模板 {name} 的fonts", _FONT_ROLES)
+    for role, font in fonts.items():
+        family_field, size_field, min_size_field = _FONT_ROLES[role]
+        allowed = {"family", "size", "min_size"} if min_size_field else {"family", "size"}
+        font = _check_mapping(font, f"模板 {name} 的fonts.{role}", allowed)
+        for key, field_name in (("family", family_field), ("size", size_field), ("min_size", min_size_field)):
+            if key in font:
+                values[field_name] = _check_layout_value(layout_fields[field_name], font[key],
+                                                         f"模板 {name} 的fonts.{role}.{key}")
+    return BarLayout(**values)
+
+
+def compile_template_spec(spec: Dict[str, Any]) -> Type[BottomBarTemplate]:
+    """
+    把一个模板描述编译为底边模板类
+
+    编译只在加载时进行一次：配色、布局和EXIF参数成为类属性，渲染时与Python编写的底边模板走同一条路径
+
+    Args:
+        spec: 模板描述
+
+    Returns:
+        Type[BottomBarTemplate]: 模板类，可以直接注册到模板上下文
+
+    Raises:
+        TemplateSpecError: 模板描述无效
+    """
+    if not isinstance(spec, dict):
+        raise TemplateSpecError("模板描述必须是字典")
+    name = spec.get("name")
+    if not isinstance(name, str) or not name.strip():
+        raise TemplateSpecError("模板描述缺少name")
+    unknown = sorted(set(spec) - _SPEC_KEYS)
+    if unknown:
+        raise TemplateSpecError(f"模板 {name} 中有未知的参数: {', '.join(map(str, unknown))}")
+
+    class_name = spec.get("class_name")
+    if not isinstance(class_name, str) or not class_name.isidentifier():
+        raise TemplateSpecError(f"模板 {name} 的class_name必须是有效的类名")
+    description = spec.get("description", "")
+    if not isinstance(description, str):
+        raise TemplateSpecError(f"模板 {name} 的description必须是字符串")
+
+    colors = _check_mapping(spec.get("colors"), f"模板 {name} 的colors", {"background", "text", "line"})
+    if "background" not in colors or "text" not in colors:
+        raise TemplateSpecError(f"模板 {name} 的colors需要指定background和text")
+    background = _check_color(colors["background"], f"模板 {name} 的背景色")
+    text = _check_color(colors["text"], f"模板 {name} 的文字颜色")
+    line = _check_color(colors.get("line", text), f"模板 {name} 的竖线颜色")
+
+    # 与黑色底边和白色底边模板一致，默认按背景色调整黑色logo的颜色
+    logo_adjust = spec.get("logo_adjust", True)
+    if not isinstance(logo_adjust, bool):
+        raise TemplateSpecError(f"模板 {name} 的logo_adjust必须是true或false")
+
+    fields = spec.get("fields", BottomBarTemplate.SELECTED_PARAMS)
+    if not isinstance(fields, list) or not fields:
+        raise TemplateSpecError(f"模板 {name} 的fields必须是非空列表")
+    unsupported = [field for field in fields if field not in SUPPORTED_FIELDS]
+    if unsupported:
+        raise TemplateSpecError(f"模板 {name} 的fields中有不支持的参数: {', '.join(map(str, unsupported))}")
+
+    attributes = {
+        "__module__": __name__,
+        "__doc__": f"由模板描述编译的底边模板: {name}",
+        "BACKGROUND_COLOR": background,
+        "TEXT_COLOR": text,
+        "LINE_COLOR": line,
+        "LOGO_ADJUST_BACKGROUNDS": [background.lower()] if logo_adjust else [],
+        "SELECTED_PARAMS": list(fields),
+        "LAYOUT": _compile_layout(spec, name),
+        "name": property(lambda self: name),
+        "description": property(lambda self: description)
+    }
+    return type(class_name, (BottomBarTemplate,), attributes)
+
+
+def compile_template_specs(path: str) -> List[Type[BottomBarTemplate]]:
+    """
+    读取模板描述文件并编译其中的所有模板，无效的模板记录错误后跳过
+
+    Args:
+        path: 模板描述文件路径
+
+    Returns:
+        List[Type[BottomBarTemplate]]: 编译得到的模板类
+    """
+    template_classes = []
+    for index, spec in enumerate(load_template_specs(path)):
+        try:
+            template_classes.append(compile_template_spec(spec))
+        except TemplateSpecError as e:
+            logger.error("跳过第%d个模板描述: %s", index + 1, e)
+    return template_classes
@@ -68,6 +68,15 @@ class TemplateContext:
         """
         return list(self._templates.keys())
     
+    def get_default_template_name(self) -> Optional[str]:
+        """
+        获取默认模板名称
+        
+        返回:
+            默认模板名称，如果没有设置则返回None
+        """
+        return self._default_template_name
+    
     def get_default_template(self) -> Optional[FrameTemplate]:
         """
         获取默认模板实例
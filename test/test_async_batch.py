@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+asyncio批量处理的单元测试
+测试结果流、取消在阶段边界生效、单张超时以及提前结束迭代
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+import unittest
+
+# 将项目根目录添加到Python路径
+sys.path.insert(0, os.path.dirname(os.path.abspath(os.path.join(__file__, ".."))))
+
+from engine.async_batch import AsyncBatch, ItemCancelled, check_cancelled
+from utils.instrumentation import span, is_enabled
+
+
+def collect(batch):
+    """
+    运行批量处理并收集全部结果
+    """
+    async def run():
+        return [result async for result in batch]
+    return asyncio.run(run())
+
+
+class TestAsyncBatch(unittest.TestCase):
+    """
+    测试asyncio批量处理
+    """
+
+    def test_results_and_errors(self):
+        """
+        测试每项返回一个结果，处理函数的异常作为error结果返回
+        """
+        def func(item):
+            if item == 2:
+                raise ValueError("bad item")
+            with span("work"):
+                return item * 10
+
+        results = collect(AsyncBatch(func, range(4), concurrency=2))
+        by_index = {result.index: result for result in results}
+        self.assertEqual(sorted(by_index), [0, 1, 2, 3])
+        self.assertEqual(by_index[3].value, 30)
+        self.assertEqual(by_index[2].status, "error")
+        self.assertIsInstance(by_index[2].error, ValueError)
+        # 批次结束后移除取消检查收集器
+        self.assertFalse(is_enabled())
+
+    def test_cancel_takes_effect_at_next_stage(self):
+        """
+        测试取消后正在处理的项在下一个阶段边界中止，未开始的项不再处理
+        """
+        entered = threading.Event()
+        release = threading.Event()
+        stages = []
+
+        def func(item):
+            with span("first"):
+                stages.append((item, "first"))
+                entered.set()
+                release.wait(5)
+            with span("second"):
+                stages.append((item, "second"))
+            return item
+
+        batch = AsyncBatch(func, range(3))
+
+        async def run():
+            results = []
+            iterator = batch.__aiter__()
+            task = asyncio.ensure_future(iterator.__anext__())
+            await asyncio.get_running_loop().run_in_executor(None, entered.wait, 5)
+            batch.cancel()
+            release.set()
+            results.append(await task)
+            results.extend([result async for result in iterator])
+            return results
+
+        results = asyncio.run(run())
+        self.assertEqual([result.status for result in results], ["cancelled"])
+        self.assertEqual(stages, [(0, "first")])
+
+    def test_timeout_returns_early_and_aborts_worker(self):
+        """
+        测试超时的项立即返回timeout结果，处理线程在下一个阶段边界中止
+        """
+        finished_stages = []
+
+        def func(item):
+            for index in range(10):
+                with span("slow"):
+                    time.sleep(0.05)
+                finished_stages.append(index)
+            return item
+
+        start = time.monotonic()
+        results = collect(AsyncBatch(func, ["photo"], timeout=0.12))
+        self.assertLess(time.monotonic() - start, 0.4)
+        self.assertEqual(results[0].status, "timeout")
+        self.assertIsInstance(results[0].error, ItemCancelled)
+        time.sleep(0.15)
+        self.assertLess(len(finished_stages), 10)
+
+    def test_slow_item_does_not_time_out_queued_items(self):
+        """
+        测试超时的项占用处理线程时，排队的项从开始处理时计算超时，不会跟着超时
+        """
+        def func(item):
+            time.sleep(1.0 if item == 0 else 0.05)
+            return item
+
+        results = collect(AsyncBatch(func, range(4), timeout=0.4))
+        self.assertEqual([(result.index, result.status) for result in results],
+                         [(0, "timeout"), (1, "ok"), (2, "ok"), (3, "ok")])
+        for result in results[1:]:
+            self.assertLess(result.elapsed, 0.3)
+
+    def test_cancel_is_not_swallowed_by_broad_except(self):
+        """
+        测试取消异常不会被处理函数中捕获Exception的代码吞掉
+        """
+        def func(item):
+            batch.cancel()
+            try:
+                with span("stage"):
+                    pass
+            except Exception:
+                return "swallowed"
+            return "done"
+
+        batch = AsyncBatch(func, [1, 2])
+        results = collect(batch)
+        self.assertEqual([result.status for result in results], ["cancelled"])
+
+    def test_check_cancelled_outside_batch(self):
+        """
+        测试不在批量处理中调用check_cancelled时不抛出异常
+        """
+        check_cancelled()
+
+    def test_breaking_out_cancels_in_flight_items(self):
+        """
+        测试调用方提前结束迭代时中止正在处理的项
+        """
+        started = threading.Event()
+        aborted = threading.Event()
+
+        def func(item):
+            if item == 0:
+                started.wait(5)
+                return item
+            started.set()
+            try:
+                for _ in range(100):
+                    with span("stage"):
+                        time.sleep(0.01)
+            except ItemCancelled:
+                aborted.set()
+                raise
+            return item
+
+        async def run():
+            async for result in AsyncBatch(func, range(2), concurrency=2):
+                if result.index == 0:
+                    break
+
+        asyncio.run(run())
+        self.assertTrue(aborted.wait(2))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
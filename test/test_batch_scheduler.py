@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+批处理调度工具的单元测试
+测试照片按相机和尺寸分组，以及结果按原始顺序输出
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from PIL import Image
+
+# 将项目根目录添加到Python路径
+sys.path.insert(0, os.path.dirname(os.path.abspath(os.path.join(__file__, ".."))))
+
+from utils.batch_scheduler import read_schedule_key, schedule_batch, ResultReorderBuffer
+
+
+def save_test_photo(path, size, model, orientation=1):
+    """
+    生成带相机型号和方向信息的测试照片
+    """
+    exif = Image.Exif()
+    exif[0x0110] = model
+    exif[0x0112] = orientation
+    Image.new("RGB", size, "gray").save(path, exif=exif)
+
+
+class TestBatchScheduler(unittest.TestCase):
+    """
+    测试批处理调度工具的功能
+    """
+
+    def setUp(self):
+        """
+        设置测试环境
+        """
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        """
+        清理测试环境
+        """
+        self.temp_dir.cleanup()
+
+    def photo_path(self, name):
+        """
+        获取临时目录中的照片路径
+        """
+        return os.path.join(self.temp_dir.name, name)
+
+    def test_schedule_groups_by_camera_and_size(self):
+        """
+        测试相同相机和尺寸的照片排在一起，组内保持原始顺序
+        """
+        specs = [("Camera B", (64, 48)), ("Camera A", (64, 48)), ("Camera B", (64, 48)), ("Camera A", (64, 48))]
+        paths = []
+        for i, (model, size) in enumerate(specs):
+            path = self.photo_path(f"{i}.jpg")
+            save_test_photo(path, size, model)
+            paths.append(path)
+
+        self.assertEqual(schedule_batch(paths, "黑色底边"), [1, 3, 0, 2])
+
+    def test_schedule_key_uses_corrected_orientation(self):
+        """
+        测试需要旋转的照片按旋转后的尺寸分组
+        """
+        path = self.photo_path("rotated.jpg")
+        save_test_photo(path, (64, 48), "Camera A", orientation=6)
+        self.assertEqual(read_schedule_key(path)[1], (48, 64))
+
+    def test_unreadable_file_is_still_scheduled(self):
+        """
+        测试无法读取的文件仍然保留在处理顺序中
+        """
+        path = self.photo_path("broken.jpg")
+        with open(path, "wb") as f:
+            f.write(b"not a jpeg")
+        self.assertEqual(schedule_batch([path]), [0])
+
+    def test_reorder_buffer_emits_in_original_order(self):
+        """
+        测试结果重排缓冲区按原始顺序输出
+        """
+        buffer = ResultReorderBuffer()
+        self.assertEqual(buffer.add(2, "c"), [])
+        self.assertEqual(buffer.add(0, "a"), [(0, "a")])
+        self.assertEqual(buffer.add(1, "b"), [(1, "b"), (2, "c")])
+        buffer.add(5, "f")
+        self.assertEqual(buffer.flush(), [(5, "f")])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
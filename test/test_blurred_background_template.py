@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+模糊背景模板的单元测试
+测试输出尺寸和照片位置、只放大露出部分的背景与整张放大一致，以及该模板不能分条渲染
+"""
+
+import io
+import os
+import sys
+import tempfile
+import unittest
+
+from PIL import Image, ImageChops
+
+# 将项目根目录添加到Python路径
+sys.path.insert(0, os.path.dirname(os.path.abspath(os.path.join(__file__, ".."))))
+
+from engine.strip_render import StripUnsupported, render_strips
+from entity.photo import Photo
+from template import get_template_context
+from template.impl.blurred_background_template import MARGIN_RATIO, _DIM_TABLE, _background_geometry
+from utils.canvas_pool import release_canvas
+from benchmark.synthetic_corpus import generate_photo, CAMERAS
+
+
+class TestBlurredBackgroundTemplate(unittest.TestCase):
+    """
+    测试模糊背景模板
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """
+        生成带EXIF的测试照片
+        """
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        cls.photo_path = os.path.join(cls.temp_dir.name, "photo.jpg")
+        generate_photo(cls.photo_path, (900, 600), index=2, camera=CAMERAS[1])
+        cls.template = get_template_context().get_template("模糊背景")
+
+    @classmethod
+    def tearDownClass(cls):
+        """
+        清理测试环境
+        """
+        cls.temp_dir.cleanup()
+
+    def render(self):
+        with Photo(self.photo_path) as photo:
+            photo.decode()
+            photo.fix_orientation()
+            return photo.img.copy(), self.template.create_frame(photo)
+
+    def test_layout(self):
+        """
+        测试照片四周留出背景，照片原样放在画布中，下方有信息横条
+        """
+        img, framed = self.render()
+        margin = int(min(img.size) * MARGIN_RATIO)
+        self.assertEqual(framed.width, img.width + 2 * margin)
+        self.assertGreater(framed.height, img.height + 2 * margin)
+        placed = framed.crop((margin, margin, margin + img.width, margin + img.height))
+        self.assertIsNone(ImageChops.difference(placed, img.convert("RGB")).getbbox())
+        # 背景经过调暗，不会出现纯白
+        corner = framed.crop((0, 0, margin, margin))
+        self.assertLess(max(high for _, high in corner.getextrema()), 255)
+        release_canvas(framed)
+
+    def test_background_matches_full_resize(self):
+        """
+        测试只放大露出部分的背景与把整张背景放大到画布尺寸的结果一致
+        """
+        img, framed = self.render()
+        factor, crop_box, blur = _background_geometry(img.size, framed.size)
+        small = img.convert("RGB").reduce(factor).crop(crop_box).filter(blur).point(_DIM_TABLE)
+        expected = small.resize(framed.size, Image.Resampling.BICUBIC)
+
+        margin = int(min(img.size) * MARGIN_RATIO)
+        for box in ((0, 0, framed.width, margin), (0, margin, margin, margin + img.height)):
+            with self.subTest(box=box):
+                difference = ImageChops.difference(framed.crop(box), expected.crop(box))
+                # 分块放大在边缘处的取样略有差别
+                self.assertLessEqual(max(high for _, high in difference.getextrema()), 2)
+        release_canvas(framed)
+
+    def test_strip_render_unsupported(self):
+        """
+        测试模糊背景模板不能分条渲染
+        """
+        ppm_path = os.path.join(self.temp_dir.name, "photo.ppm")
+        with Image.open(self.photo_path) as source:
+            source.convert("RGB").save(ppm_path)
+        with self.assertRaises(StripUnsupported):
+            render_strips(ppm_path, io.BytesIO(), "模糊背景")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+底部信息横条模板的单元测试
+测试连拍照片复用缓存的横条，且缓存不改变输出结果
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from PIL import Image, ImageChops
+from PIL.TiffImagePlugin import IFDRational
+
+# 将项目根目录添加到Python路径
+sys.path.insert(0, os.path.dirname(os.path.abspath(os.path.join(__file__, ".."))))
+
+import template
+from template.bottom_bar_template import get_bar_strip_cache
+from template.template_context import get_template_context
+from entity.photo import Photo
+
+
+def save_test_photo(path, size, capture_time):
+    """
+    生成带EXIF信息的测试照片
+    """
+    exif = Image.Exif()
+    exif[0x010f] = "Acme"
+    exif[0x0110] = "Acme X1"
+    exif_ifd = exif.get_ifd(0x8769)
+    exif_ifd[0x829a] = IFDRational(1, 250)
+    exif_ifd[0x829d] = IFDRational(28, 10)
+    exif_ifd[0x8827] = 400
+    exif_ifd[0x9003] = capture_time
+    exif_ifd[0x920a] = IFDRational(50, 1)
+    exif_ifd[0xa434] = "Acme 50mm F1.8"
+    Image.new("RGB", size, (90, 120, 150)).save(path, exif=exif)
+
+
+class TestBottomBarTemplate(unittest.TestCase):
+    """
+    测试底部信息横条模板的横条缓存
+    """
+
+    def setUp(self):
+        """
+        设置测试环境
+        """
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.photo_paths = []
+        for i in range(3):
+            path = os.path.join(self.temp_dir.name, f"burst_{i}.jpg")
+            save_test_photo(path, (900, 600), f"2025:10:01 12:00:0{i}")
+            self.photo_paths.append(path)
+        self.template = get_template_context().get_template("黑色底边")
+        get_bar_strip_cache().clear()
+
+    def tearDown(self):
+        """
+        清理测试环境
+        """
+        self.temp_dir.cleanup()
+
+    def render(self, path):
+        """
+        使用黑色底边模板渲染照片
+        """
+        photo = Photo(path)
+        photo.fix_orientation()
+        return self.template.create_frame(photo)
+
+    def test_burst_reuses_bar_strip(self):
+        """
+        测试连拍照片只渲染一次横条
+        """
+        for path in self.photo_paths:
+            self.render(path)
+
+        stats = get_bar_strip_cache().stats()
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["hits"], 2)
+
+    def test_cached_bar_matches_fresh_render(self):
+        """
+        测试使用缓存横条的结果与重新渲染的结果一致，且拍摄时间随照片变化
+        """
+        self.render(self.photo_paths[0])
+        cached = self.render(self.photo_paths[1])
+
+        get_bar_strip_cache().clear()
+        fresh = self.render(self.photo_paths[1])
+        self.assertIsNone(ImageChops.difference(cached, fresh).getbbox())
+
+        other_time = self.render(self.photo_paths[2])
+        self.assertIsNotNone(ImageChops.difference(cached, other_time).getbbox())
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
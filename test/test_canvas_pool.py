@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+画布池的单元测试
+测试相同尺寸的画布复用、原地填充、内存预算，模板复用画布时输出不受上一张照片影响，以及渲染失败时归还画布
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+from PIL import Image, ImageChops
+
+# 将项目根目录添加到Python路径
+sys.path.insert(0, os.path.dirname(os.path.abspath(os.path.join(__file__, ".."))))
+
+from entity.photo import Photo
+from template import get_template_context
+from utils.canvas_pool import CanvasPool, get_canvas_pool, release_canvas
+from benchmark.synthetic_corpus import generate_photo, CAMERAS
+
+
+class TestCanvasPool(unittest.TestCase):
+    """
+    测试画布池
+    """
+
+    def test_reuse_same_size(self):
+        """
+        测试归还的画布被相同模式和尺寸的请求复用，不同尺寸时新建
+        """
+        pool = CanvasPool(max_bytes=1024 * 1024)
+        canvas = pool.acquire("RGB", (100, 50))
+        pool.release(canvas)
+        self.assertIs(pool.acquire("RGB", (100, 50)), canvas)
+        self.assertIsNot(pool.acquire("RGB", (100, 60)), canvas)
+        self.assertIsNot(pool.acquire("L", (100, 50)), canvas)
+        stats = pool.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 3))
+
+    def test_fill_in_place(self):
+        """
+        测试复用画布时按指定颜色原地填充
+        """
+        pool = CanvasPool(max_bytes=1024 * 1024)
+        canvas = pool.acquire("RGB", (20, 20), "white")
+        canvas.paste((255, 0, 0), (0, 0, 10, 10))
+        pool.release(canvas)
+        reused = pool.acquire("RGB", (20, 20), "black")
+        self.assertIs(reused, canvas)
+        self.assertEqual(reused.getextrema(), ((0, 0), (0, 0), (0, 0)))
+
+    def test_budget_and_foreign_images(self):
+        """
+        测试空闲画布超出预算时丢弃最早归还的画布，其他来源的图片和已关闭的画布不回收
+        """
+        pool = CanvasPool(max_bytes=100 * 100 * 4 * 2)
+        canvases = [pool.acquire("RGB", (100, 100)) for _ in range(3)]
+        for canvas in canvases:
+            pool.release(canvas)
+        self.assertEqual(pool.stats()["entries"], 2)
+        with self.assertRaises(ValueError):
+            canvases[0].getpixel((0, 0))
+
+        foreign = Image.new("RGB", (10, 10))
+        pool.release(foreign)
+        closed = pool.acquire("RGB", (10, 10))
+        closed.close()
+        pool.release(closed)
+        self.assertEqual(pool.stats()["entries"], 2)
+        self.assertIsNot(pool.acquire("RGB", (10, 10)), foreign)
+
+        pool.clear()
+        self.assertEqual(pool.stats(), {"entries": 0, "bytes": 0, "hits": 0, "misses": 0})
+
+    def test_template_output_unaffected_by_reused_canvas(self):
+        """
+        测试模板复用上一张照片的画布时，输出与使用新画布时一致
+        """
+        template = get_template_context().get_template("白色底边")
+        with tempfile.TemporaryDirectory() as temp_dir:
+            paths = []
+            for index, camera in enumerate(CAMERAS[:2]):
+                path = os.path.join(temp_dir, f"photo_{index}.jpg")
+                generate_photo(path, (400, 300), index=index, camera=camera)
+                paths.append(path)
+
+            def render(path):
+                with Photo(path) as photo:
+                    photo.decode()
+                    photo.fix_orientation()
+                    return template.render(photo)
+
+            get_canvas_pool().clear()
+            expected = render(paths[1]).copy()
+            release_canvas(render(paths[0]))
+            reused = render(paths[1])
+            self.assertEqual(get_canvas_pool().stats()["hits"], 1)
+            self.assertIsNone(ImageChops.difference(reused, expected).getbbox())
+            release_canvas(reused)
+
+    def test_template_releases_canvas_on_failure(self):
+        """
+        测试模板取出画布后绘制失败时，画布归还给画布池
+        """
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "photo.jpg")
+            generate_photo(path, (400, 300), index=0, camera=CAMERAS[0])
+            for name in ("黑色底边", "模糊背景"):
+                with self.subTest(template=name):
+                    template = get_template_context().get_template(name)
+
+                    def fail(*args, **kwargs):
+                        raise RuntimeError("draw failed")
+
+                    template.draw_dynamic_text = fail
+                    get_canvas_pool().clear()
+                    with Photo(path) as photo:
+                        photo.decode()
+                        photo.fix_orientation()
+                        with self.assertRaises(RuntimeError):
+                            template.create_frame(photo)
+                    self.assertEqual(get_canvas_pool().stats()["entries"], 1)
+            get_canvas_pool().clear()
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
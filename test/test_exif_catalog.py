@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+EXIF目录库的单元测试
+测试增量扫描、筛选查询以及与Photo对象的EXIF数据一致
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from PIL import Image
+from PIL.TiffImagePlugin import IFDRational
+
+# 将项目根目录添加到Python路径
+sys.path.insert(0, os.path.dirname(os.path.abspath(os.path.join(__file__, ".."))))
+
+from utils.exif_catalog import ExifCatalog
+from utils.exif_format import format_exposure_time, format_f_number, format_focal_length
+from entity.photo import Photo
+
+
+def save_test_photo(path, make, model, focal_length, date, size=(64, 48)):
+    """
+    生成带EXIF信息的测试照片
+    """
+    exif = Image.Exif()
+    exif[0x010f] = make
+    exif[0x0110] = model
+    exif[0x0112] = 1
+    exif_ifd = exif.get_ifd(0x8769)
+    exif_ifd[0x829a] = IFDRational(1, 250)
+    exif_ifd[0x829d] = IFDRational(28, 10)
+    exif_ifd[0x8827] = 400
+    exif_ifd[0x9003] = date
+    exif_ifd[0x920a] = IFDRational(focal_length, 1)
+    exif_ifd[0xa434] = f"{make} {focal_length}mm"
+    Image.new("RGB", size, "gray").save(path, exif=exif)
+
+
+class TestExifCatalog(unittest.TestCase):
+    """
+    测试EXIF目录库
+    """
+
+    def setUp(self):
+        """
+        设置测试环境
+        """
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.photo_dir = os.path.join(self.temp_dir.name, "photos")
+        os.makedirs(self.photo_dir)
+        save_test_photo(self.path("a.jpg"), "NIKON CORPORATION", "NIKON Z 6_2", 50, "2025:10:01 08:00:00")
+        save_test_photo(self.path("b.jpg"), "Canon", "Canon EOS R5", 35, "2025:10:15 12:00:00", size=(80, 60))
+        save_test_photo(self.path("c.jpg"), "NIKON CORPORATION", "NIKON Z f", 85, "2025:11:02 18:30:00")
+        self.catalog = ExifCatalog(os.path.join(self.temp_dir.name, "catalog.db"))
+
+    def tearDown(self):
+        """
+        清理测试环境
+        """
+        self.catalog.close()
+        self.temp_dir.cleanup()
+
+    def path(self, name):
+        """
+        获取测试照片的绝对路径
+        """
+        return os.path.join(self.photo_dir, name)
+
+    def test_incremental_rescan(self):
+        """
+        测试重新扫描时只解析新增和修改过的文件，并移除已删除的文件
+        """
+        stats = self.catalog.scan([self.photo_dir])
+        self.assertEqual((stats["added"], stats["unchanged"]), (3, 0))
+
+        stats = self.catalog.scan([self.photo_dir])
+        self.assertEqual((stats["added"], stats["updated"], stats["unchanged"]), (0, 0, 3))
+
+        save_test_photo(self.path("b.jpg"), "Canon", "Canon EOS R6", 35, "2025:10:15 12:00:00")
+        os.utime(self.path("b.jpg"), ns=(1, 1))
+        os.remove(self.path("c.jpg"))
+        stats = self.catalog.scan([self.photo_dir])
+        self.assertEqual((stats["updated"], stats["unchanged"], stats["removed"]), (1, 1, 1))
+        self.assertEqual(self.catalog.count(), 2)
+        self.assertEqual(self.catalog.query(model="R6"), [self.path("b.jpg")])
+
+    def test_query_filters(self):
+        """
+        测试按品牌、焦距和日期筛选
+        """
+        self.catalog.scan([self.photo_dir])
+        self.assertEqual(self.catalog.query(make="nikon"), [self.path("a.jpg"), self.path("c.jpg")])
+        self.assertEqual(self.catalog.query(focal_length=35), [self.path("b.jpg")])
+        self.assertEqual(self.catalog.query(lens_model="85mm"), [self.path("c.jpg")])
+        self.assertEqual(self.catalog.query(date_from="2025-10-01", date_to="2025-10-31"),
+                         [self.path("a.jpg"), self.path("b.jpg")])
+        self.assertEqual(self.catalog.query(make="nikon", date_to="2025-10-01"), [self.path("a.jpg")])
+        self.assertEqual(self.catalog.query(directory=self.temp_dir.name), [])
+        self.assertEqual(len(self.catalog.query(directory=self.temp_dir.name, recursive=True)), 3)
+
+    def test_exif_data_matches_photo(self):
+        """
+        测试目录库中的EXIF数据格式化后与直接读取的结果一致，文件修改后失效
+        """
+        self.catalog.scan([self.photo_dir])
+        cached = self.catalog.get_exif_data(self.path("a.jpg"))
+        direct = Photo(self.path("a.jpg")).exif_data
+        self.assertEqual(cached["Model"], direct["Model"])
+        self.assertEqual(cached["ISOSpeedRatings"], direct["ISOSpeedRatings"])
+        self.assertEqual(format_exposure_time(cached["ExposureTime"]), format_exposure_time(direct["ExposureTime"]))
+        self.assertEqual(format_f_number(cached["FNumber"]), format_f_number(direct["FNumber"]))
+        self.assertEqual(format_focal_length(cached["FocalLength"]), format_focal_length(direct["FocalLength"]))
+
+        photo = Photo(self.path("a.jpg"), exif_data=cached)
+        self.assertEqual(photo.exif_data, cached)
+        self.assertEqual(photo.orientation, 1)
+
+        os.utime(self.path("a.jpg"), ns=(1, 1))
+        self.assertIsNone(self.catalog.get_exif_data(self.path("a.jpg")))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
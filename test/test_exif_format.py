@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+EXIF参数格式化工具的单元测试
+测试快门速度查表、IFDRational处理以及各参数的显示格式
+"""
+
+import os
+import sys
+import unittest
+from PIL.TiffImagePlugin import IFDRational
+
+# 将项目根目录添加到Python路径
+sys.path.insert(0, os.path.dirname(os.path.abspath(os.path.join(__file__, ".."))))
+
+from utils.exif_format import (
+    format_exposure_time, format_f_number, format_focal_length, format_iso, format_exif_value
+)
+
+
+class TestExifFormat(unittest.TestCase):
+    """
+    测试EXIF参数格式化
+    """
+
+    def test_standard_shutter_speeds(self):
+        """
+        测试标准快门速度通过查表格式化，包括超出1/1000的高速快门
+        """
+        self.assertEqual(format_exposure_time(IFDRational(1, 250)), "1/250s")
+        self.assertEqual(format_exposure_time(IFDRational(1, 1250)), "1/1250s")
+        self.assertEqual(format_exposure_time(IFDRational(1, 8000)), "1/8000s")
+        self.assertEqual(format_exposure_time(0.016666), "1/60s")
+        self.assertEqual(format_exposure_time(IFDRational(3, 10)), "3/10s")
+        self.assertEqual(format_exposure_time(IFDRational(30, 1)), "30s")
+
+    def test_non_standard_shutter_speed_falls_back_to_fraction(self):
+        """
+        测试非标准快门速度使用分数计算
+        """
+        self.assertEqual(format_exposure_time((2, 7)), "2/7s")
+        self.assertEqual(format_exposure_time(90), "90s")
+
+    def test_invalid_shutter_speed_keeps_raw_value(self):
+        """
+        测试无法解析的快门速度保持原始值
+        """
+        self.assertEqual(format_exposure_time("abc"), "abcs")
+        self.assertEqual(format_exposure_time(IFDRational(1, 0)), "nans")
+
+    def test_other_params(self):
+        """
+        测试光圈、焦距、ISO和曝光补偿的格式
+        """
+        self.assertEqual(format_f_number(IFDRational(28, 10)), "F2.8")
+        self.assertEqual(format_f_number(4), "F4")
+        self.assertEqual(format_focal_length(IFDRational(50, 1)), "50.0mm")
+        self.assertEqual(format_focal_length((245, 10)), "24.5mm")
+        self.assertEqual(format_iso(400), "ISO400")
+        self.assertEqual(format_iso((800, 0)), "ISO800")
+        self.assertEqual(format_exif_value("曝光补偿", IFDRational(-7, 10)), "-0.7EV")
+        self.assertEqual(format_exif_value("相机型号", "NIKON Z 6_2"), "NIKON Z 6_2")
+
+    def test_results_are_memoized(self):
+        """
+        测试重复格式化同一数值时命中缓存
+        """
+        format_exposure_time.cache_clear()
+        format_exposure_time(IFDRational(1, 500))
+        format_exposure_time(IFDRational(1, 500))
+        self.assertEqual(format_exposure_time.cache_info().hits, 1)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+精简EXIF读取工具的单元测试
+测试读取结果与Pillow的_getexif一致，并且不返回未请求的标签
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from PIL import Image, ExifTags
+from PIL.TiffImagePlugin import IFDRational
+
+# 将项目根目录添加到Python路径
+sys.path.insert(0, os.path.dirname(os.path.abspath(os.path.join(__file__, ".."))))
+
+from utils.exif_reader import read_exif_tags, EXIF_TAGS
+from entity.photo import Photo
+
+
+def save_test_photo(path, endian):
+    """
+    生成带完整EXIF信息（包括较大的MakerNote）的测试照片
+    """
+    exif = Image.Exif()
+    exif.endian = endian
+    exif[0x010f] = "NIKON CORPORATION"
+    exif[0x0110] = "NIKON Z 6_2"
+    exif[0x0112] = 6
+    exif_ifd = exif.get_ifd(0x8769)
+    exif_ifd[0x829a] = IFDRational(1, 1250)
+    exif_ifd[0x829d] = IFDRational(28, 10)
+    exif_ifd[0x8827] = 800
+    exif_ifd[0x9003] = "2025:10:01 12:34:56"
+    exif_ifd[0x9204] = IFDRational(-7, 10)
+    exif_ifd[0x920a] = IFDRational(50, 1)
+    exif_ifd[0x927c] = b"\x01" * 20000
+    exif_ifd[0xa434] = "NIKKOR Z 50mm f/1.8 S"
+    Image.new("RGB", (64, 48), "gray").save(path, exif=exif)
+
+
+class TestExifReader(unittest.TestCase):
+    """
+    测试精简EXIF读取工具
+    """
+
+    def setUp(self):
+        """
+        设置测试环境
+        """
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        """
+        清理测试环境
+        """
+        self.temp_dir.cleanup()
+
+    def pillow_exif(self, path):
+        """
+        使用Pillow的_getexif读取请求的标签
+        """
+        with Image.open(path) as img:
+            exif = img._getexif() or {}
+        return {ExifTags.TAGS.get(k, k): v for k, v in exif.items() if ExifTags.TAGS.get(k) in EXIF_TAGS}
+
+    def test_matches_pillow_for_both_byte_orders(self):
+        """
+        测试大端和小端字节序的读取结果都与Pillow一致
+        """
+        for endian in ("<", ">"):
+            path = os.path.join(self.temp_dir.name, f"photo_{endian == '<'}.jpg")
+            save_test_photo(path, endian)
+            exif_data = read_exif_tags(path)
+            self.assertEqual(exif_data, self.pillow_exif(path))
+            self.assertEqual(exif_data["Model"], "NIKON Z 6_2")
+            self.assertEqual(exif_data["ExposureTime"], IFDRational(1, 1250))
+            self.assertNotIn("MakerNote", exif_data)
+
+    def test_only_requested_tags(self):
+        """
+        测试只返回请求的标签
+        """
+        path = os.path.join(self.temp_dir.name, "photo.jpg")
+        save_test_photo(path, "<")
+        self.assertEqual(read_exif_tags(path, ["Model", "Orientation"]), {"Model": "NIKON Z 6_2", "Orientation": 6})
+
+    def test_jpeg_without_exif(self):
+        """
+        测试没有EXIF的JPEG返回空字典，非JPEG返回None
+        """
+        jpeg_path = os.path.join(self.temp_dir.name, "plain.jpg")
+        Image.new("RGB", (16, 16)).save(jpeg_path)
+        self.assertEqual(read_exif_tags(jpeg_path), {})
+
+        png_path = os.path.join(self.temp_dir.name, "plain.png")
+        Image.new("RGB", (16, 16)).save(png_path)
+        self.assertIsNone(read_exif_tags(png_path))
+
+    def test_photo_uses_reader_and_falls_back_to_pillow(self):
+        """
+        测试Photo对象只保留请求的标签，非JPEG文件回退到Pillow解析
+        """
+        jpeg_path = os.path.join(self.temp_dir.name, "photo.jpg")
+        save_test_photo(jpeg_path, "<")
+        photo = Photo(jpeg_path)
+        self.assertEqual(photo.orientation, 6)
+        self.assertNotIn("MakerNote", photo.exif_data)
+
+        png_path = os.path.join(self.temp_dir.name, "photo.png")
+        exif = Image.Exif()
+        exif[0x0110] = "Camera A"
+        Image.new("RGB", (16, 16)).save(png_path, exif=exif)
+        self.assertEqual(Photo(png_path).exif_data, {"Model": "Camera A"})
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
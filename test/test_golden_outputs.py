@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+相框输出的参考图片和性能预算测试
+使用固定的合成照片经每个已注册模板生成相框，与test/golden中的参考图片逐像素比较（允许少量误差），
+并检查各阶段耗时不超过预算；预算以校准循环的耗时为单位，在不同机器上保持稳定
+
+更新参考图片和预算（修改了模板的输出或有意调整性能后）:
+    UPDATE_GOLDEN=1 python -m pytest test/test_golden_outputs.py
+跳过耗时预算检查（如在负载很高的机器上）:
+    SKIP_TIMING_BUDGETS=1 python -m pytest test/test_golden_outputs.py
+"""
+
+import io
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import unittest
+
+import PIL
+from PIL import Image, ImageChops, ImageFont, features
+
+# 将项目根目录添加到Python路径
+PROJECT_ROOT = os.path.dirname(os.path.abspath(os.path.join(__file__, "..")))
+sys.path.insert(0, PROJECT_ROOT)
+
+from template import get_template_context
+from entity.photo import Photo
+from utils.instrumentation import TraceCollector
+from utils.image_io import encode_image
+from benchmark.synthetic_corpus import generate_photo, generate_image, CAMERAS
+
+GOLDEN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "golden")
+MANIFEST_PATH = os.path.join(GOLDEN_DIR, "manifest.json")
+DIFF_OUTPUT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "test_output")
+
+# 参考照片：(名称, 相机序号, EXIF方向)，覆盖有Logo和没有Logo的品牌以及横竖方向
+GOLDEN_PHOTOS = (
+    ("nikon_o1", 0, 1),
+    ("canon_o6", 1, 6),
+    ("leica_o3", 2, 3),
+    ("sony_o8", 3, 8)
+)
+GOLDEN_PHOTO_SIZE = (800, 600)
+
+# 像素比较的容差：平均误差上限，以及误差超过PIXEL_THRESHOLD的像素比例上限
+MAX_MEAN_DIFF = 1.0
+PIXEL_THRESHOLD = 16
+MAX_DIFF_RATIO = 0.001
+
+# 耗时预算：统计的阶段、测试照片尺寸、重复次数，以及生成预算时的余量和下限（校准单位）
+BUDGET_STAGES = ("decode", "fix_orientation", "layout", "text", "compose", "create_frame", "encode")
+TIMING_PHOTO_SIZE = (2400, 1600)
+TIMING_RUNS = 5
+BUDGET_HEADROOM = 3.0
+BUDGET_FLOOR = 0.1
+
+UPDATE_GOLDEN = os.environ.get("UPDATE_GOLDEN") == "1"
+SKIP_TIMING_BUDGETS = os.environ.get("SKIP_TIMING_BUDGETS") == "1"
+
+
+def font_signature():
+    """
+    获取影响文本渲染结果的字体环境（字体文件、Pillow和FreeType版本）
+
+    参考图片只在相同的字体环境下比较
+    """
+    fonts = {}
+    for family in ("Arial", "Arial Bold"):
+        try:
+            fonts[family] = os.path.basename(ImageFont.truetype(family, 12).path)
+        except OSError:
+            fonts[family] = "default"
+    return {
+        "fonts": fonts,
+        "pillow": PIL.__version__,
+        "freetype": features.version("freetype2")
+    }
+
+
+def calibrate():
+    """
+    运行固定的校准负载（JPEG编解码和缩放），返回最快一次的耗时（秒）
+    """
+    image = generate_image((1200, 800), 0)
+    best = None
+    for _ in range(5):
+        start = time.perf_counter()
+        data = encode_image(image, "JPEG", quality=90)
+        with Image.open(io.BytesIO(data)) as decoded:
+            decoded.load()
+            decoded.resize((600, 400), Image.Resampling.LANCZOS)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def render(template_name, photo_path):
+    """
+    使用模板生成带相框的图片（与批量处理流程一致）
+    """
+    photo = Photo(photo_path)
+    photo.decode()
+    photo.fix_orientation()
+    return get_template_context().get_template(template_name).render(photo)
+
+
+def golden_filename(template_name, photo_name):
+    """
+    参考图片文件名：模板类名_照片名.png
+    """
+    template_class = get_template_context().get_all_templates()[template_name].__name__
+    return f"{template_class}_{photo_name}.png"
+
+
+def load_manifest():
+    """
+    读取参考图片清单
+    """
+    if not os.path.exists(MANIFEST_PATH):
+        return None
+    with open(MANIFEST_PATH, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_manifest(manifest):
+    """
+    写入参考图片清单
+    """
+    os.makedirs(GOLDEN_DIR, exist_ok=True)
+    with open(MANIFEST_PATH, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+class TestGoldenOutputs(unittest.TestCase):
+    """
+    测试模板输出与参考图片一致，且各阶段耗时在预算内
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """
+        生成参考照片和计时照片
+        """
+        # 模板按当前工作目录查找logo
+        cls.previous_cwd = os.getcwd()
+        os.chdir(PROJECT_ROOT)
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        cls.photos = {}
+        for index, (name, camera_index, orientation) in enumerate(GOLDEN_PHOTOS):
+            path = os.path.join(cls.temp_dir.name, f"{name}.jpg")
+            generate_photo(path, GOLDEN_PHOTO_SIZE, orientation, CAMERAS[camera_index], index, texture=False)
+            cls.photos[name] = path
+        cls.timing_photo = os.path.join(cls.temp_dir.name, "timing.jpg")
+        generate_photo(cls.timing_photo, TIMING_PHOTO_SIZE, 6, CAMERAS[0], 0)
+        cls.template_names = get_template_context().get_all_template_names()
+        cls.manifest = load_manifest()
+        if UPDATE_GOLDEN:
+            os.makedirs(GOLDEN_DIR, exist_ok=True)
+            cls.manifest = {"font_signature": font_signature(), "goldens": {}, "budgets": {}}
+
+    @classmethod
+    def tearDownClass(cls):
+        """
+        清理测试环境
+        """
+        if UPDATE_GOLDEN:
+            save_manifest(cls.manifest)
+        cls.temp_dir.cleanup()
+        os.chdir(cls.previous_cwd)
+
+    def check_environment(self):
+        """
+        检查参考图片清单存在且字体环境一致，否则跳过
+        """
+        if self.manifest is None:
+            self.fail("缺少参考图片清单，请运行: UPDATE_GOLDEN=1 python -m pytest test/test_golden_outputs.py")
+        if not UPDATE_GOLDEN and self.manifest["font_signature"] != font_signature():
+            self.skipTest(f"字体环境与参考图片不同: {font_signature()}（参考: {self.manifest['font_signature']}）")
+
+    def test_outputs_match_golden_images(self):
+        """
+        测试每个已注册模板的输出与参考图片一致
+        """
+        self.check_environment()
+        for template_name in self.template_names:
+            for photo_name, path in self.photos.items():
+                with self.subTest(template=template_name, photo=photo_name):
+                    output = render(template_name, path)
+                    filename = golden_filename(template_name, photo_name)
+                    golden_path = os.path.join(GOLDEN_DIR, filename)
+
+                    if UPDATE_GOLDEN:
+                        output.save(golden_path, "PNG", optimize=True)
+                        self.manifest["goldens"][filename] = list(output.size)
+                        continue
+
+                    self.assertTrue(os.path.exists(golden_path),
+                                    f"缺少参考图片 {filename}，新增模板后请运行 UPDATE_GOLDEN=1 更新")
+                    with Image.open(golden_path) as golden:
+                        golden = golden.convert("RGB")
+                    self.assertEqual(output.size, golden.size)
+                    self.assert_images_close(output, golden, filename)
+
+    def assert_images_close(self, output, golden, filename):
+        """
+        在容差范围内比较两张图片，不一致时保存差异图片便于排查
+        """
+        diff = ImageChops.difference(output.convert("RGB"), golden).convert("L")
+        histogram = diff.histogram()
+        total = output.width * output.height
+        mean_diff = sum(value * count for value, count in enumerate(histogram)) / total
+        diff_ratio = sum(histogram[PIXEL_THRESHOLD + 1:]) / total
+        if mean_diff > MAX_MEAN_DIFF or diff_ratio > MAX_DIFF_RATIO:
+            os.makedirs(DIFF_OUTPUT_DIR, exist_ok=True)
+            output.save(os.path.join(DIFF_OUTPUT_DIR, f"actual_{filename}"))
+            diff.point(lambda value: min(255, value * 8)).save(os.path.join(DIFF_OUTPUT_DIR, f"diff_{filename}"))
+            self.fail(f"{filename} 与参考图片不一致: 平均误差 {mean_diff:.3f}，"
+                      f"误差超过{PIXEL_THRESHOLD}的像素 {diff_ratio:.4%}（差异图片已保存到 {DIFF_OUTPUT_DIR}）")
+
+    @unittest.skipIf(SKIP_TIMING_BUDGETS and not UPDATE_GOLDEN, "已设置SKIP_TIMING_BUDGETS")
+    def test_stage_timing_budgets(self):
+        """
+        测试各阶段耗时（以校准循环耗时为单位）不超过预算
+        """
+        self.check_environment()
+        unit = calibrate()
+        for template_name in self.template_names:
+            with self.subTest(template=template_name):
+                # 先处理一次预热缓存，再统计多次处理的中位数
+                render(template_name, self.timing_photo)
+                durations = {}
+                with TraceCollector() as collector:
+                    for _ in range(TIMING_RUNS):
+                        encode_image(render(template_name, self.timing_photo), "JPEG")
+                for record in collector.records:
+                    durations.setdefault(record.name, []).append(record.duration_ns / 1e9)
+                ratios = {stage: statistics.median(durations[stage]) / unit
+                          for stage in BUDGET_STAGES if stage in durations}
+
+                template_class = get_template_context().get_all_templates()[template_name].__name__
+                if UPDATE_GOLDEN:
+                    self.manifest["budgets"][template_class] = {
+                        stage: round(max(ratio * BUDGET_HEADROOM, BUDGET_FLOOR), 3) for stage, ratio in ratios.items()
+                    }
+                    continue
+
+                budgets = self.manifest["budgets"].get(template_class)
+                self.assertIsNotNone(budgets, f"缺少模板 {template_class} 的耗时预算，请运行 UPDATE_GOLDEN=1 更新")
+                over_budget = {stage: f"{ratios[stage]:.3f} > {budget}"
+                               for stage, budget in budgets.items() if stage in ratios and ratios[stage] > budget}
+                self.assertFalse(over_budget, f"{template_name} 的阶段耗时超出预算（校准单位）: {over_budget}")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+性能埋点工具的单元测试
+测试未启用时的空操作、模板钩子调用、Chrome trace导出和百分位统计
+"""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+# 将项目根目录添加到Python路径
+sys.path.insert(0, os.path.dirname(os.path.abspath(os.path.join(__file__, ".."))))
+
+from utils.instrumentation import span, percentile, TraceCollector, is_enabled
+from utils.image_io import save_image
+from template.impl.black_bottom_template import BlackBottomTemplate
+from entity.photo import Photo
+from benchmark.synthetic_corpus import generate_photo
+
+
+class HookedTemplate(BlackBottomTemplate):
+    """
+    记录钩子调用的测试模板
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.calls = []
+
+    def before_create_frame(self, photo, params):
+        self.calls.append("before")
+        return dict(params, marker=True)
+
+    def after_create_frame(self, photo, framed_image, params):
+        self.calls.append(("after", params.get("marker")))
+        return framed_image
+
+
+class TestInstrumentation(unittest.TestCase):
+    """
+    测试性能埋点
+    """
+
+    def setUp(self):
+        """
+        设置测试环境
+        """
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.photo_path = os.path.join(self.temp_dir.name, "photo.jpg")
+        generate_photo(self.photo_path, (600, 400))
+
+    def tearDown(self):
+        """
+        清理测试环境
+        """
+        self.temp_dir.cleanup()
+
+    def test_disabled_span_is_shared_noop(self):
+        """
+        测试未注册收集器时span()返回共享的空操作对象
+        """
+        self.assertFalse(is_enabled())
+        self.assertIs(span("decode"), span("encode", file="a.jpg"))
+
+    def test_render_calls_hooks_and_reports_stages(self):
+        """
+        测试render()调用before/after钩子，并上报各阶段耗时
+        """
+        template = HookedTemplate()
+        with TraceCollector() as collector:
+            photo = Photo(self.photo_path)
+            photo.decode()
+            photo.fix_orientation()
+            framed = template.render(photo, selected_params=["相机型号"])
+            save_image(framed, os.path.join(self.temp_dir.name, "framed.jpg"))
+        self.assertFalse(is_enabled())
+
+        self.assertEqual(template.calls, ["before", ("after", True)])
+        names = {record.name for record in collector.records}
+        for stage in ("decode", "fix_orientation", "create_frame", "layout", "logo", "text", "encode", "write"):
+            self.assertIn(stage, names)
+
+        trace_path = os.path.join(self.temp_dir.name, "trace.json")
+        collector.export_chrome_trace(trace_path)
+        with open(trace_path, "r", encoding="utf-8") as f:
+            events = json.load(f)["traceEvents"]
+        self.assertEqual(len(events), len(collector.records))
+        self.assertTrue(all(event["ph"] == "X" and event["dur"] >= 0 for event in events))
+
+    def test_summary_percentiles(self):
+        """
+        测试百分位统计
+        """
+        self.assertEqual(percentile([4, 1, 3, 2], 50), 2.5)
+        self.assertEqual(percentile([1, 2, 3, 4, 5], 90), 4.6)
+        self.assertEqual(percentile([], 99), 0.0)
+
+        with TraceCollector() as collector:
+            for _ in range(3):
+                with span("stage"):
+                    pass
+        summary = collector.summary()
+        self.assertEqual(summary["stage"]["count"], 3)
+        self.assertLessEqual(summary["stage"]["p50_ms"], summary["stage"]["max_ms"])
+        self.assertIn("stage", collector.format_summary())
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
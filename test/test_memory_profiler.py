@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+内存分析工具的单元测试
+测试按照片统计峰值内存、按阶段归因以及超过阈值的标记
+"""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+# 将项目根目录添加到Python路径
+sys.path.insert(0, os.path.dirname(os.path.abspath(os.path.join(__file__, ".."))))
+
+from utils.memory_profiler import MemoryProfiler, current_rss, reset_peak_rss
+from utils.instrumentation import is_enabled
+from utils.image_io import save_image
+from template.impl.white_bottom_template import WhiteBottomTemplate
+from entity.photo import Photo
+from benchmark.synthetic_corpus import generate_photo
+
+
+class TestMemoryProfiler(unittest.TestCase):
+    """
+    测试内存分析
+    """
+
+    def setUp(self):
+        """
+        设置测试环境
+        """
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.photo_path = os.path.join(self.temp_dir.name, "photo.jpg")
+        generate_photo(self.photo_path, (2400, 1600), orientation=6)
+
+    def tearDown(self):
+        """
+        清理测试环境
+        """
+        self.temp_dir.cleanup()
+
+    def render(self, profiler):
+        """
+        在内存分析下处理一张照片
+        """
+        with profiler.photo(self.photo_path):
+            photo = Photo(self.photo_path)
+            photo.decode()
+            photo.fix_orientation()
+            framed = WhiteBottomTemplate().render(photo)
+            save_image(framed, os.path.join(self.temp_dir.name, "framed.jpg"))
+
+    def test_reports_stages_and_flags_threshold(self):
+        """
+        测试每张照片的报告包含各阶段内存，并标记超过阈值的照片
+        """
+        with MemoryProfiler(threshold_mb=0.001) as profiler:
+            self.render(profiler)
+        self.assertFalse(is_enabled())
+
+        report = profiler.reports[0]
+        for stage in ("load_photo", "decode", "fix_orientation", "layout", "compose", "encode", "write"):
+            self.assertIn(stage, report["stages"])
+        self.assertGreaterEqual(report["peak_rss_mb"], report["rss_before_mb"])
+        self.assertIn("top_allocators", report)
+        self.assertEqual(profiler.flagged(), [report])
+        self.assertIn("photo.jpg", profiler.format_report())
+
+        report_path = os.path.join(self.temp_dir.name, "memory.json")
+        profiler.export_json(report_path)
+        with open(report_path, "r", encoding="utf-8") as f:
+            self.assertEqual(json.load(f)["photos"][0]["photo"], self.photo_path)
+
+    @unittest.skipUnless(current_rss() and reset_peak_rss(), "需要Linux的/proc峰值RSS重置支持")
+    def test_large_allocations_are_attributed_to_stages(self):
+        """
+        测试解码和画布等大块内存分配归因到对应阶段（2400x1600的RGB图像约11MB）
+        """
+        with MemoryProfiler() as profiler:
+            self.render(profiler)
+        stages = profiler.reports[0]["stages"]
+        self.assertGreater(stages["decode"]["peak_delta_mb"] + stages["fix_orientation"]["peak_delta_mb"], 5)
+        self.assertGreater(profiler.reports[0]["peak_delta_mb"], 5)
+        self.assertFalse(profiler.reports[0]["over_threshold"])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+运行指标的单元测试
+测试Prometheus文本格式、阶段耗时直方图、缓存命中率以及文件和HTTP导出
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+import urllib.request
+
+# 将项目根目录添加到Python路径
+sys.path.insert(0, os.path.dirname(os.path.abspath(os.path.join(__file__, ".."))))
+
+from utils.metrics import MetricsRegistry, RenderMetrics, MetricsFileExporter, MetricsHTTPExporter
+from utils.instrumentation import span, is_enabled
+
+
+class TestMetrics(unittest.TestCase):
+    """
+    测试运行指标
+    """
+
+    def test_text_format(self):
+        """
+        测试计数器、仪表和直方图的Prometheus文本格式
+        """
+        registry = MetricsRegistry()
+        counter = registry.counter("photos_total", "照片数", ("template",))
+        counter.inc(template="白色\"底边\"")
+        counter.inc(2, template="白色\"底边\"")
+        self.assertIs(registry.counter("photos_total", "照片数", ("template",)), counter)
+        registry.gauge("queue_depth", "队列长度").set(5)
+        histogram = registry.histogram("latency_seconds", "耗时", buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 5):
+            histogram.observe(value)
+
+        text = registry.render()
+        self.assertIn("# TYPE photos_total counter", text)
+        self.assertIn('photos_total{template="白色\\"底边\\""} 3', text)
+        self.assertIn("queue_depth 5", text)
+        self.assertIn('latency_seconds_bucket{le="0.1"} 1', text)
+        self.assertIn('latency_seconds_bucket{le="1"} 2', text)
+        self.assertIn('latency_seconds_bucket{le="+Inf"} 3', text)
+        self.assertIn("latency_seconds_count 3", text)
+        with self.assertRaises(ValueError):
+            counter.inc(stage="decode")
+
+    def test_render_metrics(self):
+        """
+        测试阶段耗时、按异常类型统计的失败数和缓存命中率
+        """
+        registry = MetricsRegistry()
+        metrics = RenderMetrics(registry, caches={"logos": lambda: {"hits": 3, "misses": 1, "entries": 1}})
+        metrics.start()
+        try:
+            with span("decode"):
+                pass
+        finally:
+            metrics.stop()
+        self.assertFalse(is_enabled())
+        self.assertEqual(metrics.stage_seconds.get_count(stage="decode"), 1)
+
+        try:
+            try:
+                raise KeyError("Model")
+            except KeyError as e:
+                raise Exception("处理图片失败") from e
+        except Exception as e:
+            metrics.photo_failed("白色底边", e)
+        self.assertEqual(metrics.failures.get(template="白色底边", exception="KeyError"), 1)
+
+        metrics.start()
+        self.assertIn('photo_frame_cache_hit_ratio{cache="logos"} 0.75', registry.render())
+        metrics.stop()
+        self.assertNotIn("photo_frame_cache_hit_ratio", registry.render())
+
+    def test_exporters(self):
+        """
+        测试写入指标文件和通过HTTP提供/metrics
+        """
+        registry = MetricsRegistry()
+        counter = registry.counter("photos_total", "照片数")
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "frame.prom")
+            exporter = MetricsFileExporter(registry, path, interval=3600)
+            exporter.start()
+            counter.inc()
+            exporter.stop()
+            with open(path, "r", encoding="utf-8") as f:
+                self.assertIn("photos_total 1", f.read())
+            self.assertEqual(os.listdir(temp_dir), ["frame.prom"])
+
+        server = MetricsHTTPExporter(registry, 0)
+        server.start()
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{server.port}/metrics", timeout=5) as response:
+                self.assertIn("text/plain", response.headers["Content-Type"])
+                self.assertIn("photos_total 1", response.read().decode("utf-8"))
+        finally:
+            server.stop()
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+管道模式的单元测试
+测试长度前缀分帧的读写，以及命令行通过标准输入输出处理单张和多张图片
+"""
+
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+# 将项目根目录添加到Python路径
+PROJECT_ROOT = os.path.dirname(os.path.abspath(os.path.join(__file__, "..")))
+sys.path.insert(0, PROJECT_ROOT)
+
+from PIL import Image
+
+from utils.pipe_framing import read_frames, write_frame, FramingError
+from benchmark.synthetic_corpus import generate_photo
+
+
+class TestPipeFraming(unittest.TestCase):
+    """
+    测试长度前缀分帧
+    """
+
+    def test_round_trip(self):
+        """
+        测试写入的帧可以原样读出，包括空帧和含NUL、换行的数据
+        """
+        frames = [b"\xff\xd8\x00\n\x00abc", b"", b"\n\n"]
+        buffer = io.BytesIO()
+        for frame in frames:
+            write_frame(buffer, frame)
+        buffer.seek(0)
+        self.assertEqual(list(read_frames(buffer)), frames)
+
+    def test_truncated_frame(self):
+        """
+        测试数据被截断时抛出FramingError
+        """
+        with self.assertRaises(FramingError):
+            list(read_frames(io.BytesIO(b"10\nabc")))
+
+    def test_invalid_header(self):
+        """
+        测试长度行不是数字或超过上限时抛出FramingError
+        """
+        with self.assertRaises(FramingError):
+            list(read_frames(io.BytesIO(b"abc\ndata")))
+        with self.assertRaises(FramingError):
+            list(read_frames(io.BytesIO(b"100\n" + b"x" * 100), max_frame_bytes=10))
+
+
+class TestPipeMode(unittest.TestCase):
+    """
+    测试命令行管道模式
+    """
+
+    def setUp(self):
+        """
+        设置测试环境
+        """
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.photos = []
+        for index in range(2):
+            path = os.path.join(self.temp_dir.name, f"photo_{index}.jpg")
+            generate_photo(path, (600, 400), index=index)
+            with open(path, "rb") as f:
+                self.photos.append(f.read())
+
+    def tearDown(self):
+        """
+        清理测试环境
+        """
+        self.temp_dir.cleanup()
+
+    def run_cli(self, stdin_data, *args):
+        """
+        运行命令行管道模式，返回完成的进程
+        """
+        return subprocess.run(
+            [sys.executable, os.path.join(PROJECT_ROOT, "cli_version.py"), "-t", "黑色底边", *args],
+            cwd=PROJECT_ROOT, input=stdin_data, capture_output=True
+        )
+
+    def test_single_image_stdin_to_stdout(self):
+        """
+        测试从标准输入读取一张照片，标准输出只包含加好相框的JPEG
+        """
+        completed = self.run_cli(self.photos[0], "-i", "-", "-o", "-")
+        self.assertEqual(completed.returncode, 0, completed.stderr.decode("utf-8", "replace"))
+        with Image.open(io.BytesIO(completed.stdout)) as framed:
+            self.assertEqual(framed.format, "JPEG")
+            self.assertEqual(framed.width, 600)
+            self.assertGreater(framed.height, 400)
+
+    def test_file_to_stdout(self):
+        """
+        测试输入为文件、输出为标准输出
+        """
+        completed = self.run_cli(b"", "-i", os.path.join(self.temp_dir.name, "photo_1.jpg"), "-o", "-")
+        self.assertEqual(completed.returncode, 0)
+        with Image.open(io.BytesIO(completed.stdout)) as framed:
+            self.assertEqual(framed.format, "JPEG")
+
+    def test_length_framing_with_bad_frame(self):
+        """
+        测试分帧模式下逐张输出，无法处理的图片输出空帧且退出码非0
+        """
+        buffer = io.BytesIO()
+        for data in [self.photos[0], b"not a jpeg", self.photos[1]]:
+            write_frame(buffer, data)
+        completed = self.run_cli(buffer.getvalue(), "-i", "-", "-o", "-", "--framing", "length")
+        self.assertEqual(completed.returncode, 1)
+        frames = list(read_frames(io.BytesIO(completed.stdout)))
+        self.assertEqual(len(frames), 3)
+        self.assertEqual(frames[1], b"")
+        for data in (frames[0], frames[2]):
+            with Image.open(io.BytesIO(data)) as framed:
+                self.assertEqual(framed.format, "JPEG")
+        self.assertIn("stdin_0001.jpg", completed.stderr.decode("utf-8"))
+
+    def test_stdin_to_output_directory(self):
+        """
+        测试从标准输入读取，输出到目录
+        """
+        output_dir = os.path.join(self.temp_dir.name, "output")
+        completed = self.run_cli(self.photos[0], "-i", "-", "-o", output_dir)
+        self.assertEqual(completed.returncode, 0)
+        self.assertEqual(os.listdir(output_dir), ["framed_stdin.jpg"])
+        self.assertEqual(completed.stdout, b"")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
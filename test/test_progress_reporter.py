@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+结构化进度输出的单元测试
+测试批量刷新、汇总统计、阶段耗时收集，以及命令行jsonl模式的输出
+"""
+
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+# 将项目根目录添加到Python路径
+PROJECT_ROOT = os.path.dirname(os.path.abspath(os.path.join(__file__, "..")))
+sys.path.insert(0, PROJECT_ROOT)
+
+from utils.progress_reporter import ProgressReporter, StageTimings
+from utils.instrumentation import span, add_collector, remove_collector
+from benchmark.synthetic_corpus import generate_photo
+
+
+class TestProgressReporter(unittest.TestCase):
+    """
+    测试结构化进度输出
+    """
+
+    def setUp(self):
+        """
+        设置测试环境
+        """
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.input_dir = os.path.join(self.temp_dir.name, "input")
+        os.makedirs(self.input_dir)
+        for index in range(2):
+            generate_photo(os.path.join(self.input_dir, f"photo_{index}.jpg"), (600, 400), index=index)
+        with open(os.path.join(self.input_dir, "broken.jpg"), "w") as f:
+            f.write("not a jpeg")
+
+    def tearDown(self):
+        """
+        清理测试环境
+        """
+        self.temp_dir.cleanup()
+
+    def test_records_are_flushed_in_batches(self):
+        """
+        测试记录按条数批量写出，关闭时写出剩余记录和汇总
+        """
+        stream = io.StringIO()
+        reporter = ProgressReporter(stream, flush_every=2, flush_interval=3600)
+        photo_path = os.path.join(self.input_dir, "photo_0.jpg")
+        reporter.photo(photo_path, photo_path, "白色底边", "ok", 10.0, {"decode": 4.0})
+        self.assertEqual(stream.getvalue(), "")
+        reporter.photo(photo_path, None, "白色底边", "error", 30.0, error="失败")
+        self.assertEqual(len(stream.getvalue().splitlines()), 2)
+        reporter.close()
+
+        records = [json.loads(line) for line in stream.getvalue().splitlines()]
+        self.assertEqual(records[0]["stages_ms"], {"decode": 4.0})
+        self.assertEqual(records[0]["bytes_in"], os.path.getsize(photo_path))
+        self.assertEqual(records[1]["error"], "失败")
+        summary = records[-1]
+        self.assertEqual(summary["type"], "summary")
+        self.assertEqual((summary["photos"], summary["succeeded"], summary["failed"]), (2, 1, 1))
+        self.assertEqual(summary["latency_ms"]["p50"], 20.0)
+        self.assertEqual(summary["latency_ms"]["max"], 30.0)
+
+    def test_stage_timings_accumulate_per_photo(self):
+        """
+        测试阶段耗时按名称累计，取出后清空
+        """
+        timings = StageTimings()
+        add_collector(timings)
+        try:
+            for _ in range(2):
+                with span("text"):
+                    pass
+        finally:
+            remove_collector(timings)
+        self.assertEqual(list(timings.take()), ["text"])
+        self.assertEqual(timings.take(), {})
+
+    def test_cli_jsonl_stdout_contains_only_records(self):
+        """
+        测试命令行jsonl模式下标准输出只包含JSON记录
+        """
+        output_dir = os.path.join(self.temp_dir.name, "output")
+        completed = subprocess.run(
+            [sys.executable, os.path.join(PROJECT_ROOT, "cli_version.py"), "-i", self.input_dir, "-o", output_dir,
+             "-t", "黑色底边", "--progress", "jsonl"],
+            cwd=PROJECT_ROOT, capture_output=True, text=True, encoding="utf-8", check=True
+        )
+        records = [json.loads(line) for line in completed.stdout.splitlines()]
+        self.assertEqual([record["type"] for record in records], ["start", "photo", "photo", "photo", "summary"])
+        photos = {os.path.basename(record["input"]): record for record in records if record["type"] == "photo"}
+        self.assertEqual(photos["broken.jpg"]["status"], "error")
+        self.assertEqual(photos["photo_0.jpg"]["status"], "ok")
+        self.assertGreater(photos["photo_0.jpg"]["bytes_out"], 0)
+        self.assertIn("decode", photos["photo_0.jpg"]["stages_ms"])
+        self.assertEqual(records[-1]["succeeded"], 2)
+        self.assertIn("处理完成", completed.stderr)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
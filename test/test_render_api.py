@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+内存渲染接口的单元测试
+测试不同照片来源、编码参数、模板实例共享、多线程调用，以及在其他工作目录中导入时没有打印输出
+"""
+
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+# 将项目根目录添加到Python路径
+PROJECT_ROOT = os.path.dirname(os.path.abspath(os.path.join(__file__, "..")))
+sys.path.insert(0, PROJECT_ROOT)
+
+from PIL import Image
+
+from engine import render, get_template
+from benchmark.synthetic_corpus import generate_photo
+
+
+class TestRenderApi(unittest.TestCase):
+    """
+    测试内存渲染接口
+    """
+
+    def setUp(self):
+        """
+        设置测试环境
+        """
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.photo_path = os.path.join(self.temp_dir.name, "photo.jpg")
+        generate_photo(self.photo_path, (600, 400), index=1)
+        with open(self.photo_path, "rb") as f:
+            self.photo_bytes = f.read()
+
+    def tearDown(self):
+        """
+        清理测试环境
+        """
+        self.temp_dir.cleanup()
+
+    def test_sources_produce_same_image(self):
+        """
+        测试文件内容、文件路径和图像三种来源得到相同尺寸的相框图片
+        """
+        from_bytes = render(self.photo_bytes, "黑色底边", output="image")
+        from_path = render(self.photo_path, "黑色底边", output="image")
+        with Image.open(self.photo_path) as source:
+            from_image = render(source, "黑色底边", output="image")
+            # 调用方传入的图像不会被关闭
+            source.load()
+        self.assertEqual(from_bytes.size, from_path.size)
+        self.assertEqual(from_bytes.size, from_image.size)
+        self.assertEqual(from_bytes.width, 600)
+        self.assertGreater(from_bytes.height, 400)
+
+    def test_encode_options(self):
+        """
+        测试返回编码后的数据，并按编码参数编码
+        """
+        low = render(self.photo_bytes, "白色底边", encode_options={"quality": 30})
+        high = render(self.photo_bytes, "白色底边", encode_options={"quality": 95})
+        self.assertTrue(low.startswith(b"\xff\xd8"))
+        self.assertLess(len(low), len(high))
+        png = render(self.photo_bytes, "白色底边", format="PNG")
+        with Image.open(io.BytesIO(png)) as image:
+            self.assertEqual(image.format, "PNG")
+
+    def test_invalid_arguments(self):
+        """
+        测试找不到模板、无效的output和来源类型时抛出异常
+        """
+        with self.assertRaises(ValueError):
+            render(self.photo_bytes, "不存在的模板")
+        with self.assertRaises(ValueError):
+            render(self.photo_bytes, output="file")
+        with self.assertRaises(TypeError):
+            render(12345)
+
+    def test_templates_shared_between_threads(self):
+        """
+        测试多个线程同时调用时共享同一个模板实例，输出一致
+        """
+        self.assertIs(get_template("黑色底边"), get_template("黑色底边"))
+        expected = render(self.photo_bytes, "黑色底边")
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(lambda _: render(self.photo_bytes, "黑色底边"), range(8)))
+        self.assertTrue(all(result == expected for result in results))
+
+    def test_no_stdout_or_tkinter_outside_project(self):
+        """
+        测试在其他工作目录中导入并调用时不向标准输出打印，也不导入tkinter
+        """
+        script = (
+            "import sys\n"
+            f"sys.path.insert(0, {PROJECT_ROOT!r})\n"
+            "from engine import render\n"
+            f"data = render(open({self.photo_path!r}, 'rb').read(), '黑色底边')\n"
+            "assert data[:2] == b'\\xff\\xd8'\n"
+            "assert 'tkinter' not in sys.modules\n"
+        )
+        completed = subprocess.run([sys.executable, "-c", script], cwd=self.temp_dir.name,
+                                   capture_output=True, text=True, encoding="utf-8")
+        self.assertEqual(completed.returncode, 0, completed.stderr)
+        self.assertEqual(completed.stdout, "")
+        # 配置文件和模板按项目目录查找，与当前工作目录无关
+        self.assertNotIn("配置文件", completed.stderr)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+本地HTTP渲染服务的单元测试
+测试上传照片渲染、错误状态码、队列满时返回503以及状态和指标接口
+"""
+
+import http.client
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+from urllib.parse import quote
+
+from PIL import Image
+
+# 将项目根目录添加到Python路径
+PROJECT_ROOT = os.path.dirname(os.path.abspath(os.path.join(__file__, "..")))
+sys.path.insert(0, PROJECT_ROOT)
+
+from engine import RenderService, RenderServer
+from utils.metrics import MetricsRegistry, RenderMetrics
+from entity.photo import Photo
+from template import get_template_context
+from benchmark.synthetic_corpus import generate_photo, CAMERAS
+
+
+class TestRenderService(unittest.TestCase):
+    """
+    测试本地HTTP渲染服务
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """
+        启动渲染服务
+        """
+        # 模板按当前工作目录查找logo
+        cls.previous_cwd = os.getcwd()
+        os.chdir(PROJECT_ROOT)
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        cls.photo_path = os.path.join(cls.temp_dir.name, "photo.jpg")
+        generate_photo(cls.photo_path, (800, 600), orientation=6, camera=CAMERAS[1])
+        with open(cls.photo_path, "rb") as f:
+            cls.photo_data = f.read()
+
+        cls.metrics = RenderMetrics(MetricsRegistry())
+        cls.service = RenderService(workers=1, max_queue=1, metrics=cls.metrics)
+        cls.service.warm_up()
+        cls.server = RenderServer(cls.service, port=0, default_template="白色底边")
+        cls.server.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        """
+        停止渲染服务并清理测试环境
+        """
+        cls.server.shutdown()
+        cls.temp_dir.cleanup()
+        os.chdir(cls.previous_cwd)
+
+    def request(self, method, path, body=None):
+        """
+        发送请求，返回(状态码, 响应头, 响应体)
+        """
+        connection = http.client.HTTPConnection("127.0.0.1", self.server.port, timeout=10)
+        try:
+            connection.request(method, quote(path, safe="/?=&"), body=body)
+            response = connection.getresponse()
+            return response.status, response.headers, response.read()
+        finally:
+            connection.close()
+
+    def test_render_streams_framed_jpeg(self):
+        """
+        测试上传照片后返回分块传输的JPEG，与直接使用模板渲染的尺寸一致
+        """
+        status, headers, body = self.request("POST", "/render?template=黑色底边&quality=85", self.photo_data)
+        self.assertEqual(status, 200)
+        self.assertEqual(headers["Content-Type"], "image/jpeg")
+        self.assertEqual(headers["Transfer-Encoding"], "chunked")
+
+        with Photo(self.photo_path) as photo:
+            photo.decode()
+            photo.fix_orientation()
+            expected = get_template_context().get_template("黑色底边").render(photo)
+        with Image.open(io.BytesIO(body)) as framed:
+            self.assertEqual(framed.format, "JPEG")
+            self.assertEqual(framed.size, expected.size)
+        self.assertGreaterEqual(self.metrics.rendered.get(template="黑色底边"), 1)
+
+    def test_errors(self):
+        """
+        测试未知模板、无效参数和无法解析的照片返回对应的状态码
+        """
+        self.assertEqual(self.request("POST", "/render?template=不存在", self.photo_data)[0], 404)
+        self.assertEqual(self.request("POST", "/render?quality=abc", self.photo_data)[0], 400)
+        status, _, body = self.request("POST", "/render", b"not a jpeg")
+        self.assertEqual(status, 422)
+        self.assertIn("error", json.loads(body))
+        self.assertEqual(self.request("GET", "/unknown")[0], 404)
+
+    def test_backpressure_returns_503(self):
+        """
+        测试处理中和排队中的请求数达到上限时返回503
+        """
+        with self.service.admit(), self.service.admit():
+            status, headers, _ = self.request("POST", "/render", self.photo_data)
+        self.assertEqual(status, 503)
+        self.assertEqual(headers["Retry-After"], "1")
+        self.assertEqual(self.request("POST", "/render", self.photo_data)[0], 200)
+
+    def test_status_endpoints(self):
+        """
+        测试模板列表、状态和指标接口
+        """
+        status, _, body = self.request("GET", "/templates")
+        self.assertEqual(status, 200)
+        self.assertEqual(json.loads(body)["default"], "白色底边")
+        status, _, body = self.request("GET", "/healthz")
+        health = json.loads(body)
+        self.assertEqual((health["workers"], health["max_queue"]), (1, 1))
+        self.assertLessEqual(health["active"] + health["queued"], 2)
+        status, _, body = self.request("GET", "/metrics")
+        self.assertEqual(status, 200)
+        self.assertIn("photo_frame_queue_depth", body.decode("utf-8"))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
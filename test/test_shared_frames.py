@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+共享内存帧池的单元测试
+测试共享内存块的分配与回收、不复制地读取帧、容量检查，以及工作进程渲染后经共享内存交给主进程编码
+"""
+
+import http.client
+import io
+import os
+import sys
+import tempfile
+import unittest
+
+from PIL import Image
+
+# 将项目根目录添加到Python路径
+PROJECT_ROOT = os.path.dirname(os.path.abspath(os.path.join(__file__, "..")))
+sys.path.insert(0, PROJECT_ROOT)
+
+from engine import RenderService, RenderServer
+from engine.shared_frames import SharedFramePool, FrameTooLarge, write_frame
+from engine.worker_pool import IsolatedWorkerPool, FrameTask, render_frame_task, WorkerTaskError
+from benchmark.synthetic_corpus import generate_photo
+
+
+class TestSharedFramePool(unittest.TestCase):
+    """
+    测试共享内存帧池
+    """
+
+    def test_acquire_release_and_timeout(self):
+        """
+        测试共享内存块按数量分配，用完时等待超时，归还后可以再次取出
+        """
+        with SharedFramePool(2, 1024) as pool:
+            first = pool.acquire()
+            second = pool.acquire()
+            self.assertNotEqual(first.name, second.name)
+            self.assertEqual(pool.free_slots(), 0)
+            with self.assertRaises(TimeoutError):
+                pool.acquire(timeout=0.05)
+            pool.release(first)
+            self.assertEqual(pool.acquire(timeout=0.05), first)
+
+    def test_for_budget(self):
+        """
+        测试按同时渲染的照片数和单帧最大像素数分配共享内存
+        """
+        with SharedFramePool.for_budget(workers=3, max_frame_pixels=1000) as pool:
+            self.assertEqual(pool.slots, 3)
+            self.assertEqual(pool.slot_bytes, 4000)
+
+    def test_write_and_open_without_copy(self):
+        """
+        测试写入的帧不复制地读取为只读图片，像素与原图一致
+        """
+        image = Image.effect_mandelbrot((300, 700), (-2, -1.5, 1, 1.5), 50).convert("RGB")
+        with SharedFramePool(1, 300 * 700 * 4) as pool:
+            slot = pool.acquire()
+            frame = write_frame(image, slot)
+            self.assertEqual((frame.mode, frame.size), ("RGBX", (300, 700)))
+            with pool.open(slot, frame) as shared:
+                self.assertTrue(shared.readonly)
+                self.assertEqual(shared.convert("RGB").tobytes(), image.tobytes())
+                buffer = io.BytesIO()
+                shared.save(buffer, "JPEG")
+            pool.release(slot)
+        with Image.open(buffer) as encoded:
+            self.assertEqual(encoded.size, (300, 700))
+
+    def test_frame_too_large(self):
+        """
+        测试图片超过共享内存块容量时抛出FrameTooLarge
+        """
+        with SharedFramePool(1, 100) as pool:
+            with self.assertRaises(FrameTooLarge):
+                write_frame(Image.new("RGB", (10, 10)), pool.acquire())
+
+
+class TestIsolatedFrameRendering(unittest.TestCase):
+    """
+    测试工作进程渲染、主进程编码
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """
+        生成测试照片
+        """
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        cls.photo_path = os.path.join(cls.temp_dir.name, "photo.jpg")
+        generate_photo(cls.photo_path, (600, 400), index=1)
+        with open(cls.photo_path, "rb") as f:
+            cls.photo_data = f.read()
+
+    @classmethod
+    def tearDownClass(cls):
+        """
+        清理测试环境
+        """
+        cls.temp_dir.cleanup()
+
+    def test_render_frame_task(self):
+        """
+        测试工作进程把渲染结果写入共享内存，无法解析的照片作为处理失败返回
+        """
+        with SharedFramePool.for_budget(workers=1, max_frame_pixels=2_000_000) as frames, \
+                IsolatedWorkerPool(render_frame_task, workers=1) as pool:
+            slot = frames.acquire()
+            frame = pool.run(FrameTask(self.photo_data, slot, "photo.jpg", "黑色底边"))
+            self.assertEqual(frame.slot, slot.name)
+            self.assertEqual(frame.size[0], 600)
+            self.assertGreater(frame.size[1], 400)
+            with frames.open(slot, frame) as framed:
+                self.assertEqual(framed.getpixel((300, frame.size[1] - 1))[:3], (0, 0, 0))
+            with self.assertRaises(WorkerTaskError):
+                pool.run(FrameTask(b"not a jpeg", slot))
+            frames.release(slot)
+
+    def test_isolated_render_service(self):
+        """
+        测试隔离模式的渲染服务返回与进程内渲染尺寸一致的JPEG
+        """
+        service = RenderService(workers=1, isolate=True, max_frame_pixels=2_000_000)
+        server = RenderServer(service, port=0, default_template="白色底边")
+        server.start()
+        try:
+            connection = http.client.HTTPConnection("127.0.0.1", server.port, timeout=60)
+            connection.request("POST", "/render", body=self.photo_data)
+            response = connection.getresponse()
+            body = response.read()
+            connection.close()
+            self.assertEqual(response.status, 200)
+            expected = RenderService(workers=1).render(self.photo_data, "白色底边")
+            with Image.open(io.BytesIO(body)) as framed:
+                self.assertEqual(framed.format, "JPEG")
+                self.assertEqual(framed.size, expected.size)
+            self.assertEqual(service.render(self.photo_data, "白色底边").mode, "RGB")
+        finally:
+            server.shutdown()
+            service.close()
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+资源释放和长时间运行的soak测试
+测试Photo关闭后释放文件句柄，以及循环处理大量照片后文件描述符和常驻内存保持平稳
+
+默认处理次数较少以便快速运行，可通过环境变量SOAK_RENDERS调大（如10000）
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+# 将项目根目录添加到Python路径
+PROJECT_ROOT = os.path.dirname(os.path.abspath(os.path.join(__file__, "..")))
+sys.path.insert(0, PROJECT_ROOT)
+
+from PIL import Image
+
+from entity.photo import Photo
+from template import get_template_context
+from benchmark.soak import open_fd_count, generate_soak_photos, run_soak
+
+SOAK_RENDERS = int(os.environ.get("SOAK_RENDERS", "200"))
+MAX_RSS_GROWTH_MB = 32
+
+
+@unittest.skipIf(open_fd_count() is None, "无法统计打开的文件描述符")
+class TestSoak(unittest.TestCase):
+    """
+    测试资源释放
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """
+        生成测试照片
+        """
+        # 模板按当前工作目录查找logo
+        cls.previous_cwd = os.getcwd()
+        os.chdir(PROJECT_ROOT)
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        cls.photo_paths = generate_soak_photos(cls.temp_dir.name, size=(600, 400))
+
+    @classmethod
+    def tearDownClass(cls):
+        """
+        清理测试环境
+        """
+        cls.temp_dir.cleanup()
+        os.chdir(cls.previous_cwd)
+
+    def test_photo_close_releases_file_handle(self):
+        """
+        测试未解码的Photo关闭后释放文件句柄，且close()可重复调用
+        """
+        before = open_fd_count()
+        photo = Photo(self.photo_paths[0])
+        self.assertEqual(open_fd_count(), before + 1)
+        photo.close()
+        photo.close()
+        self.assertEqual(open_fd_count(), before)
+        self.assertIsNone(photo.img)
+
+        with Photo(self.photo_paths[1]) as photo:
+            photo.decode()
+            photo.fix_orientation()
+        self.assertEqual(open_fd_count(), before)
+
+    def test_fd_count_detects_unclosed_images(self):
+        """
+        测试采样能发现未关闭的图片文件
+        """
+        before = open_fd_count()
+        images = [Image.open(path) for path in self.photo_paths]
+        self.assertEqual(open_fd_count(), before + len(images))
+        for image in images:
+            image.close()
+        self.assertEqual(open_fd_count(), before)
+
+    def test_long_run_keeps_fds_and_rss_flat(self):
+        """
+        测试循环处理照片后文件描述符不增长，常驻内存保持平稳
+        """
+        result = run_soak(self.photo_paths, SOAK_RENDERS, get_template_context().get_all_template_names())
+        self.assertEqual(result["fd_growth"], 0, result["samples"])
+        self.assertLess(result["rss_growth_mb"], MAX_RSS_GROWTH_MB, result["samples"])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+声明式模板的单元测试
+测试模板描述编译为底边模板、与Python编写的模板输出一致、参数校验，以及从描述文件加载时跳过无效的模板
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+from PIL import ImageChops
+
+# 将项目根目录添加到Python路径
+sys.path.insert(0, os.path.dirname(os.path.abspath(os.path.join(__file__, ".."))))
+
+from entity.photo import Photo
+from template import get_template_context
+from template.bottom_bar_template import BarLayout, BottomBarTemplate
+from template.impl.black_bottom_template import BlackBottomTemplate
+from template.spec_compiler import TemplateSpecError, compile_template_spec, compile_template_specs
+from utils.canvas_pool import release_canvas
+from benchmark.synthetic_corpus import generate_photo, CAMERAS
+
+
+def make_spec(**overrides):
+    spec = {
+        "class_name": "TestSpecTemplate",
+        "name": "测试模板",
+        "colors": {"background": "black", "text": "white", "line": "white"}
+    }
+    spec.update(overrides)
+    return spec
+
+
+class TestSpecCompiler(unittest.TestCase):
+    """
+    测试声明式模板的编译
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """
+        生成带EXIF的测试照片
+        """
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        cls.photo_path = os.path.join(cls.temp_dir.name, "photo.jpg")
+        generate_photo(cls.photo_path, (800, 600), index=1, camera=CAMERAS[0])
+
+    @classmethod
+    def tearDownClass(cls):
+        """
+        清理测试环境
+        """
+        cls.temp_dir.cleanup()
+
+    def render(self, template):
+        with Photo(self.photo_path) as photo:
+            photo.decode()
+            photo.fix_orientation()
+            return template.create_frame(photo)
+
+    def test_default_spec_matches_black_bottom(self):
+        """
+        测试只指定黑底配色的模板描述与黑色底边模板的输出一致
+        """
+        template_class = compile_template_spec(make_spec())
+        self.assertTrue(issubclass(template_class, BottomBarTemplate))
+        self.assertEqual(template_class.__name__, "TestSpecTemplate")
+        self.assertEqual(template_class.LAYOUT, BarLayout())
+
+        expected = self.render(BlackBottomTemplate()).copy()
+        framed = self.render(template_class())
+        self.assertIsNone(ImageChops.difference(framed, expected).getbbox())
+        release_canvas(framed)
+
+    def test_fonts_layout_and_fields(self):
+        """
+        测试字体、布局和显示参数编译为类属性，并影响横条布局
+        """
+        template_class = compile_template_spec(make_spec(
+            fonts={"model": {"family": "Arial Bold", "size": 0.04, "min_size": 20}},
+            layout={"bar_height": 0.12, "line_width": 2},
+            fields=["相机型号", "光圈"],
+            logo_adjust=False
+        ))
+        template = template_class()
+        self.assertEqual(template.name, "测试模板")
+        self.assertEqual(template.LAYOUT.model_font, "Arial Bold")
+        self.assertEqual(template.LAYOUT.model_font_min_size, 20)
+        self.assertEqual(template.LAYOUT.lens_font_size, BarLayout().lens_font_size)
+        self.assertEqual(template.SELECTED_PARAMS, ["相机型号", "光圈"])
+        self.assertEqual(template.LOGO_ADJUST_BACKGROUNDS, [])
+
+        with Photo(self.photo_path) as photo:
+            plan = template.plan_bar(photo, 800, 600)
+        self.assertEqual(plan.height, int(600 * 0.12))
+        self.assertEqual(len(plan.left_items), 1)
+        self.assertIsNone(plan.second_line)
+
+    def test_invalid_specs(self):
+        """
+        测试无效的模板描述抛出TemplateSpecError
+        """
+        invalid = {
+            "missing name": make_spec(name=""),
+            "bad class name": make_spec(class_name="not a class"),
+            "bad color": make_spec(colors={"background": "blackish", "text": "white"}),
+            "missing text color": make_spec(colors={"background": "black"}),
+            "unknown key": make_spec(colour="red"),
+            "unknown layout": make_spec(layout={"bar_hieght": 0.1}),
+            "font in layout": make_spec(layout={"model_font": "Arial"}),
+            "negative ratio": make_spec(layout={"bar_height": -0.1}),
+            "fractional pixels": make_spec(layout={"line_width": 1.5}),
+            "unknown font role": make_spec(fonts={"title": {"size": 0.02}}),
+            "min size on details": make_spec(fonts={"details": {"min_size": 10}}),
+            "unknown field": make_spec(fields=["相机型号", "快门"]),
+            "empty fields": make_spec(fields=[])
+        }
+        for case, spec in invalid.items():
+            with self.subTest(case=case), self.assertRaises(TemplateSpecError):
+                compile_template_spec(spec)
+
+    def test_compile_spec_file(self):
+        """
+        测试从描述文件编译模板时跳过无效的模板，文件不存在时返回空列表
+        """
+        path = os.path.join(self.temp_dir.name, "frame_templates.yml")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(
+                "templates:\n"
+                "  - class_name: GoodTemplate\n"
+                "    name: 好模板\n"
+                "    colors: {background: '#202020', text: white}\n"
+                "  - class_name: BadTemplate\n"
+                "    name: 坏模板\n"
+                "    colors: {background: '#202020', text: nope}\n"
+            )
+        with self.assertLogs("template.spec_compiler", level="ERROR"):
+            template_classes = compile_template_specs(path)
+        self.assertEqual([cls.__name__ for cls in template_classes], ["GoodTemplate"])
+        self.assertEqual(template_classes[0].LINE_COLOR, "white")
+        self.assertEqual(compile_template_specs(os.path.join(self.temp_dir.name, "missing.yml")), [])
+
+    def test_bundled_specs_registered(self):
+        """
+        测试项目中frame_templates.yml描述的模板已注册
+        """
+        template = get_template_context().get_template("灰色底边")
+        self.assertIsInstance(template, BottomBarTemplate)
+        self.assertEqual(type(template).__name__, "GrayBottomTemplate")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
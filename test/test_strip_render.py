@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+分条渲染的单元测试
+测试按行段读取未压缩照片（包括平面TIFF）、PNG流式写入、分条渲染结果与整张渲染一致，以及不支持的格式和解压炸弹保护
+"""
+
+import io
+import os
+import struct
+import sys
+import tempfile
+import unittest
+import warnings
+
+from PIL import Image, ImageChops
+
+# 将项目根目录添加到Python路径
+sys.path.insert(0, os.path.dirname(os.path.abspath(os.path.join(__file__, ".."))))
+
+from engine import render
+from engine.strip_render import BandSource, StripUnsupported, render_strips
+from entity.photo import Photo
+from template import get_template_context
+from utils.image_io import PNGStreamWriter
+from benchmark.synthetic_corpus import generate_photo, CAMERAS
+
+
+def write_planar_tiff(path, image, rows_per_strip):
+    """
+    按通道分开存储（PlanarConfiguration=2）写出未压缩的RGB TIFF，Pillow不能保存这种格式
+    """
+    width, height = image.size
+    strips = []
+    for plane in image.split():
+        data = plane.tobytes()
+        for top in range(0, height, rows_per_strip):
+            strips.append(data[top * width:min(top + rows_per_strip, height) * width])
+
+    # (标签, 类型, 数量, 值)，值为空的项指向IFD之后的数组
+    entries = [(256, 3, 1, width), (257, 3, 1, height), (258, 3, 3, None), (259, 3, 1, 1), (262, 3, 1, 2),
+               (273, 4, len(strips), None), (277, 3, 1, 3), (278, 3, 1, rows_per_strip),
+               (279, 4, len(strips), None), (284, 3, 1, 2)]
+    bits_offset = 8 + 2 + 12 * len(entries) + 4
+    offsets_offset = bits_offset + 6
+    counts_offset = offsets_offset + 4 * len(strips)
+    arrays = {258: bits_offset, 273: offsets_offset, 279: counts_offset}
+    offsets = []
+    position = counts_offset + 4 * len(strips)
+    for strip in strips:
+        offsets.append(position)
+        position += len(strip)
+
+    data = bytearray(b"II*\x00" + struct.pack("<I", 8) + struct.pack("<H", len(entries)))
+    for tag, kind, count, value in entries:
+        if value is None:
+            data += struct.pack("<HHII", tag, kind, count, arrays[tag])
+        else:
+            data += struct.pack("<HHIHH", tag, kind, count, value, 0)
+    data += struct.pack("<I", 0) + struct.pack("<3H", 8, 8, 8)
+    data += struct.pack(f"<{len(strips)}I", *offsets) + struct.pack(f"<{len(strips)}I", *map(len, strips))
+    with open(path, "wb") as f:
+        f.write(bytes(data) + b"".join(strips))
+
+
+class TestStripRender(unittest.TestCase):
+    """
+    测试分条渲染
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """
+        生成带EXIF的测试照片，并另存为未压缩的TIFF、PPM和BMP
+        """
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        jpeg_path = cls.path("photo.jpg")
+        generate_photo(jpeg_path, (900, 420), index=3, camera=CAMERAS[0])
+        with Image.open(jpeg_path) as source:
+            cls.pixels = source.convert("RGB")
+            exif = source.getexif()
+        cls.pixels.save(cls.path("photo.tif"), exif=exif)
+        cls.pixels.save(cls.path("photo.ppm"))
+        cls.pixels.save(cls.path("photo.bmp"))
+
+    @classmethod
+    def tearDownClass(cls):
+        """
+        清理测试环境
+        """
+        cls.temp_dir.cleanup()
+
+    @classmethod
+    def path(cls, name):
+        return os.path.join(cls.temp_dir.name, name)
+
+    def test_band_source_reads_rows(self):
+        """
+        测试按行段读取的像素与整张解码一致（包括从下到上存储的BMP）
+        """
+        for name in ("photo.tif", "photo.ppm", "photo.bmp"):
+            with self.subTest(name=name), BandSource(self.path(name)) as source:
+                self.assertEqual(source.size, (900, 420))
+                band = source.read(100, 257)
+                self.assertEqual(band.size, (900, 157))
+                self.assertEqual(band.tobytes(), self.pixels.crop((0, 100, 900, 257)).tobytes())
+
+    def test_planar_tiff(self):
+        """
+        测试各通道分开存储的平面TIFF按行段读取时合并各通道，分条渲染输出与整张渲染一致
+        """
+        planar_path = self.path("planar.tif")
+        write_planar_tiff(planar_path, self.pixels, rows_per_strip=64)
+        with Image.open(planar_path) as decoded:
+            self.assertEqual(decoded.convert("RGB").tobytes(), self.pixels.tobytes())
+
+        with BandSource(planar_path) as source:
+            band = source.read(100, 257)
+            self.assertEqual(band.tobytes(), self.pixels.crop((0, 100, 900, 257)).tobytes())
+
+        output = io.BytesIO()
+        render_strips(planar_path, output, "黑色底边", band_bytes=900 * 4 * 50)
+        expected = render(planar_path, "黑色底边", output="image")
+        with Image.open(io.BytesIO(output.getvalue())) as framed:
+            self.assertIsNone(ImageChops.difference(framed.convert("RGB"), expected.convert("RGB")).getbbox())
+
+    def test_png_stream_writer(self):
+        """
+        测试逐段写入的PNG可以正常读取，行数不足时报错
+        """
+        buffer = io.BytesIO()
+        writer = PNGStreamWriter(buffer, self.pixels.size)
+        for top in range(0, self.pixels.height, 100):
+            writer.write(self.pixels.crop((0, top, self.pixels.width, min(top + 100, self.pixels.height))))
+        writer.close()
+        with Image.open(io.BytesIO(buffer.getvalue())) as decoded:
+            self.assertEqual(decoded.tobytes(), self.pixels.tobytes())
+
+        writer = PNGStreamWriter(io.BytesIO(), (10, 10))
+        writer.write(Image.new("RGB", (10, 4)))
+        with self.assertRaises(ValueError):
+            writer.close()
+
+    def test_bar_rows_match_full_bar(self):
+        """
+        测试分段渲染的信息横条拼起来与整条横条一致
+        """
+        template = get_template_context().get_template("黑色底边")
+        with Photo(self.path("photo.jpg")) as photo:
+            plan = template.plan_bar(photo, 900, 420)
+        full = template.render_bar_rows(plan, 0, plan.height)
+        expected = template.render_static_bar(plan).copy()
+        template.draw_dynamic_text(expected, plan, 0)
+        self.assertIsNone(ImageChops.difference(full, expected).getbbox())
+
+        pieces = Image.new("RGB", full.size)
+        for top in range(0, plan.height, 5):
+            pieces.paste(template.render_bar_rows(plan, top, min(top + 5, plan.height)), (0, top))
+        self.assertIsNone(ImageChops.difference(pieces, full).getbbox())
+
+    def test_matches_full_render(self):
+        """
+        测试分条渲染输出与整张渲染一致
+        """
+        output_path = self.path("framed.png")
+        size = render_strips(self.path("photo.tif"), output_path, "黑色底边", band_bytes=900 * 4 * 64)
+        expected = render(self.path("photo.tif"), "黑色底边", output="image")
+        self.assertEqual(size, expected.size)
+        with Image.open(output_path) as framed:
+            self.assertIsNone(ImageChops.difference(framed.convert("RGB"), expected.convert("RGB")).getbbox())
+
+    def test_unsupported_sources(self):
+        """
+        测试JPEG和压缩TIFF不支持分条渲染
+        """
+        self.pixels.save(self.path("compressed.tif"), compression="tiff_lzw")
+        for name in ("photo.jpg", "compressed.tif"):
+            with self.subTest(name=name), self.assertRaises(StripUnsupported):
+                render_strips(self.path(name), io.BytesIO(), "黑色底边")
+
+    def test_not_limited_by_decompression_bomb_guard(self):
+        """
+        测试超过Pillow解压炸弹上限的照片可以分条渲染
+        """
+        previous = Image.MAX_IMAGE_PIXELS
+        Image.MAX_IMAGE_PIXELS = 100_000
+        try:
+            with self.assertRaises(Image.DecompressionBombError):
+                Image.open(self.path("photo.tif"))
+            with warnings.catch_warnings():
+                warnings.simplefilter("error", Image.DecompressionBombWarning)
+                output = io.BytesIO()
+                render_strips(self.path("photo.tif"), output, "白色底边", band_bytes=900 * 4 * 50)
+        finally:
+            Image.MAX_IMAGE_PIXELS = previous
+        with Image.open(io.BytesIO(output.getvalue())) as framed:
+            self.assertEqual(framed.width, 900)
+            self.assertGreater(framed.height, 420)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -6,6 +6,7 @@
 
 import os
 import sys
+import tempfile
 import unittest
 from PIL import Image
 
@@ -14,6 +15,7 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(os.path.join(__file__, ".."))
 
 from template.template_context import get_template_context
 from entity.photo import Photo
+from benchmark.synthetic_corpus import generate_photo, CAMERAS
 
 
 class TestTemplateContext(unittest.TestCase):
@@ -36,6 +38,21 @@ class TestTemplateContext(unittest.TestCase):
         # 获取测试照片路径
         self.test_photo_path1 = os.path.join(self.test_photos_dir, "DSC_0268.JPG")
         self.test_photo_path2 = os.path.join(self.test_photos_dir, "DSC_0269.JPG")
+        
+        # 测试照片不在仓库中时，使用合成照片（有Logo和没有Logo的品牌各一张）
+        self.temp_dir = tempfile.TemporaryDirectory()
+        if not os.path.exists(self.test_photo_path1):
+            self.test_photo_path1 = os.path.join(self.temp_dir.name, "DSC_0268.JPG")
+            generate_photo(self.test_photo_path1, (1200, 800), orientation=1, camera=CAMERAS[0])
+        if not os.path.exists(self.test_photo_path2):
+            self.test_photo_path2 = os.path.join(self.temp_dir.name, "DSC_0269.JPG")
+            generate_photo(self.test_photo_path2, (1200, 800), orientation=6, camera=CAMERAS[3], index=1)
+    
+    def tearDown(self):
+        """
+        清理测试环境
+        """
+        self.temp_dir.cleanup()
     
     def test_get_template_context(self):
         """
@@ -56,9 +73,11 @@ class TestTemplateContext(unittest.TestCase):
         测试获取所有模板名称
         """
         template_names = self.template_context.get_all_template_names()
-        self.assertEqual(len(template_names), 2)
+        self.assertEqual(len(template_names), 4)
         self.assertIn("黑色底边", template_names)
         self.assertIn("白色底边", template_names)
+        self.assertIn("模糊背景", template_names)
+        self.assertIn("灰色底边", template_names)
     
     def test_get_template(self):
         """
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+文本测量缓存的单元测试
+测试测量缓存命中和按宽度截断的求解结果
+"""
+
+import os
+import sys
+import unittest
+from PIL import ImageFont
+
+# 将项目根目录添加到Python路径
+sys.path.insert(0, os.path.dirname(os.path.abspath(os.path.join(__file__, ".."))))
+
+from utils.text_measure import TextMeasureCache, ELLIPSIS
+
+
+class TestTextMeasureCache(unittest.TestCase):
+    """
+    测试文本测量缓存的功能
+    """
+
+    def setUp(self):
+        """
+        设置测试环境
+        """
+        self.cache = TextMeasureCache()
+        self.font = ImageFont.load_default()
+
+    def test_measure_is_cached(self):
+        """
+        测试重复测量同一文本时命中缓存
+        """
+        width = self.cache.text_width(self.font, "NIKON Z 6_2")
+        self.assertEqual(width, self.font.getbbox("NIKON Z 6_2")[2])
+        self.cache.text_width(self.font, "NIKON Z 6_2")
+        stats = self.cache.stats()
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["hits"], 1)
+
+    def test_fit_text_keeps_short_text(self):
+        """
+        测试能放下的文本保持不变
+        """
+        text = "ISO100"
+        width = self.cache.text_width(self.font, text)
+        self.assertEqual(self.cache.fit_text(self.font, text, width), text)
+
+    def test_fit_text_finds_longest_prefix(self):
+        """
+        测试截断结果是能放下的最长前缀加省略号
+        """
+        text = "NIKKOR Z 24-70mm f/2.8 S"
+        max_width = self.cache.text_width(self.font, text) // 2
+        fitted = self.cache.fit_text(self.font, text, max_width)
+
+        self.assertTrue(fitted.endswith(ELLIPSIS))
+        self.assertLessEqual(self.cache.text_width(self.font, fitted), max_width)
+
+        # 再多保留一个字符就会超出宽度
+        prefix_length = len(fitted) - len(ELLIPSIS)
+        longer = text[:prefix_length + 1].rstrip() + ELLIPSIS
+        self.assertGreater(self.cache.text_width(self.font, longer), max_width)
+
+    def test_fit_text_returns_empty_when_nothing_fits(self):
+        """
+        测试连省略号都放不下时返回空字符串
+        """
+        self.assertEqual(self.cache.fit_text(self.font, "Canon EOS R5", 1), "")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+文本精灵缓存的单元测试
+测试精灵粘贴结果与直接绘制一致，以及缓存的命中统计和容量限制
+"""
+
+import os
+import sys
+import unittest
+from PIL import Image, ImageChops, ImageDraw, ImageFont
+
+# 将项目根目录添加到Python路径
+sys.path.insert(0, os.path.dirname(os.path.abspath(os.path.join(__file__, ".."))))
+
+from utils.text_sprite import TextSpriteCache
+
+
+class TestTextSpriteCache(unittest.TestCase):
+    """
+    测试文本精灵缓存的功能
+    """
+
+    def setUp(self):
+        """
+        设置测试环境
+        """
+        self.cache = TextSpriteCache()
+        self.font = ImageFont.load_default()
+        self.text = "50.0mm  F2.8  1/250s  ISO400"
+
+    def test_sprite_matches_draw_text(self):
+        """
+        测试粘贴精灵与ImageDraw.text的绘制结果像素一致
+        """
+        for fill, background in (("white", "black"), ("black", "white")):
+            expected = Image.new("RGB", (300, 40), background)
+            ImageDraw.Draw(expected).text((7, 9), self.text, fill=fill, font=self.font)
+
+            actual = Image.new("RGB", (300, 40), background)
+            self.cache.draw_text(actual, (7, 9), self.text, self.font, fill)
+
+            self.assertIsNone(ImageChops.difference(expected, actual).getbbox())
+
+    def test_hit_and_miss_counters(self):
+        """
+        测试重复绘制同一文本时命中缓存
+        """
+        image = Image.new("RGB", (300, 40), "black")
+        for _ in range(3):
+            self.cache.draw_text(image, (0, 0), self.text, self.font, "white")
+        self.cache.draw_text(image, (0, 0), self.text, self.font, "black")
+
+        stats = self.cache.stats()
+        self.assertEqual(stats["misses"], 2)
+        self.assertEqual(stats["hits"], 2)
+        self.assertEqual(stats["entries"], 2)
+
+    def test_cache_is_bounded(self):
+        """
+        测试缓存占用超出预算时淘汰旧精灵
+        """
+        sprite_bytes = self.cache.get_sprite("ISO100", self.font, "white").nbytes
+        cache = TextSpriteCache(max_bytes=sprite_bytes * 3)
+        for iso in range(100, 200):
+            cache.get_sprite(f"ISO{iso}", self.font, "white")
+
+        stats = cache.stats()
+        self.assertLessEqual(stats["bytes"], sprite_bytes * 3)
+        self.assertLess(stats["entries"], 100)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+缩略图加载工具的单元测试
+测试EXIF嵌入缩略图的读取、草稿模式回退以及后台加载顺序和缓存上限
+"""
+
+import io
+import os
+import struct
+import sys
+import tempfile
+import threading
+import unittest
+from PIL import Image
+
+# 将项目根目录添加到Python路径
+sys.path.insert(0, os.path.dirname(os.path.abspath(os.path.join(__file__, ".."))))
+
+from utils.exif_reader import read_exif_thumbnail, read_exif_tags
+from utils.thumbnail_loader import load_thumbnail, ThumbnailLoader
+
+
+def build_exif_with_thumbnail(thumbnail_data, orientation=1):
+    """
+    构造带IFD1缩略图的EXIF数据（小端字节序）
+    """
+    ifd0_offset = 8
+    ifd0 = struct.pack("<H", 1) + struct.pack("<HHLHH", 0x0112, 3, 1, orientation, 0)
+    ifd1_offset = ifd0_offset + len(ifd0) + 4
+    ifd0 += struct.pack("<L", ifd1_offset)
+    thumbnail_offset = ifd1_offset + 2 + 2 * 12 + 4
+    ifd1 = struct.pack("<H", 2)
+    ifd1 += struct.pack("<HHLL", 0x0201, 4, 1, thumbnail_offset)
+    ifd1 += struct.pack("<HHLL", 0x0202, 4, 1, len(thumbnail_data))
+    ifd1 += struct.pack("<L", 0)
+    return b"Exif\x00\x00" + b"II*\x00" + struct.pack("<L", ifd0_offset) + ifd0 + ifd1 + thumbnail_data
+
+
+class TestThumbnailLoader(unittest.TestCase):
+    """
+    测试缩略图加载
+    """
+
+    def setUp(self):
+        """
+        设置测试环境
+        """
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        """
+        清理测试环境
+        """
+        self.temp_dir.cleanup()
+
+    def save_photo(self, name, color="gray", thumbnail_color=None, orientation=1, size=(320, 240)):
+        """
+        生成测试照片，thumbnail_color不为空时嵌入该颜色的EXIF缩略图
+        """
+        path = os.path.join(self.temp_dir.name, name)
+        kwargs = {}
+        if thumbnail_color:
+            buffer = io.BytesIO()
+            Image.new("RGB", (160, 120), thumbnail_color).save(buffer, "JPEG")
+            kwargs["exif"] = build_exif_with_thumbnail(buffer.getvalue(), orientation)
+        Image.new("RGB", size, color).save(path, **kwargs)
+        return path
+
+    def test_read_embedded_thumbnail(self):
+        """
+        测试读取EXIF中嵌入的缩略图，同时不影响普通标签的读取
+        """
+        path = self.save_photo("thumb.jpg", thumbnail_color="red", orientation=6)
+        data = read_exif_thumbnail(path)
+        self.assertTrue(data.startswith(b"\xff\xd8"))
+        self.assertEqual(read_exif_tags(path, ["Orientation"]), {"Orientation": 6})
+        self.assertIsNone(read_exif_thumbnail(self.save_photo("plain.jpg")))
+
+    def test_load_thumbnail_prefers_embedded_and_applies_orientation(self):
+        """
+        测试优先使用嵌入缩略图并按EXIF方向旋转
+        """
+        path = self.save_photo("thumb.jpg", color="blue", thumbnail_color="red", orientation=6)
+        thumbnail = load_thumbnail(path, (48, 48))
+        self.assertEqual(thumbnail.size, (36, 48))
+        red, green, blue = thumbnail.getpixel((18, 24))
+        self.assertGreater(red, 200)
+        self.assertLess(blue, 50)
+
+    def test_load_thumbnail_falls_back_to_draft_decode(self):
+        """
+        测试没有嵌入缩略图时解码原图生成
+        """
+        path = self.save_photo("plain.jpg", color="blue", size=(640, 480))
+        thumbnail = load_thumbnail(path, (48, 48))
+        self.assertEqual(thumbnail.size, (48, 36))
+        self.assertGreater(thumbnail.getpixel((24, 18))[2], 200)
+
+    def test_loader_order_and_cache_bound(self):
+        """
+        测试后台加载按请求顺序进行，并且缓存数量不超过上限
+        """
+        paths = [self.save_photo(f"{i}.jpg") for i in range(4)]
+        loaded = []
+        done = threading.Event()
+
+        def callback(path, thumbnail):
+            loaded.append(path)
+            if len(loaded) == 3:
+                done.set()
+
+        loader = ThumbnailLoader(callback, max_items=2)
+        try:
+            loader.request([paths[2], paths[0], paths[3], paths[0]])
+            self.assertTrue(done.wait(5))
+            self.assertEqual(loaded, [paths[2], paths[0], paths[3]])
+            self.assertIsNone(loader.get(paths[2]))
+            self.assertIsNotNone(loader.get(paths[3]))
+            self.assertEqual(loader.stats()["items"], 2)
+        finally:
+            loader.close()
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+进程隔离工作进程池的单元测试
+测试正常结果、处理异常、超时和崩溃后的重试与隔离清单、内存上限、取消和等待超时，以及卡住的照片不影响其他照片
+"""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+import unittest
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+# 将项目根目录添加到Python路径
+sys.path.insert(0, os.path.dirname(os.path.abspath(os.path.join(__file__, ".."))))
+
+from PIL import Image
+
+from engine.async_batch import AsyncBatch
+from engine.worker_pool import IsolatedWorkerPool, RenderTask, render_task, WorkerTaskError, QuarantinedError
+from utils.memory_profiler import process_rss
+from benchmark.synthetic_corpus import generate_photo
+
+
+def fail_or_double(value):
+    """
+    负数时抛出异常
+    """
+    if value < 0:
+        raise ValueError("negative")
+    return value * 2
+
+
+def hang_or_double(value):
+    """
+    输入为hang时一直不返回
+    """
+    if value == "hang":
+        time.sleep(3600)
+    return value * 2
+
+
+def crash(value):
+    """
+    直接结束进程，模拟解码器崩溃
+    """
+    os._exit(3)
+
+
+def allocate(megabytes):
+    """
+    分配大块内存后等待
+    """
+    data = bytearray(megabytes * 1024 * 1024)
+    time.sleep(3600)
+    return len(data)
+
+
+class TestIsolatedWorkerPool(unittest.TestCase):
+    """
+    测试进程隔离的工作进程池
+    """
+
+    def setUp(self):
+        """
+        设置测试环境
+        """
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.quarantine_file = os.path.join(self.temp_dir.name, "quarantine.jsonl")
+
+    def tearDown(self):
+        """
+        清理测试环境
+        """
+        self.temp_dir.cleanup()
+
+    def read_quarantine(self):
+        """
+        读取隔离清单
+        """
+        with open(self.quarantine_file, "r", encoding="utf-8") as f:
+            return [json.loads(line) for line in f]
+
+    def test_results_and_task_errors(self):
+        """
+        测试返回处理结果，处理函数的异常不重试也不隔离
+        """
+        with IsolatedWorkerPool(fail_or_double, workers=2, quarantine_file=self.quarantine_file) as pool:
+            futures = [pool.submit(value) for value in (1, -1, 3)]
+            self.assertEqual(futures[0].result(timeout=30), 2)
+            self.assertEqual(futures[2].result(timeout=30), 6)
+            with self.assertRaises(WorkerTaskError) as context:
+                futures[1].result(timeout=30)
+            self.assertIn("ValueError", str(context.exception))
+            self.assertIn("negative", context.exception.details)
+            self.assertEqual(pool.restarts, 0)
+        self.assertFalse(os.path.exists(self.quarantine_file))
+
+    def test_hung_item_is_retried_then_quarantined_without_blocking_others(self):
+        """
+        测试卡住的照片被结束、重试一次后隔离，期间其他照片照常处理
+        """
+        with IsolatedWorkerPool(hang_or_double, workers=2, timeout=2.0,
+                                quarantine_file=self.quarantine_file) as pool:
+            hung = pool.submit("hang")
+            start = time.monotonic()
+            results = [pool.submit(value).result(timeout=30) for value in ("a", "b", "c", "d")]
+            self.assertEqual(results, ["aa", "bb", "cc", "dd"])
+            # 其他照片不需要等待卡住的照片超时
+            self.assertLess(time.monotonic() - start, 2.0)
+            with self.assertRaises(QuarantinedError) as context:
+                hung.result(timeout=30)
+            self.assertEqual(pool.restarts, 2)
+        record = self.read_quarantine()[0]
+        self.assertEqual(record, context.exception.record)
+        self.assertEqual(record["reason"], "timeout")
+        self.assertEqual(record["attempts"], 2)
+        self.assertEqual(len(record["failures"]), 2)
+
+    def test_crashed_worker_is_replaced(self):
+        """
+        测试工作进程崩溃后隔离该项，新的工作进程继续处理
+        """
+        with IsolatedWorkerPool(crash, workers=1, quarantine_file=self.quarantine_file) as pool:
+            with self.assertRaises(QuarantinedError):
+                pool.submit(RenderTask("photo.jpg", "framed_photo.jpg", exif_data={"Model": "X"})).result(timeout=60)
+        record = self.read_quarantine()[0]
+        # 隔离清单中记录照片路径，而不是整个任务
+        self.assertEqual(record["item"], "photo.jpg")
+        self.assertEqual(record["reason"], "crash")
+        self.assertEqual(record["failures"][0]["exitcode"], 3)
+
+    def test_run_timeout_kills_worker(self):
+        """
+        测试等待超时后结束正在处理的工作进程，不重试也不写入隔离清单
+        """
+        with IsolatedWorkerPool(hang_or_double, workers=1, quarantine_file=self.quarantine_file) as pool:
+            start = time.monotonic()
+            with self.assertRaises(FutureTimeoutError):
+                pool.run("hang", timeout=0.5)
+            self.assertLess(time.monotonic() - start, 2.0)
+            self.assertEqual(pool.run("a", timeout=30), "aa")
+            self.assertEqual(pool.restarts, 1)
+        self.assertFalse(os.path.exists(self.quarantine_file))
+
+    def test_async_batch_timeout_reaches_worker(self):
+        """
+        测试在AsyncBatch中调用run()时，单张超时结束卡住的工作进程，后面的照片不跟着超时
+        """
+        with IsolatedWorkerPool(hang_or_double, workers=1, quarantine_file=self.quarantine_file) as pool:
+            # 先启动工作进程，避免进程启动时间计入第一张照片的超时
+            pool.run("w", timeout=30)
+
+            async def run():
+                batch = AsyncBatch(pool.run, ["hang", "a", "b"], concurrency=1, timeout=2.0)
+                return [(result.index, result.status, result.value) async for result in batch]
+
+            results = asyncio.run(run())
+            self.assertEqual(results, [(0, "timeout", None), (1, "ok", "aa"), (2, "ok", "bb")])
+            self.assertEqual(pool.restarts, 1)
+        self.assertFalse(os.path.exists(self.quarantine_file))
+
+    @unittest.skipUnless(process_rss(os.getpid()), "需要Linux的/proc进程内存信息")
+    def test_memory_limit(self):
+        """
+        测试工作进程超出内存上限时被结束并隔离
+        """
+        with IsolatedWorkerPool(allocate, workers=1, memory_limit_mb=150, timeout=30, retries=0) as pool:
+            with self.assertRaises(QuarantinedError) as context:
+                pool.submit(300).result(timeout=60)
+        self.assertEqual(context.exception.record["reason"], "memory")
+        self.assertGreater(context.exception.record["failures"][0]["peak_rss_mb"], 150)
+
+    def test_render_task_with_truncated_photo(self):
+        """
+        测试在工作进程中生成相框，截断的照片作为处理失败返回
+        """
+        photo_path = os.path.join(self.temp_dir.name, "photo.jpg")
+        generate_photo(photo_path, (600, 400), index=2)
+        truncated_path = os.path.join(self.temp_dir.name, "truncated.jpg")
+        with open(photo_path, "rb") as src, open(truncated_path, "wb") as dst:
+            dst.write(src.read()[:2000])
+
+        with IsolatedWorkerPool(render_task, workers=1) as pool:
+            output_path = pool.run(RenderTask(photo_path, os.path.join(self.temp_dir.name, "framed.jpg"),
+                                              "黑色底边"))
+            with self.assertRaises(WorkerTaskError):
+                pool.run(RenderTask(truncated_path, os.path.join(self.temp_dir.name, "framed_truncated.jpg"),
+                                    "黑色底边"))
+        with Image.open(output_path) as framed:
+            self.assertEqual(framed.width, 600)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,108 @@
+"""
+批处理调度工具
+按模板、尺寸、相机和镜头对照片重新排序，让相似照片连续处理以提高各类缓存的命中率，
+并提供按原始顺序输出结果的缓冲区
+"""
+
+from typing import Any, Dict, List, Sequence, Tuple
+
+from PIL import Image
+
+# EXIF标签编号
+_TAG_MAKE = 0x010f
+_TAG_MODEL = 0x0110
+_TAG_ORIENTATION = 0x0112
+_TAG_EXIF_IFD = 0x8769
+_TAG_LENS_MODEL = 0xa434
+
+
+def read_schedule_key(image_path: str, template_name: str = "") -> Tuple:
+    """
+    读取照片的调度键，只解析文件头和EXIF，不解码像素数据
+
+    Args:
+        image_path: 照片文件路径
+        template_name: 处理该照片使用的模板名称
+
+    Returns:
+        Tuple: (模板名称, 修正方向后的尺寸, 相机品牌, 相机型号, 镜头型号)，读取失败时尺寸为(0, 0)
+    """
+    try:
+        with Image.open(image_path) as img:
+            width, height = img.size
+            exif = img.getexif()
+            make = str(exif.get(_TAG_MAKE, "")).strip()
+            model = str(exif.get(_TAG_MODEL, "")).strip()
+            orientation = exif.get(_TAG_ORIENTATION, 1)
+            lens_model = str(exif.get_ifd(_TAG_EXIF_IFD).get(_TAG_LENS_MODEL, "")).strip()
+    except Exception:
+        return (template_name, (0, 0), "", "", "")
+
+    # 方向为5-8的照片在修正方向后宽高互换
+    if orientation in (5, 6, 7, 8):
+        width, height = height, width
+    return (template_name, (width, height), make, model, lens_model)
+
+
+def schedule_batch(photo_files: Sequence[str], template_name: str = "") -> List[int]:
+    """
+    计算缓存友好的处理顺序
+
+    相同模板、尺寸、相机和镜头的照片排在一起，组内保持原始顺序
+
+    Args:
+        photo_files: 照片文件路径列表
+        template_name: 处理使用的模板名称
+
+    Returns:
+        List[int]: 按处理顺序排列的原始索引列表
+    """
+    keys = [read_schedule_key(path, template_name) for path in photo_files]
+    # sorted是稳定排序，组内保持原始顺序
+    return sorted(range(len(photo_files)), key=lambda index: keys[index])
+
+
+class ResultReorderBuffer:
+    """
+    结果重排缓冲区
+    按任意顺序接收处理结果，按原始顺序依次输出
+    """
+
+    def __init__(self):
+        self._pending: Dict[int, Any] = {}
+        self._next_index = 0
+
+    def add(self, index: int, result: Any) -> List[Tuple[int, Any]]:
+        """
+        加入一个处理结果
+
+        Args:
+            index: 结果对应的原始索引
+            result: 处理结果
+
+        Returns:
+            List[Tuple[int, Any]]: 按原始顺序可以输出的(索引, 结果)列表
+        """
+        self._pending[index] = result
+        ready = []
+        while self._next_index in self._pending:
+            ready.append((self._next_index, self._pending.pop(self._next_index)))
+            self._next_index += 1
+        return ready
+
+    def __len__(self) -> int:
+        """
+        等待前面的结果完成、暂不能输出的结果数量
+        """
+        return len(self._pending)
+
+    def flush(self) -> List[Tuple[int, Any]]:
+        """
+        输出所有剩余结果（例如处理被中途终止时）
+
+        Returns:
+            List[Tuple[int, Any]]: 按原始索引排序的(索引, 结果)列表
+        """
+        ready = sorted(self._pending.items())
+        self._pending.clear()
+        return ready
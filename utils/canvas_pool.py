@@ -0,0 +1,181 @@
+"""
+可重复使用的画布池
+同一台相机拍摄的一批照片加相框后尺寸几乎相同，按(模式, 尺寸)回收输出画布，下一张照片直接复用，
+避免每张照片都重新分配几十到上百MB的画布（内存分配和缺页开销），批量处理时常驻内存保持平稳
+
+用法:
+    canvas = get_canvas_pool().acquire("RGB", (width, height), "black")
+    ...  # 在画布上粘贴照片和横条
+    save_image(canvas, path)
+    release_canvas(canvas)  # 编码完成后归还，之后不能再使用
+"""
+
+import threading
+import weakref
+from typing import Dict, List, Optional, Tuple
+
+from PIL import Image
+
+from utils.image_cache import image_nbytes
+
+
+def _is_closed(image: Image.Image) -> bool:
+    """
+    图片是否已调用过close()
+    """
+    try:
+        image.im
+    except ValueError:
+        return True
+    return False
+
+
+class CanvasPool:
+    """
+    按内存预算限制的画布池
+    只回收由本池创建的画布，空闲画布超出预算时丢弃最早归还的画布
+    """
+
+    def __init__(self, max_bytes: int):
+        """
+        初始化画布池
+
+        Args:
+            max_bytes: 空闲画布最多占用的字节数
+        """
+        self.max_bytes = max_bytes
+        # 空闲画布，按归还顺序排列：((模式, 尺寸), 画布)
+        self._idle: List[Tuple[tuple, Image.Image]] = []
+        self._bytes = 0
+        # 由本池创建的画布（id -> 弱引用），归还其他图片（如缓存中共享的横条）时不回收
+        self._issued: Dict[int, weakref.ref] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def acquire(self, mode: str, size: Tuple[int, int], color=None) -> Image.Image:
+        """
+        取出一块画布，没有相同模式和尺寸的空闲画布时新建
+
+        Args:
+            mode: 图片模式
+            size: 画布尺寸(宽, 高)
+            color: 填充颜色，为空时不填充（复用的画布保留上一张照片的内容，调用方需覆盖整块画布）
+
+        Returns:
+            Image.Image: 画布
+        """
+        key = (mode, tuple(size))
+        canvas = None
+        with self._lock:
+            # 优先复用最近归还的画布，其内存页更可能仍在缓存中
+            for index in range(len(self._idle) - 1, -1, -1):
+                if self._idle[index][0] == key:
+                    canvas = self._idle.pop(index)[1]
+                    self._bytes -= image_nbytes(canvas)
+                    break
+            if canvas is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        if canvas is None:
+            canvas = Image.new(mode, size, color if color is not None else 0)
+            canvas_id = id(canvas)
+            with self._lock:
+                self._issued[canvas_id] = weakref.ref(canvas, lambda _, key=canvas_id: self._forget(key))
+        elif color is not None:
+            # 原地填充，不分配新的内存
+            canvas.paste(color, (0, 0) + canvas.size)
+        return canvas
+
+    def release(self, image: Optional[Image.Image]) -> None:
+        """
+        归还画布，归还后调用方不能再使用该图片；不是本池创建的图片直接关闭
+
+        Args:
+            image: 画布
+        """
+        if image is None:
+            return
+        with self._lock:
+            ref = self._issued.get(id(image))
+        if ref is None or ref() is not image:
+            image.close()
+            return
+        if _is_closed(image):
+            return
+
+        nbytes = image_nbytes(image)
+        if nbytes > self.max_bytes:
+            image.close()
+            return
+        image.info.clear()
+        with self._lock:
+            if any(idle is image for _, idle in self._idle):
+                return
+            self._idle.append(((image.mode, image.size), image))
+            self._bytes += nbytes
+            # 超出内存预算时丢弃最早归还的画布
+            while self._bytes > self.max_bytes:
+                _, evicted = self._idle.pop(0)
+                self._bytes -= image_nbytes(evicted)
+                evicted.close()
+
+    def _forget(self, key: int) -> None:
+        """
+        画布被回收后移除其记录
+        """
+        with self._lock:
+            self._issued.pop(key, None)
+
+    def clear(self) -> None:
+        """
+        释放所有空闲画布并清空命中统计
+        """
+        with self._lock:
+            for _, canvas in self._idle:
+                canvas.close()
+            self._idle.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        """
+        获取画布池统计信息
+
+        Returns:
+            dict: 包含entries、bytes、hits、misses的统计字典
+        """
+        with self._lock:
+            return {
+                "entries": len(self._idle),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses
+            }
+
+
+# 全局画布池：一张45MP照片的画布约180MB，预算可以保留一块大画布或几块常见尺寸的画布
+_canvas_pool = CanvasPool(max_bytes=256 * 1024 * 1024)
+
+
+def get_canvas_pool() -> CanvasPool:
+    """
+    获取全局画布池
+
+    Returns:
+        CanvasPool: 画布池
+    """
+    return _canvas_pool
+
+
+def release_canvas(image: Optional[Image.Image]) -> None:
+    """
+    处理完成后归还加好相框的图片（代替image.close()）
+
+    Args:
+        image: 模板渲染结果
+    """
+    _canvas_pool.release(image)
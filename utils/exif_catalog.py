@@ -0,0 +1,354 @@
+"""
+EXIF目录库
+使用SQLite按(路径, 文件大小, 修改时间)缓存照片的EXIF信息和尺寸，
+重新扫描时只解析新增或修改过的文件，并支持按相机、镜头、焦距和日期筛选照片
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+from PIL import Image, ExifTags
+
+from utils.exif_reader import read_exif_tags, EXIF_TAGS
+
+logger = logging.getLogger(__name__)
+
+# 默认扫描的照片扩展名
+DEFAULT_EXTENSIONS = (".jpg", ".jpeg")
+
+# 数据库列名到Photo.exif_data标签名的映射
+_COLUMN_TAGS = {
+    "make": "Make",
+    "model": "Model",
+    "lens_model": "LensModel",
+    "focal_length": "FocalLength",
+    "f_number": "FNumber",
+    "exposure_time": "ExposureTime",
+    "iso": "ISOSpeedRatings",
+    "date_time_original": "DateTimeOriginal",
+    "orientation": "Orientation",
+    "exposure_bias": "ExposureBiasValue",
+    "flash": "Flash",
+    "metering_mode": "MeteringMode"
+}
+
+# 以数值形式保存的标签
+_NUMERIC_COLUMNS = {"focal_length", "f_number", "exposure_time", "exposure_bias"}
+_INTEGER_COLUMNS = {"iso", "orientation", "flash", "metering_mode"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS photos (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    width INTEGER,
+    height INTEGER,
+    make TEXT,
+    model TEXT,
+    lens_model TEXT,
+    focal_length REAL,
+    f_number REAL,
+    exposure_time REAL,
+    iso INTEGER,
+    date_time_original TEXT,
+    orientation INTEGER,
+    exposure_bias REAL,
+    flash INTEGER,
+    metering_mode INTEGER,
+    scanned_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_photos_model ON photos (make, model);
+CREATE INDEX IF NOT EXISTS idx_photos_lens ON photos (lens_model, focal_length);
+CREATE INDEX IF NOT EXISTS idx_photos_date ON photos (date_time_original);
+"""
+
+
+def _normalize_value(column: str, value):
+    """
+    将EXIF值转换为可以存入SQLite的类型
+
+    Args:
+        column: 列名
+        value: EXIF值
+
+    Returns:
+        转换后的值，无法转换时返回None
+    """
+    if value is None:
+        return None
+    try:
+        if isinstance(value, tuple):
+            # ISO等多值标签取第一个，(分子, 分母)形式的有理数转换为小数
+            if column in _NUMERIC_COLUMNS and len(value) == 2:
+                value = value[0] / value[1]
+            else:
+                value = value[0]
+        if column in _NUMERIC_COLUMNS:
+            return float(value)
+        if column in _INTEGER_COLUMNS:
+            return int(value)
+        return str(value).strip()
+    except (ValueError, TypeError, ZeroDivisionError, IndexError):
+        return None
+
+
+def _normalize_date(date: str, end_of_day: bool = False) -> str:
+    """
+    将日期转换为EXIF的时间格式，便于与DateTimeOriginal比较
+
+    Args:
+        date: 日期或时间，如"2025-10-01"、"2025:10:01 12:00:00"
+        end_of_day: 只有日期时，是否补全为当天的最后一秒
+
+    Returns:
+        str: EXIF格式的时间，如"2025:10:01 23:59:59"
+    """
+    date = date.strip()
+    date_part, _, time_part = date.partition(" ")
+    date_part = date_part.replace("-", ":").replace("/", ":")
+    if not time_part:
+        time_part = "23:59:59" if end_of_day else "00:00:00"
+    return f"{date_part} {time_part}"
+
+
+class ExifCatalog:
+    """
+    基于SQLite的照片EXIF目录库
+    """
+
+    def __init__(self, db_path: str):
+        """
+        打开（或创建）EXIF目录库
+
+        Args:
+            db_path: SQLite数据库文件路径
+        """
+        self.db_path = db_path
+        self._connection = sqlite3.connect(db_path, check_same_thread=False)
+        self._connection.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock, self._connection:
+            self._connection.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        """
+        关闭数据库连接
+        """
+        with self._lock:
+            self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _list_files(self, inputs: Iterable[str], recursive: bool, extensions) -> Dict[str, os.stat_result]:
+        """
+        列出需要扫描的照片文件及其文件状态
+
+        Returns:
+            Dict[str, os.stat_result]: 文件绝对路径到文件状态的映射
+        """
+        files = {}
+        pending_dirs = []
+        for path in inputs:
+            path = os.path.abspath(path)
+            if os.path.isdir(path):
+                pending_dirs.append(path)
+            elif os.path.isfile(path) and path.lower().endswith(extensions):
+                files[path] = os.stat(path)
+
+        while pending_dirs:
+            directory = pending_dirs.pop()
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if recursive:
+                            pending_dirs.append(entry.path)
+                    elif entry.is_file() and entry.name.lower().endswith(extensions):
+                        files[entry.path] = entry.stat()
+        return files
+
+    def _read_photo_info(self, path: str) -> Dict[str, object]:
+        """
+        读取照片的EXIF信息和尺寸（不解码像素数据）
+
+        Returns:
+            Dict[str, object]: 列名到值的字典
+        """
+        exif_data = read_exif_tags(path, EXIF_TAGS)
+        with Image.open(path) as img:
+            width, height = img.size
+            if exif_data is None:
+                # 非JPEG或EXIF无法解析时回退到Pillow
+                exif = img.getexif()
+                tags = {**dict(exif.items()), **dict(exif.get_ifd(ExifTags.IFD.Exif).items())}
+                exif_data = {ExifTags.TAGS.get(k, k): v for k, v in tags.items()}
+
+        info = {"width": width, "height": height}
+        for column, tag in _COLUMN_TAGS.items():
+            info[column] = _normalize_value(column, exif_data.get(tag))
+        return info
+
+    def scan(self, inputs: Iterable[str], recursive: bool = False,
+             extensions=DEFAULT_EXTENSIONS, prune: bool = True) -> Dict[str, int]:
+        """
+        增量扫描照片文件或目录，只解析新增和修改过的文件
+
+        Args:
+            inputs: 照片文件或目录路径列表
+            recursive: 是否递归扫描子目录
+            extensions: 扫描的文件扩展名
+            prune: 是否删除扫描目录中已不存在的照片记录
+
+        Returns:
+            Dict[str, int]: 扫描统计，包含added、updated、unchanged、removed、failed
+        """
+        inputs = list(inputs)
+        extensions = tuple(ext.lower() for ext in extensions)
+        files = self._list_files(inputs, recursive, extensions)
+        stats = {"added": 0, "updated": 0, "unchanged": 0, "removed": 0, "failed": 0}
+
+        with self._lock:
+            known = {
+                row["path"]: (row["size"], row["mtime_ns"])
+                for row in self._connection.execute("SELECT path, size, mtime_ns FROM photos")
+            }
+
+        rows = []
+        now = time.time()
+        for path, stat in files.items():
+            previous = known.get(path)
+            if previous == (stat.st_size, stat.st_mtime_ns):
+                stats["unchanged"] += 1
+                continue
+            try:
+                info = self._read_photo_info(path)
+            except Exception as e:
+                logger.warning("读取照片信息失败: %s: %s", path, str(e))
+                stats["failed"] += 1
+                continue
+            info.update(path=path, size=stat.st_size, mtime_ns=stat.st_mtime_ns, scanned_at=now)
+            rows.append(info)
+            stats["updated" if previous else "added"] += 1
+
+        # 扫描目录中已删除的照片
+        removed = []
+        if prune:
+            directories = [os.path.abspath(p) for p in inputs if os.path.isdir(p)]
+            for path in known:
+                if path in files:
+                    continue
+                for directory in directories:
+                    parent = os.path.dirname(path)
+                    if parent == directory or (recursive and path.startswith(directory + os.sep)):
+                        removed.append((path,))
+                        break
+            stats["removed"] = len(removed)
+
+        if rows or removed:
+            columns = ["path", "size", "mtime_ns", "width", "height", "scanned_at"] + list(_COLUMN_TAGS)
+            placeholders = ", ".join(f":{column}" for column in columns)
+            with self._lock, self._connection:
+                self._connection.executemany(
+                    f"INSERT OR REPLACE INTO photos ({', '.join(columns)}) VALUES ({placeholders})", rows
+                )
+                self._connection.executemany("DELETE FROM photos WHERE path = ?", removed)
+        return stats
+
+    def query(self, make: Optional[str] = None, model: Optional[str] = None, lens_model: Optional[str] = None,
+              focal_length: Optional[float] = None, date_from: Optional[str] = None, date_to: Optional[str] = None,
+              directory: Optional[str] = None, recursive: bool = False, limit: Optional[int] = None) -> List[str]:
+        """
+        按条件筛选照片
+
+        Args:
+            make: 相机品牌（不区分大小写的子串匹配）
+            model: 相机型号（不区分大小写的子串匹配）
+            lens_model: 镜头型号（不区分大小写的子串匹配）
+            focal_length: 焦距（毫米，允许0.5毫米误差）
+            date_from: 起始日期（含），如"2025-10-01"
+            date_to: 结束日期（含），如"2025-10-31"
+            directory: 只返回该目录中的照片
+            recursive: 是否包含directory子目录中的照片
+            limit: 最多返回的数量
+
+        Returns:
+            List[str]: 按路径排序的照片路径列表
+        """
+        conditions = []
+        params = []
+        for column, value in (("make", make), ("model", model), ("lens_model", lens_model)):
+            if value:
+                conditions.append(f"{column} LIKE ? ESCAPE '\\'")
+                escaped = value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+                params.append(f"%{escaped}%")
+        if focal_length is not None:
+            conditions.append("focal_length BETWEEN ? AND ?")
+            params.extend([focal_length - 0.5, focal_length + 0.5])
+        if date_from:
+            conditions.append("date_time_original >= ?")
+            params.append(_normalize_date(date_from))
+        if date_to:
+            conditions.append("date_time_original <= ?")
+            params.append(_normalize_date(date_to, end_of_day=True))
+        if directory:
+            prefix = os.path.abspath(directory) + os.sep
+            conditions.append("substr(path, 1, ?) = ?")
+            params.extend([len(prefix), prefix])
+
+        sql = "SELECT path FROM photos"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY path"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        with self._lock:
+            paths = [row["path"] for row in self._connection.execute(sql, params)]
+        if directory and not recursive:
+            # 不递归时排除子目录中的照片
+            prefix = os.path.abspath(directory)
+            paths = [path for path in paths if os.path.dirname(path) == prefix]
+        return paths
+
+    def get_exif_data(self, path: str) -> Optional[Dict[str, object]]:
+        """
+        获取照片的EXIF信息（格式与Photo.exif_data一致）
+
+        文件不在目录库中或在扫描后被修改过时返回None
+
+        Args:
+            path: 照片路径
+
+        Returns:
+            Optional[Dict[str, object]]: EXIF标签名称到值的字典
+        """
+        path = os.path.abspath(path)
+        with self._lock:
+            row = self._connection.execute("SELECT * FROM photos WHERE path = ?", (path,)).fetchone()
+        if row is None:
+            return None
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        if (row["size"], row["mtime_ns"]) != (stat.st_size, stat.st_mtime_ns):
+            return None
+        return {tag: row[column] for column, tag in _COLUMN_TAGS.items() if row[column] is not None}
+
+    def count(self) -> int:
+        """
+        获取目录库中的照片数量
+
+        Returns:
+            int: 照片数量
+        """
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM photos").fetchone()[0]
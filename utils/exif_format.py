@@ -0,0 +1,264 @@
+"""
+EXIF参数格式化工具
+统一模板、GUI和命令行中快门速度、光圈、焦距、ISO等参数的显示格式，格式化结果带缓存
+"""
+
+import bisect
+import math
+from fractions import Fraction
+from functools import lru_cache, wraps
+from typing import Any, Optional
+
+from PIL.TiffImagePlugin import IFDRational
+
+# 相机常用的1/3档快门速度（秒），按标称值记录
+STANDARD_SHUTTER_SPEEDS = [
+    "30", "25", "20", "15", "13", "10", "8", "6", "5", "4", "3.2", "2.5", "2", "1.6", "1.3", "1",
+    "0.8", "0.6", "0.5", "0.4", "0.3",
+    "1/4", "1/5", "1/6", "1/8", "1/10", "1/13", "1/15", "1/20", "1/25", "1/30", "1/40", "1/50",
+    "1/60", "1/80", "1/100", "1/125", "1/160", "1/200", "1/250", "1/320", "1/400", "1/500",
+    "1/640", "1/800", "1/1000", "1/1250", "1/1600", "1/2000", "1/2500", "1/3200", "1/4000",
+    "1/5000", "1/6400", "1/8000", "1/10000", "1/12800", "1/16000", "1/20000", "1/25600", "1/32000"
+]
+
+# 查表时允许的相对误差（相机记录的数值可能是标称值的近似值，如1/60记为0.0166）
+SHUTTER_TABLE_TOLERANCE = 0.005
+
+
+def _memoized(func):
+    """
+    带缓存的格式化函数装饰器，参数不可哈希时直接计算
+    """
+    cached = lru_cache(maxsize=1024, typed=True)(func)
+
+    @wraps(func)
+    def wrapper(value):
+        try:
+            return cached(value)
+        except TypeError:
+            return func(value)
+
+    wrapper.cache_info = cached.cache_info
+    wrapper.cache_clear = cached.cache_clear
+    return wrapper
+
+
+def _format_fraction(numerator: int, denominator: int) -> str:
+    """
+    将分数格式化为快门速度文本
+
+    Args:
+        numerator: 分子
+        denominator: 分母
+
+    Returns:
+        str: 快门速度文本，如"1/250s"、"2s"、"3/10s"
+    """
+    if denominator == 1:
+        # 整数形式
+        return f"{numerator}s"
+    elif numerator == 1:
+        # 1/分母 形式
+        return f"1/{denominator}s"
+    else:
+        # 分子/分母 形式
+        return f"{numerator}/{denominator}s"
+
+
+def _build_shutter_table():
+    """
+    预先计算标准快门速度表
+
+    Returns:
+        Tuple[list, list]: (按秒数升序排列的秒数列表, 对应的快门速度文本列表)
+    """
+    entries = []
+    for nominal in STANDARD_SHUTTER_SPEEDS:
+        fraction = Fraction(nominal)
+        entries.append((float(fraction), _format_fraction(fraction.numerator, fraction.denominator)))
+    entries.sort()
+    return [seconds for seconds, _ in entries], [text for _, text in entries]
+
+
+_SHUTTER_SECONDS, _SHUTTER_TEXTS = _build_shutter_table()
+
+
+def _lookup_shutter_table(seconds: float) -> Optional[str]:
+    """
+    在标准快门速度表中查找最接近的值
+
+    Args:
+        seconds: 曝光时间（秒）
+
+    Returns:
+        Optional[str]: 匹配的快门速度文本，没有足够接近的标准值时返回None
+    """
+    index = bisect.bisect_left(_SHUTTER_SECONDS, seconds)
+    for candidate in (index - 1, index):
+        if 0 <= candidate < len(_SHUTTER_SECONDS):
+            nominal = _SHUTTER_SECONDS[candidate]
+            if abs(seconds - nominal) <= nominal * SHUTTER_TABLE_TOLERANCE:
+                return _SHUTTER_TEXTS[candidate]
+    return None
+
+
+def _to_float(value: Any) -> float:
+    """
+    将EXIF数值（IFDRational、(分子, 分母)元组、数字或字符串）转换为浮点数
+
+    Args:
+        value: EXIF数值
+
+    Returns:
+        float: 浮点数，分母为0时返回nan
+    """
+    if isinstance(value, IFDRational):
+        if value.denominator == 0:
+            return math.nan
+        return value.numerator / value.denominator
+    if isinstance(value, tuple):
+        numerator, denominator = value
+        return numerator / denominator if denominator else math.nan
+    return float(value)
+
+
+def _format_number(value: Any) -> str:
+    """
+    将EXIF数值格式化为文本，整数保持整数形式，有理数显示为小数
+
+    Args:
+        value: EXIF数值
+
+    Returns:
+        str: 数值文本
+    """
+    if isinstance(value, int):
+        return str(value)
+    try:
+        return str(_to_float(value))
+    except (ValueError, TypeError, ZeroDivisionError):
+        return f"{value}"
+
+
+@_memoized
+def format_exposure_time(value: Any) -> str:
+    """
+    格式化快门速度
+
+    优先查找标准1/3档快门速度表，没有匹配时才使用Fraction计算最接近的分数
+
+    Args:
+        value: 曝光时间（秒），支持IFDRational、(分子, 分母)元组、数字和字符串
+
+    Returns:
+        str: 快门速度文本，如"1/250s"
+    """
+    try:
+        seconds = _to_float(value)
+    except (ValueError, TypeError, ZeroDivisionError):
+        # 如果转换失败，直接显示原始值
+        return f"{value}s"
+    if math.isnan(seconds) or math.isinf(seconds) or seconds <= 0:
+        return f"{value}s"
+
+    text = _lookup_shutter_table(seconds)
+    if text is not None:
+        return text
+
+    # 非标准快门速度：转换为分数并简化
+    fraction = Fraction(seconds).limit_denominator(1000)
+    if fraction == 0:
+        # 极短的曝光时间超出分母上限时，按倒数取整
+        return f"1/{round(1 / seconds)}s"
+    return _format_fraction(fraction.numerator, fraction.denominator)
+
+
+@_memoized
+def format_f_number(value: Any) -> str:
+    """
+    格式化光圈值
+
+    Args:
+        value: 光圈值
+
+    Returns:
+        str: 光圈文本，如"F2.8"
+    """
+    return f"F{_format_number(value)}"
+
+
+@_memoized
+def format_focal_length(value: Any) -> str:
+    """
+    格式化焦距
+
+    Args:
+        value: 焦距（毫米）
+
+    Returns:
+        str: 焦距文本，如"50.0mm"
+    """
+    if isinstance(value, tuple):
+        # 分数形式 (numerator, denominator)
+        try:
+            return f"{_to_float(value):.1f}mm"
+        except (ValueError, TypeError):
+            return f"{value}mm"
+    return f"{_format_number(value)}mm"
+
+
+@_memoized
+def format_iso(value: Any) -> str:
+    """
+    格式化ISO感光度
+
+    Args:
+        value: ISO值，多个值时取第一个
+
+    Returns:
+        str: ISO文本，如"ISO400"
+    """
+    if isinstance(value, tuple) and value:
+        value = value[0]
+    return f"ISO{value}"
+
+
+@_memoized
+def format_exposure_bias(value: Any) -> str:
+    """
+    格式化曝光补偿
+
+    Args:
+        value: 曝光补偿值
+
+    Returns:
+        str: 曝光补偿文本，如"-0.7EV"
+    """
+    return f"{_format_number(value)}EV"
+
+
+# 中文参数名到格式化函数的映射
+_PARAM_FORMATTERS = {
+    "光圈": format_f_number,
+    "快门速度": format_exposure_time,
+    "焦距": format_focal_length,
+    "ISO": format_iso,
+    "曝光补偿": format_exposure_bias
+}
+
+
+def format_exif_value(param: str, value: Any) -> str:
+    """
+    按中文参数名格式化EXIF值
+
+    Args:
+        param: 中文参数名（如"光圈"、"快门速度"）
+        value: EXIF值
+
+    Returns:
+        str: 格式化后的文本，没有专门格式的参数保持原有格式
+    """
+    formatter = _PARAM_FORMATTERS.get(param)
+    if formatter is None:
+        return f"{value}"
+    return formatter(value)
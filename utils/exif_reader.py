@@ -0,0 +1,289 @@
+"""
+精简EXIF读取工具
+只解析JPEG文件APP1段中模板用到的EXIF标签，不读取像素数据，
+也不读取MakerNote和缩略图等大块数据；缩略图只在需要时单独读取
+"""
+
+import struct
+from contextlib import nullcontext
+from typing import BinaryIO, Dict, Iterable, Optional, Union
+
+from PIL import ExifTags
+from PIL.TiffImagePlugin import IFDRational
+
+# 模板、GUI和命令行用到的EXIF标签
+EXIF_TAGS = (
+    "Make", "Model", "LensModel", "FNumber", "ExposureTime", "ISOSpeedRatings", "FocalLength",
+    "DateTimeOriginal", "Orientation", "ExposureBiasValue", "Flash", "MeteringMode"
+)
+
+# Exif子IFD指针标签
+_TAG_EXIF_IFD = 0x8769
+
+# IFD1中嵌入JPEG缩略图的偏移和长度标签
+_TAG_THUMBNAIL_OFFSET = 0x0201
+_TAG_THUMBNAIL_LENGTH = 0x0202
+
+# 初次读取的APP1段长度，通常已覆盖IFD0和Exif子IFD
+_INITIAL_READ_SIZE = 4096
+
+# TIFF数据类型编号到单个值字节数的映射
+_TYPE_SIZES = {1: 1, 2: 1, 3: 2, 4: 4, 5: 8, 6: 1, 7: 1, 8: 2, 9: 4, 10: 8, 11: 4, 12: 8}
+
+# EXIF标签名称到编号的映射
+_TAG_IDS = {name: tag_id for tag_id, name in ExifTags.TAGS.items()}
+
+
+class _TiffBlock:
+    """
+    APP1段中TIFF数据的按需读取器
+    先读取段开头的一小块数据，其余位置按偏移量从文件中读取
+    """
+
+    def __init__(self, fp: BinaryIO, length: int):
+        self._fp = fp
+        self._base = fp.tell()
+        self._length = length
+        self._head = fp.read(min(length, _INITIAL_READ_SIZE))
+
+    def read(self, offset: int, size: int) -> bytes:
+        """
+        读取TIFF数据中指定偏移处的字节
+
+        Args:
+            offset: 相对TIFF头的偏移
+            size: 读取的字节数
+
+        Returns:
+            bytes: 读取到的数据，越界时抛出ValueError
+        """
+        if offset < 0 or size < 0 or offset + size > self._length:
+            raise ValueError("EXIF偏移超出APP1段范围")
+        if offset + size <= len(self._head):
+            return self._head[offset:offset + size]
+        self._fp.seek(self._base + offset)
+        data = self._fp.read(size)
+        if len(data) != size:
+            raise ValueError("EXIF数据不完整")
+        return data
+
+
+def _find_exif_segment(fp: BinaryIO) -> Optional[int]:
+    """
+    在JPEG文件头部查找EXIF APP1段，遇到图像数据（SOS）前停止
+
+    Args:
+        fp: 位于文件开头的文件对象
+
+    Returns:
+        Optional[int]: 找到时返回TIFF数据长度，文件指针位于TIFF头；不是JPEG时抛出ValueError；没有EXIF时返回None
+    """
+    if fp.read(2) != b"\xff\xd8":
+        raise ValueError("不是JPEG文件")
+
+    while True:
+        marker = fp.read(2)
+        if len(marker) < 2 or marker[0] != 0xFF:
+            return None
+        code = marker[1]
+        # 跳过填充字节
+        while code == 0xFF:
+            next_byte = fp.read(1)
+            if not next_byte:
+                return None
+            code = next_byte[0]
+        # SOS之后是压缩的图像数据，EOI表示文件结束
+        if code in (0xDA, 0xD9):
+            return None
+        # 没有长度字段的标记
+        if 0xD0 <= code <= 0xD7 or code == 0x01:
+            continue
+
+        length_bytes = fp.read(2)
+        if len(length_bytes) < 2:
+            return None
+        length = struct.unpack(">H", length_bytes)[0] - 2
+        if code == 0xE1 and length > 6:
+            if fp.read(6) == b"Exif\x00\x00":
+                return length - 6
+            fp.seek(length - 6, 1)
+        else:
+            fp.seek(length, 1)
+
+
+def _decode_value(block: _TiffBlock, endian: str, field_type: int, count: int, raw: bytes):
+    """
+    解码IFD条目的值，与Pillow的_getexif结果保持一致
+
+    Args:
+        block: TIFF数据读取器
+        endian: 字节序（"<"或">"）
+        field_type: TIFF数据类型编号
+        count: 值的个数
+        raw: 条目中4字节的值或偏移
+
+    Returns:
+        解码后的值
+    """
+    size = _TYPE_SIZES[field_type] * count
+    if size <= 4:
+        data = raw[:size]
+    else:
+        data = block.read(struct.unpack(endian + "L", raw)[0], size)
+
+    if field_type == 2:
+        # ASCII字符串
+        if data.endswith(b"\0"):
+            data = data[:-1]
+        return data.decode("latin-1", "replace")
+    if field_type in (1, 7):
+        # BYTE、UNDEFINED保持原始字节
+        return data
+    if field_type in (5, 10):
+        # RATIONAL、SRATIONAL
+        fmt = "L" if field_type == 5 else "l"
+        numbers = struct.unpack(f"{endian}{2 * count}{fmt}", data)
+        values = tuple(IFDRational(numbers[i], numbers[i + 1]) for i in range(0, len(numbers), 2))
+    else:
+        fmt = {3: "H", 4: "L", 6: "b", 8: "h", 9: "l", 11: "f", 12: "d"}[field_type]
+        values = struct.unpack(f"{endian}{count}{fmt}", data)
+    return values[0] if len(values) == 1 else values
+
+
+def _read_ifd(block: _TiffBlock, endian: str, offset: int, wanted_ids: set, result: Dict[int, object]) -> Optional[int]:
+    """
+    读取一个IFD中需要的标签
+
+    Args:
+        block: TIFF数据读取器
+        endian: 字节序
+        offset: IFD相对TIFF头的偏移
+        wanted_ids: 需要读取的标签编号集合
+        result: 保存读取结果的字典（标签编号 -> 值）
+
+    Returns:
+        Optional[int]: Exif子IFD的偏移，没有时返回None
+    """
+    entry_count = struct.unpack(endian + "H", block.read(offset, 2))[0]
+    entries = block.read(offset + 2, entry_count * 12)
+    exif_ifd_offset = None
+    for i in range(entry_count):
+        tag_id, field_type, count = struct.unpack(endian + "HHL", entries[i * 12:i * 12 + 8])
+        raw = entries[i * 12 + 8:i * 12 + 12]
+        if tag_id == _TAG_EXIF_IFD:
+            exif_ifd_offset = struct.unpack(endian + "L", raw)[0]
+        elif tag_id in wanted_ids and field_type in _TYPE_SIZES and tag_id not in result:
+            result[tag_id] = _decode_value(block, endian, field_type, count, raw)
+    return exif_ifd_offset
+
+
+def _next_ifd_offset(block: _TiffBlock, endian: str, offset: int) -> int:
+    """
+    获取IFD链中下一个IFD的偏移
+
+    Args:
+        block: TIFF数据读取器
+        endian: 字节序
+        offset: 当前IFD相对TIFF头的偏移
+
+    Returns:
+        int: 下一个IFD的偏移，没有时为0
+    """
+    entry_count = struct.unpack(endian + "H", block.read(offset, 2))[0]
+    return struct.unpack(endian + "L", block.read(offset + 2 + entry_count * 12, 4))[0]
+
+
+def _open_tiff_block(fp: BinaryIO):
+    """
+    定位JPEG文件中的EXIF TIFF数据并识别字节序
+
+    Args:
+        fp: 位于文件开头的文件对象
+
+    Returns:
+        (block, endian, ifd0_offset)；没有EXIF时返回None；不是JPEG或TIFF头无效时抛出ValueError
+    """
+    length = _find_exif_segment(fp)
+    if length is None:
+        return None
+
+    block = _TiffBlock(fp, length)
+    header = block.read(0, 8)
+    if header[:2] == b"II":
+        endian = "<"
+    elif header[:2] == b"MM":
+        endian = ">"
+    else:
+        raise ValueError("无效的TIFF头")
+    return block, endian, struct.unpack(endian + "L", header[4:8])[0]
+
+
+def read_exif_tags(image_path: Union[str, BinaryIO], tags: Iterable[str] = EXIF_TAGS) -> Optional[Dict[str, object]]:
+    """
+    从JPEG文件中读取指定的EXIF标签
+
+    只读取文件头部的APP1段，不解码图像数据；MakerNote和缩略图等未请求的数据不会被读取
+
+    Args:
+        image_path: JPEG文件路径，或可随机访问的二进制文件对象（如上传数据的BytesIO）
+        tags: 需要读取的EXIF标签名称
+
+    Returns:
+        Optional[Dict[str, object]]: 标签名称到值的字典（与Pillow的_getexif格式一致）；
+        文件不是JPEG或EXIF数据损坏时返回None，调用方可以回退到Pillow解析
+    """
+    wanted = {_TAG_IDS[name]: name for name in tags if name in _TAG_IDS}
+    try:
+        if hasattr(image_path, "read"):
+            image_path.seek(0)
+            context = nullcontext(image_path)
+        else:
+            context = open(image_path, "rb")
+        with context as fp:
+            tiff = _open_tiff_block(fp)
+            if tiff is None:
+                return {}
+
+            block, endian, ifd0_offset = tiff
+            values: Dict[int, object] = {}
+            exif_ifd_offset = _read_ifd(block, endian, ifd0_offset, set(wanted), values)
+            if exif_ifd_offset:
+                _read_ifd(block, endian, exif_ifd_offset, set(wanted), values)
+    except (OSError, ValueError, struct.error, KeyError):
+        return None
+
+    return {wanted[tag_id]: value for tag_id, value in values.items()}
+
+
+def read_exif_thumbnail(image_path: str) -> Optional[bytes]:
+    """
+    读取JPEG文件EXIF中嵌入的JPEG缩略图（IFD1）
+
+    Args:
+        image_path: JPEG文件路径
+
+    Returns:
+        Optional[bytes]: 缩略图的JPEG数据，没有缩略图或无法解析时返回None
+    """
+    wanted = {_TAG_THUMBNAIL_OFFSET, _TAG_THUMBNAIL_LENGTH}
+    try:
+        with open(image_path, "rb") as fp:
+            tiff = _open_tiff_block(fp)
+            if tiff is None:
+                return None
+
+            block, endian, ifd0_offset = tiff
+            ifd1_offset = _next_ifd_offset(block, endian, ifd0_offset)
+            if not ifd1_offset:
+                return None
+
+            values: Dict[int, object] = {}
+            _read_ifd(block, endian, ifd1_offset, wanted, values)
+            if not wanted.issubset(values):
+                return None
+            data = block.read(values[_TAG_THUMBNAIL_OFFSET], values[_TAG_THUMBNAIL_LENGTH])
+    except (OSError, ValueError, struct.error, KeyError, TypeError):
+        return None
+
+    # 只接受完整的JPEG数据
+    return data if data.startswith(b"\xff\xd8") else None
@@ -0,0 +1,113 @@
+"""
+有界图片缓存
+按图片占用的内存字节数进行LRU淘汰，用于缓存信息横条、缩放后的logo等可复用的渲染结果
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+from PIL import Image
+
+
+def image_nbytes(image: Image.Image) -> int:
+    """
+    估算图片在内存中占用的字节数
+
+    Pillow中多通道图片每个像素占4个字节，单通道图片占1个字节
+
+    Args:
+        image: 图片对象
+
+    Returns:
+        int: 估算的字节数
+    """
+    pixel_size = 4 if len(image.getbands()) > 1 or image.mode in ("I", "F") else 1
+    return image.width * image.height * pixel_size
+
+
+class ImageCache:
+    """
+    按内存预算限制的图片LRU缓存
+    缓存中的图片只能读取（粘贴、复制），调用方不应修改
+    """
+
+    def __init__(self, max_bytes: int):
+        """
+        初始化图片缓存
+
+        Args:
+            max_bytes: 缓存的图片最多占用的字节数
+        """
+        self.max_bytes = max_bytes
+        self._images: "OrderedDict[Hashable, Image.Image]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Image.Image]:
+        """
+        获取缓存的图片
+
+        Args:
+            key: 缓存键
+
+        Returns:
+            Optional[Image.Image]: 缓存的图片，未命中时返回None
+        """
+        with self._lock:
+            image = self._images.get(key)
+            if image is not None:
+                self._images.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+            return image
+
+    def put(self, key: Hashable, image: Image.Image) -> None:
+        """
+        将图片加入缓存，超出预算的图片不缓存
+
+        Args:
+            key: 缓存键
+            image: 图片对象
+        """
+        nbytes = image_nbytes(image)
+        if nbytes > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._images.pop(key, None)
+            if previous is not None:
+                self._bytes -= image_nbytes(previous)
+            self._images[key] = image
+            self._bytes += nbytes
+            # 超出内存预算时淘汰最久未使用的图片
+            while self._bytes > self.max_bytes:
+                _, evicted = self._images.popitem(last=False)
+                self._bytes -= image_nbytes(evicted)
+
+    def clear(self) -> None:
+        """
+        清空缓存和命中统计
+        """
+        with self._lock:
+            self._images.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        """
+        获取缓存统计信息
+
+        Returns:
+            dict: 包含entries、bytes、hits、misses的统计字典
+        """
+        with self._lock:
+            return {
+                "entries": len(self._images),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses
+            }
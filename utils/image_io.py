@@ -0,0 +1,137 @@
+"""
+图片编码和保存工具
+将编码和写文件分成两个阶段，分别上报耗时；超大图片可以用PNGStreamWriter按行段编码
+"""
+
+import io
+import struct
+import zlib
+from typing import BinaryIO, Tuple
+
+from PIL import Image
+
+from utils.instrumentation import span
+
+
+def encode_image(image: Image.Image, format: str = "JPEG", **options) -> bytes:
+    """
+    将图片编码为指定格式的字节数据
+
+    Args:
+        image: 图片对象
+        format: 图片格式
+        **options: 传给Image.save的编码参数（如quality）
+
+    Returns:
+        bytes: 编码后的数据
+    """
+    with span("encode", format=format):
+        buffer = io.BytesIO()
+        image.save(buffer, format, **options)
+        return buffer.getvalue()
+
+
+def write_image(image: Image.Image, fp: BinaryIO, format: str = "JPEG", **options) -> None:
+    """
+    将图片直接编码到文件对象，编码器每输出一块数据就写入一次（用于流式响应）
+
+    Args:
+        image: 图片对象
+        fp: 可写的二进制文件对象
+        format: 图片格式
+        **options: 传给Image.save的编码参数（如quality）
+    """
+    with span("encode", format=format):
+        image.save(fp, format, **options)
+
+
+def save_image(image: Image.Image, path: str, format: str = "JPEG", **options) -> None:
+    """
+    编码图片并写入文件
+
+    Args:
+        image: 图片对象
+        path: 输出文件路径
+        format: 图片格式
+        **options: 传给Image.save的编码参数（如quality）
+    """
+    data = encode_image(image, format, **options)
+    with span("write", path=path):
+        with open(path, "wb") as f:
+            f.write(data)
+
+
+class PNGStreamWriter:
+    """
+    逐段写入PNG：每收到一段行就压缩并写出，整张图片不需要同时在内存中（用于分条渲染超大照片）
+
+    各行不做PNG预测滤波（滤波类型0），文件比Pillow保存的PNG略大
+
+    用法:
+        writer = PNGStreamWriter(fp, (width, height))
+        for band in bands:
+            writer.write(band)
+        writer.close()
+    """
+
+    # 模式 -> (PNG颜色类型, 每像素字节数)
+    _COLOR_TYPES = {"L": (0, 1), "RGB": (2, 3), "RGBA": (6, 4)}
+
+    def __init__(self, fp: BinaryIO, size: Tuple[int, int], mode: str = "RGB", compress_level: int = 6):
+        """
+        初始化并写入PNG文件头
+
+        Args:
+            fp: 可写的二进制文件对象
+            size: 图片尺寸(宽, 高)
+            mode: 图片模式（L、RGB或RGBA）
+            compress_level: zlib压缩级别（0-9）
+        """
+        if mode not in self._COLOR_TYPES:
+            raise ValueError(f"不支持的PNG模式: {mode}")
+        self._fp = fp
+        self.size = size
+        self.mode = mode
+        self.rows_written = 0
+        color_type, self._pixel_bytes = self._COLOR_TYPES[mode]
+        self._compressor = zlib.compressobj(compress_level)
+        fp.write(b"\x89PNG\r\n\x1a\n")
+        self._write_chunk(b"IHDR", struct.pack(">IIBBBBB", size[0], size[1], 8, color_type, 0, 0, 0))
+
+    def _write_chunk(self, tag: bytes, data: bytes) -> None:
+        self._fp.write(struct.pack(">I", len(data)) + tag)
+        self._fp.write(data)
+        self._fp.write(struct.pack(">I", zlib.crc32(data, zlib.crc32(tag))))
+
+    def write(self, band: Image.Image) -> None:
+        """
+        压缩并写出一段行
+
+        Args:
+            band: 宽度与图片相同、模式相同的一段行
+        """
+        if band.mode != self.mode or band.width != self.size[0]:
+            raise ValueError(f"行段应为{self.mode}模式、宽度{self.size[0]}: {band.mode} {band.width}")
+        if self.rows_written + band.height > self.size[1]:
+            raise ValueError("写入的行数超过图片高度")
+        with span("encode", format="PNG", rows=band.height):
+            data = band.tobytes()
+            stride = self.size[0] * self._pixel_bytes
+            # 每行前加滤波类型字节0
+            rows = b"".join(b"\x00" + data[start:start + stride] for start in range(0, len(data), stride))
+            compressed = self._compressor.compress(rows)
+        if compressed:
+            self._write_chunk(b"IDAT", compressed)
+        self.rows_written += band.height
+
+    def close(self) -> None:
+        """
+        写出剩余的压缩数据和文件结束块
+
+        Raises:
+            ValueError: 写入的行数少于图片高度
+        """
+        if self.rows_written != self.size[1]:
+            raise ValueError(f"只写入了{self.rows_written}行，图片高度为{self.size[1]}")
+        self._write_chunk(b"IDAT", self._compressor.flush())
+        self._write_chunk(b"IEND", b"")
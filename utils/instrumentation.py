@@ -0,0 +1,265 @@
+"""
+性能埋点工具
+处理流程中的各个阶段（解码、方向处理、布局、Logo、文本绘制、编码、写文件）通过span()上报耗时，
+耗时记录发送给已注册的收集器；没有注册收集器时span()返回空操作对象，几乎没有额外开销
+"""
+
+import json
+import math
+import os
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, List, NamedTuple, Sequence
+
+# 已注册的收集器
+_collectors: List["TraceCollector"] = []
+_collectors_lock = threading.Lock()
+
+
+class SpanRecord(NamedTuple):
+    """
+    一次阶段耗时记录
+    """
+    name: str
+    start_ns: int
+    duration_ns: int
+    thread_id: int
+    args: Dict[str, object]
+
+
+class _NoopSpan:
+    """
+    未启用埋点时使用的空操作span
+    """
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class _Span:
+    """
+    记录一个阶段的开始和结束时间，结束时发送给收集器
+    """
+
+    __slots__ = ("name", "args", "collectors", "start_ns")
+
+    def __init__(self, name: str, args: Dict[str, object], collectors: Sequence["TraceCollector"]):
+        self.name = name
+        self.args = args
+        self.collectors = collectors
+        self.start_ns = 0
+
+    def __enter__(self):
+        # 收集器可以实现span_started()，在阶段开始时记录额外信息（如内存占用）
+        for collector in self.collectors:
+            span_started = getattr(collector, "span_started", None)
+            if span_started is not None:
+                span_started(self.name, self.args)
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        duration_ns = time.perf_counter_ns() - self.start_ns
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        record = SpanRecord(self.name, self.start_ns, duration_ns, threading.get_ident(), self.args)
+        for collector in self.collectors:
+            collector.record(record)
+        return False
+
+
+def span(name: str, **args):
+    """
+    统计一个阶段的耗时，用法: with span("decode"): ...
+
+    Args:
+        name: 阶段名称
+        **args: 附加信息（如文件名），会写入Chrome trace的args
+
+    Returns:
+        上下文管理器；没有注册收集器时返回共享的空操作对象
+    """
+    collectors = _collectors
+    if not collectors:
+        return _NOOP_SPAN
+    return _Span(name, args, collectors)
+
+
+def is_enabled() -> bool:
+    """
+    判断是否有已注册的收集器
+
+    Returns:
+        bool: 是否启用埋点
+    """
+    return bool(_collectors)
+
+
+def add_collector(collector: "TraceCollector") -> None:
+    """
+    注册收集器
+
+    Args:
+        collector: 收集器，需实现record(SpanRecord)方法，可选实现span_started(name, args)方法
+    """
+    global _collectors
+    with _collectors_lock:
+        if collector not in _collectors:
+            # 替换为新列表，正在结束的span仍使用旧列表，不需要加锁
+            _collectors = _collectors + [collector]
+
+
+def remove_collector(collector: "TraceCollector") -> None:
+    """
+    注销收集器
+
+    Args:
+        collector: 之前注册的收集器
+    """
+    global _collectors
+    with _collectors_lock:
+        _collectors = [c for c in _collectors if c is not collector]
+
+
+def percentile(values: Sequence[float], percent: float) -> float:
+    """
+    计算百分位数（线性插值）
+
+    Args:
+        values: 数值列表
+        percent: 百分位（0-100）
+
+    Returns:
+        float: 百分位数，列表为空时返回0
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * percent / 100
+    lower = math.floor(position)
+    upper = math.ceil(position)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+class TraceCollector:
+    """
+    在内存中保存耗时记录的收集器，可导出Chrome trace JSON和按阶段的百分位统计
+    """
+
+    def __init__(self):
+        self._records: List[SpanRecord] = []
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        add_collector(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        remove_collector(self)
+
+    def record(self, record: SpanRecord) -> None:
+        """
+        保存一条耗时记录
+
+        Args:
+            record: 耗时记录
+        """
+        with self._lock:
+            self._records.append(record)
+
+    @property
+    def records(self) -> List[SpanRecord]:
+        """
+        获取全部耗时记录
+        """
+        with self._lock:
+            return list(self._records)
+
+    def clear(self) -> None:
+        """
+        清空耗时记录
+        """
+        with self._lock:
+            self._records.clear()
+
+    def to_chrome_trace(self) -> Dict[str, object]:
+        """
+        转换为Chrome trace格式（可在chrome://tracing或Perfetto中打开）
+
+        Returns:
+            Dict[str, object]: Chrome trace JSON对象
+        """
+        pid = os.getpid()
+        events = []
+        for record in self.records:
+            events.append({
+                "name": record.name,
+                "ph": "X",
+                "ts": record.start_ns / 1000,
+                "dur": record.duration_ns / 1000,
+                "pid": pid,
+                "tid": record.thread_id,
+                "args": {key: str(value) for key, value in record.args.items()}
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export_chrome_trace(self, path: str) -> None:
+        """
+        将耗时记录写入Chrome trace JSON文件
+
+        Args:
+            path: 输出文件路径
+        """
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_chrome_trace(), f, ensure_ascii=False)
+
+    def summary(self, percents: Sequence[float] = (50, 90, 99)) -> Dict[str, Dict[str, float]]:
+        """
+        按阶段统计耗时（毫秒）
+
+        Args:
+            percents: 需要计算的百分位
+
+        Returns:
+            Dict[str, Dict[str, float]]: 阶段名称 -> 次数、总耗时、平均值、百分位数和最大值
+        """
+        durations = defaultdict(list)
+        for record in self.records:
+            durations[record.name].append(record.duration_ns / 1e6)
+
+        result = {}
+        for name, values in durations.items():
+            stats = {"count": len(values), "total_ms": sum(values), "mean_ms": sum(values) / len(values)}
+            for percent in percents:
+                stats[f"p{percent:g}_ms"] = percentile(values, percent)
+            stats["max_ms"] = max(values)
+            result[name] = stats
+        return result
+
+    def format_summary(self, percents: Sequence[float] = (50, 90, 99)) -> str:
+        """
+        生成便于阅读的耗时统计表格
+
+        Args:
+            percents: 需要计算的百分位
+
+        Returns:
+            str: 统计表格文本
+        """
+        summary = self.summary(percents)
+        columns = ["count", "mean_ms"] + [f"p{percent:g}_ms" for percent in percents] + ["max_ms"]
+        lines = [f"{'阶段':<16}" + "".join(f"{column:>12}" for column in columns)]
+        for name, stats in sorted(summary.items(), key=lambda item: -item[1]["total_ms"]):
+            cells = [f"{stats['count']:>12d}"] + [f"{stats[column]:>12.2f}" for column in columns[1:]]
+            lines.append(f"{name:<18}" + "".join(cells))
+        return "\n".join(lines)
+
@@ -0,0 +1,327 @@
+"""
+内存分析工具
+批量处理时按照片记录峰值RSS和tracemalloc统计的主要Python内存分配位置，
+并通过埋点阶段（解码、方向处理、布局、Logo、画布等）统计每个阶段的峰值内存增量
+
+Pillow的像素数据由C代码分配，tracemalloc统计不到，因此阶段内存以RSS为准；
+Linux下通过/proc/self/clear_refs重置峰值RSS，使每个阶段都能得到独立的峰值，
+其他平台只能统计阶段前后的RSS变化
+"""
+
+import json
+import os
+import sys
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+from utils.instrumentation import add_collector, remove_collector, SpanRecord
+
+_MB = 1024 * 1024
+
+# Linux下的进程状态和峰值RSS重置文件
+_PROC_STATUS = "/proc/self/status"
+_PROC_CLEAR_REFS = "/proc/self/clear_refs"
+
+
+def _read_status_kb(field: str) -> Optional[int]:
+    """
+    从/proc/self/status读取内存字段（KB）
+    """
+    try:
+        with open(_PROC_STATUS, "r") as f:
+            for line in f:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return None
+
+
+def process_rss(pid: int) -> int:
+    """
+    获取其他进程的常驻内存（字节，仅Linux支持）
+
+    Args:
+        pid: 进程ID
+
+    Returns:
+        int: 常驻内存，无法获取时返回0
+    """
+    try:
+        with open(f"/proc/{pid}/status", "r") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        return 0
+    return 0
+
+
+def current_rss() -> int:
+    """
+    获取当前进程的常驻内存（字节）
+
+    Returns:
+        int: 常驻内存，无法获取时返回0
+    """
+    rss_kb = _read_status_kb("VmRSS")
+    if rss_kb is not None:
+        return rss_kb * 1024
+    try:
+        import resource
+        # 非Linux平台只能得到历史峰值
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return maxrss if sys.platform == "darwin" else maxrss * 1024
+    except (ImportError, OSError):
+        return 0
+
+
+def peak_rss() -> int:
+    """
+    获取进程的峰值常驻内存（字节），Linux下为上次重置以来的峰值
+
+    Returns:
+        int: 峰值常驻内存
+    """
+    hwm_kb = _read_status_kb("VmHWM")
+    if hwm_kb is not None:
+        return hwm_kb * 1024
+    return current_rss()
+
+
+def reset_peak_rss() -> bool:
+    """
+    将峰值RSS重置为当前RSS（仅Linux支持）
+
+    Returns:
+        bool: 是否重置成功
+    """
+    try:
+        with open(_PROC_CLEAR_REFS, "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+class _OpenSpan:
+    """
+    正在进行的阶段的内存信息
+    """
+
+    __slots__ = ("name", "rss_start", "python_start", "max_rss")
+
+    def __init__(self, name, rss_start, python_start):
+        self.name = name
+        self.rss_start = rss_start
+        self.python_start = python_start
+        self.max_rss = rss_start
+
+
+class MemoryProfiler:
+    """
+    批量处理的内存分析器
+
+    用法:
+        with MemoryProfiler(threshold_mb=1024) as profiler:
+            for path in photo_files:
+                with profiler.photo(path):
+                    ...  # 解码、生成相框、保存
+        print(profiler.format_report())
+    """
+
+    def __init__(self, threshold_mb: Optional[float] = None, top_allocators: int = 5, trace_frames: int = 1):
+        """
+        初始化内存分析器
+
+        Args:
+            threshold_mb: 峰值内存增量超过该值（MB）的照片会被标记，为空时不标记
+            top_allocators: 每张照片记录的主要Python内存分配位置数量
+            trace_frames: tracemalloc记录的调用栈深度
+        """
+        self.threshold_mb = threshold_mb
+        self.top_allocators = top_allocators
+        self.trace_frames = trace_frames
+        self.reports: List[Dict[str, object]] = []
+        self._lock = threading.RLock()
+        self._current = None
+        self._open_spans: List[_OpenSpan] = []
+        self._photo_peak = 0
+        self._snapshot = None
+        self._started_tracemalloc = False
+        self._can_reset = False
+
+    def start(self) -> None:
+        """
+        开始内存分析：启动tracemalloc并注册为埋点收集器
+        """
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.trace_frames)
+            self._started_tracemalloc = True
+        self._can_reset = reset_peak_rss()
+        add_collector(self)
+
+    def stop(self) -> None:
+        """
+        停止内存分析
+        """
+        remove_collector(self)
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def _observe_peak(self) -> int:
+        """
+        读取自上次重置以来的峰值RSS，更新当前照片和正在进行的阶段的峰值，然后重置
+
+        Returns:
+            int: 当前RSS
+        """
+        peak = peak_rss()
+        self._photo_peak = max(self._photo_peak, peak)
+        for open_span in self._open_spans:
+            open_span.max_rss = max(open_span.max_rss, peak)
+        if self._can_reset:
+            reset_peak_rss()
+        return current_rss()
+
+    @contextmanager
+    def photo(self, name: str):
+        """
+        统计一张照片处理过程中的内存
+
+        Args:
+            name: 照片名称或路径
+        """
+        with self._lock:
+            self._observe_peak()
+            rss_before = current_rss()
+            self._photo_peak = rss_before
+            self._open_spans = []
+            if tracemalloc.is_tracing():
+                tracemalloc.reset_peak()
+                self._snapshot = tracemalloc.take_snapshot()
+            self._current = {
+                "photo": name,
+                "rss_before_mb": rss_before / _MB,
+                "stages": {}
+            }
+        try:
+            yield self._current
+        finally:
+            with self._lock:
+                self._finish_photo(rss_before)
+
+    def _finish_photo(self, rss_before: int) -> None:
+        """
+        结束当前照片的统计，生成报告
+        """
+        rss_after = self._observe_peak()
+        report = self._current
+        report["peak_rss_mb"] = self._photo_peak / _MB
+        report["peak_delta_mb"] = (self._photo_peak - rss_before) / _MB
+        report["rss_after_mb"] = rss_after / _MB
+
+        if tracemalloc.is_tracing() and self._snapshot is not None:
+            report["python_peak_mb"] = tracemalloc.get_traced_memory()[1] / _MB
+            snapshot = tracemalloc.take_snapshot().filter_traces((
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, __file__)
+            ))
+            report["top_allocators"] = [
+                {
+                    "location": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                    "size_kb": stat.size_diff / 1024,
+                    "count": stat.count_diff
+                }
+                for stat in snapshot.compare_to(self._snapshot, "lineno")[:self.top_allocators]
+            ]
+        report["over_threshold"] = bool(self.threshold_mb) and report["peak_delta_mb"] > self.threshold_mb
+
+        self.reports.append(report)
+        self._current = None
+        self._snapshot = None
+        self._open_spans = []
+
+    def span_started(self, name: str, args: Dict[str, object]) -> None:
+        """
+        埋点阶段开始时记录当前内存（由instrumentation调用）
+        """
+        with self._lock:
+            if self._current is None:
+                return
+            rss = self._observe_peak()
+            python_now = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else 0
+            self._open_spans.append(_OpenSpan(name, rss, python_now))
+
+    def record(self, record: SpanRecord) -> None:
+        """
+        埋点阶段结束时统计该阶段的内存变化（由instrumentation调用）
+        """
+        with self._lock:
+            if self._current is None:
+                return
+            index = next((i for i in range(len(self._open_spans) - 1, -1, -1)
+                          if self._open_spans[i].name == record.name), None)
+            if index is None:
+                return
+            rss = self._observe_peak()
+            open_span = self._open_spans.pop(index)
+            python_now = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else 0
+
+            stages = self._current["stages"]
+            stage = stages.setdefault(record.name, {"peak_delta_mb": 0.0, "rss_delta_mb": 0.0, "python_delta_mb": 0.0})
+            stage["peak_delta_mb"] = max(stage["peak_delta_mb"], (open_span.max_rss - open_span.rss_start) / _MB)
+            stage["rss_delta_mb"] += (rss - open_span.rss_start) / _MB
+            stage["python_delta_mb"] += (python_now - open_span.python_start) / _MB
+
+    def flagged(self) -> List[Dict[str, object]]:
+        """
+        获取峰值内存超过阈值的照片报告
+
+        Returns:
+            List[Dict[str, object]]: 超过阈值的照片报告
+        """
+        return [report for report in self.reports if report["over_threshold"]]
+
+    def export_json(self, path: str) -> None:
+        """
+        将内存报告写入JSON文件
+
+        Args:
+            path: 输出文件路径
+        """
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"threshold_mb": self.threshold_mb, "photos": self.reports}, f, ensure_ascii=False, indent=2)
+
+    def format_report(self) -> str:
+        """
+        生成便于阅读的内存报告
+
+        Returns:
+            str: 每张照片的峰值内存、峰值最高的阶段和超过阈值的照片
+        """
+        lines = [f"{'照片':<28}{'峰值RSS(MB)':>14}{'峰值增量(MB)':>14}  主要阶段"]
+        for report in self.reports:
+            stages = sorted(report["stages"].items(), key=lambda item: -item[1]["peak_delta_mb"])[:3]
+            stage_text = ", ".join(f"{name} {stage['peak_delta_mb']:.1f}MB" for name, stage in stages)
+            flag = " ⚠" if report["over_threshold"] else ""
+            name = os.path.basename(report["photo"])
+            lines.append(f"{name:<30}{report['peak_rss_mb']:>14.1f}{report['peak_delta_mb']:>14.1f}  {stage_text}{flag}")
+        flagged = self.flagged()
+        if flagged:
+            lines.append(f"\n峰值内存增量超过 {self.threshold_mb:g}MB 的照片: {len(flagged)} 张")
+            for report in flagged:
+                lines.append(f"  - {report['photo']}: {report['peak_delta_mb']:.1f}MB")
+                for allocator in report.get("top_allocators", [])[:3]:
+                    lines.append(f"      {allocator['location']}: {allocator['size_kb']:.1f}KB")
+        return "\n".join(lines)
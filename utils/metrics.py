@@ -0,0 +1,528 @@
+"""
+Prometheus格式的运行指标
+持续处理照片时用计数器、仪表和直方图代替日志：已处理照片数、按异常类型统计的失败数、
+各阶段耗时直方图、缓存命中率（字体、logo、信息横条等）以及队列长度
+
+指标可以定期写入Prometheus文本格式文件（供node_exporter的textfile收集器读取），
+也可以在本地端口上通过HTTP提供/metrics
+"""
+
+import logging
+import math
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from utils.instrumentation import add_collector, remove_collector, SpanRecord
+
+logger = logging.getLogger(__name__)
+
+# 阶段耗时直方图的默认分桶（秒）
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Prometheus文本格式的Content-Type
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape_label(value: str) -> str:
+    """
+    转义标签值中的反斜杠、双引号和换行
+    """
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    """
+    格式化指标值
+    """
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    """
+    格式化标签，如{stage="decode"}
+    """
+    if not names:
+        return ""
+    return "{" + ",".join(f"{name}=\"{_escape_label(value)}\"" for name, value in zip(names, values)) + "}"
+
+
+class _Metric:
+    """
+    指标基类，按标签值区分子序列
+    """
+
+    type_name = "untyped"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        """
+        将标签字典转换为按labelnames排列的标签值
+        """
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"指标 {self.name} 的标签应为 {self.labelnames}，实际为 {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self) -> Iterable[Tuple[str, str, float]]:
+        """
+        导出样本：(指标名后缀, 格式化后的标签, 值)
+        """
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        """
+        生成Prometheus文本格式的行
+        """
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.type_name}"]
+        for suffix, labels, value in self.samples():
+            lines.append(f"{self.name}{suffix}{labels} {_format_value(value)}")
+        return lines
+
+
+class Counter(_Metric):
+    """
+    只增不减的计数器
+    """
+
+    type_name = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help_text, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        """
+        增加计数
+
+        Args:
+            amount: 增加的数量
+            **labels: 标签值
+        """
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, **labels) -> float:
+        """
+        获取当前计数
+        """
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            yield "", _format_labels(self.labelnames, key), value
+
+
+class Gauge(_Metric):
+    """
+    可增可减的仪表
+    """
+
+    type_name = "gauge"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help_text, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def set(self, value: float, **labels) -> None:
+        """
+        设置当前值
+
+        Args:
+            value: 数值
+            **labels: 标签值
+        """
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def get(self, **labels) -> float:
+        """
+        获取当前值
+        """
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            yield "", _format_labels(self.labelnames, key), value
+
+
+class Histogram(_Metric):
+    """
+    按分桶统计分布的直方图
+    """
+
+    type_name = "histogram"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # 标签值 -> [各分桶计数（非累计）, 总和, 总数]
+        self._values: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        """
+        记录一次观测值
+
+        Args:
+            value: 观测值
+            **labels: 标签值
+        """
+        key = self._key(labels)
+        index = next((i for i, bound in enumerate(self.buckets) if value <= bound), len(self.buckets))
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def get_count(self, **labels) -> int:
+        """
+        获取观测次数
+        """
+        with self._lock:
+            entry = self._values.get(self._key(labels))
+            return entry[2] if entry else 0
+
+    def samples(self):
+        with self._lock:
+            items = sorted((key, (list(entry[0]), entry[1], entry[2])) for key, entry in self._values.items())
+        names = self.labelnames + ("le",)
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (math.inf,), counts):
+                cumulative += bucket_count
+                yield "_bucket", _format_labels(names, key + (_format_value(bound),)), cumulative
+            labels = _format_labels(self.labelnames, key)
+            yield "_sum", labels, total
+            yield "_count", labels, count
+
+
+class MetricsRegistry:
+    """
+    指标注册表
+
+    除了直接注册的指标外，还可以注册回调，在导出时按需生成指标（如读取缓存的命中统计）
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._callbacks: List[Callable[[], Iterable[_Metric]]] = []
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+                    raise ValueError(f"指标 {metric.name} 已以不同类型或标签注册")
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+        """
+        注册计数器，同名指标已存在时返回已有的指标
+        """
+        return self._register(Counter(name, help_text, labelnames))
+
+    def gauge(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Gauge:
+        """
+        注册仪表，同名指标已存在时返回已有的指标
+        """
+        return self._register(Gauge(name, help_text, labelnames))
+
+    def histogram(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        """
+        注册直方图，同名指标已存在时返回已有的指标
+        """
+        return self._register(Histogram(name, help_text, labelnames, buckets))
+
+    def add_callback(self, callback: Callable[[], Iterable[_Metric]]) -> None:
+        """
+        注册导出时调用的回调，回调返回需要导出的指标
+
+        Args:
+            callback: 回调函数
+        """
+        with self._lock:
+            if callback not in self._callbacks:
+                self._callbacks.append(callback)
+
+    def remove_callback(self, callback: Callable[[], Iterable[_Metric]]) -> None:
+        """
+        注销回调
+        """
+        with self._lock:
+            self._callbacks = [c for c in self._callbacks if c != callback]
+
+    def render(self) -> str:
+        """
+        生成Prometheus文本格式的全部指标
+
+        Returns:
+            str: 指标文本
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+            callbacks = list(self._callbacks)
+        for callback in callbacks:
+            metrics.extend(callback())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+class RenderMetrics:
+    """
+    批量处理的标准指标：已处理照片数、失败数、阶段耗时、队列长度和缓存命中率
+
+    用法:
+        metrics = RenderMetrics(caches=render_cache_stats())
+        metrics.start()                      # 注册为埋点收集器，统计阶段耗时
+        metrics.photo_rendered("白色底边")
+        metrics.photo_failed("白色底边", error)
+        metrics.set_queue_depth("pending", 10)
+        metrics.stop()
+    """
+
+    def __init__(self, registry: Optional[MetricsRegistry] = None,
+                 caches: Optional[Dict[str, Callable[[], Dict[str, int]]]] = None):
+        """
+        初始化批量处理指标
+
+        Args:
+            registry: 指标注册表，为空时使用全局注册表
+            caches: 缓存名称 -> 返回命中统计（hits、misses、entries）的函数
+        """
+        self.registry = registry or get_metrics_registry()
+        self.caches = dict(caches or {})
+        self.rendered = self.registry.counter(
+            "photo_frame_photos_rendered_total", "已成功生成相框的照片数", ("template",))
+        self.failures = self.registry.counter(
+            "photo_frame_photo_failures_total", "处理失败的照片数（按异常类型）", ("template", "exception"))
+        self.stage_seconds = self.registry.histogram(
+            "photo_frame_stage_duration_seconds", "各处理阶段的耗时（秒）", ("stage",))
+        self.queue_depth = self.registry.gauge(
+            "photo_frame_queue_depth", "队列中等待处理或等待输出的照片数", ("queue",))
+
+    def start(self) -> None:
+        """
+        注册为埋点收集器开始统计阶段耗时，并在导出时输出缓存命中率
+        """
+        add_collector(self)
+        self.registry.add_callback(self._cache_metrics)
+
+    def stop(self) -> None:
+        """
+        停止统计阶段耗时和导出缓存命中率（应在导出最终指标之后调用）
+        """
+        remove_collector(self)
+        self.registry.remove_callback(self._cache_metrics)
+
+    def record(self, record: SpanRecord) -> None:
+        """
+        记录阶段耗时（由instrumentation调用）
+        """
+        self.stage_seconds.observe(record.duration_ns / 1e9, stage=record.name)
+
+    def photo_rendered(self, template: str) -> None:
+        """
+        记录一张照片处理成功
+
+        Args:
+            template: 使用的模板
+        """
+        self.rendered.inc(template=template)
+
+    def photo_failed(self, template: str, error) -> None:
+        """
+        记录一张照片处理失败
+
+        Args:
+            template: 使用的模板
+            error: 异常对象或异常类型名称；包装过的异常按最初的异常类型统计
+        """
+        while isinstance(error, BaseException) and error.__cause__ is not None:
+            error = error.__cause__
+        exception = error if isinstance(error, str) else type(error).__name__
+        self.failures.inc(template=template, exception=exception)
+
+    def set_queue_depth(self, queue: str, depth: int) -> None:
+        """
+        设置队列长度
+
+        Args:
+            queue: 队列名称（如pending、reorder）
+            depth: 队列长度
+        """
+        self.queue_depth.set(depth, queue=queue)
+
+    def _cache_metrics(self) -> List[_Metric]:
+        """
+        导出时读取各缓存的命中统计
+        """
+        hits = Gauge("photo_frame_cache_hits", "缓存命中次数", ("cache",))
+        misses = Gauge("photo_frame_cache_misses", "缓存未命中次数", ("cache",))
+        entries = Gauge("photo_frame_cache_entries", "缓存条目数", ("cache",))
+        ratio = Gauge("photo_frame_cache_hit_ratio", "缓存命中率", ("cache",))
+        for name, stats in self.caches.items():
+            values = stats()
+            total = values.get("hits", 0) + values.get("misses", 0)
+            hits.set(values.get("hits", 0), cache=name)
+            misses.set(values.get("misses", 0), cache=name)
+            entries.set(values.get("entries", 0), cache=name)
+            ratio.set(values.get("hits", 0) / total if total else 0.0, cache=name)
+        return [hits, misses, entries, ratio] if self.caches else []
+
+
+class MetricsFileExporter:
+    """
+    定期将指标写入Prometheus文本格式文件（先写临时文件再替换，读取方不会读到写了一半的文件）
+    """
+
+    def __init__(self, registry: MetricsRegistry, path: str, interval: float = 15.0):
+        """
+        初始化文件导出
+
+        Args:
+            registry: 指标注册表
+            path: 输出文件路径
+            interval: 写入间隔（秒）
+        """
+        self.registry = registry
+        self.path = path
+        self.interval = interval
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def write(self) -> None:
+        """
+        立即写入一次指标
+        """
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(self.registry.render())
+        os.replace(temp_path, self.path)
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.write()
+            except OSError as e:
+                logger.warning("写入指标文件失败: %s", str(e))
+
+    def start(self) -> None:
+        """
+        启动后台写入线程
+        """
+        self.write()
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="metrics-file-exporter", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        停止后台写入线程，并写入最终的指标
+        """
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.write()
+
+
+class MetricsHTTPExporter:
+    """
+    在本地端口上通过HTTP提供/metrics
+    """
+
+    def __init__(self, registry: MetricsRegistry, port: int, host: str = "127.0.0.1"):
+        """
+        初始化HTTP导出
+
+        Args:
+            registry: 指标注册表
+            port: 端口，0表示由系统分配
+            host: 监听地址
+        """
+        self.registry = registry
+        registry_ref = registry
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?", 1)[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = registry_ref.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def port(self) -> int:
+        """
+        实际监听的端口
+        """
+        return self._server.server_address[1]
+
+    def start(self) -> None:
+        """
+        在后台线程中开始提供服务
+        """
+        self._thread = threading.Thread(target=self._server.serve_forever, name="metrics-http-exporter", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        停止服务
+        """
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+# 全局指标注册表
+_metrics_registry = MetricsRegistry()
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    """
+    获取全局指标注册表
+
+    Returns:
+        MetricsRegistry: 指标注册表
+    """
+    return _metrics_registry
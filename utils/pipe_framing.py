@@ -0,0 +1,65 @@
+"""
+管道模式的多图片分帧
+一个进程通过标准输入输出连续处理多张图片时，每张图片前写一行十进制字节数：
+
+    <字节数>\\n<图片数据><字节数>\\n<图片数据>...
+
+图片数据中可能出现任意字节（包括NUL和换行），因此用长度前缀而不是分隔符分帧；
+在shell中可以这样生成: for f in *.jpg; do stat -c %s "$f"; cat "$f"; done
+"""
+
+from typing import BinaryIO, Iterator
+
+# 长度行的最大字节数，防止读到非分帧数据时无限读取
+_MAX_HEADER_BYTES = 20
+
+
+class FramingError(Exception):
+    """
+    分帧数据格式错误
+    """
+
+
+def read_frames(fp: BinaryIO, max_frame_bytes: int = 512 * 1024 * 1024) -> Iterator[bytes]:
+    """
+    从二进制流中依次读取长度前缀分帧的数据，直到流结束
+
+    Args:
+        fp: 二进制输入流（如sys.stdin.buffer）
+        max_frame_bytes: 单帧的最大字节数
+
+    Yields:
+        bytes: 每一帧的数据
+
+    Raises:
+        FramingError: 长度行格式错误、超过上限或数据被截断
+    """
+    while True:
+        header = fp.readline(_MAX_HEADER_BYTES + 1)
+        if not header:
+            return
+        if not header.endswith(b"\n"):
+            raise FramingError(f"长度行格式错误: {header[:_MAX_HEADER_BYTES]!r}")
+        try:
+            length = int(header.strip())
+        except ValueError:
+            raise FramingError(f"长度行格式错误: {header.strip()!r}")
+        if length < 0 or length > max_frame_bytes:
+            raise FramingError(f"帧长度超出范围: {length}")
+        data = fp.read(length)
+        if len(data) != length:
+            raise FramingError(f"数据被截断: 需要 {length} 字节，只读到 {len(data)} 字节")
+        yield data
+
+
+def write_frame(fp: BinaryIO, data: bytes) -> None:
+    """
+    写入一帧数据并刷新，下游可以立即读取
+
+    Args:
+        fp: 二进制输出流（如sys.stdout.buffer）
+        data: 帧数据；处理失败时写入空帧，保持输入和输出一一对应
+    """
+    fp.write(f"{len(data)}\n".encode("ascii"))
+    fp.write(data)
+    fp.flush()
@@ -0,0 +1,227 @@
+"""
+结构化进度输出
+批量处理时每张照片输出一行JSON记录（输入、输出、模板、读写字节数、各阶段耗时、状态和错误），
+结束时输出包含吞吐量和延迟百分位的汇总记录，便于编排系统直接解析而不必抓取中文日志
+
+记录先写入缓冲区，按条数或时间间隔批量刷新，每条记录只有一次json序列化的开销
+"""
+
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, TextIO
+
+from utils.instrumentation import SpanRecord, percentile
+
+# 汇总记录中的延迟百分位
+SUMMARY_PERCENTS = (50, 90, 99)
+
+
+class StageTimings:
+    """
+    按线程累计当前照片各阶段耗时的收集器（通过instrumentation.add_collector注册）
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def _stages(self) -> Dict[str, float]:
+        stages = getattr(self._local, "stages", None)
+        if stages is None:
+            stages = self._local.stages = defaultdict(float)
+        return stages
+
+    def record(self, record: SpanRecord) -> None:
+        """
+        累计阶段耗时（由instrumentation调用）
+        """
+        self._stages()[record.name] += record.duration_ns / 1e6
+
+    def take(self) -> Dict[str, float]:
+        """
+        取出当前线程累计的各阶段耗时（毫秒）并清空
+
+        Returns:
+            Dict[str, float]: 阶段名 -> 耗时（毫秒）
+        """
+        stages = self._stages()
+        self._local.stages = None
+        return {name: round(ms, 3) for name, ms in stages.items()}
+
+
+class ProgressReporter:
+    """
+    JSON Lines进度输出
+
+    用法:
+        with ProgressReporter.open_fd(1) as reporter:
+            reporter.photo(input_path, output_path, template, status="ok", ...)
+    """
+
+    def __init__(self, stream: TextIO, flush_every: int = 64, flush_interval: float = 1.0,
+                 close_stream: bool = False):
+        """
+        初始化进度输出
+
+        Args:
+            stream: 输出流
+            flush_every: 缓冲的记录数达到该值时刷新
+            flush_interval: 距上次刷新超过该时间（秒）时刷新
+            close_stream: 关闭时是否同时关闭输出流
+        """
+        self.stream = stream
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.close_stream = close_stream
+        self._buffer: List[str] = []
+        self._last_flush = time.monotonic()
+        self._start = time.monotonic()
+        self._latencies: List[float] = []
+        self._succeeded = 0
+        self._failed = 0
+        self._bytes_in = 0
+        self._bytes_out = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def open_fd(cls, fd: int, **kwargs) -> "ProgressReporter":
+        """
+        输出到文件描述符（如1为标准输出），关闭时不关闭该文件描述符
+
+        Args:
+            fd: 文件描述符
+            **kwargs: 传给构造函数的参数
+
+        Returns:
+            ProgressReporter: 进度输出
+        """
+        stream = open(fd, "w", encoding="utf-8", closefd=False, buffering=1 << 16)
+        return cls(stream, close_stream=True, **kwargs)
+
+    def photo(self, input_path: str, output_path: Optional[str], template: str, status: str,
+              latency_ms: float, stages: Optional[Dict[str, float]] = None, error: Optional[str] = None) -> None:
+        """
+        输出一张照片的处理记录
+
+        Args:
+            input_path: 输入照片路径
+            output_path: 输出照片路径，失败时为空
+            template: 使用的模板
+            status: 状态（"ok"或"error"）
+            latency_ms: 处理总耗时（毫秒）
+            stages: 各阶段耗时（毫秒）
+            error: 错误信息
+        """
+        bytes_in = _file_size(input_path)
+        bytes_out = _file_size(output_path) if output_path else 0
+        record = {
+            "type": "photo",
+            "input": input_path,
+            "output": output_path,
+            "template": template,
+            "status": status,
+            "bytes_in": bytes_in,
+            "bytes_out": bytes_out,
+            "latency_ms": round(latency_ms, 3),
+            "stages_ms": stages or {}
+        }
+        if error is not None:
+            record["error"] = error
+
+        with self._lock:
+            self._latencies.append(latency_ms)
+            self._bytes_in += bytes_in
+            self._bytes_out += bytes_out
+            if status == "ok":
+                self._succeeded += 1
+            else:
+                self._failed += 1
+            self._write(record)
+
+    def summary(self) -> Dict[str, object]:
+        """
+        计算汇总信息：处理数量、吞吐量、读写字节数和延迟百分位
+
+        Returns:
+            Dict[str, object]: 汇总记录
+        """
+        with self._lock:
+            elapsed = time.monotonic() - self._start
+            total = self._succeeded + self._failed
+            latency = {f"p{p}": round(percentile(self._latencies, p), 3) for p in SUMMARY_PERCENTS}
+            latency["max"] = round(max(self._latencies, default=0.0), 3)
+            return {
+                "type": "summary",
+                "photos": total,
+                "succeeded": self._succeeded,
+                "failed": self._failed,
+                "elapsed_s": round(elapsed, 3),
+                "photos_per_s": round(total / elapsed, 3) if elapsed > 0 else 0.0,
+                "bytes_in": self._bytes_in,
+                "bytes_out": self._bytes_out,
+                "latency_ms": latency
+            }
+
+    def event(self, record: Dict[str, object]) -> None:
+        """
+        输出一条自定义记录（如开始处理、扫描统计）
+
+        Args:
+            record: 记录内容，应包含type字段
+        """
+        with self._lock:
+            self._write(record)
+
+    def _write(self, record: Dict[str, object]) -> None:
+        """
+        将记录加入缓冲区，达到条数或时间间隔时刷新（调用方需持有锁）
+        """
+        self._buffer.append(json.dumps(record, ensure_ascii=False, separators=(",", ":")))
+        if len(self._buffer) >= self.flush_every or time.monotonic() - self._last_flush >= self.flush_interval:
+            self._flush()
+
+    def _flush(self) -> None:
+        """
+        写出缓冲区中的记录（调用方需持有锁）
+        """
+        if self._buffer:
+            self.stream.write("\n".join(self._buffer) + "\n")
+            self._buffer = []
+        self.stream.flush()
+        self._last_flush = time.monotonic()
+
+    def flush(self) -> None:
+        """
+        写出缓冲区中的记录
+        """
+        with self._lock:
+            self._flush()
+
+    def close(self) -> None:
+        """
+        输出汇总记录并关闭
+        """
+        summary = self.summary()
+        with self._lock:
+            self._buffer.append(json.dumps(summary, ensure_ascii=False, separators=(",", ":")))
+            self._flush()
+            if self.close_stream:
+                self.stream.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def _file_size(path: Optional[str]) -> int:
+    """
+    获取文件大小，文件不存在时返回0
+    """
+    try:
+        return os.path.getsize(path)
+    except (OSError, TypeError):
+        return 0
@@ -0,0 +1,211 @@
+"""
+文本测量缓存与按宽度截断工具
+为模板提供带缓存的字体加载、文本宽度测量以及二分查找的自适应截断
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Hashable, Tuple
+
+from PIL import ImageFont
+
+logger = logging.getLogger(__name__)
+
+# 截断文本时追加的省略号
+ELLIPSIS = "..."
+
+
+@lru_cache(maxsize=64)
+def get_font(family: str, size: int):
+    """
+    按(字体名称, 字号)缓存字体对象，避免每张照片重复加载字体文件
+
+    Args:
+        family: 字体名称或字体文件路径（如"Arial"、"Arial Bold"）
+        size: 字号（像素）
+
+    Returns:
+        字体对象，加载失败时返回Pillow默认字体
+    """
+    try:
+        return ImageFont.truetype(family, size)
+    except Exception as e:
+        # 只记录异常文本：日志记录持有异常时会通过traceback保留调用方栈帧中的图像
+        logger.warning("字体加载失败: %s", str(e))
+        return ImageFont.load_default()
+
+
+def font_key(font) -> Hashable:
+    """
+    获取字体的缓存键
+
+    TrueType字体按(文件路径, 字号, 字体索引)区分，其他字体按对象标识区分
+
+    Args:
+        font: 字体对象
+
+    Returns:
+        Hashable: 字体缓存键
+    """
+    path = getattr(font, "path", None)
+    if path is not None:
+        return (path, getattr(font, "size", None), getattr(font, "index", 0))
+    return ("id", id(font))
+
+
+class TextMeasureCache:
+    """
+    文本测量缓存
+    以(字体, 文本)为键缓存getbbox结果，并提供基于前缀宽度二分查找的截断求解
+    """
+
+    def __init__(self, max_entries: int = 8192):
+        """
+        初始化文本测量缓存
+
+        Args:
+            max_entries: 最多缓存的测量结果数量，超出后按LRU淘汰
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[Hashable, str], Tuple[int, int, int, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_bbox(self, font, text: str) -> Tuple[int, int, int, int]:
+        """
+        获取文本的包围盒（带缓存）
+
+        Args:
+            font: 字体对象
+            text: 文本内容
+
+        Returns:
+            Tuple[int, int, int, int]: (left, top, right, bottom)
+        """
+        key = (font_key(font), text)
+        with self._lock:
+            bbox = self._entries.get(key)
+            if bbox is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return bbox
+            self.misses += 1
+
+        bbox = tuple(font.getbbox(text)) if text else (0, 0, 0, 0)
+
+        with self._lock:
+            self._entries[key] = bbox
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return bbox
+
+    def text_width(self, font, text: str) -> int:
+        """
+        获取文本从绘制原点到右边缘的宽度
+
+        Args:
+            font: 字体对象
+            text: 文本内容
+
+        Returns:
+            int: 文本宽度（像素）
+        """
+        return self.get_bbox(font, text)[2]
+
+    def fit_text(self, font, text: str, max_width: int, ellipsis: str = ELLIPSIS) -> str:
+        """
+        求解能放入指定宽度的最长文本，放不下时在末尾追加省略号
+
+        使用二分查找前缀长度，只需O(log n)次测量
+
+        Args:
+            font: 字体对象
+            text: 原始文本
+            max_width: 允许的最大宽度（像素）
+            ellipsis: 截断后追加的省略号
+
+        Returns:
+            str: 原始文本（能放下时）或截断后带省略号的文本，连省略号都放不下时返回空字符串
+        """
+        if not text or self.text_width(font, text) <= max_width:
+            return text
+
+        # 在[0, len(text) - 1]中查找满足宽度限制的最长前缀
+        low, high = 0, len(text) - 1
+        best = None
+        while low <= high:
+            mid = (low + high) // 2
+            candidate = text[:mid].rstrip() + ellipsis
+            if self.text_width(font, candidate) <= max_width:
+                best = candidate
+                low = mid + 1
+            else:
+                high = mid - 1
+
+        return best if best is not None else ""
+
+    def clear(self) -> None:
+        """
+        清空缓存和命中统计
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        """
+        获取缓存统计信息
+
+        Returns:
+            dict: 包含entries、hits、misses的统计字典
+        """
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+# 创建全局文本测量缓存实例，供所有模板共享
+_measure_cache = TextMeasureCache()
+
+
+def get_measure_cache() -> TextMeasureCache:
+    """
+    获取全局文本测量缓存实例
+
+    Returns:
+        TextMeasureCache: 全局文本测量缓存
+    """
+    return _measure_cache
+
+
+def measure_text_width(font, text: str) -> int:
+    """
+    使用全局缓存测量文本宽度
+
+    Args:
+        font: 字体对象
+        text: 文本内容
+
+    Returns:
+        int: 文本宽度（像素）
+    """
+    return _measure_cache.text_width(font, text)
+
+
+def fit_text_to_width(font, text: str, max_width: int, ellipsis: str = ELLIPSIS) -> str:
+    """
+    使用全局缓存将文本截断到指定宽度以内
+
+    Args:
+        font: 字体对象
+        text: 原始文本
+        max_width: 允许的最大宽度（像素）
+        ellipsis: 截断后追加的省略号
+
+    Returns:
+        str: 能放入指定宽度的文本
+    """
+    return _measure_cache.fit_text(font, text, max_width, ellipsis)
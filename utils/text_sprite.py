@@ -0,0 +1,187 @@
+"""
+文本精灵缓存
+将批量处理中反复出现的文本（相机型号、镜头型号、曝光参数等）预先渲染为透明度蒙版，
+后续直接粘贴到目标图片上，避免每张照片都重新光栅化字形
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Hashable, Tuple
+
+from PIL import Image, ImageDraw
+
+from utils.text_measure import font_key, get_measure_cache
+
+
+class TextSprite:
+    """
+    预渲染的文本精灵
+    保存文本的透明度蒙版以及蒙版相对绘制原点的偏移
+    """
+
+    __slots__ = ("mask", "offset", "fill")
+
+    def __init__(self, mask: Image.Image, offset: Tuple[int, int], fill):
+        """
+        初始化文本精灵
+
+        Args:
+            mask: "L"模式的透明度蒙版
+            offset: 蒙版左上角相对绘制原点的偏移 (x, y)
+            fill: 文本颜色
+        """
+        self.mask = mask
+        self.offset = offset
+        self.fill = fill
+
+    @property
+    def nbytes(self) -> int:
+        """
+        获取蒙版占用的字节数
+
+        Returns:
+            int: 字节数
+        """
+        return self.mask.width * self.mask.height
+
+
+class TextSpriteCache:
+    """
+    有界的文本精灵缓存
+    以(字体, 字号, 文本, 颜色)为键，按占用字节数进行LRU淘汰
+    """
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024):
+        """
+        初始化文本精灵缓存
+
+        Args:
+            max_bytes: 缓存的蒙版最多占用的字节数
+        """
+        self.max_bytes = max_bytes
+        self._sprites: "OrderedDict[Hashable, TextSprite]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_sprite(self, text: str, font, fill) -> TextSprite:
+        """
+        获取文本精灵，未命中时渲染并加入缓存
+
+        Args:
+            text: 文本内容
+            font: 字体对象
+            fill: 文本颜色
+
+        Returns:
+            TextSprite: 文本精灵
+        """
+        key = (font_key(font), getattr(font, "size", None), text, fill)
+        with self._lock:
+            sprite = self._sprites.get(key)
+            if sprite is not None:
+                self._sprites.move_to_end(key)
+                self.hits += 1
+                return sprite
+            self.misses += 1
+
+        sprite = self._render(text, font, fill)
+
+        with self._lock:
+            if key not in self._sprites:
+                self._sprites[key] = sprite
+                self._bytes += sprite.nbytes
+                # 超出内存预算时淘汰最久未使用的精灵
+                while self._bytes > self.max_bytes and len(self._sprites) > 1:
+                    _, evicted = self._sprites.popitem(last=False)
+                    self._bytes -= evicted.nbytes
+        return sprite
+
+    def _render(self, text: str, font, fill) -> TextSprite:
+        """
+        将文本渲染为透明度蒙版
+
+        Args:
+            text: 文本内容
+            font: 字体对象
+            fill: 文本颜色
+
+        Returns:
+            TextSprite: 渲染好的文本精灵
+        """
+        left, top, right, bottom = get_measure_cache().get_bbox(font, text)
+        mask = Image.new("L", (max(right - left, 1), max(bottom - top, 1)), 0)
+        ImageDraw.Draw(mask).text((-left, -top), text, fill=255, font=font)
+        return TextSprite(mask, (left, top), fill)
+
+    def draw_text(self, image: Image.Image, xy: Tuple[int, int], text: str, font, fill) -> None:
+        """
+        将文本精灵粘贴到目标图片上，效果等同于ImageDraw.text
+
+        Args:
+            image: 目标图片
+            xy: 文本绘制原点 (x, y)
+            text: 文本内容
+            font: 字体对象
+            fill: 文本颜色
+        """
+        if not text:
+            return
+        sprite = self.get_sprite(text, font, fill)
+        x = int(xy[0]) + sprite.offset[0]
+        y = int(xy[1]) + sprite.offset[1]
+        image.paste(sprite.fill, (x, y, x + sprite.mask.width, y + sprite.mask.height), sprite.mask)
+
+    def clear(self) -> None:
+        """
+        清空缓存和命中统计
+        """
+        with self._lock:
+            self._sprites.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        """
+        获取缓存统计信息
+
+        Returns:
+            dict: 包含entries、bytes、hits、misses的统计字典
+        """
+        with self._lock:
+            return {
+                "entries": len(self._sprites),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses
+            }
+
+
+# 创建全局文本精灵缓存实例，供所有模板共享
+_sprite_cache = TextSpriteCache()
+
+
+def get_sprite_cache() -> TextSpriteCache:
+    """
+    获取全局文本精灵缓存实例
+
+    Returns:
+        TextSpriteCache: 全局文本精灵缓存
+    """
+    return _sprite_cache
+
+
+def draw_text_sprite(image: Image.Image, xy: Tuple[int, int], text: str, font, fill) -> None:
+    """
+    使用全局文本精灵缓存绘制文本
+
+    Args:
+        image: 目标图片
+        xy: 文本绘制原点 (x, y)
+        text: 文本内容
+        font: 字体对象
+        fill: 文本颜色
+    """
+    _sprite_cache.draw_text(image, xy, text, font, fill)
@@ -0,0 +1,205 @@
+"""
+缩略图加载工具
+优先使用照片EXIF中嵌入的JPEG缩略图，没有时使用JPEG草稿模式（按比例缩小解码）生成，
+在后台线程中按请求顺序（通常是可见区域优先）加载，并用有界LRU缓存保存结果
+"""
+
+import io
+import logging
+import threading
+from collections import OrderedDict, deque
+from typing import Callable, Iterable, Optional, Tuple
+
+from PIL import Image
+
+from utils.exif_reader import read_exif_tags, read_exif_thumbnail
+
+logger = logging.getLogger(__name__)
+
+# 默认缩略图尺寸
+DEFAULT_THUMBNAIL_SIZE = (48, 48)
+
+# 默认最多缓存的缩略图数量
+DEFAULT_MAX_ITEMS = 512
+
+# EXIF方向到转置操作的映射（EXIF缩略图不会按方向旋转）
+_ORIENTATION_TRANSPOSE = {
+    2: Image.Transpose.FLIP_LEFT_RIGHT,
+    3: Image.Transpose.ROTATE_180,
+    4: Image.Transpose.FLIP_TOP_BOTTOM,
+    5: Image.Transpose.TRANSPOSE,
+    6: Image.Transpose.ROTATE_270,
+    7: Image.Transpose.TRANSVERSE,
+    8: Image.Transpose.ROTATE_90
+}
+
+
+def load_thumbnail(image_path: str, size: Tuple[int, int] = DEFAULT_THUMBNAIL_SIZE) -> Image.Image:
+    """
+    生成照片的缩略图
+
+    优先使用EXIF中嵌入的缩略图；没有时用草稿模式解码，JPEG只需解码1/2到1/8尺寸的数据
+
+    Args:
+        image_path: 照片路径
+        size: 缩略图最大尺寸
+
+    Returns:
+        Image.Image: 已按EXIF方向旋转的RGB缩略图
+    """
+    exif_data = read_exif_tags(image_path, ("Orientation",))
+    orientation = exif_data.get("Orientation", 1) if exif_data else 1
+
+    thumbnail = None
+    data = read_exif_thumbnail(image_path)
+    if data:
+        try:
+            with Image.open(io.BytesIO(data)) as embedded:
+                embedded.draft("RGB", size)
+                thumbnail = embedded.convert("RGB")
+        except Exception:
+            thumbnail = None
+
+    if thumbnail is None:
+        with Image.open(image_path) as img:
+            if exif_data is None:
+                # 非JPEG文件从Pillow读取方向
+                orientation = img.getexif().get(0x0112, 1)
+            img.draft("RGB", size)
+            thumbnail = img.convert("RGB")
+
+    if orientation in _ORIENTATION_TRANSPOSE:
+        thumbnail = thumbnail.transpose(_ORIENTATION_TRANSPOSE[orientation])
+    thumbnail.thumbnail(size, Image.Resampling.BILINEAR)
+    return thumbnail
+
+
+class ThumbnailLoader:
+    """
+    后台缩略图加载器
+
+    调用request()提交需要的照片（按优先级排列），后台线程依次加载，
+    完成后通过回调通知调用方；回调在后台线程中执行，GUI需自行切换到主线程
+    """
+
+    def __init__(self, callback: Callable[[str, Image.Image], None],
+                 size: Tuple[int, int] = DEFAULT_THUMBNAIL_SIZE, max_items: int = DEFAULT_MAX_ITEMS):
+        """
+        初始化缩略图加载器
+
+        Args:
+            callback: 缩略图加载完成时的回调，参数为(照片路径, 缩略图)
+            size: 缩略图最大尺寸
+            max_items: 最多缓存的缩略图数量
+        """
+        self.callback = callback
+        self.size = size
+        self.max_items = max_items
+        self._cache = OrderedDict()
+        self._pending = deque()
+        self._condition = threading.Condition()
+        self._worker = None
+        self._closed = False
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, image_path: str) -> Optional[Image.Image]:
+        """
+        获取已缓存的缩略图
+
+        Args:
+            image_path: 照片路径
+
+        Returns:
+            Optional[Image.Image]: 缩略图，未缓存时返回None
+        """
+        with self._condition:
+            thumbnail = self._cache.get(image_path)
+            if thumbnail is None:
+                self.misses += 1
+                return None
+            self._cache.move_to_end(image_path)
+            self.hits += 1
+            return thumbnail
+
+    def request(self, image_paths: Iterable[str]) -> None:
+        """
+        提交需要加载的照片，替换之前尚未开始的请求
+
+        Args:
+            image_paths: 照片路径，按加载优先级排列（可见区域在前）
+        """
+        with self._condition:
+            if self._closed:
+                return
+            self._pending.clear()
+            seen = set()
+            for image_path in image_paths:
+                if image_path not in self._cache and image_path not in seen:
+                    self._pending.append(image_path)
+                    seen.add(image_path)
+            if self._pending and self._worker is None:
+                self._worker = threading.Thread(target=self._run, daemon=True)
+                self._worker.start()
+            self._condition.notify()
+
+    def cancel(self) -> None:
+        """
+        取消尚未开始的加载请求
+        """
+        with self._condition:
+            self._pending.clear()
+
+    def clear(self) -> None:
+        """
+        取消加载请求并清空缓存
+        """
+        with self._condition:
+            self._pending.clear()
+            self._cache.clear()
+
+    def close(self) -> None:
+        """
+        停止后台线程
+        """
+        with self._condition:
+            self._closed = True
+            self._pending.clear()
+            self._condition.notify()
+        if self._worker is not None:
+            self._worker.join(timeout=1)
+
+    def stats(self) -> dict:
+        """
+        获取缓存统计
+
+        Returns:
+            dict: 命中次数、未命中次数、缓存数量和待加载数量
+        """
+        with self._condition:
+            return {"hits": self.hits, "misses": self.misses, "items": len(self._cache), "pending": len(self._pending)}
+
+    def _run(self) -> None:
+        """
+        后台线程：按顺序加载待处理的缩略图
+        """
+        while True:
+            with self._condition:
+                while not self._pending and not self._closed:
+                    self._condition.wait()
+                if self._closed:
+                    return
+                image_path = self._pending.popleft()
+
+            try:
+                thumbnail = load_thumbnail(image_path, self.size)
+            except Exception as e:
+                logger.warning("加载缩略图失败: %s: %s", image_path, str(e))
+                continue
+
+            with self._condition:
+                self._cache[image_path] = thumbnail
+                self._cache.move_to_end(image_path)
+                while len(self._cache) > self.max_items:
+                    self._cache.popitem(last=False)
+            self.callback(image_path, thumbnail)